@@ -0,0 +1,37 @@
+"""Unique natural key on games
+
+Revision ID: 002
+Revises: 001
+Create Date: 2025-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the most recently updated row for each date and team pair
+    op.execute("""
+    DELETE FROM football.games AS g
+    USING (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY date, home_team, away_team
+            ORDER BY updated_at DESC NULLS LAST, created_at DESC NULLS LAST, id
+        ) AS row_number
+        FROM football.games
+    ) AS ranked
+    WHERE g.id = ranked.id AND ranked.row_number > 1;
+    """)
+    
+    op.create_unique_constraint(
+        'uq_games_date_teams', 'games', ['date', 'home_team', 'away_team'], schema='football'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_games_date_teams', 'games', schema='football', type_='unique')
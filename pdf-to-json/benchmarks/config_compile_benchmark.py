@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the compiled converter configuration.
+
+Compares building a FootballConverter when every instance compiles the
+configuration files itself against reusing the in-memory artifact, times
+loading the artifact from the on-disk cache and an atomic reload, and
+reports merge throughput on a synthetic Tippmix corpus with the
+precompiled market rules.
+
+Usage:
+    python benchmarks/config_compile_benchmark.py
+    python benchmarks/config_compile_benchmark.py --instances 200 --games 5000
+"""
+
+import argparse
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from converter import compiled_config as compiled_config_module
+from converter.compiled_config import (
+    CACHE_DIRNAME, CONFIG_SOURCES, compile_config, load_compiled_config, reload_compiled_config
+)
+from converter.football_converter import FootballConverter
+from tippmix_corpus import generate_json_content
+
+CONFIG_DIR = Path(__file__).parent.parent / "config"
+
+
+def time_runs(runs: int, action: Callable[[], object], before: Callable[[], None] = lambda: None) -> List[float]:
+    """Wall time of each run in milliseconds; ``before`` runs untimed."""
+    timings = []
+    for _ in range(runs):
+        before()
+        started = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> int:
+    """Run the benchmark and return a process exit code."""
+    parser = argparse.ArgumentParser(description="Compiled converter config benchmark")
+    parser.add_argument("--instances", type=int, default=50,
+                        help="FootballConverter instances per scenario")
+    parser.add_argument("--games", type=int, default=2_000, help="Games in the merge corpus")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as workdir:
+        config_dir = Path(workdir) / "config"
+        config_dir.mkdir()
+        for name in CONFIG_SOURCES:
+            shutil.copy(CONFIG_DIR / name, config_dir / name)
+
+        def forget_artifacts() -> None:
+            compiled_config_module._artifacts.clear()
+            shutil.rmtree(config_dir / CACHE_DIRNAME, ignore_errors=True)
+
+        cold = time_runs(args.instances, lambda: FootballConverter(config_dir=str(config_dir)),
+                         before=forget_artifacts)
+        warm = time_runs(args.instances, lambda: FootballConverter(config_dir=str(config_dir)))
+        compiled = time_runs(args.instances, lambda: compile_config(str(config_dir)))
+        load_compiled_config(str(config_dir))
+        from_disk = time_runs(args.instances, lambda: load_compiled_config(str(config_dir)))
+        reload = time_runs(args.instances, lambda: reload_compiled_config(str(config_dir)))
+
+        converter = FootballConverter(config_dir=str(config_dir))
+        matches = converter.extractor.extract_football_data(generate_json_content(args.games))
+        started = time.perf_counter()
+        games = converter.market_processor.merge_matches_by_game(matches)
+        merge_seconds = time.perf_counter() - started
+
+    print(f"Instances: {args.instances}")
+    print(f"{'converter, compiling config':<32} {statistics.median(cold):8.2f} ms median")
+    print(f"{'converter, shared artifact':<32} {statistics.median(warm):8.2f} ms median")
+    print(f"{'compile_config':<32} {statistics.median(compiled):8.2f} ms median")
+    print(f"{'artifact from disk cache':<32} {statistics.median(from_disk):8.2f} ms median")
+    print(f"{'reload and swap':<32} {statistics.median(reload):8.2f} ms median")
+    print(f"Merged {len(matches):,} market lines into {len(games):,} games in {merge_seconds:.2f} s "
+          f"({len(matches) / merge_seconds:,.0f} lines/s)")
+
+    if statistics.median(warm) >= statistics.median(cold):
+        print("FAIL: sharing the compiled artifact did not speed up converter construction")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Job affinity simulation for the scaling manager.
+
+Routes a skewed stream of jobs through ScalingManager with each load
+balancing strategy. Every simulated worker keeps a small LRU cache standing
+in for its TeamNormalizer memo and CacheManager local tier. The simulation
+reports the local cache hit ratio per strategy and the share of keys that
+change owner when a worker joins or leaves the consistent-hash ring.
+
+Usage:
+    python benchmarks/consistent_hash_benchmark.py
+    python benchmarks/consistent_hash_benchmark.py --workers 16 --jobs 200000
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from automation.scaling_manager import (
+    ConsistentHashRing, LoadBalancingStrategy, ScalingConfig, ScalingManager
+)
+
+
+def build_job_stream(buckets: int, total: int, seed: int) -> List[Dict[str, Any]]:
+    """Build jobs keyed by league/date bucket with a Zipf-like popularity skew."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(buckets)]
+    chosen = rng.choices(range(buckets), weights=weights, k=total)
+    return [{"league": f"league-{bucket % 40}", "date": f"2025-08-{bucket // 40 % 28 + 1:02d}-{bucket}"}
+            for bucket in chosen]
+
+
+async def simulate(strategy: LoadBalancingStrategy, jobs: List[Dict[str, Any]], workers: int,
+                   cache_size: int, concurrency: int) -> Dict[str, Any]:
+    """Route the job stream and count per-worker cache hits."""
+    manager = ScalingManager(ScalingConfig(load_balancing_strategy=strategy))
+    for index in range(workers):
+        worker_id = f"worker-{index}"
+        await manager.register_worker(worker_id, "127.0.0.1", 9000 + index, max_jobs=concurrency)
+        await manager.update_worker_heartbeat(worker_id)
+
+    caches: Dict[str, OrderedDict] = {worker_id: OrderedDict() for worker_id in manager.workers}
+    in_flight: deque = deque()
+    hits = 0
+
+    for job_index, requirements in enumerate(jobs):
+        worker_id = await manager.assign_job(f"job-{job_index}", requirements)
+        in_flight.append((worker_id, job_index))
+        if len(in_flight) >= concurrency:
+            done_worker, done_job = in_flight.popleft()
+            await manager.job_completed(done_worker, f"job-{done_job}")
+
+        key = (requirements["league"], requirements["date"])
+        cache = caches[worker_id]
+        if key in cache:
+            cache.move_to_end(key)
+            hits += 1
+        else:
+            cache[key] = True
+            if len(cache) > cache_size:
+                cache.popitem(last=False)
+
+    return {"hit_ratio": hits / len(jobs)}
+
+
+def measure_key_movement(workers: int, keys: int, virtual_nodes: int) -> Dict[str, float]:
+    """Share of keys that change owner when one worker joins or leaves."""
+    ring = ConsistentHashRing(virtual_nodes)
+    for index in range(workers):
+        ring.add_node(f"worker-{index}")
+    sample = [f"key-{index}" for index in range(keys)]
+    before = [ring.get_node(key) for key in sample]
+
+    ring.add_node(f"worker-{workers}")
+    after_join = [ring.get_node(key) for key in sample]
+    ring.remove_node(f"worker-{workers}")
+    ring.remove_node("worker-0")
+    after_leave = [ring.get_node(key) for key in sample]
+
+    return {
+        "join": sum(a != b for a, b in zip(before, after_join)) / keys,
+        "leave": sum(a != b for a, b in zip(before, after_leave)) / keys,
+    }
+
+
+def main() -> int:
+    """Run the simulation and return a process exit code."""
+    parser = argparse.ArgumentParser(description="Consistent-hash job affinity simulation")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--jobs", type=int, default=50_000)
+    parser.add_argument("--buckets", type=int, default=2_000,
+                        help="Distinct league/date affinity buckets")
+    parser.add_argument("--cache-size", type=int, default=200,
+                        help="Entries each worker's local cache holds")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Jobs in flight across the pool")
+    parser.add_argument("--virtual-nodes", type=int, default=ScalingConfig.virtual_nodes_per_worker)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    jobs = build_job_stream(args.buckets, args.jobs, args.seed)
+
+    print(f"Workers: {args.workers}  Jobs: {args.jobs:,}  Buckets: {args.buckets:,}  "
+          f"Cache per worker: {args.cache_size}")
+
+    results = {}
+    for strategy in (LoadBalancingStrategy.ROUND_ROBIN,
+                     LoadBalancingStrategy.LEAST_CONNECTIONS,
+                     LoadBalancingStrategy.CONSISTENT_HASH):
+        results[strategy] = asyncio.run(
+            simulate(strategy, jobs, args.workers, args.cache_size, args.concurrency)
+        )
+        print(f"{strategy.value:<20} local cache hit ratio: {results[strategy]['hit_ratio']:6.1%}")
+
+    movement = measure_key_movement(args.workers, 20_000, args.virtual_nodes)
+    print(f"Keys moved when a worker joins: {movement['join']:.1%}  "
+          f"leaves: {movement['leave']:.1%}  (ideal ~{1 / (args.workers + 1):.1%} / {1 / args.workers:.1%})")
+
+    baseline = max(results[LoadBalancingStrategy.ROUND_ROBIN]["hit_ratio"],
+                   results[LoadBalancingStrategy.LEAST_CONNECTIONS]["hit_ratio"])
+    if results[LoadBalancingStrategy.CONSISTENT_HASH]["hit_ratio"] <= baseline:
+        print("FAIL: consistent hashing did not improve the local cache hit ratio")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark for DataProcessor market deduplication and capping.
+
+Builds games with many additional markets (some duplicated) and runs
+``DataProcessor.process_games`` against the previous implementation, which
+MD5-hashed a string of every market, copied every game and fully sorted
+the markets of each capped game. Verifies both produce identical games and
+statistics and reports the throughput of each.
+
+Usage:
+    python benchmarks/market_dedup_benchmark.py
+    python benchmarks/market_dedup_benchmark.py --games 50000 --markets 40
+"""
+
+import argparse
+import copy
+import hashlib
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from converter.data_processor import DataProcessor
+
+MARKET_TYPES = ["double_chance", "handicap", "total_goals", "both_teams_score",
+                "half_time", "first_last_goal", "draw_no_bet", "unknown"]
+
+
+class LegacyDataProcessor(DataProcessor):
+    """The hash-and-sort implementation, kept here as the reference."""
+
+    def process_games(self, games: List[Dict[str, Any]], max_markets=None) -> List[Dict[str, Any]]:
+        self._reset_stats()
+        if max_markets is None:
+            max_markets = self.max_markets
+        deduplicated = []
+        for game in games:
+            markets = game.get('additional_markets', [])
+            seen, unique = set(), []
+            for market in markets:
+                content = str(sorted({
+                    'market_type': market.get('market_type', ''),
+                    'description': market.get('description', ''),
+                    'odds': market.get('odds', {}),
+                }.items()))
+                market_hash = hashlib.md5(content.encode('utf-8')).hexdigest()
+                if market_hash not in seen:
+                    seen.add(market_hash)
+                    unique.append(market)
+            removed = len(markets) - len(unique)
+            game_copy = game.copy()
+            game_copy['additional_markets'] = unique
+            game_copy['processing_info']['duplicates_removed'] = removed
+            if removed > 0:
+                self.processing_stats['games_with_duplicates'] += 1
+                self.processing_stats['total_duplicates_removed'] += removed
+                self.processing_stats['duplicate_details'].append({
+                    'game_key': f"{game.get('home_team', 'Unknown')} - {game.get('away_team', 'Unknown')}",
+                    'time': game.get('time', 'Unknown'),
+                    'duplicates_removed': removed,
+                    'original_count': len(markets),
+                    'final_count': len(unique)
+                })
+            deduplicated.append(game_copy)
+        self.processing_stats['games_processed'] = len(games)
+
+        processed = []
+        for game in deduplicated:
+            markets = game['additional_markets']
+            if len(markets) <= max_markets:
+                processed.append(game)
+                continue
+            ordered = self._sort_markets_by_priority(markets)
+            game_copy = game.copy()
+            game_copy['additional_markets'] = ordered[:max_markets]
+            game_copy['processing_info']['markets_capped'] = True
+            game_copy['total_markets'] = max_markets + (1 if game.get('main_market') else 0)
+            self.processing_stats['games_with_capping'] += 1
+            self.processing_stats['total_markets_capped'] += len(ordered) - max_markets
+            self.processing_stats['capping_details'].append({
+                'game_key': f"{game.get('home_team', 'Unknown')} - {game.get('away_team', 'Unknown')}",
+                'time': game.get('time', 'Unknown'),
+                'original_count': len(markets),
+                'capped_count': max_markets,
+                'markets_removed': len(ordered) - max_markets,
+                'excluded_market_types': [m.get('market_type', 'unknown') for m in ordered[max_markets:]]
+            })
+            processed.append(game_copy)
+        return processed
+
+
+def make_games(count: int, markets_per_game: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Games with ``markets_per_game`` markets, about a tenth of them duplicates."""
+    rng = random.Random(seed)
+    games = []
+    for index in range(count):
+        markets = []
+        for market_index in range(markets_per_game):
+            if markets and rng.random() < 0.1:
+                markets.append(dict(rng.choice(markets)))
+                continue
+            market_type = rng.choice(MARKET_TYPES)
+            markets.append({
+                'market_type': market_type,
+                'description': f"{market_type} {market_index}",
+                'priority': 10,
+                'odds': {'home_odds': round(rng.uniform(1.1, 5.0), 2), 'draw_odds': None,
+                         'away_odds': round(rng.uniform(1.1, 5.0), 2)},
+            })
+        games.append({
+            'league': 'NB I', 'date': '2025-08-05', 'time': 'K 20:00',
+            'home_team': f"Home {index}", 'away_team': f"Away {index}",
+            'main_market': {'market_type': '1x2', 'home_odds': 2.0, 'draw_odds': 3.0, 'away_odds': 4.0},
+            'additional_markets': markets,
+            'total_markets': markets_per_game + 1,
+            'processing_info': {'team_normalized': True, 'markets_capped': False, 'duplicates_removed': 0},
+        })
+    return games
+
+
+def run(processor: DataProcessor, games: List[Dict[str, Any]]):
+    """Process a private copy of ``games``; returns (games, stats, seconds)."""
+    games = copy.deepcopy(games)
+    started = time.perf_counter()
+    result = processor.process_games(games)
+    return result, processor.get_processing_stats(), time.perf_counter() - started
+
+
+def main() -> int:
+    """Run the benchmark and return a process exit code."""
+    parser = argparse.ArgumentParser(description="Market deduplication and capping benchmark")
+    parser.add_argument("--games", type=int, default=50_000)
+    parser.add_argument("--markets", type=int, default=30, help="Additional markets per game")
+    parser.add_argument("--max-markets", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    games = make_games(args.games, args.markets)
+    print(f"Games: {args.games:,}  Markets per game: {args.markets}  Cap: {args.max_markets}")
+
+    legacy_games, legacy_stats, legacy_seconds = run(LegacyDataProcessor(max_markets=args.max_markets), games)
+    new_games, new_stats, new_seconds = run(DataProcessor(max_markets=args.max_markets), games)
+
+    print(f"{'legacy':<8} {legacy_seconds:7.2f} s  {args.games / legacy_seconds:10,.0f} games/s")
+    print(f"{'current':<8} {new_seconds:7.2f} s  {args.games / new_seconds:10,.0f} games/s")
+    print(f"Speedup: {legacy_seconds / new_seconds:.2f}x")
+
+    if new_games != legacy_games or new_stats != legacy_stats:
+        print("FAIL: output differs from the legacy implementation")
+        return 1
+    if new_seconds >= legacy_seconds:
+        print("FAIL: no speedup over the legacy implementation")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Football pipeline benchmark suite.
+
+Registers one benchmark per pipeline stage with ``BenchmarkRunner`` — PDF
+parsing, extraction, team normalization, market merging, deduplication and
+capping, day splitting and reporting — plus end-to-end runs of
+``FootballConverter`` and ``OptimizedConverter``. Inputs come from the
+deterministic Tippmix corpus generator, and every stage after extraction is
+fed pre-computed output of the stage before it, so each benchmark measures
+exactly one stage.
+
+``football_converter_sampled`` repeats the FootballConverter run under the
+sampling profiler. When it is selected, the suite also reports the
+profiler's cost: time spent taking samples as a share of wall time.
+
+Each benchmark is also registered as a ``RegressionTest``. The first run for
+a baseline version stores the baseline under ``benchmarks/results/baselines``;
+later runs fail (exit code 1) when throughput drops past the threshold.
+
+Usage:
+    python benchmarks/pipeline_benchmarks.py --size small
+    python benchmarks/pipeline_benchmarks.py --size medium --stages extraction data_processing
+    python benchmarks/pipeline_benchmarks.py --baseline-version v1.1 --max-throughput-drop 15
+"""
+
+import argparse
+import asyncio
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from automation.benchmarking import BenchmarkRunner, RegressionTest
+from automation.config import PerformanceConfig
+from automation.performance_monitor import PerformanceProfiler
+from converter.day_splitter import DaySplitter
+from converter.data_processor import DataProcessor
+from converter.football_converter import FootballConverter
+from converter.football_extractor import FootballExtractor
+from converter.market_processor import MarketProcessor
+from converter.optimized_converter import OptimizedConverter
+from converter.report_generator import ReportGenerator
+from converter.team_normalizer import TeamNormalizer
+from tippmix_corpus import generate_json_content, resolve_size, write_json_corpus, write_pdf_corpus
+
+DEFAULT_CONFIG_DIR = str(Path(__file__).parent.parent / "config")
+RESULTS_DIR = str(Path(__file__).parent / "results")
+
+PIPELINE_STAGES = [
+    "pdf_parse",
+    "extraction",
+    "normalization",
+    "market_merging",
+    "data_processing",
+    "day_splitting",
+    "report_generation",
+    "football_converter",
+    "football_converter_sampled",
+    "optimized_converter",
+]
+
+
+@dataclass
+class StageBenchmark:
+    """A registered stage benchmark and the work units one call processes."""
+    stage: str
+    name: str
+    func: Callable
+    items: int
+    unit: str
+
+
+class PipelineBenchmarkSuite:
+    """Builds the corpus, pre-computes stage inputs and registers benchmarks."""
+
+    def __init__(self, games: int, config_dir: str = DEFAULT_CONFIG_DIR, seed: int = 42,
+                 markets_per_game: int = 6, max_markets: int = 10):
+        self.games = games
+        self.config_dir = config_dir
+        self.seed = seed
+        self.markets_per_game = markets_per_game
+        self.max_markets = max_markets
+        self.work_dir = Path(tempfile.mkdtemp(prefix="pipeline_bench_"))
+        self.stages: Dict[str, StageBenchmark] = {}
+        self.profiler: Optional[PerformanceProfiler] = None
+
+    def prepare(self, stages: Optional[List[str]] = None) -> Dict[str, StageBenchmark]:
+        """
+        Generate the corpus and build stage benchmarks.
+
+        Args:
+            stages: Stage names to build; all stages when omitted
+
+        Returns:
+            Mapping of stage name to its benchmark
+        """
+        wanted = set(stages or PIPELINE_STAGES)
+
+        json_content = generate_json_content(self.games, self.seed, self.markets_per_game)
+        json_path = write_json_corpus(
+            str(self.work_dir / "corpus.json"), self.games, self.seed, self.markets_per_game
+        )
+
+        # Run the pipeline once to obtain realistic inputs for each stage
+        extractor = FootballExtractor(self.config_dir)
+        normalizer = TeamNormalizer(self.config_dir)
+        market_processor = MarketProcessor()
+        data_processor = DataProcessor(max_markets=self.max_markets, config_dir=self.config_dir)
+        day_splitter = DaySplitter()
+        report_generator = ReportGenerator()
+
+        matches = extractor.extract_football_data(json_content)
+        team_names = [name for match in matches for name in (match['home_team'], match['away_team'])]
+        normalized = self._normalize_matches(normalizer, matches)
+        merged = market_processor.merge_matches_by_game(normalized)
+        processed = data_processor.process_games(merged)
+        processing_stats = {'data_processing': data_processor.get_processing_stats()}
+        market_count = sum(len(game.get('additional_markets', [])) for game in merged)
+
+        if "pdf_parse" in wanted:
+            pdf_benchmark = self._build_pdf_benchmark()
+            if pdf_benchmark:
+                self._add("pdf_parse", *pdf_benchmark)
+
+        self._add("extraction",
+                  lambda: extractor.extract_football_data(json_content),
+                  len(matches), "matches")
+        self._add("normalization",
+                  lambda: [normalizer.normalize(name) for name in team_names],
+                  len(team_names), "team names")
+        self._add("market_merging",
+                  lambda: market_processor.merge_matches_by_game(normalized),
+                  len(normalized), "matches")
+        self._add("data_processing",
+                  lambda: data_processor.process_games(merged),
+                  market_count, "markets")
+        self._add("day_splitting",
+                  lambda: day_splitter.split_by_days(processed, str(self.work_dir / "days")),
+                  len(processed), "games")
+        self._add("report_generation",
+                  lambda: report_generator.generate_reports(
+                      processed, processing_stats, str(self.work_dir / "reports")
+                  ),
+                  len(processed), "games")
+
+        football_converter = FootballConverter(self.config_dir, self.max_markets)
+        self._add("football_converter",
+                  lambda: self._check(football_converter.convert_football(
+                      str(json_path), str(self.work_dir / "football_converter")
+                  )),
+                  self.games, "games")
+
+        self.profiler = PerformanceProfiler(PerformanceConfig())
+
+        def run_sampled():
+            with self.profiler.sampling_context("benchmark", force=True):
+                self._check(football_converter.convert_football(
+                    str(json_path), str(self.work_dir / "football_converter_sampled")
+                ))
+
+        self._add("football_converter_sampled", run_sampled, self.games, "games")
+
+        optimized_converter = OptimizedConverter(self.config_dir, self.max_markets)
+
+        async def run_optimized():
+            self._check(await optimized_converter.convert_football_async(
+                str(json_path), str(self.work_dir / "optimized_converter")
+            ))
+            # A silent fallback would record regular loading as the streaming baseline
+            if optimized_converter.performance_metrics.streaming_fallbacks:
+                raise RuntimeError("Streaming JSON parsing fell back to regular loading")
+
+        self._add("optimized_converter", run_optimized, self.games, "games")
+
+        self.stages = {stage: bench for stage, bench in self.stages.items() if stage in wanted}
+        return self.stages
+
+    def register(self, runner: BenchmarkRunner, baseline_version: str,
+                 max_throughput_drop: float, iterations: int, warmup_iterations: int,
+                 memory_threshold_mb: int = 50) -> None:
+        """
+        Register every prepared stage as a benchmark and a regression test.
+
+        Args:
+            runner: Benchmark runner to register with
+            baseline_version: Baseline version the results are compared against
+            max_throughput_drop: Allowed throughput drop in percent before failing
+            iterations: Measured iterations per benchmark
+            warmup_iterations: Unmeasured warmup iterations per benchmark
+            memory_threshold_mb: Allowed memory growth before failing
+        """
+        threshold_percent = duration_threshold_for(max_throughput_drop)
+
+        for bench in self.stages.values():
+            runner.register_benchmark(bench.name, bench.func)
+            runner.register_regression_test(RegressionTest(
+                name=bench.name,
+                benchmark_function=bench.func,
+                baseline_version=baseline_version,
+                threshold_percent=threshold_percent,
+                iterations=iterations,
+                warmup_iterations=warmup_iterations,
+                memory_threshold_mb=memory_threshold_mb
+            ))
+
+    def cleanup(self) -> None:
+        """Remove the generated corpus and pipeline outputs."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _add(self, stage: str, func: Callable, items: int, unit: str) -> None:
+        name = f"pipeline_{stage}_{self.games}"
+        self.stages[stage] = StageBenchmark(stage, name, func, items, unit)
+
+    def _build_pdf_benchmark(self) -> Optional[tuple]:
+        """Render the corpus to PDF; skipped when no PDF tooling is installed."""
+        try:
+            from converter.pdf_parser import PDFParser
+            parser = PDFParser()
+            pdf_path = write_pdf_corpus(
+                str(self.work_dir / "corpus.pdf"), self.games, self.seed, self.markets_per_game
+            )
+        except ImportError as e:
+            print(f"Skipping pdf_parse benchmark: {e}")
+            return None
+
+        pages = parser.get_page_count(str(pdf_path))
+        return (lambda: parser.extract_text(str(pdf_path)), pages, "pages")
+
+    @staticmethod
+    def _normalize_matches(normalizer: TeamNormalizer, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Mirror FootballConverter's normalization stage output."""
+        normalized = []
+        for match in matches:
+            normalized_match = match.copy()
+            normalized_match['original_home_team'] = match['home_team']
+            normalized_match['original_away_team'] = match['away_team']
+            normalized_match['home_team'] = normalizer.normalize(match['home_team'])
+            normalized_match['away_team'] = normalizer.normalize(match['away_team'])
+            normalized.append(normalized_match)
+        return normalized
+
+    @staticmethod
+    def _check(result: Dict[str, Any]) -> None:
+        if not result.get('success'):
+            raise RuntimeError(f"Conversion failed: {result.get('errors')}")
+
+
+def duration_threshold_for(max_throughput_drop: float) -> float:
+    """
+    Convert an allowed throughput drop into the runner's duration threshold.
+
+    At a fixed corpus size throughput is inversely proportional to duration,
+    so a drop of d percent corresponds to a duration increase of d / (100 - d).
+
+    Args:
+        max_throughput_drop: Allowed throughput drop in percent (0-100, exclusive)
+
+    Returns:
+        Allowed duration increase in percent
+    """
+    if not 0 < max_throughput_drop < 100:
+        raise ValueError("Throughput drop threshold must be between 0 and 100 percent")
+    return max_throughput_drop / (100 - max_throughput_drop) * 100
+
+
+def throughput(items: int, iterations: int, duration: float) -> float:
+    """Work units processed per second over all measured iterations."""
+    return items * iterations / duration if duration > 0 else 0.0
+
+
+def print_results(suite: PipelineBenchmarkSuite, results: Dict[str, Any], iterations: int) -> None:
+    """Print per-stage throughput and regression status."""
+    print(f"\nPipeline benchmarks ({suite.games} games)")
+    print("=" * 102)
+    print(f"{'Stage':<28}{'Status':<18}{'Throughput':>22}{'Baseline':>18}{'Change':>12}")
+    print("-" * 102)
+
+    for bench in suite.stages.values():
+        result = results['tests'].get(bench.name, {})
+        status = result.get('status', 'missing')
+
+        current = baseline = change = ""
+        current_tp = baseline_tp = None
+        if 'current_duration' in result:
+            current_tp = throughput(bench.items, iterations, result['current_duration'])
+            current = f"{current_tp:,.0f} {bench.unit}/s"
+        if 'baseline_duration' in result:
+            baseline_tp = throughput(bench.items, iterations, result['baseline_duration'])
+            baseline = f"{baseline_tp:,.0f}/s"
+        if current_tp is not None and baseline_tp:
+            change = f"{(current_tp - baseline_tp) / baseline_tp * 100:+.1f}%"
+        if status == 'error':
+            current = result.get('error', '')[:40]
+
+        print(f"{bench.stage:<28}{status:<18}{current:>22}{baseline:>18}{change:>12}")
+
+    statuses = [test.get('status') for test in results['tests'].values()]
+    print("-" * 102)
+    print(f"passed: {statuses.count('passed')}  failed: {statuses.count('failed')}  "
+          f"errors: {statuses.count('error')}  baselines created: {statuses.count('baseline_created')}")
+
+
+def measure_sampling_overhead(suite: PipelineBenchmarkSuite, iterations: int) -> Dict[str, float]:
+    """
+    Measure what the sampling profiler costs the FootballConverter run.
+
+    Comparing plain and sampled wall times cannot resolve a few percent on
+    second-long jobs; run-to-run variance is far larger. Instead the sampler
+    times its own work, and the overhead is that sampling time as a share of
+    the sampled runs' wall time. This is the cost the sampler adds to the
+    process; it excludes second-order effects such as GIL hand-offs.
+
+    Args:
+        suite: Prepared suite containing the football_converter_sampled stage
+        iterations: Sampled runs to measure
+
+    Returns:
+        Dictionary with ``overhead_percent``, ``samples``, ``avg_sample_cost_us``
+        and ``wall_time`` (seconds over all runs)
+    """
+    sampled = suite.stages['football_converter_sampled'].func
+    sampler = suite.profiler.sampler
+
+    # One unmeasured run warms caches and the sampler thread start path
+    sampled()
+
+    samples_start = sampler.samples_taken
+    sampling_start = sampler.sampling_time
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        sampled()
+    wall_time = time.perf_counter() - wall_start
+
+    samples = sampler.samples_taken - samples_start
+    sampling_time = sampler.sampling_time - sampling_start
+    return {
+        'overhead_percent': sampling_time / wall_time * 100 if wall_time > 0 else 0.0,
+        'samples': samples,
+        'avg_sample_cost_us': sampling_time / samples * 1_000_000 if samples else 0.0,
+        'wall_time': wall_time
+    }
+
+
+async def run_suite(args) -> int:
+    """Prepare, register and run the pipeline regression tests."""
+    games = resolve_size(args.size)
+    suite = PipelineBenchmarkSuite(
+        games,
+        config_dir=args.config_dir,
+        seed=args.seed,
+        markets_per_game=args.markets_per_game,
+        max_markets=args.max_markets
+    )
+
+    try:
+        stages = suite.prepare(args.stages)
+        print(f"Prepared {len(stages)} stage benchmarks on a {games}-game corpus")
+
+        runner = BenchmarkRunner(PerformanceConfig(), results_dir=RESULTS_DIR)
+        suite.register(
+            runner,
+            baseline_version=args.baseline_version,
+            max_throughput_drop=args.max_throughput_drop,
+            iterations=args.iterations,
+            warmup_iterations=args.warmup
+        )
+
+        if args.update_baseline:
+            for bench in stages.values():
+                baseline_file = runner.results_dir / "baselines" / f"{bench.name}_{args.baseline_version}.json"
+                baseline_file.unlink(missing_ok=True)
+
+        results = await runner.run_regression_tests()
+        print_results(suite, results, args.iterations)
+
+        # The runner counts newly created baselines as errors; only real
+        # failures and execution errors fail the run
+        statuses = [test.get('status') for test in results['tests'].values()]
+        exit_code = 1 if 'failed' in statuses or 'error' in statuses else 0
+
+        if 'football_converter_sampled' in stages:
+            overhead = measure_sampling_overhead(suite, args.overhead_iterations)
+            print(f"Sampling profiler cost on football_converter: {overhead['overhead_percent']:.2f}% "
+                  f"of wall time ({overhead['samples']} samples at "
+                  f"{overhead['avg_sample_cost_us']:.0f} us over {args.overhead_iterations} runs)")
+
+        return exit_code
+    finally:
+        suite.cleanup()
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run the football pipeline benchmark suite")
+    parser.add_argument("--size", default="small",
+                        help="Corpus size: small, medium, large or a number of games")
+    parser.add_argument("--stages", nargs="+", choices=PIPELINE_STAGES,
+                        help="Only run these stages")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus random seed")
+    parser.add_argument("--markets-per-game", type=int, default=6,
+                        help="Additional market lines per game in the corpus")
+    parser.add_argument("--max-markets", type=int, default=10,
+                        help="Market cap passed to the converters")
+    parser.add_argument("--config-dir", default=DEFAULT_CONFIG_DIR, help="Converter config directory")
+    parser.add_argument("--iterations", type=int, default=5, help="Measured iterations per stage")
+    parser.add_argument("--warmup", type=int, default=1, help="Warmup iterations per stage")
+    parser.add_argument("--baseline-version", default="current",
+                        help="Baseline version to compare against (created on first run)")
+    parser.add_argument("--max-throughput-drop", type=float, default=10.0,
+                        help="Fail when throughput drops by more than this percent")
+    parser.add_argument("--overhead-iterations", type=int, default=10,
+                        help="Sampled runs used to measure sampling profiler cost")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Replace the stored baseline with this run")
+    parser.add_argument("--verbose", action="store_true", help="Keep pipeline INFO logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Pipeline INFO logging would dominate the measured time
+        logging.disable(logging.INFO)
+
+    try:
+        return asyncio.run(run_suite(args))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
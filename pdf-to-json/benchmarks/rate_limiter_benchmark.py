@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Rate limiter microbenchmark.
+
+Drives the token bucket limiter with requests spread across a large pool of
+client identifiers and reports decisions per second, per-request latency and
+bucket memory. The legacy sliding-window limiter can be run for comparison.
+
+Usage:
+    python benchmarks/rate_limiter_benchmark.py
+    python benchmarks/rate_limiter_benchmark.py --requests 1000000 --compare-legacy
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from automation.security import RateLimiter, TokenBucketRateLimiter
+
+
+def build_identifiers(count: int) -> List[str]:
+    """Build a pool of distinct IPv4-style identifiers."""
+    return [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(count)]
+
+
+def build_request_stream(identifiers: List[str], total: int, seed: int) -> List[str]:
+    """Build a deterministic request stream with a hot subset of clients."""
+    rng = random.Random(seed)
+    hot = identifiers[:max(1, len(identifiers) // 100)]
+    return [
+        rng.choice(hot) if rng.random() < 0.2 else rng.choice(identifiers)
+        for _ in range(total)
+    ]
+
+
+def run_limiter(limiter: Any, stream: List[str]) -> Dict[str, Any]:
+    """Feed the request stream through a limiter and time it."""
+    is_allowed = limiter.is_allowed
+    allowed_count = 0
+    
+    start = time.perf_counter()
+    for identifier in stream:
+        if is_allowed(identifier)[0]:
+            allowed_count += 1
+    elapsed = time.perf_counter() - start
+    
+    return {
+        "elapsed": elapsed,
+        "requests_per_second": len(stream) / elapsed if elapsed > 0 else 0.0,
+        "microseconds_per_request": elapsed / len(stream) * 1_000_000,
+        "allowed": allowed_count,
+        "denied": len(stream) - allowed_count,
+    }
+
+
+def main() -> int:
+    """Run the benchmark and return a process exit code."""
+    parser = argparse.ArgumentParser(description="Rate limiter microbenchmark")
+    parser.add_argument("--requests", type=int, default=500_000,
+                        help="Number of requests to simulate")
+    parser.add_argument("--identifiers", type=int, default=100_000,
+                        help="Number of distinct client identifiers")
+    parser.add_argument("--target-rps", type=int, default=50_000,
+                        help="Minimum decisions per second required to pass")
+    parser.add_argument("--requests-per-minute", type=int, default=100)
+    parser.add_argument("--burst-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compare-legacy", action="store_true",
+                        help="Also run the sliding-window RateLimiter")
+    args = parser.parse_args()
+    
+    identifiers = build_identifiers(args.identifiers)
+    stream = build_request_stream(identifiers, args.requests, args.seed)
+    
+    print(f"Requests: {args.requests:,}  Identifiers: {args.identifiers:,}  "
+          f"Target: {args.target_rps:,} req/s")
+    
+    limiter = TokenBucketRateLimiter(
+        args.requests_per_minute,
+        args.burst_size,
+        max_identifiers=args.identifiers
+    )
+    result = run_limiter(limiter, stream)
+    stats = limiter.get_stats()
+    
+    print(f"token_bucket:   {result['requests_per_second']:>12,.0f} req/s  "
+          f"{result['microseconds_per_request']:6.2f} us/req  "
+          f"tracked={stats['tracked_identifiers']:,} evicted={stats['evicted_identifiers']:,}")
+    
+    if args.compare_legacy:
+        legacy = RateLimiter(args.requests_per_minute, args.burst_size)
+        legacy_result = run_limiter(legacy, stream)
+        print(f"sliding_window: {legacy_result['requests_per_second']:>12,.0f} req/s  "
+              f"{legacy_result['microseconds_per_request']:6.2f} us/req  "
+              f"tracked={len(legacy.requests):,}")
+    
+    if result["requests_per_second"] < args.target_rps:
+        print(f"FAIL: below target of {args.target_rps:,} req/s")
+        return 1
+    
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Load test for the security middleware stacks.
+
+Serves the same small FastAPI app with a local uvicorn twice: once behind
+the three BaseHTTPMiddleware classes and once behind SecurityASGIMiddleware.
+Concurrent clients hit a JSON endpoint with a query parameter (so request
+validation runs) and a streaming endpoint. Reports throughput, p50/p99
+latency and streaming time to first byte per stack.
+
+Usage:
+    python benchmarks/security_middleware_load_test.py
+    python benchmarks/security_middleware_load_test.py --requests 20000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from automation.security import SecurityConfig, SecurityManager
+from automation.security_middleware import (
+    FileUploadSecurityMiddleware, RequestValidationMiddleware, SecurityASGIMiddleware,
+    SecurityMiddleware
+)
+
+STACKS = ("base_http", "asgi")
+
+
+def build_app(stack: str, stream_delay: float) -> FastAPI:
+    """App with one JSON and one streaming endpoint behind the given stack."""
+    app = FastAPI()
+    # Limits high enough that the load test never sees a 429
+    manager = SecurityManager(SecurityConfig(
+        rate_limit_requests_per_minute=10 ** 9, rate_limit_burst_size=10 ** 9
+    ))
+    if stack == "asgi":
+        app.add_middleware(SecurityASGIMiddleware, security_manager=manager)
+    else:
+        app.add_middleware(RequestValidationMiddleware, security_manager=manager)
+        app.add_middleware(FileUploadSecurityMiddleware, security_manager=manager)
+        app.add_middleware(SecurityMiddleware, security_manager=manager)
+
+    @app.get("/api/v1/games")
+    async def games(league: str = ""):
+        return {"league": league, "games": [{"id": index} for index in range(20)]}
+
+    @app.get("/api/v1/reports/stream")
+    async def report_stream():
+        async def chunks():
+            for index in range(5):
+                yield f"row-{index}\n".encode()
+                await asyncio.sleep(stream_delay)
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app: FastAPI, port: int) -> uvicorn.Server:
+    """Run uvicorn in a background thread and wait until it accepts connections."""
+    server = uvicorn.Server(uvicorn.Config(
+        app, host="127.0.0.1", port=port, log_level="warning", lifespan="off", access_log=False
+    ))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def run_load(base_url: str, total: int, concurrency: int) -> Dict[str, float]:
+    """Issue ``total`` JSON requests with ``concurrency`` clients in flight."""
+    latencies: List[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.get("/api/v1/games", params={"league": "NB I"})
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"Unexpected status {response.status_code}")
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+async def measure_first_byte(base_url: str, samples: int) -> float:
+    """Median time to the first streamed chunk, in milliseconds."""
+    timings = []
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(samples):
+            started = time.perf_counter()
+            async with client.stream("GET", "/api/v1/reports/stream") as response:
+                async for _ in response.aiter_bytes():
+                    timings.append(time.perf_counter() - started)
+                    break
+    return statistics.median(timings) * 1000
+
+
+def main() -> int:
+    """Run the load test and return a process exit code."""
+    parser = argparse.ArgumentParser(description="Security middleware load test")
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--stream-samples", type=int, default=20)
+    parser.add_argument("--stream-delay", type=float, default=0.05,
+                        help="Seconds between streamed chunks")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print(f"Requests: {args.requests:,}  Concurrency: {args.concurrency}")
+
+    results = {}
+    for stack in STACKS:
+        port = free_port()
+        server = start_server(build_app(stack, args.stream_delay), port)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            asyncio.run(run_load(base_url, args.warmup, args.concurrency))
+            results[stack] = asyncio.run(run_load(base_url, args.requests, args.concurrency))
+            results[stack]["ttfb_ms"] = asyncio.run(measure_first_byte(base_url, args.stream_samples))
+        finally:
+            server.should_exit = True
+            time.sleep(0.2)
+
+        stats = results[stack]
+        print(f"{stack:<10} {stats['rps']:>8,.0f} req/s  p50 {stats['p50_ms']:6.2f} ms  "
+              f"p99 {stats['p99_ms']:6.2f} ms  stream first byte {stats['ttfb_ms']:6.2f} ms")
+
+    if results["asgi"]["p50_ms"] >= results["base_http"]["p50_ms"]:
+        print("FAIL: the ASGI middleware did not lower median latency")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
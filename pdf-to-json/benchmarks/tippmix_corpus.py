@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic Tippmix corpus generator.
+
+Produces Tippmix-style betting program text with the same line shapes the
+extractor sees in real PDF exports: ``Labdarúgás, <league>`` headers,
+Hungarian date lines, 1X2 match lines and additional market lines
+(Kétesély, Hendikep, Gólszám, Mindkét csapat gól, Döntetlennél visszajár).
+The same seed and size always yield byte-identical output, so benchmark
+baselines stay comparable between runs.
+
+Usage:
+    python benchmarks/tippmix_corpus.py --size medium --output /tmp/corpus.json
+    python benchmarks/tippmix_corpus.py --size 5000 --pdf --output /tmp/corpus.pdf
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Named corpus sizes (number of games)
+CORPUS_SIZES: Dict[str, int] = {
+    "small": 100,
+    "medium": 1_000,
+    "large": 10_000,
+}
+
+LEAGUES = [
+    "Angol Premier Liga",
+    "Spanyol La Liga",
+    "Német Bundesliga",
+    "Olasz Serie A",
+    "Francia Ligue 1",
+    "Holland Eredivisie",
+    "Portugál Primeira Liga",
+    "Magyar NB I",
+    "Dán Superliga",
+    "Svéd Allsvenskan",
+]
+
+TEAMS = [
+    "Arsenal", "Chelsea", "Liverpool", "Manchester City", "Manchester Utd",
+    "Tottenham", "Newcastle", "Aston Villa", "Real Madrid", "Barcelona",
+    "Atletico Madrid", "Sevilla", "Valencia", "Bayern München", "Dortmund",
+    "Leipzig", "Leverkusen", "Juventus", "Inter", "AC Milan", "Napoli",
+    "AS Roma", "Lazio", "PSG", "Marseille", "Lyon", "Monaco", "Ajax",
+    "PSV", "Feyenoord", "Benfica", "Porto", "Sporting", "Ferencváros",
+    "Puskás Akadémia", "Debrecen", "Paks", "FC København", "Brøndby",
+    "Malmö FF", "AIK", "Hammarby", "Djurgården",
+]
+
+# First program day; names and codes below are indexed by date.weekday()
+START_DATE = date(2025, 8, 5)
+
+DAY_NAMES = ["Hétfő", "Kedd", "Szerda", "Csütörtök", "Péntek", "Szombat", "Vasárnap"]
+DAY_CODES = ["H", "K", "Sze", "Cs", "P", "Szo", "V"]
+
+MONTHS = [
+    "január", "február", "március", "április", "május", "június",
+    "július", "augusztus", "szeptember", "október", "november", "december",
+]
+
+# Additional market line templates: (suffix between away team and odds, odds count)
+MARKET_TEMPLATES = [
+    ("Kétesély", 3),
+    ("Hendikep +1,5", 2),
+    ("Hendikep -1,5", 2),
+    ("Gólszám 2,5", 2),
+    ("Gólszám 3,5", 2),
+    ("Mindkét csapat gól", 2),
+    ("Döntetlennél visszajár", 2),
+    ("1. félidő", 3),
+]
+
+
+def _odds(rng: random.Random, count: int) -> str:
+    """Render ``count`` odds in Hungarian decimal notation."""
+    return " ".join(f"{rng.uniform(1.05, 9.5):.2f}".replace(".", ",") for _ in range(count))
+
+
+def generate_full_text(games: int, seed: int = 42, markets_per_game: int = 6,
+                       games_per_league: int = 12, days: int = 7) -> str:
+    """
+    Generate Tippmix-style program text.
+
+    Args:
+        games: Number of distinct games to generate
+        seed: Random seed; identical inputs produce identical output
+        markets_per_game: Additional market lines emitted per game
+        games_per_league: Games emitted under each league header
+        days: Number of consecutive days the games are spread over
+
+    Returns:
+        Program text with one line per header, date or market
+    """
+    rng = random.Random(seed)
+    markets_per_game = max(0, min(markets_per_game, len(MARKET_TEMPLATES)))
+    lines: List[str] = ["Tippmix Program", "Labdarúgás fogadási ajánlat", ""]
+    event_id = 10000
+
+    for index in range(games):
+        match_date = START_DATE + timedelta(days=index * days // max(games, 1))
+        weekday = match_date.weekday()
+        if index % games_per_league == 0:
+            league = LEAGUES[(index // games_per_league) % len(LEAGUES)]
+            lines.append(f"Labdarúgás, {league}")
+            lines.append(
+                f"{DAY_NAMES[weekday]} ({match_date.year}. {MONTHS[match_date.month - 1]} {match_date.day}.)"
+            )
+
+        home, away = rng.sample(TEAMS, 2)
+        kickoff = f"{DAY_CODES[weekday]} {rng.randint(12, 22)}:{rng.choice(('00', '15', '30', '45'))}"
+
+        lines.append(f"{kickoff} {event_id} {home} - {away} {_odds(rng, 3)}")
+        event_id += 1
+
+        for suffix, odds_count in rng.sample(MARKET_TEMPLATES, markets_per_game):
+            lines.append(f"{kickoff} {event_id} {home} - {away} {suffix} {_odds(rng, odds_count)}")
+            event_id += 1
+
+        if index % 50 == 49:
+            lines.append("")
+            lines.append(f"{index // 50 + 1}. oldal")
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_json_content(games: int, seed: int = 42, markets_per_game: int = 6) -> Dict[str, Any]:
+    """
+    Generate converter input in the shape produced by the PDF parser.
+
+    Args:
+        games: Number of distinct games to generate
+        seed: Random seed
+        markets_per_game: Additional market lines emitted per game
+
+    Returns:
+        Dictionary with ``metadata`` and ``content.full_text``
+    """
+    full_text = generate_full_text(games, seed=seed, markets_per_game=markets_per_game)
+    return {
+        "content": {
+            "full_text": full_text,
+        },
+        "metadata": {
+            "source": "synthetic_tippmix_corpus",
+            "games": games,
+            "seed": seed,
+            "markets_per_game": markets_per_game,
+        },
+    }
+
+
+def resolve_size(size: str) -> int:
+    """Resolve a named or numeric corpus size to a game count."""
+    if size in CORPUS_SIZES:
+        return CORPUS_SIZES[size]
+    try:
+        games = int(size)
+    except ValueError:
+        raise ValueError(
+            f"Unknown corpus size '{size}', expected one of {sorted(CORPUS_SIZES)} or an integer"
+        )
+    if games <= 0:
+        raise ValueError("Corpus size must be positive")
+    return games
+
+
+def write_json_corpus(output_path: str, games: int, seed: int = 42,
+                      markets_per_game: int = 6) -> Path:
+    """
+    Write a JSON corpus file suitable for ``FootballConverter.convert_football``.
+
+    Args:
+        output_path: Target file path
+        games: Number of distinct games to generate
+        seed: Random seed
+        markets_per_game: Additional market lines emitted per game
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_json_content(games, seed, markets_per_game), f, ensure_ascii=False)
+    return path
+
+
+def write_pdf_corpus(output_path: str, games: int, seed: int = 42,
+                     markets_per_game: int = 6, font_path: Optional[str] = None) -> Path:
+    """
+    Render the corpus text into a PDF for parser benchmarks.
+
+    Requires reportlab. The base-14 Helvetica font cannot encode every
+    Hungarian glyph (ő, ű), so a TrueType font is used when one is available.
+
+    Args:
+        output_path: Target file path
+        games: Number of distinct games to generate
+        seed: Random seed
+        markets_per_game: Additional market lines emitted per game
+        font_path: Optional TrueType font to embed
+
+    Returns:
+        Path of the written file
+    """
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        raise ImportError("reportlab is required to render PDF corpora: pip install reportlab")
+
+    font_name = "Helvetica"
+    candidates = [font_path] if font_path else [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+        "/Library/Fonts/Arial Unicode.ttf",
+    ]
+    for candidate in candidates:
+        if candidate and Path(candidate).exists():
+            pdfmetrics.registerFont(TTFont("CorpusFont", candidate))
+            font_name = "CorpusFont"
+            break
+
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    text = generate_full_text(games, seed=seed, markets_per_game=markets_per_game)
+    if font_name == "Helvetica":
+        text = text.replace("ő", "ö").replace("ű", "ü").replace("Ő", "Ö").replace("Ű", "Ü")
+
+    pdf = canvas.Canvas(str(path), pagesize=A4)
+    width, height = A4
+    margin, leading, font_size = 36, 10, 8
+    y = height - margin
+    pdf.setFont(font_name, font_size)
+
+    for line in text.splitlines():
+        if y < margin:
+            pdf.showPage()
+            pdf.setFont(font_name, font_size)
+            y = height - margin
+        pdf.drawString(margin, y, line)
+        y -= leading
+
+    pdf.save()
+    return path
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Tippmix corpus")
+    parser.add_argument("--size", default="small",
+                        help=f"Named size ({', '.join(CORPUS_SIZES)}) or number of games")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--markets-per-game", type=int, default=6,
+                        help="Additional market lines per game")
+    parser.add_argument("--pdf", action="store_true", help="Render a PDF instead of JSON")
+    parser.add_argument("--output", required=True, help="Output file path")
+    args = parser.parse_args()
+
+    try:
+        games = resolve_size(args.size)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.pdf:
+        path = write_pdf_corpus(args.output, games, args.seed, args.markets_per_game)
+    else:
+        path = write_json_corpus(args.output, games, args.seed, args.markets_per_game)
+
+    print(f"Wrote {games} games to {path} ({path.stat().st_size / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
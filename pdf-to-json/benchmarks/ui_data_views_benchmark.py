@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Streamlit UI data views.
+
+Builds a football output of about 50 MB and compares one rerun of the
+Validate JSON page without caching (parse the upload and build a table of
+every game) against a cached rerun that turns to another page (look up the
+remembered view and build one page of rows).
+
+Usage:
+    python benchmarks/ui_data_views_benchmark.py
+    python benchmarks/ui_data_views_benchmark.py --size-mb 100 --page-size 250
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ui.data_views import build_json_view, content_digest, flatten_record
+
+
+def make_output(size_mb: float, seed: int = 42) -> bytes:
+    """Football output JSON of roughly ``size_mb`` megabytes."""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    games, size, index = [], 0, 0
+    while size < target:
+        game = {
+            "league": f"League {index % 40}", "date": "2025-08-05", "time": "K 20:00",
+            "home_team": f"Home {index}", "away_team": f"Away {index}",
+            "original_home_team": f"Home {index}", "original_away_team": f"Away {index}",
+            "main_market": {"market_type": "1x2", "home_odds": 2.1, "draw_odds": 3.2, "away_odds": 3.6},
+            "additional_markets": [
+                {"market_type": "handicap", "description": f"Hendikep {n}", "priority": 3,
+                 "odds": {"home_odds": round(rng.uniform(1.1, 5), 2), "away_odds": round(rng.uniform(1.1, 5), 2)}}
+                for n in range(10)
+            ],
+            "total_markets": 11,
+            "processing_info": {"team_normalized": True, "markets_capped": False, "duplicates_removed": 0},
+        }
+        games.append(game)
+        size += len(json.dumps(game))
+        index += 1
+    return json.dumps({"metadata": {"total_games": len(games)}, "games": games}).encode("utf-8")
+
+
+def timed(action, runs: int) -> float:
+    """Median wall time in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    """Run the benchmark and return a process exit code."""
+    parser = argparse.ArgumentParser(description="Streamlit UI data view benchmark")
+    parser.add_argument("--size-mb", type=float, default=50)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    content = make_output(args.size_mb)
+    print(f"Output: {len(content) / 1024 / 1024:.1f} MB")
+
+    def uncached_rerun():
+        data = json.loads(content)
+        return [flatten_record(game) for game in data["games"]]
+
+    digest = content_digest(content)
+    views = {digest: build_json_view(content, digest)}
+    pages = iter(range(1, 10 ** 9))
+
+    def cached_rerun():
+        return views[digest].page_rows(next(pages), args.page_size)
+
+    uncached = timed(uncached_rerun, args.runs)
+    cached = timed(cached_rerun, args.runs)
+    first_load = timed(lambda: build_json_view(content), 1)
+
+    print(f"{'uncached rerun':<22} {uncached:10.1f} ms")
+    print(f"{'first load (cached)':<22} {first_load:10.1f} ms")
+    print(f"{'cached page turn':<22} {cached:10.1f} ms")
+    print(f"Games: {len(views[digest].records):,}")
+
+    if cached >= 1000:
+        print("FAIL: a cached page turn took a second or more")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,8 @@ Provides comprehensive REST API endpoints for:
 
 import os
 import asyncio
+import hashlib
+import json
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any, Union
@@ -22,9 +24,9 @@ from passlib.context import CryptContext
 
 from fastapi import (
     FastAPI, File, UploadFile, HTTPException, Depends, BackgroundTasks,
-    status, Request, WebSocket, WebSocketDisconnect
+    status, Request, WebSocket, WebSocketDisconnect, Query
 )
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field, validator
@@ -41,6 +43,14 @@ from automation.models import Job, JobStatus, JobPriority
 from automation.exceptions import AutomationManagerError, ProcessingManagerError
 from automation.security import SecurityManager, SecurityConfig
 from automation.security_middleware import create_security_middleware_stack
+from automation.cache_manager import CacheStrategy
+from converter.compiled_config import reload_compiled_config
+from converter.exceptions import ConfigurationError
+from database.connection import initialize_database, get_database_manager, get_db_session
+from database.models import Game
+from database.repositories import (
+    GameRepository, GAME_DEFAULT_COLUMNS, add_game_write_listener, remove_game_write_listener
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -73,11 +83,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Security middleware has to be registered before the app starts serving.
+# Request checks stay off until startup applies the loaded settings.
+security_manager: Optional[SecurityManager] = create_security_middleware_stack(
+    app, SecurityConfig(enable_rate_limiting=False, enable_input_validation=False)
+)
+
 # Global variables for components
 automation_manager: Optional[AutomationManager] = None
 config: Optional[AutomationConfig] = None
-security_manager: Optional[SecurityManager] = None
 websocket_connections: List[WebSocket] = []
+
+# Bumped on every game write so cached pages from before the write are never served
+games_cache_generation = 0
+event_loop: Optional[asyncio.AbstractEventLoop] = None
 webhook_urls: List[str] = []
 
 # Pydantic models for request/response
@@ -152,6 +171,12 @@ class FileUploadResponse(BaseModel):
     file_path: Optional[str] = None
     job_id: Optional[str] = None
 
+class SamplingConfigRequest(BaseModel):
+    enabled: Optional[bool] = None
+    job_rate: Optional[float] = Field(default=None, ge=0.0, le=1.0)
+    interval_ms: Optional[float] = Field(default=None, gt=0)
+    clear_samples: bool = False
+
 # Authentication and Authorization
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -657,27 +682,131 @@ async def upload_file(
 
 # Data access endpoints
 
+def _parse_query_date(name: str, value: Optional[str]):
+    """Parse an ISO date query parameter or raise 400."""
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {name}: expected YYYY-MM-DD"
+        )
+
+def _game_database_available() -> bool:
+    """Check whether the game database has been initialized."""
+    try:
+        get_database_manager()
+        return True
+    except RuntimeError:
+        return False
+
+def _query_games_page(query: Dict[str, Any], include_total: bool) -> Dict[str, Any]:
+    """Run a games page query in a worker thread."""
+    filters = {key: query[key] for key in ("date", "date_from", "date_to", "league", "home_team", "away_team")}
+    with get_db_session() as session:
+        repository = GameRepository(session)
+        page = repository.query_games(
+            columns=query["fields"], cursor=query["cursor"],
+            limit=query["limit"], offset=query["offset"], **filters
+        )
+        page["total"] = repository.count_games(**filters) if include_total else None
+    return page
+
+def _invalidate_game_pages(count: int) -> None:
+    """Drop cached game pages after games are written."""
+    global games_cache_generation
+    games_cache_generation += 1
+    
+    cache_manager = getattr(automation_manager, "cache_manager", None) if automation_manager else None
+    if cache_manager and event_loop and not event_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(cache_manager.clear_strategy(CacheStrategy.GAME_QUERIES), event_loop)
+
 @app.get("/api/v1/games")
 async def get_games(
     date: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
     league: Optional[str] = None,
-    limit: int = 100,
-    offset: int = 0,
+    home_team: Optional[str] = None,
+    away_team: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0, description="Legacy offset, ignored when a cursor is given"),
+    include_total: bool = False,
     user: User = Depends(verify_token)
 ):
-    """Get processed game data."""
-    # In a real implementation, this would query the database
-    # For now, return mock data
-    return {
+    """
+    Get processed game data, ordered by date, time and id.
+    
+    Follow ``next_cursor`` to page through results; keyset pages stay fast at
+    any depth. Hot pages are cached and dropped when new games are stored.
+    """
+    columns = [name.strip() for name in fields.split(",") if name.strip()] if fields else list(GAME_DEFAULT_COLUMNS)
+    query = {
+        "date": _parse_query_date("date", date),
+        "date_from": _parse_query_date("date_from", date_from),
+        "date_to": _parse_query_date("date_to", date_to),
+        "league": league,
+        "home_team": home_team,
+        "away_team": away_team,
+        "fields": columns,
+        "cursor": cursor,
+        "limit": limit,
+        "offset": 0 if cursor else offset,
+    }
+    response = {
         "games": [],
         "total": 0,
+        "count": 0,
         "limit": limit,
-        "offset": offset,
+        "offset": query["offset"],
+        "next_cursor": None,
+        "fields": columns,
         "filters": {
             "date": date,
-            "league": league
+            "date_from": date_from,
+            "date_to": date_to,
+            "league": league,
+            "home_team": home_team,
+            "away_team": away_team
         }
     }
+    if not _game_database_available():
+        return response
+    
+    cache_manager = getattr(automation_manager, "cache_manager", None) if automation_manager else None
+    cache_key = None
+    if cache_manager:
+        digest = hashlib.sha1(
+            json.dumps({**query, "include_total": include_total}, default=str, sort_keys=True).encode()
+        ).hexdigest()
+        cache_key = f"{games_cache_generation}:{digest}"
+        cached = await cache_manager.get(cache_key, strategy=CacheStrategy.GAME_QUERIES)
+        if cached is not None:
+            response.update(cached)
+            return response
+    
+    try:
+        loop = asyncio.get_running_loop()
+        page = await loop.run_in_executor(None, _query_games_page, query, include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to query games: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to query games: {str(e)}"
+        )
+    
+    page["count"] = len(page["games"])
+    if cache_key:
+        await cache_manager.set(cache_key, page, strategy=CacheStrategy.GAME_QUERIES)
+    
+    response.update(page)
+    return response
 
 @app.get("/api/v1/reports/latest")
 async def get_latest_report(user: User = Depends(verify_token)):
@@ -852,10 +981,18 @@ async def update_config(
 
 @app.post("/api/v1/config/reload")
 async def reload_config(user: User = Depends(require_role("admin"))):
-    """Reload system configuration."""
+    """Reload system configuration and the compiled converter configuration."""
     global config, automation_manager
     
     try:
+        # Recompile the converter configuration first: an invalid file fails the
+        # reload before anything is swapped. Running converters switch over at
+        # their next conversion, so no worker restarts are needed.
+        converter_config_dir = "config"
+        if automation_manager and automation_manager.processing_manager:
+            converter_config_dir = automation_manager.processing_manager.converter.config_dir
+        compiled = reload_compiled_config(converter_config_dir)
+        
         # Reload configuration from file
         from automation.config import load_config
         config = load_config()
@@ -867,9 +1004,16 @@ async def reload_config(user: User = Depends(require_role("admin"))):
         return {
             "success": True,
             "message": "Configuration reloaded successfully",
+            "converter_config": compiled.summary(),
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
         
+    except ConfigurationError as e:
+        logger.error(f"Rejected converter configuration: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid converter configuration: {e.message}"
+        )
     except Exception as e:
         logger.error(f"Failed to reload configuration: {e}")
         raise HTTPException(
@@ -1405,8 +1549,9 @@ if __name__ == "__main__":
         port=8000,
         reload=True,
         log_level="info"
-    )# 
-Comprehensive monitoring and health check endpoints
+    )
+
+# Comprehensive monitoring and health check endpoints
 
 @app.get("/api/v1/health/detailed", response_model=Dict[str, Any])
 async def detailed_health_check(user: User = Depends(verify_token)):
@@ -1528,11 +1673,13 @@ async def get_recent_metrics(
         return {"metrics": [], "count": 0}
     
     try:
-        recent_metrics = automation_manager.monitoring_manager.get_recent_metrics(minutes)
+        monitoring_manager = automation_manager.monitoring_manager
+        recent_metrics = monitoring_manager.get_recent_metrics(minutes)
         return {
             "metrics": [metric.to_dict() for metric in recent_metrics],
             "count": len(recent_metrics),
-            "period_minutes": minutes
+            "period_minutes": minutes,
+            "aggregates": monitoring_manager.get_metric_aggregates(minutes)
         }
     except Exception as e:
         logger.error(f"Failed to get recent metrics: {e}")
@@ -1541,6 +1688,89 @@ async def get_recent_metrics(
             detail=f"Failed to get recent metrics: {str(e)}"
         )
 
+def _get_performance_profiler():
+    """Get the running performance profiler or raise 503."""
+    profiler = getattr(automation_manager, 'performance_profiler', None) if automation_manager else None
+    if not profiler:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Performance profiler not available"
+        )
+    return profiler
+
+@app.get("/api/v1/metrics/profiles/sampling", response_model=Dict[str, Any])
+async def get_sampling_profiler_status(user: User = Depends(require_role("admin"))):
+    """Get sampling profiler settings and statistics."""
+    return _get_performance_profiler().get_sampling_status()
+
+@app.put("/api/v1/metrics/profiles/sampling", response_model=Dict[str, Any])
+async def configure_sampling_profiler(
+    request: SamplingConfigRequest,
+    user: User = Depends(require_role("admin"))
+):
+    """Toggle the sampling profiler or change the fraction of jobs it samples."""
+    profiler = _get_performance_profiler()
+    
+    try:
+        if request.clear_samples:
+            profiler.sampler.clear()
+        
+        return profiler.configure_sampling(
+            enabled=request.enabled,
+            job_rate=request.job_rate,
+            interval=request.interval_ms / 1000 if request.interval_ms else None
+        )
+    except Exception as e:
+        logger.error(f"Failed to configure sampling profiler: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to configure sampling profiler: {str(e)}"
+        )
+
+@app.post("/api/v1/process/job/{job_id}/profile")
+async def enable_job_profiling(
+    job_id: str,
+    enabled: bool = True,
+    user: User = Depends(require_role("admin"))
+):
+    """Run a specific job under the sampling profiler (or stop doing so)."""
+    profiler = _get_performance_profiler()
+    
+    if enabled:
+        profiler.enable_job_sampling(job_id)
+        return {"message": f"Sampling profiler enabled for job {job_id}"}
+    
+    profiler.disable_job_sampling(job_id)
+    return {"message": f"Sampling profiler disabled for job {job_id}"}
+
+@app.get("/api/v1/metrics/profiles/flamegraph")
+async def get_flamegraph(
+    stage: Optional[str] = None,
+    format: str = "folded",
+    user: User = Depends(require_role("admin"))
+):
+    """
+    Export sampled stacks aggregated per pipeline stage.
+    
+    ``format=folded`` returns text for flamegraph.pl, inferno or speedscope;
+    ``format=json`` returns {stage: {folded_stack: count}}.
+    """
+    profiler = _get_performance_profiler()
+    
+    if format == "folded":
+        return PlainTextResponse(profiler.sampler.export_folded(stage))
+    if format == "json":
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "stages": profiler.sampler.get_folded_stacks(stage),
+            "stats": profiler.sampler.get_stats()
+        }
+    
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="format must be 'folded' or 'json'"
+    )
+
 # Webhook registration for alerts
 @app.post("/api/v1/webhooks/register")
 async def register_webhook(
@@ -1612,18 +1842,34 @@ async def list_webhooks(user: User = Depends(require_role("admin"))):
 @app.on_event("startup")
 async def startup_event():
     """Initialize application components on startup."""
-    global automation_manager, config, websocket_manager, security_manager
+    global automation_manager, config, websocket_manager, security_manager, event_loop
     
     try:
         logger.info("Starting Football Automation API...")
+        event_loop = asyncio.get_running_loop()
         
         # Load configuration
         config = load_config()
         logger.info(f"Configuration loaded for environment: {config.environment}")
         
-        # Initialize security manager and middleware
-        security_manager = create_security_middleware_stack(app, config.security)
-        logger.info("Security manager and middleware initialized")
+        # Initialize game data access
+        try:
+            db_manager = initialize_database(
+                config.database.url,
+                pool_size=config.database.pool_size,
+                max_overflow=config.database.max_overflow,
+                pool_timeout=config.database.pool_timeout,
+                pool_recycle=config.database.pool_recycle
+            )
+            if db_manager.is_sqlite:
+                Game.__table__.create(db_manager.sync_engine, checkfirst=True)
+            add_game_write_listener(_invalidate_game_pages)
+        except Exception as e:
+            logger.warning(f"Game database unavailable: {e}")
+        
+        # Apply loaded security settings to the registered middleware
+        security_manager.configure(SecurityConfig.from_automation_config(config.security))
+        logger.info("Security manager configured")
         
         # Initialize WebSocket manager
         websocket_manager = WebSocketManager()
@@ -1642,6 +1888,9 @@ async def startup_event():
         # Start automation manager
         await automation_manager.start()
         
+        # Share rate limit buckets across workers through the automation cache
+        security_manager.attach_cache_manager(automation_manager.cache_manager)
+        
         logger.info("Football Automation API started successfully")
         
     except Exception as e:
@@ -1655,6 +1904,7 @@ async def shutdown_event():
     
     try:
         logger.info("Shutting down Football Automation API...")
+        remove_game_write_listener(_invalidate_game_pages)
         
         # Stop automation manager
         if automation_manager:
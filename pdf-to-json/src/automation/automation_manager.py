@@ -30,6 +30,7 @@ from .file_watcher import FileWatcher, FileEvent, FileEventType
 from .processing_manager import ProcessingManager, ProcessingResult
 from .cache_manager import CacheManager
 from .monitoring import MonitoringManager
+from .performance_monitor import PerformanceProfiler
 from .logging_config import configure_structured_logging, setup_log_aggregation
 from .exceptions import AutomationManagerError
 from .models import get_session_factory, create_tables
@@ -92,6 +93,7 @@ class AutomationManager:
         self.processing_manager: Optional[ProcessingManager] = None
         self.cache_manager: Optional[CacheManager] = None
         self.monitoring_manager: Optional[MonitoringManager] = None
+        self.performance_profiler: Optional[PerformanceProfiler] = None
         
         # Scheduler for periodic tasks
         self.scheduler: Optional[AsyncIOScheduler] = None
@@ -408,9 +410,11 @@ class AutomationManager:
             self.logger.info("File watcher initialized")
             
             # Initialize processing manager
+            self.performance_profiler = PerformanceProfiler(self.config.performance)
             self.processing_manager = ProcessingManager(
                 self.config.processing,
-                self.config.database
+                self.config.database,
+                profiler=self.performance_profiler
             )
             self.processing_manager.add_progress_callback(self._handle_processing_progress)
             await self.processing_manager.start()
@@ -130,10 +130,12 @@ class RegressionTest:
 class BenchmarkRunner:
     """Performance benchmark runner."""
     
-    def __init__(self, config: PerformanceConfig):
+    def __init__(self, config: PerformanceConfig, results_dir: Optional[str] = None):
         self.config = config
         self.logger = structlog.get_logger(__name__)
-        self.results_dir = Path("benchmarks/results")
+        # Relative default kept for existing callers; scripts should pass an
+        # absolute directory so baselines don't depend on the working directory
+        self.results_dir = Path(results_dir or "benchmarks/results")
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
         # Initialize APM collector for detailed metrics
@@ -192,8 +194,11 @@ class BenchmarkRunner:
             tracemalloc.start()
             memory_start = psutil.Process().memory_info().rss
             
-            # CPU monitoring setup
+            # CPU monitoring setup; sampled without blocking so the sampler
+            # does not add to the measured duration
             cpu_measurements = []
+            process = psutil.Process()
+            process.cpu_percent(interval=None)
             
             # Actual benchmark runs
             start_time = time.time()
@@ -211,7 +216,7 @@ class BenchmarkRunner:
                         )
                     
                     # Measure CPU usage for this iteration
-                    cpu_measurements.append(psutil.cpu_percent(interval=0.1))
+                    cpu_measurements.append(process.cpu_percent(interval=None))
                     
                 except asyncio.TimeoutError:
                     error_msg = f"Benchmark timed out after {timeout} seconds"
@@ -515,7 +520,7 @@ class BenchmarkRunner:
                 data = json.load(f)
             
             data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-            return BenchmarkResult(**data)
+            return BenchmarkResult(**{k: v for k, v in data.items() if k != 'memory_delta' and k != 'duration_per_iteration'})
             
         except Exception as e:
             self.logger.error("Failed to load baseline result", 
@@ -34,6 +34,8 @@ class CacheStrategy(Enum):
     MARKET_CLASSIFICATION = "market_classification"
     PROCESSING_RESULTS = "processing_results"
     CONFIGURATION = "configuration"
+    RATE_LIMITING = "rate_limiting"
+    GAME_QUERIES = "game_queries"
     CUSTOM = "custom"
 
 
@@ -126,9 +128,14 @@ class CacheManager:
             CacheStrategy.MARKET_CLASSIFICATION: "market_class:",
             CacheStrategy.PROCESSING_RESULTS: "proc_result:",
             CacheStrategy.CONFIGURATION: "config:",
+            CacheStrategy.RATE_LIMITING: "rate_limit:",
+            CacheStrategy.GAME_QUERIES: "game_query:",
             CacheStrategy.CUSTOM: "custom:"
         }
         
+        # Registered Lua scripts, keyed by source
+        self._scripts: Dict[str, Any] = {}
+        
         # Invalidation patterns
         self.invalidation_patterns: Dict[str, List[Pattern]] = {}
         
@@ -327,6 +334,46 @@ class CacheManager:
             logger.error(f"Unexpected error deleting key {full_key}: {e}")
             return False
     
+    async def run_script(
+        self,
+        script: str,
+        keys: List[str],
+        args: List[Any],
+        strategy: CacheStrategy = CacheStrategy.CUSTOM
+    ) -> Optional[Any]:
+        """
+        Run a Lua script atomically on Redis.
+        
+        Scripts are registered once and invoked by SHA afterwards.
+        
+        Args:
+            script: Lua source
+            keys: Cache keys passed as KEYS (strategy prefix is applied)
+            args: Values passed as ARGV
+            strategy: Cache strategy used to prefix keys
+            
+        Returns:
+            Script result, or None if Redis is unavailable
+        """
+        if not (self.redis_client and self.config.enabled):
+            return None
+        
+        full_keys = [self._build_key(key, strategy) for key in keys]
+        
+        try:
+            registered = self._scripts.get(script)
+            if registered is None:
+                registered = self.redis_client.register_script(script)
+                self._scripts[script] = registered
+            return await registered(keys=full_keys, args=args)
+            
+        except RedisError as e:
+            logger.error(f"Redis error running script on {full_keys}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error running script on {full_keys}: {e}")
+            return None
+    
     async def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalidate cache keys matching a pattern.
@@ -92,6 +92,7 @@ class ProcessingConfig:
     enable_progress_tracking: bool = True
     cleanup_completed_jobs_after: int = 86400  # seconds (24 hours)
     priority_levels: int = 5
+    stage_trace_dir: Optional[str] = None  # write a Chrome trace JSON per job when set
     
     def __post_init__(self):
         """Validate configuration after initialization."""
@@ -116,7 +117,8 @@ class CacheConfig:
         "team_normalization": 86400,  # 24 hours
         "market_classification": 43200,  # 12 hours
         "processing_results": 3600,  # 1 hour
-        "configuration": 1800  # 30 minutes
+        "configuration": 1800,  # 30 minutes
+        "game_queries": 300  # 5 minutes, also invalidated when games are written
     })
     enable_compression: bool = True
     connection_pool_size: int = 10
@@ -205,6 +207,11 @@ class SecurityConfig:
     jwt_secret_key: str = "default-dev-secret-change-in-production"
     jwt_expiration_hours: int = 24
     api_rate_limit_per_minute: int = 100
+    rate_limit_burst_size: int = 20
+    rate_limit_algorithm: str = "token_bucket"  # token_bucket or sliding_window
+    rate_limit_use_redis: bool = False
+    rate_limit_max_identifiers: int = 100_000
+    rate_limit_idle_timeout_seconds: Optional[float] = None
     allowed_file_types: List[str] = field(default_factory=lambda: [".pdf"])
     max_file_size_mb: int = 100
     enable_ip_whitelisting: bool = False
@@ -220,6 +227,15 @@ class SecurityConfig:
             raise AutomationConfigError("JWT expiration hours must be positive")
         if self.api_rate_limit_per_minute <= 0:
             raise AutomationConfigError("API rate limit must be positive")
+        if self.rate_limit_burst_size <= 0:
+            raise AutomationConfigError("Rate limit burst size must be positive")
+        if self.rate_limit_algorithm not in ("token_bucket", "sliding_window"):
+            raise AutomationConfigError(f"Unknown rate limit algorithm: {self.rate_limit_algorithm}")
+        if self.rate_limit_max_identifiers <= 0:
+            raise AutomationConfigError("Rate limit max identifiers must be positive")
+        if (self.rate_limit_idle_timeout_seconds is not None
+                and self.rate_limit_idle_timeout_seconds <= 0):
+            raise AutomationConfigError("Rate limit idle timeout must be positive")
         if self.max_file_size_mb <= 0:
             raise AutomationConfigError("Max file size must be positive")
 
@@ -261,6 +277,13 @@ class PerformanceConfig:
     profile_slow_functions: bool = True
     slow_function_threshold: float = 1.0  # seconds
     
+    # Sampling profiler settings (low-overhead, safe for production jobs)
+    enable_sampling_profiler: bool = False
+    sampling_interval: float = 0.01  # seconds between stack samples
+    sampling_job_rate: float = 0.0  # fraction of jobs sampled automatically
+    sampling_max_depth: int = 64  # frames kept per sampled stack
+    max_folded_stacks: int = 5000  # distinct stacks kept per stage
+    
     # Memory monitoring settings
     max_memory_snapshots: int = 1000
     memory_leak_threshold: int = 10 * 1024 * 1024  # 10MB
@@ -270,6 +293,8 @@ class PerformanceConfig:
     slow_query_threshold: float = 1.0  # seconds
     max_slow_queries: int = 100
     max_db_metrics: int = 1000
+    query_sample_rate: float = 1.0  # fraction of statements timed and recorded
+    query_fingerprint_cache_size: int = 5000
     
     # APM settings
     max_metrics_history: int = 10000
@@ -294,6 +319,18 @@ class PerformanceConfig:
             raise AutomationConfigError("Memory leak threshold must be positive")
         if self.slow_query_threshold <= 0:
             raise AutomationConfigError("Slow query threshold must be positive")
+        if not 0 < self.query_sample_rate <= 1:
+            raise AutomationConfigError("Query sample rate must be in (0, 1]")
+        if self.query_fingerprint_cache_size <= 0:
+            raise AutomationConfigError("Query fingerprint cache size must be positive")
+        if self.sampling_interval <= 0:
+            raise AutomationConfigError("Sampling interval must be positive")
+        if not 0 <= self.sampling_job_rate <= 1:
+            raise AutomationConfigError("Sampling job rate must be in [0, 1]")
+        if self.sampling_max_depth <= 0:
+            raise AutomationConfigError("Sampling max depth must be positive")
+        if self.max_folded_stacks <= 0:
+            raise AutomationConfigError("Max folded stacks must be positive")
 
 
 @dataclass
@@ -495,6 +532,8 @@ def _apply_environment_variables(config: AutomationConfig, prefix: str) -> Autom
         # Security
         f"{prefix}JWT_SECRET_KEY": ("security", "jwt_secret_key"),
         f"{prefix}API_RATE_LIMIT": ("security", "api_rate_limit_per_minute"),
+        f"{prefix}RATE_LIMIT_ALGORITHM": ("security", "rate_limit_algorithm"),
+        f"{prefix}RATE_LIMIT_USE_REDIS": ("security", "rate_limit_use_redis"),
         f"{prefix}MAX_FILE_SIZE_MB": ("security", "max_file_size_mb"),
         
         # Monitoring
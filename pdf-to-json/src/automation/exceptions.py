@@ -42,4 +42,9 @@ class MonitoringError(AutomationError):
 
 class PerformanceError(AutomationError):
     """Raised when performance monitoring operations fail."""
-    pass
\ No newline at end of file
+    pass
+
+
+class ScalingManagerError(AutomationError):
+    """Raised when scaling manager operations fail."""
+    pass
@@ -9,11 +9,13 @@ import asyncio
 import logging
 import smtplib
 import time
+from array import array
+from bisect import bisect_left
 from datetime import datetime, timezone, timedelta
 from email.mime.text import MIMEText as MimeText
 from email.mime.multipart import MIMEMultipart as MimeMultipart
-from typing import Dict, Any, List, Optional, Callable, Awaitable
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Iterator, Sequence
+from dataclasses import dataclass, asdict, fields
 from pathlib import Path
 import json
 import psutil
@@ -25,6 +27,18 @@ from .models import SystemMetrics, get_session_factory
 from .config import MonitoringConfig, NotificationConfig
 from .exceptions import MonitoringError
 
+try:
+    from converter.stage_tracing import StageSpan, add_stage_listener, remove_stage_listener
+except ImportError:
+    StageSpan = None
+    add_stage_listener = remove_stage_listener = None
+
+# Histogram buckets for pipeline stage instrumentation
+STAGE_DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+STAGE_ROWS_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 500000)
+STAGE_MEMORY_BUCKETS = (1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024,
+                        256 * 1024 * 1024, 1024 * 1024 * 1024)
+
 
 @dataclass
 class SystemHealth:
@@ -78,6 +92,85 @@ class Alert:
             'timestamp': self.timestamp.isoformat()
         }
 
+# SystemHealth fields stored as numeric series in the metrics ring buffer
+HEALTH_SERIES = tuple(f.name for f in fields(SystemHealth) if f.name != 'timestamp')
+
+
+class MetricRingBuffer:
+    """
+    Fixed-size time series store with one array-backed ring per metric.
+    
+    All metrics share a ring of POSIX timestamps, so a sample is written in
+    O(number of metrics) without allocating, and the oldest sample is
+    overwritten once the buffer is full. Timestamps are appended in order,
+    which lets window lookups binary search the ring instead of scanning it.
+    """
+    
+    def __init__(self, capacity: int, metric_names: Sequence[str]):
+        if capacity <= 0:
+            raise MonitoringError("Metric ring buffer capacity must be positive")
+        self.capacity = capacity
+        self.metric_names = tuple(metric_names)
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.values: Dict[str, array] = {
+            name: array('d', bytes(8 * capacity)) for name in self.metric_names
+        }
+        self.start = 0
+        self.size = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def append(self, timestamp: float, values: Dict[str, float]):
+        """Write one sample, overwriting the oldest when full."""
+        if self.size < self.capacity:
+            index = (self.start + self.size) % self.capacity
+            self.size += 1
+        else:
+            index = self.start
+            self.start = (self.start + 1) % self.capacity
+        
+        self.timestamps[index] = timestamp
+        for name in self.metric_names:
+            self.values[name][index] = values[name]
+    
+    def _window_start(self, since: float) -> int:
+        """Return the logical position of the first sample at or after ``since``."""
+        start, capacity, timestamps = self.start, self.capacity, self.timestamps
+        return bisect_left(range(self.size), since,
+                           key=lambda position: timestamps[(start + position) % capacity])
+    
+    def window_indices(self, since: float) -> Iterator[int]:
+        """Yield physical indices of samples at or after ``since``, oldest first."""
+        start, capacity = self.start, self.capacity
+        for position in range(self._window_start(since), self.size):
+            yield (start + position) % capacity
+    
+    def window(self, name: str, since: float) -> List[float]:
+        """Return the values of one metric at or after ``since``, oldest first."""
+        series = self.values[name]
+        return [series[index] for index in self.window_indices(since)]
+    
+    def aggregate(self, name: str, since: float) -> Dict[str, Optional[float]]:
+        """Compute min, max, p50 and p95 of one metric over a window."""
+        samples = sorted(self.window(name, since))
+        count = len(samples)
+        if not count:
+            return {'count': 0, 'min': None, 'max': None, 'p50': None, 'p95': None}
+        return {
+            'count': count,
+            'min': samples[0],
+            'max': samples[-1],
+            'p50': samples[_nearest_rank(0.50, count)],
+            'p95': samples[_nearest_rank(0.95, count)]
+        }
+
+
+def _nearest_rank(quantile: float, count: int) -> int:
+    """Index of the nearest-rank quantile in a sorted sequence of ``count`` items."""
+    return max(0, min(count - 1, int(quantile * count + 0.999999) - 1))
+
+
 class MetricsCollector:
     """Collects and manages system metrics."""
     
@@ -90,8 +183,11 @@ class MetricsCollector:
         self._setup_prometheus_metrics()
         
         # Internal metrics storage
-        self.metrics_history: List[SystemHealth] = []
         self.max_history_size = 1000
+        self.metrics_history = MetricRingBuffer(self.max_history_size, HEALTH_SERIES)
+        
+        # CPU times at the previous sample; usage is the busy share of the delta
+        self._last_cpu_times = psutil.cpu_times()
         
         # Component references (set by monitoring manager)
         self.processing_manager = None
@@ -113,14 +209,36 @@ class MetricsCollector:
         self.jobs_total = Counter('jobs_total', 'Total number of jobs', ['status'], registry=self.registry)
         self.errors_total = Counter('errors_total', 'Total number of errors', ['component'], registry=self.registry)
         self.downloads_total = Counter('downloads_total', 'Total number of downloads', ['status'], registry=self.registry)
+        
+        # Pipeline stage instrumentation
+        self.stage_duration = Histogram(
+            'pipeline_stage_duration_seconds', 'Pipeline stage wall time', ['stage'],
+            buckets=STAGE_DURATION_BUCKETS, registry=self.registry
+        )
+        self.stage_cpu_time = Histogram(
+            'pipeline_stage_cpu_seconds', 'Pipeline stage CPU time', ['stage'],
+            buckets=STAGE_DURATION_BUCKETS, registry=self.registry
+        )
+        self.stage_rows = Histogram(
+            'pipeline_stage_rows', 'Rows entering and leaving a pipeline stage', ['stage', 'direction'],
+            buckets=STAGE_ROWS_BUCKETS, registry=self.registry
+        )
+        self.stage_memory = Histogram(
+            'pipeline_stage_memory_bytes', 'Memory allocated by a pipeline stage', ['stage'],
+            buckets=STAGE_MEMORY_BUCKETS, registry=self.registry
+        )
+        self.stage_failures = Counter(
+            'pipeline_stage_failures_total', 'Pipeline stage failures', ['stage'], registry=self.registry
+        )
     
     async def collect_metrics(self) -> SystemHealth:
         """Collect current system metrics."""
         try:
-            # System metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            # System metrics are sampled off the event loop
+            loop = asyncio.get_running_loop()
+            cpu_percent, memory_percent, disk_percent = await loop.run_in_executor(
+                None, self._sample_system
+            )
             
             # Queue metrics
             queue_length = 0
@@ -153,8 +271,8 @@ class MetricsCollector:
             health = SystemHealth(
                 timestamp=datetime.now(timezone.utc),
                 cpu_usage_percent=cpu_percent,
-                memory_usage_percent=memory.percent,
-                disk_usage_percent=(disk.used / disk.total) * 100,
+                memory_usage_percent=memory_percent,
+                disk_usage_percent=disk_percent,
                 queue_length=queue_length,
                 active_jobs=active_jobs,
                 error_rate_percent=error_rate,
@@ -168,9 +286,9 @@ class MetricsCollector:
             self._update_prometheus_metrics(health)
             
             # Store in history
-            self.metrics_history.append(health)
-            if len(self.metrics_history) > self.max_history_size:
-                self.metrics_history.pop(0)
+            self.metrics_history.append(health.timestamp.timestamp(), {
+                name: float(getattr(health, name)) for name in HEALTH_SERIES
+            })
             
             self.logger.debug("Metrics collected", **health.to_dict())
             return health
@@ -179,6 +297,26 @@ class MetricsCollector:
             self.logger.error("Failed to collect metrics", error=str(e))
             raise MonitoringError(f"Failed to collect metrics: {e}")
     
+    def _sample_system(self) -> tuple:
+        """
+        Sample CPU, memory and disk usage without blocking.
+        
+        CPU usage is the busy share of CPU time since the previous sample, so
+        no sleep is needed and other ``psutil.cpu_percent`` callers do not
+        disturb the measurement.
+        """
+        cpu_times = psutil.cpu_times()
+        last, self._last_cpu_times = self._last_cpu_times, cpu_times
+        total = sum(cpu_times) - sum(last)
+        idle = (cpu_times.idle - last.idle) + (
+            getattr(cpu_times, 'iowait', 0.0) - getattr(last, 'iowait', 0.0)
+        )
+        cpu_percent = max(0.0, min(100.0, (total - idle) / total * 100)) if total > 0 else 0.0
+        
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        return cpu_percent, memory.percent, (disk.used / disk.total) * 100
+    
     def _update_prometheus_metrics(self, health: SystemHealth):
         """Update Prometheus metrics."""
         self.cpu_usage.set(health.cpu_usage_percent)
@@ -227,14 +365,54 @@ class MetricsCollector:
         except Exception:
             return False
     
+    def record_stage_span(self, span: 'StageSpan'):
+        """Record a finished pipeline stage span in the stage histograms."""
+        stage = span.stage
+        self.stage_duration.labels(stage=stage).observe(span.wall_time)
+        self.stage_cpu_time.labels(stage=stage).observe(span.cpu_time)
+        
+        if span.rows_in is not None:
+            self.stage_rows.labels(stage=stage, direction='in').observe(span.rows_in)
+        if span.rows_out is not None:
+            self.stage_rows.labels(stage=stage, direction='out').observe(span.rows_out)
+        
+        # Prefer exact allocation peaks when tracemalloc tracing is enabled
+        allocated = span.peak_allocated_bytes if span.peak_allocated_bytes is not None else span.memory_delta_bytes
+        self.stage_memory.labels(stage=stage).observe(max(0, allocated))
+        
+        if not span.success:
+            self.stage_failures.labels(stage=stage).inc()
+    
     def get_metrics_export(self) -> str:
         """Get Prometheus metrics export."""
         return generate_latest(self.registry).decode('utf-8')
     
     def get_recent_metrics(self, minutes: int = 60) -> List[SystemHealth]:
         """Get recent metrics within specified minutes."""
-        cutoff = datetime.now(timezone.utc) - timedelta(minutes=minutes)
-        return [m for m in self.metrics_history if m.timestamp >= cutoff]
+        history = self.metrics_history
+        cutoff = time.time() - minutes * 60
+        return [
+            SystemHealth(
+                timestamp=datetime.fromtimestamp(history.timestamps[index], timezone.utc),
+                components_healthy=bool(history.values['components_healthy'][index]),
+                queue_length=int(history.values['queue_length'][index]),
+                active_jobs=int(history.values['active_jobs'][index]),
+                **{
+                    name: history.values[name][index] for name in HEALTH_SERIES
+                    if name not in ('components_healthy', 'queue_length', 'active_jobs')
+                }
+            )
+            for index in history.window_indices(cutoff)
+        ]
+    
+    def get_metric_aggregates(self, minutes: int = 60) -> Dict[str, Dict[str, Optional[float]]]:
+        """Get min, max, p50 and p95 of each metric within specified minutes."""
+        cutoff = time.time() - minutes * 60
+        return {
+            name: self.metrics_history.aggregate(name, cutoff) for name in HEALTH_SERIES
+        }
+
+
 class AlertManager:
     """Manages alerts and notifications."""
     
@@ -603,6 +781,10 @@ class MonitoringManager:
             self.logger.info("Starting monitoring system")
             self.is_running = True
             
+            # Export pipeline stage spans to Prometheus
+            if add_stage_listener:
+                add_stage_listener(self.metrics_collector.record_stage_span)
+            
             # Start monitoring loop
             if self.config.enabled:
                 self.monitoring_task = asyncio.create_task(self._monitoring_loop())
@@ -624,6 +806,9 @@ class MonitoringManager:
             self.is_running = False
             self.shutdown_event.set()
             
+            if remove_stage_listener:
+                remove_stage_listener(self.metrics_collector.record_stage_span)
+            
             # Stop monitoring loop
             if self.monitoring_task:
                 self.monitoring_task.cancel()
@@ -693,6 +878,10 @@ class MonitoringManager:
         """Get recent metrics."""
         return self.metrics_collector.get_recent_metrics(minutes)
     
+    def get_metric_aggregates(self, minutes: int = 60) -> Dict[str, Dict[str, Optional[float]]]:
+        """Get windowed metric aggregates."""
+        return self.metrics_collector.get_metric_aggregates(minutes)
+    
     def add_alert_handler(self, handler: Callable[[Alert], Awaitable[None]]):
         """Add an alert handler."""
         self.alert_manager.add_alert_handler(handler)
\ No newline at end of file
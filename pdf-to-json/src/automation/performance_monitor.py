@@ -9,6 +9,8 @@ import asyncio
 import gc
 import logging
 import psutil
+import random
+import sys
 import time
 import tracemalloc
 from collections import defaultdict, deque
@@ -16,7 +18,8 @@ from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Callable, Awaitable, Union
+from types import CodeType
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple, Union
 import cProfile
 import pstats
 import io
@@ -32,7 +35,12 @@ from sqlalchemy.pool import Pool
 from .models import SystemMetrics, get_session_factory
 from .config import PerformanceConfig
 from .exceptions import PerformanceError
-from .query_optimizer import QueryOptimizer
+from .query_optimizer import QueryOptimizer, QueryFingerprintCache, LatencyHistogram
+
+try:
+    from converter.stage_tracing import get_active_stage
+except ImportError:
+    get_active_stage = None
 
 
 @dataclass
@@ -175,6 +183,189 @@ class DatabaseMetrics:
         }
 
 
+class StackSampler:
+    """
+    Thread-based statistical stack sampler.
+    
+    A daemon thread wakes every ``interval`` seconds, captures the stacks of
+    the registered threads via ``sys._current_frames()`` and counts them per
+    pipeline stage. Stacks are stored as tuples of code objects and only
+    rendered to folded-stack text on export, so each sample costs one frame
+    walk and a dictionary update. The sampler thread exits when no threads
+    are registered.
+    """
+    
+    UNSTAGED = "unstaged"
+    
+    def __init__(self, interval: float = 0.01, max_depth: int = 64, max_stacks: int = 5000):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self.logger = structlog.get_logger(__name__)
+        
+        # thread id -> [label, registration count]
+        self._targets: Dict[int, List[Any]] = {}
+        # stage -> stack (root first) -> sample count
+        self._stacks: Dict[str, Dict[Tuple[CodeType, ...], int]] = defaultdict(dict)
+        self._frame_labels: Dict[CodeType, str] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        
+        self.samples_taken = 0
+        self.samples_dropped = 0
+        self.sampling_time = 0.0
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the sampler thread is active."""
+        return self._thread is not None
+    
+    def add_thread(self, thread_id: int, label: str = ""):
+        """Start sampling a thread. Calls nest; each needs a matching remove_thread."""
+        with self._lock:
+            target = self._targets.get(thread_id)
+            if target:
+                target[1] += 1
+            else:
+                self._targets[thread_id] = [label, 1]
+            
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+    
+    def remove_thread(self, thread_id: int):
+        """Stop sampling a thread once all its registrations are removed."""
+        with self._lock:
+            target = self._targets.get(thread_id)
+            if not target:
+                return
+            target[1] -= 1
+            if target[1] <= 0:
+                del self._targets[thread_id]
+    
+    def _run(self):
+        """Sampler thread main loop."""
+        sleep = time.sleep
+        perf_counter = time.perf_counter
+        
+        while True:
+            sleep(self.interval)
+            
+            with self._lock:
+                if not self._targets:
+                    self._thread = None
+                    return
+                
+                sample_start = perf_counter()
+                frames = sys._current_frames()
+                for thread_id in self._targets:
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        self._record(thread_id, frame)
+                del frames
+                self.sampling_time += perf_counter() - sample_start
+    
+    def _record(self, thread_id: int, frame):
+        """Count one sample of a thread's stack. Caller holds the lock."""
+        codes = []
+        depth = 0
+        while frame is not None and depth < self.max_depth:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+            depth += 1
+        codes.reverse()
+        key = tuple(codes)
+        
+        stage = get_active_stage(thread_id) if get_active_stage else None
+        stacks = self._stacks[stage or self.UNSTAGED]
+        
+        if key in stacks:
+            stacks[key] += 1
+        elif len(stacks) < self.max_stacks:
+            stacks[key] = 1
+        else:
+            self.samples_dropped += 1
+            return
+        self.samples_taken += 1
+    
+    def _frame_label(self, code: CodeType) -> str:
+        label = self._frame_labels.get(code)
+        if label is None:
+            module = Path(code.co_filename).stem
+            label = f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+            self._frame_labels[code] = label
+        return label
+    
+    def get_folded_stacks(self, stage: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Get sample counts per folded stack, grouped by stage.
+        
+        Args:
+            stage: Only return this stage
+            
+        Returns:
+            Mapping of stage to {"frame;frame;frame": count}, root frame first
+        """
+        with self._lock:
+            snapshot = {
+                name: dict(stacks) for name, stacks in self._stacks.items()
+                if stage is None or name == stage
+            }
+        
+        return {
+            name: {
+                ";".join(self._frame_label(code) for code in key): count
+                for key, count in stacks.items()
+            }
+            for name, stacks in snapshot.items()
+        }
+    
+    def export_folded(self, stage: Optional[str] = None) -> str:
+        """
+        Export folded stacks in the text format used by flamegraph.pl and speedscope.
+        
+        Each line is ``stage;frame;...;frame count`` so a flamegraph groups
+        samples under one root per pipeline stage.
+        
+        Args:
+            stage: Only export this stage
+            
+        Returns:
+            Folded stack text, one stack per line
+        """
+        lines = []
+        for name, stacks in self.get_folded_stacks(stage).items():
+            for folded, count in sorted(stacks.items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"{name};{folded} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sampler statistics including the measured sampling overhead."""
+        with self._lock:
+            stage_samples = {name: sum(stacks.values()) for name, stacks in self._stacks.items()}
+            targets = len(self._targets)
+        
+        return {
+            'running': self.is_running,
+            'interval_seconds': self.interval,
+            'sampled_threads': targets,
+            'samples_taken': self.samples_taken,
+            'samples_dropped': self.samples_dropped,
+            'samples_per_stage': stage_samples,
+            'sampling_time_seconds': self.sampling_time,
+            'avg_sample_cost_us': (self.sampling_time / self.samples_taken * 1_000_000
+                                   if self.samples_taken else 0.0)
+        }
+    
+    def clear(self):
+        """Discard all collected samples."""
+        with self._lock:
+            self._stacks.clear()
+            self.samples_taken = 0
+            self.samples_dropped = 0
+            self.sampling_time = 0.0
+
+
 class PerformanceProfiler:
     """Performance profiling tools for bottleneck identification."""
     
@@ -184,6 +375,17 @@ class PerformanceProfiler:
         self.active_profiles: Dict[str, cProfile.Profile] = {}
         self.profile_results: Dict[str, List[ProfileResult]] = defaultdict(list)
         self._lock = threading.Lock()
+        
+        # Sampling profiler for production jobs
+        self.sampler = StackSampler(
+            interval=config.sampling_interval,
+            max_depth=config.sampling_max_depth,
+            max_stacks=config.max_folded_stacks
+        )
+        self.sampling_enabled = config.enable_sampling_profiler
+        self.sampling_job_rate = config.sampling_job_rate
+        self.sampled_job_ids: set = set()
+        self.sampled_jobs_total = 0
     
     @contextmanager
     def profile_context(self, name: str):
@@ -270,6 +472,93 @@ class PerformanceProfiler:
         except Exception as e:
             self.logger.error("Failed to process profile results", name=name, error=str(e))
     
+    def configure_sampling(self, enabled: Optional[bool] = None, job_rate: Optional[float] = None,
+                           interval: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Change sampling profiler settings at runtime.
+        
+        Args:
+            enabled: Turn percentage-based job sampling on or off
+            job_rate: Fraction of jobs to sample when enabled (0-1)
+            interval: Seconds between stack samples
+            
+        Returns:
+            Current sampling status
+        """
+        if job_rate is not None and not 0 <= job_rate <= 1:
+            raise PerformanceError("Sampling job rate must be in [0, 1]")
+        if interval is not None and interval <= 0:
+            raise PerformanceError("Sampling interval must be positive")
+        
+        if enabled is not None:
+            self.sampling_enabled = enabled
+        if job_rate is not None:
+            self.sampling_job_rate = job_rate
+        if interval is not None:
+            self.sampler.interval = interval
+        
+        self.logger.info("Sampling profiler configured",
+                        enabled=self.sampling_enabled,
+                        job_rate=self.sampling_job_rate,
+                        interval=self.sampler.interval)
+        return self.get_sampling_status()
+    
+    def enable_job_sampling(self, job_id: str):
+        """Always sample the next run of the given job, regardless of the sampling rate."""
+        self.sampled_job_ids.add(job_id)
+    
+    def disable_job_sampling(self, job_id: str):
+        """Remove a per-job sampling request."""
+        self.sampled_job_ids.discard(job_id)
+    
+    def should_sample_job(self, job_id: str) -> bool:
+        """Decide whether a job runs under the sampling profiler."""
+        if job_id in self.sampled_job_ids:
+            return True
+        if not self.sampling_enabled or self.sampling_job_rate <= 0:
+            return False
+        return random.random() < self.sampling_job_rate
+    
+    @contextmanager
+    def sampling_context(self, job_id: str, force: bool = False):
+        """
+        Sample the current thread's stacks while a job runs, if the job is selected.
+        
+        Enter this in the thread that runs the converter (not the event loop
+        thread): samples are attributed to the pipeline stage that thread is
+        executing, as published by the converter's stage tracer. A per-job
+        request from enable_job_sampling is consumed when the run finishes.
+        
+        Args:
+            job_id: Job identifier used for per-job toggles
+            force: Sample regardless of per-job toggles and the sampling rate
+            
+        Yields:
+            True if the job is being sampled
+        """
+        if not (force or self.should_sample_job(job_id)):
+            yield False
+            return
+        
+        thread_id = threading.get_ident()
+        self.sampler.add_thread(thread_id, job_id)
+        self.sampled_jobs_total += 1
+        try:
+            yield True
+        finally:
+            self.sampler.remove_thread(thread_id)
+            self.sampled_job_ids.discard(job_id)
+    
+    def get_sampling_status(self) -> Dict[str, Any]:
+        """Get sampling profiler settings and statistics."""
+        return {
+            'enabled': self.sampling_enabled,
+            'job_rate': self.sampling_job_rate,
+            'sampled_job_ids': sorted(self.sampled_job_ids),
+            'sampled_jobs_total': self.sampled_jobs_total,
+            **self.sampler.get_stats()
+        }
+    
     def get_profile_results(self, name: str) -> List[ProfileResult]:
         """Get profiling results for a specific profile."""
         return self.profile_results.get(name, [])
@@ -449,17 +738,23 @@ class DatabasePerformanceMonitor:
     def __init__(self, config: PerformanceConfig):
         self.config = config
         self.logger = structlog.get_logger(__name__)
+        # 'count', 'total_time' and 'slow_queries' are estimates scaled by
+        # 1 / query_sample_rate; 'sampled_count' is what was actually timed
         self.query_stats: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
-            'count': 0,
+            'count': 0.0,
+            'sampled_count': 0,
             'total_time': 0.0,
             'max_time': 0.0,
             'min_time': float('inf'),
             'avg_time': 0.0,
-            'slow_queries': 0
+            'slow_queries': 0,
+            'histogram': LatencyHistogram()
         })
-        self.slow_queries: List[Dict[str, Any]] = []
+        self.slow_queries: deque = deque(maxlen=config.max_slow_queries)
         self.connection_metrics: List[DatabaseMetrics] = []
         self.engines: List[Engine] = []
+        self.fingerprints = QueryFingerprintCache(config.query_fingerprint_cache_size)
+        self.sample_rate = config.query_sample_rate
         
     def register_engine(self, engine: Engine):
         """Register a SQLAlchemy engine for monitoring."""
@@ -476,30 +771,38 @@ class DatabasePerformanceMonitor:
     
     def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
         """Called before SQL execution."""
-        context._query_start_time = time.time()
-        context._query_statement = statement
+        # Unsampled statements are never timed, so they cost one random() call
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        context._query_start_time = time.perf_counter()
     
     def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
         """Called after SQL execution."""
-        if not hasattr(context, '_query_start_time'):
+        start_time = getattr(context, '_query_start_time', None)
+        if start_time is None:
             return
         
-        execution_time = time.time() - context._query_start_time
+        execution_time = time.perf_counter() - start_time
         
-        # Normalize query for statistics (remove parameters)
-        normalized_query = self._normalize_query(statement)
+        # Normalize query for statistics (cached per raw statement)
+        normalized_query = self.fingerprints.get(statement).normalized_query
         
-        # Update statistics
+        # Update statistics; each timed statement stands for 1 / sample_rate executions
+        weight = 1.0 / self.sample_rate
         stats = self.query_stats[normalized_query]
-        stats['count'] += 1
-        stats['total_time'] += execution_time
-        stats['max_time'] = max(stats['max_time'], execution_time)
-        stats['min_time'] = min(stats['min_time'], execution_time)
+        stats['count'] += weight
+        stats['sampled_count'] += 1
+        stats['total_time'] += execution_time * weight
+        if execution_time > stats['max_time']:
+            stats['max_time'] = execution_time
+        if execution_time < stats['min_time']:
+            stats['min_time'] = execution_time
         stats['avg_time'] = stats['total_time'] / stats['count']
+        stats['histogram'].record(execution_time)
         
         # Check for slow queries
         if execution_time > self.config.slow_query_threshold:
-            stats['slow_queries'] += 1
+            stats['slow_queries'] += weight
             
             slow_query = {
                 'timestamp': datetime.now(timezone.utc).isoformat(),
@@ -508,12 +811,9 @@ class DatabasePerformanceMonitor:
                 'parameters': str(parameters) if parameters else None
             }
             
+            # Bounded deque keeps only recent slow queries
             self.slow_queries.append(slow_query)
             
-            # Keep only recent slow queries
-            if len(self.slow_queries) > self.config.max_slow_queries:
-                self.slow_queries.pop(0)
-            
             self.logger.warning("Slow query detected", 
                               execution_time=execution_time,
                               query=statement[:200])
@@ -532,12 +832,7 @@ class DatabasePerformanceMonitor:
     
     def _normalize_query(self, query: str) -> str:
         """Normalize query for statistics by removing parameters."""
-        # Simple normalization - replace parameter placeholders
-        import re
-        normalized = re.sub(r'\?', '?', query)
-        normalized = re.sub(r':\w+', ':param', normalized)
-        normalized = re.sub(r'\$\d+', '$param', normalized)
-        return normalized.strip()
+        return self.fingerprints.get(query).normalized_query
     
     def collect_database_metrics(self) -> DatabaseMetrics:
         """Collect current database performance metrics."""
@@ -571,8 +866,8 @@ class DatabasePerformanceMonitor:
                 connection_pool_size=total_pool_size,
                 active_connections=total_active,
                 idle_connections=total_idle,
-                query_count=total_queries,
-                slow_query_count=total_slow_queries,
+                query_count=round(total_queries),
+                slow_query_count=round(total_slow_queries),
                 average_query_time=avg_query_time,
                 longest_query_time=max_query_time
             )
@@ -591,11 +886,14 @@ class DatabasePerformanceMonitor:
     
     def get_query_statistics(self) -> Dict[str, Any]:
         """Get query performance statistics."""
-        return dict(self.query_stats)
+        return {
+            query: {**stats, 'histogram': stats['histogram'].to_dict()}
+            for query, stats in self.query_stats.items()
+        }
     
     def get_slow_queries(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent slow queries."""
-        return self.slow_queries[-limit:]
+        return list(self.slow_queries)[-limit:]
     
     def get_top_queries_by_time(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get top queries by total execution time."""
@@ -608,7 +906,7 @@ class DatabasePerformanceMonitor:
         return [
             {
                 'query': query,
-                'stats': stats
+                'stats': {**stats, 'histogram': stats['histogram'].to_dict()}
             }
             for query, stats in sorted_queries[:limit]
         ]
@@ -622,6 +920,7 @@ class DatabasePerformanceMonitor:
         """Reset all query statistics."""
         self.query_stats.clear()
         self.slow_queries.clear()
+        self.fingerprints.clear()
         self.logger.info("Database statistics reset")
 
 
@@ -10,13 +10,14 @@ This module provides a comprehensive job processing system with:
 """
 
 import asyncio
+import threading
 import uuid
 import time
 import traceback
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Any, Optional, Callable, Awaitable, Union
 from pathlib import Path
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 import logging
 import psutil
 from dataclasses import dataclass, field
@@ -31,6 +32,7 @@ from .models import (
     get_session_factory, create_tables
 )
 from .exceptions import ProcessingManagerError
+from .performance_monitor import PerformanceProfiler
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -38,6 +40,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from converter.football_converter import FootballConverter
 from converter.exceptions import FootballProcessingError
 
+try:
+    from converter.converter import PDFToJSONConverter
+except ImportError:
+    PDFToJSONConverter = None
+
 
 @dataclass
 class ProcessingResult:
@@ -101,7 +108,8 @@ class ProcessingManager:
     def __init__(self, 
                  processing_config: ProcessingConfig,
                  database_config: DatabaseConfig,
-                 converter: Optional[FootballConverter] = None):
+                 converter: Optional[FootballConverter] = None,
+                 profiler: Optional[PerformanceProfiler] = None):
         """
         Initialize the ProcessingManager.
         
@@ -109,10 +117,17 @@ class ProcessingManager:
             processing_config: Processing configuration
             database_config: Database configuration
             converter: Optional FootballConverter instance
+            profiler: Optional profiler deciding which jobs run under the sampling profiler
         """
         self.config = processing_config
         self.db_config = database_config
-        self.converter = converter or FootballConverter()
+        self.converter = converter or FootballConverter(trace_dir=processing_config.stage_trace_dir)
+        self.profiler = profiler
+        
+        # FootballConverter keeps per-run state, so concurrent jobs each check
+        # out their own instance; idle ones are reused to keep their caches warm
+        self._idle_converters: List[FootballConverter] = [self.converter]
+        self._converter_lock = threading.Lock()
         
         # Database session factory
         self.session_factory = get_session_factory(database_config.url)
@@ -532,33 +547,27 @@ class ProcessingManager:
     async def _process_pdf_file(self, job_data: Dict[str, Any], progress_callback: Callable) -> ProcessingResult:
         """Process a PDF file using the FootballConverter."""
         input_file = job_data['input_file']
+        output_dir = (job_data.get('parameters') or {}).get('output_dir', 'jsons')
         
-        # Stage 1: PDF to JSON conversion
         await progress_callback(10.0, "pdf_conversion")
         
-        # Use the existing converter (this would need to be made async in a real implementation)
-        # For now, we'll simulate the processing stages
-        
-        await progress_callback(30.0, "data_extraction")
-        await asyncio.sleep(0.1)  # Simulate processing time
-        
-        await progress_callback(50.0, "team_normalization")
-        await asyncio.sleep(0.1)
+        # The converter is synchronous and CPU bound; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None, self._run_conversion, job_data['id'], input_file, output_dir
+        )
         
-        await progress_callback(70.0, "market_processing")
-        await asyncio.sleep(0.1)
+        if not result.get('success'):
+            raise ProcessingManagerError(result.get('error') or "Football conversion failed")
         
         await progress_callback(90.0, "report_generation")
-        await asyncio.sleep(0.1)
         
-        # In a real implementation, this would call the actual converter
-        # result = await self.converter.convert_football_async(json_file_path)
-        
-        # For now, return a mock result
-        output_files = [
-            f"jsons/converted_{Path(input_file).stem}.json",
-            f"jsons/reports/report_{Path(input_file).stem}.json"
-        ]
+        files_created = result.get('files_created', {})
+        output_files = []
+        if files_created.get('merged_file'):
+            output_files.append(files_created['merged_file'])
+        output_files.extend(files_created.get('daily_files', []))
+        output_files.extend(files_created.get('report_files', {}).values())
         
         return ProcessingResult(
             success=True,
@@ -566,10 +575,57 @@ class ProcessingManager:
             output_files=output_files,
             metadata={
                 "input_file": input_file,
-                "processing_stages": ["pdf_conversion", "data_extraction", "team_normalization", "market_processing", "report_generation"]
+                "processing_stages": result['processing_summary']['stages_completed'],
+                "total_games": result['processing_summary']['total_games'],
+                "trace_file": result.get('trace_file')
             }
         )
     
+    def _run_conversion(self, job_id: str, input_file: str, output_dir: str) -> Dict[str, Any]:
+        """
+        Run the conversion pipeline for one job (executes in a worker thread).
+        
+        PDF inputs are converted to the intermediate JSON first; JSON inputs
+        produced by an earlier conversion go straight to the football pipeline.
+        """
+        json_file = input_file
+        if Path(input_file).suffix.lower() == '.pdf':
+            if PDFToJSONConverter is None:
+                raise ProcessingManagerError("PDF conversion is not available")
+            
+            json_file = str(Path(output_dir) / f"{Path(input_file).stem}.json")
+            pdf_result = PDFToJSONConverter().convert_file(input_file, json_file, validate_output=False)
+            if not pdf_result['success']:
+                raise ProcessingManagerError(
+                    f"PDF conversion failed for job {job_id}: {'; '.join(pdf_result['errors'])}"
+                )
+        
+        # Sample this worker thread, where the pipeline stages actually run
+        sampling = self.profiler.sampling_context(job_id) if self.profiler else nullcontext(False)
+        converter = self._acquire_converter()
+        try:
+            with sampling:
+                return converter.convert_football(json_file, output_dir)
+        finally:
+            self._release_converter(converter)
+    
+    def _acquire_converter(self) -> FootballConverter:
+        """Check out an idle converter, creating one if all are busy."""
+        with self._converter_lock:
+            if self._idle_converters:
+                return self._idle_converters.pop()
+        
+        return FootballConverter(
+            config_dir=self.converter.config_dir,
+            max_markets=self.converter.max_markets,
+            trace_dir=self.converter.trace_dir
+        )
+    
+    def _release_converter(self, converter: FootballConverter):
+        """Return a converter to the idle pool."""
+        with self._converter_lock:
+            self._idle_converters.append(converter)
+    
     async def _update_job_progress(self, job_id: str, percent: float, stage: str, metadata: Dict[str, Any] = None):
         """Update job progress in database and notify callbacks."""
         try:
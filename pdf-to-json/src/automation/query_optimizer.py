@@ -7,10 +7,12 @@ including query plan analysis, index recommendations, and performance tuning.
 
 import re
 import time
-from collections import defaultdict, Counter
+import random
+from bisect import bisect_left
+from collections import defaultdict, Counter, OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple, FrozenSet
 import structlog
 from sqlalchemy import text, inspect
 from sqlalchemy.engine import Engine
@@ -20,6 +22,182 @@ from .config import PerformanceConfig
 from .exceptions import PerformanceError
 
 
+# Precompiled normalization patterns, applied in order
+_NORMALIZE_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r'--.*$', re.MULTILINE), ''),
+    (re.compile(r'/\*.*?\*/', re.DOTALL), ''),
+    (re.compile(r'\s+'), ' '),
+    (re.compile(r':\w+'), ':param'),
+    (re.compile(r'\$\d+'), '$param'),
+    (re.compile(r"'[^']*'"), "'string'"),
+    (re.compile(r'"[^"]*"'), '"string"'),
+    (re.compile(r'\b\d+\b'), 'N'),
+]
+
+_FROM_TABLE = re.compile(r'FROM\s+(\w+)', re.IGNORECASE)
+_JOIN_TABLE = re.compile(r'JOIN\s+(\w+)', re.IGNORECASE)
+_SELECT_CLAUSE = re.compile(r'SELECT\s+(.+?)\s+FROM', re.IGNORECASE | re.DOTALL)
+_SELECT_COLUMN = re.compile(r'(\w+)(?:\s+AS\s+\w+)?(?:\s*,|$)', re.IGNORECASE)
+_WHERE_CLAUSE = re.compile(r'WHERE\s+(.+?)(?:\s+GROUP\s+BY|\s+ORDER\s+BY|\s+LIMIT|$)', re.IGNORECASE | re.DOTALL)
+_CONDITION_COLUMN = re.compile(r'(\w+)\s*[=<>!]', re.IGNORECASE)
+
+# Latency histogram bucket upper bounds in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query for analysis by removing parameters and formatting."""
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        query = pattern.sub(replacement, query)
+    return query.strip().upper()
+
+
+def extract_query_metadata(query: str) -> Tuple[Set[str], Set[str]]:
+    """Extract table and column names from query."""
+    tables = set(_FROM_TABLE.findall(query))
+    tables.update(_JOIN_TABLE.findall(query))
+    columns = set()
+    
+    select_match = _SELECT_CLAUSE.search(query)
+    if select_match and '*' not in select_match.group(1):
+        columns.update(_SELECT_COLUMN.findall(select_match.group(1)))
+    
+    where_match = _WHERE_CLAUSE.search(query)
+    if where_match:
+        columns.update(_CONDITION_COLUMN.findall(where_match.group(1)))
+    
+    return tables, columns
+
+
+@dataclass(frozen=True)
+class QueryFingerprint:
+    """Normalized identity and metadata of a SQL statement."""
+    query_hash: str
+    normalized_query: str
+    tables: FrozenSet[str]
+    columns: FrozenSet[str]
+    
+    @classmethod
+    def from_statement(cls, statement: str) -> 'QueryFingerprint':
+        """Build a fingerprint by normalizing the statement once."""
+        normalized = normalize_query(statement)
+        tables, columns = extract_query_metadata(statement)
+        return cls(
+            query_hash=str(hash(normalized)),
+            normalized_query=normalized,
+            tables=frozenset(tables),
+            columns=frozenset(columns)
+        )
+
+
+class QueryFingerprintCache:
+    """
+    Bounded LRU cache of fingerprints keyed by raw statement text.
+    
+    SQLAlchemy reuses the same compiled statement string for every execution
+    of a query, so normalization runs once per distinct statement.
+    """
+    
+    def __init__(self, max_size: int = 5000):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[str, QueryFingerprint]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, statement: str) -> QueryFingerprint:
+        """Get the fingerprint for a statement, computing it on first sight."""
+        fingerprint = self._entries.get(statement)
+        if fingerprint is not None:
+            # LRU: a burst of one-off statements must not evict the hot ones
+            self._entries.move_to_end(statement)
+            self.hits += 1
+            return fingerprint
+        
+        self.misses += 1
+        fingerprint = QueryFingerprint.from_statement(statement)
+        while len(self._entries) >= self.max_size:
+            try:
+                self._entries.popitem(last=False)
+            except KeyError:
+                break
+        self._entries[statement] = fingerprint
+        return fingerprint
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self):
+        """Drop all cached fingerprints."""
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': (self.hits / lookups * 100) if lookups else 0.0
+        }
+
+
+class LatencyHistogram:
+    """Fixed-size latency histogram with bucketed percentile estimates."""
+    
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'min', 'max')
+    
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+    
+    def record(self, value: float):
+        """Record a single latency observation in seconds."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def percentile(self, percent: float) -> float:
+        """Estimate a percentile as the upper bound of its bucket."""
+        if self.count == 0:
+            return 0.0
+        
+        rank = percent / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.max)
+                return self.max
+        return self.max
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        bucket_labels = [str(bound) for bound in self.bounds] + ['+Inf']
+        return {
+            'buckets': dict(zip(bucket_labels, self.counts)),
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99)
+        }
+
+
 @dataclass
 class QueryAnalysis:
     """Query analysis result."""
@@ -35,6 +213,7 @@ class QueryAnalysis:
     query_type: str  # SELECT, INSERT, UPDATE, DELETE
     complexity_score: int
     optimization_suggestions: List[str] = field(default_factory=list)
+    sampled_count: Optional[int] = None  # executions actually recorded when sampling
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -42,6 +221,7 @@ class QueryAnalysis:
             'query_hash': self.query_hash,
             'normalized_query': self.normalized_query,
             'execution_count': self.execution_count,
+            'sampled_count': self.sampled_count,
             'total_time': self.total_time,
             'avg_time': self.avg_time,
             'min_time': self.min_time,
@@ -109,15 +289,22 @@ class QueryOptimizer:
         self.logger = structlog.get_logger(__name__)
         
         # Query tracking
+        # 'count' and 'total_time' are estimates scaled by 1 / query_sample_rate;
+        # 'sampled_count' is the number of executions actually recorded
         self.query_stats: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
-            'count': 0,
+            'count': 0.0,
+            'sampled_count': 0,
             'total_time': 0.0,
             'min_time': float('inf'),
             'max_time': 0.0,
-            'queries': [],
+            'histogram': LatencyHistogram(),
+            'sample_query': None,
+            'normalized_query': None,
             'tables': set(),
             'columns': set()
         })
+        self.fingerprints = QueryFingerprintCache(config.query_fingerprint_cache_size)
+        self.sample_rate = config.query_sample_rate
         
         # Registered engines
         self.engines: List[Engine] = []
@@ -140,86 +327,46 @@ class QueryOptimizer:
         self.logger.info("Database engine registered for optimization", engine=str(engine.url))
     
     def analyze_query(self, query: str, execution_time: float) -> str:
-        """Analyze a query and return its hash for tracking."""
-        normalized_query = self._normalize_query(query)
-        query_hash = str(hash(normalized_query))
+        """
+        Analyze a query and return its hash for tracking.
+        
+        Only a ``query_sample_rate`` fraction of calls is recorded. Each
+        recorded call stands for ``1 / query_sample_rate`` executions, so
+        counts and total time estimate the full load. The fingerprint is
+        cached per raw statement either way.
+        """
+        fingerprint = self.fingerprints.get(query)
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return fingerprint.query_hash
         
         # Update statistics
-        stats = self.query_stats[query_hash]
-        stats['count'] += 1
-        stats['total_time'] += execution_time
-        stats['min_time'] = min(stats['min_time'], execution_time)
-        stats['max_time'] = max(stats['max_time'], execution_time)
-        stats['normalized_query'] = normalized_query
-        
-        # Store recent queries for analysis
-        stats['queries'].append({
-            'query': query,
-            'execution_time': execution_time,
-            'timestamp': datetime.now(timezone.utc)
-        })
-        
-        # Keep only recent queries
-        if len(stats['queries']) > 100:
-            stats['queries'] = stats['queries'][-100:]
-        
-        # Extract table and column information
-        tables, columns = self._extract_query_metadata(query)
-        stats['tables'].update(tables)
-        stats['columns'].update(columns)
-        
-        return query_hash
+        weight = 1.0 / self.sample_rate
+        stats = self.query_stats[fingerprint.query_hash]
+        stats['count'] += weight
+        stats['sampled_count'] += 1
+        stats['total_time'] += execution_time * weight
+        if execution_time < stats['min_time']:
+            stats['min_time'] = execution_time
+        if execution_time > stats['max_time']:
+            stats['max_time'] = execution_time
+        stats['histogram'].record(execution_time)
+        
+        if stats['sample_query'] is None:
+            stats['sample_query'] = query
+            stats['normalized_query'] = fingerprint.normalized_query
+            stats['tables'].update(fingerprint.tables)
+            stats['columns'].update(fingerprint.columns)
+        
+        return fingerprint.query_hash
     
     def _normalize_query(self, query: str) -> str:
         """Normalize query for analysis by removing parameters and formatting."""
-        # Remove comments
-        query = re.sub(r'--.*$', '', query, flags=re.MULTILINE)
-        query = re.sub(r'/\*.*?\*/', '', query, flags=re.DOTALL)
-        
-        # Normalize whitespace
-        query = re.sub(r'\s+', ' ', query.strip())
-        
-        # Replace parameter placeholders
-        query = re.sub(r'\?', '?', query)
-        query = re.sub(r':\w+', ':param', query)
-        query = re.sub(r'\$\d+', '$param', query)
-        
-        # Replace string literals
-        query = re.sub(r"'[^']*'", "'string'", query)
-        query = re.sub(r'"[^"]*"', '"string"', query)
-        
-        # Replace numeric literals
-        query = re.sub(r'\b\d+\b', 'N', query)
-        
-        return query.upper()
+        return self.fingerprints.get(query).normalized_query
     
     def _extract_query_metadata(self, query: str) -> Tuple[Set[str], Set[str]]:
         """Extract table and column names from query."""
-        tables = set()
-        columns = set()
-        
-        # Simple regex-based extraction (could be improved with SQL parser)
-        # Extract table names from FROM and JOIN clauses
-        from_matches = re.findall(r'FROM\s+(\w+)', query, re.IGNORECASE)
-        join_matches = re.findall(r'JOIN\s+(\w+)', query, re.IGNORECASE)
-        tables.update(from_matches + join_matches)
-        
-        # Extract column names from SELECT and WHERE clauses
-        select_matches = re.findall(r'SELECT\s+(.+?)\s+FROM', query, re.IGNORECASE | re.DOTALL)
-        if select_matches:
-            select_clause = select_matches[0]
-            if '*' not in select_clause:
-                # Extract individual columns
-                column_matches = re.findall(r'(\w+)(?:\s+AS\s+\w+)?(?:\s*,|$)', select_clause, re.IGNORECASE)
-                columns.update(column_matches)
-        
-        where_matches = re.findall(r'WHERE\s+(.+?)(?:\s+GROUP\s+BY|\s+ORDER\s+BY|\s+LIMIT|$)', query, re.IGNORECASE | re.DOTALL)
-        if where_matches:
-            where_clause = where_matches[0]
-            column_matches = re.findall(r'(\w+)\s*[=<>!]', where_clause, re.IGNORECASE)
-            columns.update(column_matches)
-        
-        return tables, columns
+        fingerprint = self.fingerprints.get(query)
+        return set(fingerprint.tables), set(fingerprint.columns)
     
     def get_query_analysis(self, query_hash: str) -> Optional[QueryAnalysis]:
         """Get analysis for a specific query."""
@@ -250,7 +397,7 @@ class QueryOptimizer:
         return QueryAnalysis(
             query_hash=query_hash,
             normalized_query=normalized_query,
-            execution_count=stats['count'],
+            execution_count=round(stats['count']),
             total_time=stats['total_time'],
             avg_time=stats['total_time'] / stats['count'],
             min_time=stats['min_time'],
@@ -259,7 +406,8 @@ class QueryOptimizer:
             columns_accessed=list(stats['columns']),
             query_type=query_type,
             complexity_score=complexity_score,
-            optimization_suggestions=suggestions
+            optimization_suggestions=suggestions,
+            sampled_count=stats['sampled_count']
         )
     
     def _calculate_complexity_score(self, query: str) -> int:
@@ -430,13 +578,13 @@ class QueryOptimizer:
                 query = stats['normalized_query']
                 
                 if query.startswith('SELECT'):
-                    patterns['select'] += stats['count']
+                    patterns['select'] += round(stats['count'])
                 elif query.startswith('INSERT'):
-                    patterns['insert'] += stats['count']
+                    patterns['insert'] += round(stats['count'])
                 elif query.startswith('UPDATE'):
-                    patterns['update'] += stats['count']
+                    patterns['update'] += round(stats['count'])
                 elif query.startswith('DELETE'):
-                    patterns['delete'] += stats['count']
+                    patterns['delete'] += round(stats['count'])
         
         return dict(patterns)
     
@@ -455,19 +603,22 @@ class QueryOptimizer:
             
             for stats in self.query_stats.values():
                 if table_name in stats['tables']:
+                    # Every execution of a fingerprint shares the same
+                    # structure, so analyze one statement and weight by count
+                    query = stats['sample_query']
+                    executions = round(stats['count'])
+                    
                     # Analyze WHERE clauses
-                    for query_info in stats['queries']:
-                        query = query_info['query']
-                        where_columns = self._extract_where_columns(query, table_name)
-                        for col in where_columns:
-                            where_conditions[col] += 1
-                            column_usage[col] += 1
-                        
-                        # Analyze JOIN conditions
-                        join_columns = self._extract_join_columns(query, table_name)
-                        for col in join_columns:
-                            join_conditions[col] += 1
-                            column_usage[col] += 1
+                    where_columns = self._extract_where_columns(query, table_name)
+                    for col in where_columns:
+                        where_conditions[col] += executions
+                        column_usage[col] += executions
+                    
+                    # Analyze JOIN conditions
+                    join_columns = self._extract_join_columns(query, table_name)
+                    for col in join_columns:
+                        join_conditions[col] += executions
+                        column_usage[col] += executions
             
             # Generate recommendations based on usage patterns
             
@@ -516,12 +667,12 @@ class QueryOptimizer:
         columns = []
         
         # Simple regex-based extraction
-        where_match = re.search(r'WHERE\s+(.+?)(?:\s+GROUP\s+BY|\s+ORDER\s+BY|\s+LIMIT|$)', query, re.IGNORECASE | re.DOTALL)
+        where_match = _WHERE_CLAUSE.search(query)
         if where_match:
             where_clause = where_match.group(1)
             
             # Look for column conditions
-            column_matches = re.findall(r'(\w+)\s*[=<>!]', where_clause, re.IGNORECASE)
+            column_matches = _CONDITION_COLUMN.findall(where_clause)
             columns.extend(column_matches)
         
         return columns
@@ -552,15 +703,13 @@ class QueryOptimizer:
         
         for stats in self.query_stats.values():
             if table_name in stats['tables']:
-                for query_info in stats['queries']:
-                    query = query_info['query']
-                    columns = self._extract_where_columns(query, table_name)
-                    
-                    # Find all pairs of columns used together
-                    for i, col1 in enumerate(columns):
-                        for col2 in columns[i+1:]:
-                            pair = tuple(sorted([col1, col2]))
-                            pairs[pair] += 1
+                columns = self._extract_where_columns(stats['sample_query'], table_name)
+                
+                # Find all pairs of columns used together
+                for i, col1 in enumerate(columns):
+                    for col2 in columns[i+1:]:
+                        pair = tuple(sorted([col1, col2]))
+                        pairs[pair] += round(stats['count'])
         
         return pairs
     
@@ -571,7 +720,9 @@ class QueryOptimizer:
             'query_analysis': {},
             'slow_queries': [],
             'frequent_queries': [],
-            'optimization_opportunities': []
+            'optimization_opportunities': [],
+            'sample_rate': self.sample_rate,
+            'fingerprint_cache': self.fingerprints.get_stats()
         }
         
         # Analyze all tracked queries
@@ -585,6 +736,7 @@ class QueryOptimizer:
                     report['slow_queries'].append({
                         'query_hash': query_hash,
                         'avg_time': analysis.avg_time,
+                        'p95_time': stats['histogram'].percentile(95),
                         'execution_count': analysis.execution_count,
                         'suggestions': analysis.optimization_suggestions
                     })
@@ -607,6 +759,7 @@ class QueryOptimizer:
     def reset_statistics(self):
         """Reset all query statistics."""
         self.query_stats.clear()
+        self.fingerprints.clear()
         self.logger.info("Query optimizer statistics reset")
     
     def export_statistics(self, filepath: str):
@@ -624,10 +777,7 @@ class QueryOptimizer:
                 export_stats = dict(stats)
                 export_stats['tables'] = list(export_stats['tables'])
                 export_stats['columns'] = list(export_stats['columns'])
-                
-                # Convert datetime objects
-                for query_info in export_stats['queries']:
-                    query_info['timestamp'] = query_info['timestamp'].isoformat()
+                export_stats['histogram'] = export_stats['histogram'].to_dict()
                 
                 export_data['query_stats'][query_hash] = export_stats
             
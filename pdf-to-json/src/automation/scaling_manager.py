@@ -18,7 +18,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 import json
 import hashlib
-import random
+from bisect import bisect_right, insort
 
 from .exceptions import ScalingManagerError
 from .models import JobStatus
@@ -93,6 +93,7 @@ class ScalingConfig:
     
     # Load balancing
     load_balancing_strategy: LoadBalancingStrategy = LoadBalancingStrategy.LEAST_CONNECTIONS
+    virtual_nodes_per_worker: int = 128  # Ring points per worker for consistent hashing
     health_check_interval: int = 30
     heartbeat_timeout: int = 60
     
@@ -122,6 +123,98 @@ class ScalingMetrics:
     scale_actions_count: int
 
 
+def _ring_hash(value: str) -> int:
+    """Map a string to a 64-bit position on the hash ring."""
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], 'big')
+
+
+def job_affinity_key(job_requirements: Dict[str, Any]) -> Optional[str]:
+    """
+    Derive the consistent-hash affinity key for a job.
+    
+    An explicit ``affinity_key`` wins, then the PDF ``content_hash``, then a
+    league/date bucket, so repeat and related jobs map to the same worker.
+    """
+    if job_requirements.get('affinity_key'):
+        return str(job_requirements['affinity_key'])
+    if job_requirements.get('content_hash'):
+        return f"content:{job_requirements['content_hash']}"
+    league, date = job_requirements.get('league'), job_requirements.get('date')
+    if league or date:
+        return f"bucket:{league or ''}:{date or ''}"
+    return None
+
+
+class ConsistentHashRing:
+    """
+    Consistent-hash ring with virtual nodes.
+    
+    Each worker owns ``virtual_nodes`` points on a 64-bit ring, and a key
+    belongs to the first point clockwise from its hash. Adding or removing
+    a worker only inserts or deletes that worker's points, so roughly 1/N of
+    the keys change owner.
+    """
+    
+    def __init__(self, virtual_nodes: int = 128):
+        if virtual_nodes <= 0:
+            raise ScalingManagerError("virtual_nodes must be positive")
+        self.virtual_nodes = virtual_nodes
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self._nodes: Dict[str, List[int]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+    
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+    
+    def add_node(self, node: str) -> None:
+        """Insert a node's virtual points into the ring."""
+        if node in self._nodes:
+            return
+        points = []
+        for replica in range(self.virtual_nodes):
+            point = _ring_hash(f"{node}#{replica}")
+            # Skip the rare collision rather than stealing another node's point
+            if point in self._owners:
+                continue
+            self._owners[point] = node
+            insort(self._points, point)
+            points.append(point)
+        self._nodes[node] = points
+    
+    def remove_node(self, node: str) -> None:
+        """Delete a node's virtual points from the ring."""
+        points = self._nodes.pop(node, None)
+        if not points:
+            return
+        removed = set(points)
+        for point in points:
+            del self._owners[point]
+        self._points = [point for point in self._points if point not in removed]
+    
+    def get_node(self, key: str) -> Optional[str]:
+        """Return the node owning ``key``."""
+        return next(self.iter_nodes(key), None)
+    
+    def iter_nodes(self, key: str):
+        """Yield distinct nodes clockwise from ``key``, owner first."""
+        points = self._points
+        if not points:
+            return
+        start = bisect_right(points, _ring_hash(key))
+        seen: Set[str] = set()
+        count = len(points)
+        for offset in range(count):
+            node = self._owners[points[(start + offset) % count]]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == len(self._nodes):
+                    return
+
+
 class ScalingManager:
     """
     Manages horizontal scaling and load balancing for worker instances.
@@ -147,6 +240,7 @@ class ScalingManager:
         # Worker registry
         self.workers: Dict[str, WorkerInstance] = {}
         self.worker_round_robin_index = 0
+        self.hash_ring = ConsistentHashRing(config.virtual_nodes_per_worker)
         
         # Scaling state
         self.is_running = False
@@ -256,6 +350,7 @@ class ScalingManager:
         )
         
         self.workers[worker_id] = worker
+        self.hash_ring.add_node(worker_id)
         self.logger.info(f"Registered worker: {worker_id} at {host}:{port}")
         
         # Perform initial health check
@@ -272,6 +367,9 @@ class ScalingManager:
             worker = self.workers[worker_id]
             worker.status = WorkerStatus.STOPPING
             
+            # Hand the worker's keys to its ring successors straight away
+            self.hash_ring.remove_node(worker_id)
+            
             # Wait for active jobs to complete or timeout
             timeout = self.config.worker_shutdown_timeout
             start_time = time.time()
@@ -338,7 +436,8 @@ class ScalingManager:
             return None
         
         # Select worker based on load balancing strategy
-        selected_worker = self._select_worker(eligible_workers)
+        affinity_key = job_affinity_key(job_requirements)
+        selected_worker = self._select_worker(eligible_workers, affinity_key)
         
         if not selected_worker:
             self.logger.warning(f"No worker selected for job {job_id}")
@@ -364,7 +463,7 @@ class ScalingManager:
                 # Try next best worker
                 eligible_workers.remove(selected_worker)
                 if eligible_workers:
-                    selected_worker = self._select_worker(eligible_workers)
+                    selected_worker = self._select_worker(eligible_workers, affinity_key)
                 else:
                     break
         
@@ -412,7 +511,8 @@ class ScalingManager:
         
         return eligible
     
-    def _select_worker(self, eligible_workers: List[WorkerInstance]) -> Optional[WorkerInstance]:
+    def _select_worker(self, eligible_workers: List[WorkerInstance],
+                       affinity_key: Optional[str] = None) -> Optional[WorkerInstance]:
         """Select the best worker based on load balancing strategy."""
         if not eligible_workers:
             return None
@@ -426,7 +526,7 @@ class ScalingManager:
         elif strategy == LoadBalancingStrategy.WEIGHTED_ROUND_ROBIN:
             return self._select_weighted_round_robin(eligible_workers)
         elif strategy == LoadBalancingStrategy.CONSISTENT_HASH:
-            return self._select_consistent_hash(eligible_workers)
+            return self._select_consistent_hash(eligible_workers, affinity_key)
         elif strategy == LoadBalancingStrategy.RESOURCE_BASED:
             return self._select_resource_based(eligible_workers)
         else:
@@ -457,12 +557,25 @@ class ScalingManager:
         
         return workers[0]
     
-    def _select_consistent_hash(self, workers: List[WorkerInstance]) -> WorkerInstance:
-        """Select worker using consistent hashing."""
-        # Simple hash-based selection
-        hash_input = f"{time.time()}{random.random()}"
-        hash_value = int(hashlib.md5(hash_input.encode()).hexdigest(), 16)
-        return workers[hash_value % len(workers)]
+    def _select_consistent_hash(self, workers: List[WorkerInstance],
+                                affinity_key: Optional[str] = None) -> WorkerInstance:
+        """
+        Select worker using consistent hashing on the job affinity key.
+        
+        The key's ring owner is preferred; when it is not eligible (busy,
+        unhealthy or missing a capability) the next distinct worker clockwise
+        is used, so only that worker's keys spill over. Jobs without an
+        affinity key have nothing to keep warm and go to the least loaded worker.
+        """
+        if affinity_key is None:
+            return self._select_least_connections(workers)
+        
+        eligible = {worker.worker_id: worker for worker in workers}
+        for worker_id in self.hash_ring.iter_nodes(affinity_key):
+            worker = eligible.get(worker_id)
+            if worker is not None:
+                return worker
+        return self._select_least_connections(workers)
     
     def _select_resource_based(self, workers: List[WorkerInstance]) -> WorkerInstance:
         """Select worker based on resource availability."""
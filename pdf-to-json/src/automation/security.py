@@ -16,11 +16,12 @@ import mimetypes
 import tempfile
 import subprocess
 import logging
+import time
 from typing import Dict, List, Optional, Set, Any, Union, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import asyncio
 import aiofiles
 import magic
@@ -30,6 +31,8 @@ import ipaddress
 import jwt
 from passlib.context import CryptContext
 
+from .cache_manager import CacheManager, CacheStrategy
+
 logger = logging.getLogger(__name__)
 
 # Security constants
@@ -56,6 +59,10 @@ class SecurityConfig:
     allowed_file_types: List[str] = field(default_factory=lambda: ['.pdf', '.json', '.csv', '.txt'])
     rate_limit_requests_per_minute: int = 100
     rate_limit_burst_size: int = 20
+    rate_limit_algorithm: str = "token_bucket"  # token_bucket or sliding_window
+    rate_limit_max_identifiers: int = 100_000
+    rate_limit_idle_timeout_seconds: Optional[float] = None
+    rate_limit_use_redis: bool = False
     allowed_ips: List[str] = field(default_factory=list)
     blocked_ips: List[str] = field(default_factory=list)
     jwt_secret_key: str = "change-this-in-production"
@@ -65,6 +72,38 @@ class SecurityConfig:
     enable_malware_scanning: bool = False
     clamav_socket_path: str = "/var/run/clamav/clamd.ctl"
     upload_quarantine_dir: str = "quarantine"
+    
+    def __post_init__(self):
+        """Validate rate limiting settings after initialization."""
+        if self.rate_limit_requests_per_minute <= 0:
+            raise ValueError("Rate limit requests per minute must be positive")
+        if self.rate_limit_burst_size <= 0:
+            raise ValueError("Rate limit burst size must be positive")
+        if self.rate_limit_max_identifiers <= 0:
+            raise ValueError("Rate limit max identifiers must be positive")
+        if (self.rate_limit_idle_timeout_seconds is not None
+                and self.rate_limit_idle_timeout_seconds <= 0):
+            raise ValueError("Rate limit idle timeout must be positive")
+        if self.rate_limit_algorithm not in ("token_bucket", "sliding_window"):
+            raise ValueError(f"Unknown rate limit algorithm: {self.rate_limit_algorithm}")
+    
+    @classmethod
+    def from_automation_config(cls, settings: Any) -> "SecurityConfig":
+        """Build security settings from the loaded ``automation.config.SecurityConfig``."""
+        return cls(
+            enable_ip_whitelisting=settings.enable_ip_whitelisting,
+            max_file_size_mb=settings.max_file_size_mb,
+            allowed_file_types=list(settings.allowed_file_types),
+            rate_limit_requests_per_minute=settings.api_rate_limit_per_minute,
+            rate_limit_burst_size=settings.rate_limit_burst_size,
+            rate_limit_algorithm=settings.rate_limit_algorithm,
+            rate_limit_max_identifiers=settings.rate_limit_max_identifiers,
+            rate_limit_idle_timeout_seconds=settings.rate_limit_idle_timeout_seconds,
+            rate_limit_use_redis=settings.rate_limit_use_redis,
+            allowed_ips=list(settings.allowed_ips),
+            jwt_secret_key=settings.jwt_secret_key,
+            jwt_expiration_hours=settings.jwt_expiration_hours
+        )
 
 
 @dataclass
@@ -153,6 +192,145 @@ class RateLimiter:
         }
 
 
+class TokenBucketRateLimiter:
+    """
+    Token bucket rate limiter with O(1) cost per request.
+
+    Each identifier owns a bucket of up to ``burst_size`` tokens that refills at
+    ``requests_per_minute / 60`` tokens per second on the monotonic clock.
+    Buckets are kept in least-recently-used order, so idle identifiers are
+    evicted from the front without scanning and memory stays bounded by
+    ``max_identifiers``. When a ``CacheManager`` is supplied,
+    ``is_allowed_async`` keeps buckets in Redis so limits hold across workers.
+    """
+
+    # Atomic refill-and-take on a Redis hash. Server TIME gives every worker
+    # the same clock; PEXPIRE drops buckets of idle identifiers.
+    REDIS_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local last = tonumber(state[2])
+if tokens == nil or last == nil then
+    tokens = capacity
+    last = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - last) * refill_rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, requests_per_minute: int = 100, burst_size: int = 20,
+                 max_identifiers: int = 100_000,
+                 idle_timeout_seconds: Optional[float] = None,
+                 cache_manager: Optional[CacheManager] = None):
+        self.requests_per_minute = requests_per_minute
+        self.burst_size = burst_size
+        self.capacity = float(max(burst_size, 1))
+        self.refill_rate = requests_per_minute / 60.0
+        self.max_identifiers = max_identifiers
+        # A bucket left alone for capacity / refill_rate seconds is full again,
+        # so evicting it after that long does not change any decision.
+        if idle_timeout_seconds is None:
+            idle_timeout_seconds = self.capacity / self.refill_rate
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.cache_manager = cache_manager
+        self.buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.evicted_identifiers = 0
+    
+    def is_allowed(self, identifier: str) -> Tuple[bool, Dict[str, Any]]:
+        """Check if request is allowed for the given identifier."""
+        now = time.monotonic()
+        buckets = self.buckets
+        bucket = buckets.get(identifier)
+        
+        if bucket is None:
+            bucket = [self.capacity, now]
+            buckets[identifier] = bucket
+        else:
+            buckets.move_to_end(identifier)
+            tokens = bucket[0] + (now - bucket[1]) * self.refill_rate
+            bucket[0] = tokens if tokens < self.capacity else self.capacity
+            bucket[1] = now
+        
+        self._evict_idle(now)
+        
+        allowed = bucket[0] >= 1.0
+        if allowed:
+            bucket[0] -= 1.0
+        return allowed, self._build_info(allowed, bucket[0])
+    
+    async def is_allowed_async(self, identifier: str) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Check if request is allowed, sharing the bucket through Redis.
+        
+        Falls back to the in-process buckets when no cache manager is set or
+        Redis is unavailable.
+        """
+        if self.cache_manager is None:
+            return self.is_allowed(identifier)
+        
+        result = await self.cache_manager.run_script(
+            self.REDIS_SCRIPT,
+            keys=[identifier],
+            args=[
+                self.capacity,
+                self.refill_rate,
+                max(1000, int(self.idle_timeout_seconds * 1000))
+            ],
+            strategy=CacheStrategy.RATE_LIMITING
+        )
+        if result is None:
+            return self.is_allowed(identifier)
+        
+        allowed = int(result[0]) == 1
+        return allowed, self._build_info(allowed, float(result[1]))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        return {
+            "tracked_identifiers": len(self.buckets),
+            "max_identifiers": self.max_identifiers,
+            "evicted_identifiers": self.evicted_identifiers,
+            "idle_timeout_seconds": self.idle_timeout_seconds
+        }
+    
+    def _evict_idle(self, now: float) -> None:
+        """Drop least recently used buckets that are idle or over capacity."""
+        buckets = self.buckets
+        cutoff = now - self.idle_timeout_seconds
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if len(buckets) <= self.max_identifiers and oldest[1] > cutoff:
+                break
+            buckets.popitem(last=False)
+            self.evicted_identifiers += 1
+    
+    def _build_info(self, allowed: bool, tokens: float) -> Dict[str, Any]:
+        """Build the rate limit info dictionary for a decision."""
+        remaining = int(tokens)
+        seconds_to_full = (self.capacity - tokens) / self.refill_rate
+        info = {
+            "allowed": allowed,
+            "remaining": remaining,
+            "burst_tokens_remaining": remaining,
+            "limit": self.requests_per_minute,
+            "reset_time": (datetime.now() + timedelta(seconds=seconds_to_full)).isoformat()
+        }
+        if not allowed:
+            info["retry_after"] = max(1, int((1.0 - tokens) / self.refill_rate + 0.999))
+        return info
+
+
 class InputValidator:
     """Comprehensive input validation and sanitization."""
     
@@ -584,40 +762,81 @@ class IPWhitelist:
 class SecurityManager:
     """Main security manager coordinating all security features."""
     
-    def __init__(self, config: SecurityConfig):
+    def __init__(self, config: SecurityConfig, cache_manager: Optional[CacheManager] = None):
+        self.cache_manager = cache_manager
+        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.configure(config)
+        
+        logger.info("Security manager initialized")
+    
+    def configure(self, config: SecurityConfig) -> None:
+        """
+        Apply new security settings.
+        
+        Middleware keeps a reference to this manager from the moment it is
+        registered, so settings loaded later are applied here instead of by
+        creating a new manager.
+        """
         self.config = config
-        self.rate_limiter = RateLimiter(
-            config.rate_limit_requests_per_minute,
-            config.rate_limit_burst_size
-        )
+        if config.rate_limit_algorithm == "sliding_window":
+            self.rate_limiter = RateLimiter(
+                config.rate_limit_requests_per_minute,
+                config.rate_limit_burst_size
+            )
+        else:
+            self.rate_limiter = TokenBucketRateLimiter(
+                config.rate_limit_requests_per_minute,
+                config.rate_limit_burst_size,
+                max_identifiers=config.rate_limit_max_identifiers,
+                idle_timeout_seconds=config.rate_limit_idle_timeout_seconds,
+                cache_manager=self.cache_manager if config.rate_limit_use_redis else None
+            )
         self.input_validator = InputValidator(config)
         self.file_scanner = FileScanner(config)
         self.ip_whitelist = IPWhitelist(config)
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        
-        logger.info("Security manager initialized")
+    
+    def attach_cache_manager(self, cache_manager: Optional[CacheManager]) -> None:
+        """Share token buckets through the given cache manager when Redis limiting is enabled."""
+        self.cache_manager = cache_manager
+        if isinstance(self.rate_limiter, TokenBucketRateLimiter) and self.config.rate_limit_use_redis:
+            self.rate_limiter.cache_manager = cache_manager
+            logger.info("Rate limiter buckets shared through Redis")
     
     def get_client_ip(self, request: Request) -> str:
         """Extract client IP from request."""
+        return self.resolve_client_ip(
+            request.headers.get("X-Forwarded-For"),
+            request.headers.get("X-Real-IP"),
+            request.client.host if request.client else None
+        )
+    
+    @staticmethod
+    def resolve_client_ip(forwarded_for: Optional[str], real_ip: Optional[str],
+                          client_host: Optional[str]) -> str:
+        """Pick the client IP from proxy headers, falling back to the peer address."""
         # Check for forwarded headers (when behind proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
         if forwarded_for:
             return forwarded_for.split(",")[0].strip()
         
-        real_ip = request.headers.get("X-Real-IP")
         if real_ip:
             return real_ip
         
         # Fallback to direct connection
-        return request.client.host if request.client else "unknown"
+        return client_host or "unknown"
     
     async def check_rate_limit(self, request: Request) -> Dict[str, Any]:
         """Check rate limiting for request."""
+        return await self.check_rate_limit_for(self.get_client_ip(request))
+    
+    async def check_rate_limit_for(self, client_ip: str) -> Dict[str, Any]:
+        """Check rate limiting for a client IP."""
         if not self.config.enable_rate_limiting:
             return {"allowed": True, "reason": "Rate limiting disabled"}
         
-        client_ip = self.get_client_ip(request)
-        allowed, info = self.rate_limiter.is_allowed(client_ip)
+        if isinstance(self.rate_limiter, TokenBucketRateLimiter):
+            allowed, info = await self.rate_limiter.is_allowed_async(client_ip)
+        else:
+            allowed, info = self.rate_limiter.is_allowed(client_ip)
         
         if not allowed:
             logger.warning(f"Rate limit exceeded for IP: {client_ip}")
@@ -626,10 +845,13 @@ class SecurityManager:
     
     def check_ip_whitelist(self, request: Request) -> Tuple[bool, str]:
         """Check IP whitelisting for request."""
+        return self.check_ip_whitelist_for(self.get_client_ip(request))
+    
+    def check_ip_whitelist_for(self, client_ip: str) -> Tuple[bool, str]:
+        """Check IP whitelisting for a client IP."""
         if not self.config.enable_ip_whitelisting:
             return True, "IP whitelisting disabled"
         
-        client_ip = self.get_client_ip(request)
         return self.ip_whitelist.is_allowed(client_ip)
     
     async def validate_file_upload(self, upload_file: UploadFile) -> FileValidationResult:
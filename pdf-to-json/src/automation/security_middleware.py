@@ -7,16 +7,23 @@ This module provides security middleware for the FastAPI application including:
 - Request validation
 - Security headers
 - CORS protection
+
+``SecurityASGIMiddleware`` runs all checks in a single pure-ASGI pass and is
+what ``create_security_middleware_stack`` installs. The older
+``BaseHTTPMiddleware`` classes are kept for callers that compose them directly.
 """
 
 import logging
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl
 from fastapi import Request, Response, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from fastapi.responses import JSONResponse
 import time
 
 from .security import SecurityManager, SecurityConfig
+from .cache_manager import CacheManager
 
 logger = logging.getLogger(__name__)
 
@@ -86,7 +93,13 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             response = self._add_security_headers(response)
             
             # Add rate limit headers to successful responses
-            if rate_limit_info.get("requests_in_window") is not None:
+            if rate_limit_info.get("remaining") is not None:
+                response.headers["X-RateLimit-Limit"] = str(
+                    self.security_manager.config.rate_limit_requests_per_minute
+                )
+                response.headers["X-RateLimit-Remaining"] = str(rate_limit_info["remaining"])
+                response.headers["X-RateLimit-Reset"] = rate_limit_info.get("reset_time", "")
+            elif rate_limit_info.get("requests_in_window") is not None:
                 response.headers["X-RateLimit-Limit"] = str(
                     self.security_manager.config.rate_limit_requests_per_minute
                 )
@@ -291,13 +304,232 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
             )
 
 
-def create_security_middleware_stack(app, security_config: SecurityConfig):
-    """Create and configure all security middleware."""
-    security_manager = SecurityManager(security_config)
+SECURITY_HEADERS: Tuple[Tuple[bytes, bytes], ...] = (
+    (b"x-frame-options", b"DENY"),
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"content-security-policy", (
+        b"default-src 'self'; "
+        b"script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+        b"style-src 'self' 'unsafe-inline'; "
+        b"img-src 'self' data: https:; "
+        b"font-src 'self' https:; "
+        b"connect-src 'self' ws: wss:; "
+        b"frame-ancestors 'none';"
+    )),
+    (b"server", b"Football-Automation-API"),
+)
+HSTS_HEADER = (b"strict-transport-security", b"max-age=31536000; includeSubDomains")
+DEFAULT_SKIP_PATHS = frozenset({"/health", "/", "/docs", "/redoc", "/openapi.json"})
+DEFAULT_UPLOAD_PATHS = ("/upload", "/api/v1/upload", "/convert")
+
+
+class SecurityASGIMiddleware:
+    """
+    IP allowlisting, rate limiting, request validation and security headers in one ASGI pass.
+    
+    Unlike ``BaseHTTPMiddleware`` this neither spawns a task per request nor
+    buffers the response body: it only inspects the request scope and adds
+    headers to the ``http.response.start`` message, so streaming responses
+    pass through untouched. Header lists are built once; settings are read
+    from the security manager on every request so ``configure()`` applies
+    immediately.
+    """
+    
+    def __init__(self, app: ASGIApp, security_manager: SecurityManager,
+                 skip_paths: Iterable[str] = DEFAULT_SKIP_PATHS,
+                 skip_prefixes: Iterable[str] = (),
+                 upload_paths: Iterable[str] = DEFAULT_UPLOAD_PATHS):
+        """
+        Args:
+            app: Wrapped ASGI application
+            security_manager: Shared security manager
+            skip_paths: Exact paths that only receive security headers
+            skip_prefixes: Path prefixes that only receive security headers
+            upload_paths: Path fragments of file upload endpoints
+        """
+        self.app = app
+        self.security_manager = security_manager
+        self.skip_paths = frozenset(skip_paths)
+        self.skip_prefixes = tuple(skip_prefixes)
+        self.upload_paths = tuple(upload_paths)
+        self._header_names = frozenset(name for name, _ in SECURITY_HEADERS + (HSTS_HEADER,))
+        self._headers = list(SECURITY_HEADERS)
+        self._https_headers = self._headers + [HSTS_HEADER]
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        path = scope["path"]
+        headers = dict(scope["headers"])
+        https = scope.get("scheme") == "https" or headers.get(b"x-forwarded-proto") == b"https"
+        extra_headers = self._https_headers if https else self._headers
+        
+        if path in self.skip_paths or (self.skip_prefixes and path.startswith(self.skip_prefixes)):
+            await self.app(scope, receive, self._wrap_send(send, extra_headers))
+            return
+        
+        response_started = False
+        
+        async def send_with_headers(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                message["headers"] = self._merge_headers(message.get("headers", ()), response_headers)
+            await send(message)
+        
+        try:
+            rejection, response_headers = await self._check_request(scope, headers)
+            response_headers = extra_headers + response_headers
+            if rejection is not None:
+                await rejection(scope, receive, send_with_headers)
+                return
+            
+            await self.app(scope, receive, send_with_headers)
+            
+            processing_time = time.perf_counter() - start_time
+            if processing_time > 1.0:  # Log slow requests
+                logger.info(f"Slow request: {scope['method']} {path} took {processing_time:.2f}s")
+        
+        except Exception as e:
+            await self.security_manager.log_security_event(
+                "middleware_error",
+                {"error": str(e)},
+                Request(scope)
+            )
+            logger.error(f"Security middleware error: {e}")
+            if response_started:
+                raise
+            
+            # Return generic error to avoid information disclosure
+            response = JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"error": "Internal server error"}
+            )
+            await response(scope, receive, self._wrap_send(send, extra_headers))
     
-    # Add middleware in reverse order (last added is executed first)
-    app.add_middleware(RequestValidationMiddleware, security_manager=security_manager)
-    app.add_middleware(FileUploadSecurityMiddleware, security_manager=security_manager)
-    app.add_middleware(SecurityMiddleware, security_manager=security_manager)
+    async def _check_request(self, scope: Scope,
+                             headers: Dict[bytes, bytes]) -> Tuple[Optional[Response], List[Tuple[bytes, bytes]]]:
+        """
+        Run the request checks in order.
+        
+        Returns:
+            The rejection response (or None) and rate limit headers for the response
+        """
+        manager = self.security_manager
+        config = manager.config
+        client = scope.get("client")
+        forwarded_for = headers.get(b"x-forwarded-for")
+        real_ip = headers.get(b"x-real-ip")
+        client_ip = manager.resolve_client_ip(
+            forwarded_for.decode("latin-1") if forwarded_for else None,
+            real_ip.decode("latin-1") if real_ip else None,
+            client[0] if client else None
+        )
+        
+        # IP whitelisting check
+        ip_allowed, ip_reason = manager.check_ip_whitelist_for(client_ip)
+        if not ip_allowed:
+            await manager.log_security_event("ip_blocked", {"reason": ip_reason}, Request(scope))
+            return JSONResponse(
+                status_code=status.HTTP_403_FORBIDDEN,
+                content={"error": "Access denied", "reason": ip_reason}
+            ), []
+        
+        # Rate limiting check
+        rate_limit_info = await manager.check_rate_limit_for(client_ip)
+        limit = str(config.rate_limit_requests_per_minute).encode()
+        reset = str(rate_limit_info.get("reset_time", "")).encode()
+        if not rate_limit_info.get("allowed", True):
+            await manager.log_security_event("rate_limit_exceeded", rate_limit_info, Request(scope))
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"error": "Rate limit exceeded", "details": rate_limit_info}
+            ), [
+                (b"x-ratelimit-limit", limit),
+                (b"x-ratelimit-remaining", b"0"),
+                (b"x-ratelimit-reset", reset),
+                (b"retry-after", str(rate_limit_info.get("retry_after", 60)).encode()),
+            ]
+        
+        if rate_limit_info.get("remaining") is not None:
+            remaining = rate_limit_info["remaining"]
+        elif rate_limit_info.get("requests_in_window") is not None:
+            remaining = max(0, config.rate_limit_requests_per_minute - rate_limit_info["requests_in_window"])
+        else:
+            remaining = None
+        rate_limit_headers = [] if remaining is None else [
+            (b"x-ratelimit-limit", limit),
+            (b"x-ratelimit-remaining", str(remaining).encode()),
+            (b"x-ratelimit-reset", reset),
+        ]
+        
+        # File upload checks
+        path = scope["path"]
+        if scope["method"] == "POST" and any(fragment in path for fragment in self.upload_paths):
+            content_type = headers.get(b"content-type", b"")
+            if not content_type.startswith(b"multipart/form-data"):
+                return JSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={"error": "Invalid content type for file upload"}
+                ), rate_limit_headers
+            
+            content_length = headers.get(b"content-length")
+            max_size = config.max_file_size_mb * 1024 * 1024
+            if content_length and int(content_length) > max_size:
+                await manager.log_security_event(
+                    "file_too_large",
+                    {"content_length": content_length.decode(), "max_size": max_size},
+                    Request(scope)
+                )
+                return JSONResponse(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    content={"error": f"File too large (max {config.max_file_size_mb}MB)"}
+                ), rate_limit_headers
+        
+        # Query parameter validation
+        if config.enable_input_validation and scope.get("query_string"):
+            query = scope["query_string"].decode("latin-1")
+            for key, value in parse_qsl(query, keep_blank_values=True):
+                validation_result = manager.input_validator.validate_string(value, max_length=1000)
+                if not validation_result.is_valid:
+                    await manager.log_security_event(
+                        "invalid_query_param",
+                        {"param": key, "errors": validation_result.errors},
+                        Request(scope)
+                    )
+                    return JSONResponse(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        content={
+                            "error": "Invalid query parameter",
+                            "param": key,
+                            "details": validation_result.errors
+                        }
+                    ), rate_limit_headers
+        
+        return None, rate_limit_headers
     
+    def _merge_headers(self, headers: Iterable[Tuple[bytes, bytes]],
+                       extra_headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+        """Replace any security headers set by the application with ours."""
+        return [header for header in headers if header[0].lower() not in self._header_names] + extra_headers
+    
+    def _wrap_send(self, send: Send, extra_headers: List[Tuple[bytes, bytes]]) -> Send:
+        """Send wrapper that only adds the given headers."""
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = self._merge_headers(message.get("headers", ()), extra_headers)
+            await send(message)
+        return send_with_headers
+
+
+def create_security_middleware_stack(app, security_config: SecurityConfig,
+                                     cache_manager: Optional[CacheManager] = None):
+    """Create the security manager and install the security middleware."""
+    security_manager = SecurityManager(security_config, cache_manager=cache_manager)
+    app.add_middleware(SecurityASGIMiddleware, security_manager=security_manager)
     return security_manager
\ No newline at end of file
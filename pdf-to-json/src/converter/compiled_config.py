@@ -0,0 +1,310 @@
+"""
+Compiled configuration artifact for the football pipeline.
+
+The extractor, team normalizer, market processor and data processor are
+driven by four files in the config directory. ``compile_config`` turns them
+into one immutable, versioned CompiledConfig holding the compiled regexes,
+the team alias index, the special bet keyword matcher and the validated
+market priorities, so FootballConverter instances share one parse and
+compile instead of repeating it per instance.
+
+The version is a hash of the source files. Artifacts are kept in memory per
+config directory and pickled to ``<config_dir>/.compiled/<version>.pickle``
+so other processes skip parsing and validation; compiled regexes are rebuilt
+from their pattern strings on unpickling. The cache is only read from the
+config directory, which is trusted like the configuration itself.
+
+``reload_compiled_config`` compiles strictly and replaces the in-memory
+artifact with a single assignment: a failed reload leaves the previous
+artifact in place, and running converters switch over at their next
+conversion.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config_loader import ConfigLoader
+from .data_processor import validate_market_priorities_config
+from .exceptions import ConfigurationError
+from .football_extractor import ExtractorPatterns, compile_extractor_patterns
+from .market_processor import MarketRules, compile_market_classifiers, compile_market_rules, default_market_rules
+from .team_normalizer import TeamAliasIndex, compile_team_aliases
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout changes so stale pickles are ignored
+COMPILED_CONFIG_FORMAT = 1
+
+CONFIG_SOURCES: Tuple[str, ...] = (
+    'extractor_patterns.json',
+    'market_keywords.json',
+    'team_aliases.json',
+    'market_priorities.json',
+)
+
+CACHE_DIRNAME = '.compiled'
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """
+    Precompiled converter configuration.
+
+    Sections whose source file is missing or invalid are None (the market
+    rules fall back to the built-in patterns); components then load their
+    file themselves and report the problem as they always did. ``sources``
+    lists the files compiled into the artifact.
+    """
+    version: str
+    config_dir: str
+    compiled_at: str
+    extractor: Optional[ExtractorPatterns]
+    market_rules: MarketRules
+    team_aliases: Optional[TeamAliasIndex]
+    market_priorities: Optional[Dict[str, Any]]
+    sources: Tuple[str, ...] = field(default=())
+    errors: Tuple[str, ...] = field(default=())
+
+    def summary(self) -> Dict[str, Any]:
+        """Version and section status, for logs and API responses."""
+        return {
+            'version': self.version,
+            'compiled_at': self.compiled_at,
+            'sources': list(self.sources),
+            'errors': list(self.errors),
+        }
+
+
+# Validated artifacts by resolved config directory
+_artifacts: Dict[str, CompiledConfig] = {}
+_artifacts_lock = threading.Lock()
+
+
+def _config_key(config_dir: str) -> str:
+    return str(Path(config_dir).resolve())
+
+
+def read_sources(config_dir: str) -> Dict[str, Optional[bytes]]:
+    """Raw bytes of each source file, None for missing ones."""
+    sources: Dict[str, Optional[bytes]] = {}
+    for name in CONFIG_SOURCES:
+        try:
+            sources[name] = (Path(config_dir) / name).read_bytes()
+        except FileNotFoundError:
+            sources[name] = None
+    return sources
+
+
+def source_version(sources: Dict[str, Optional[bytes]]) -> str:
+    """Content hash identifying the artifact compiled from ``sources``."""
+    digest = hashlib.sha256(f"format:{COMPILED_CONFIG_FORMAT}".encode())
+    for name in CONFIG_SOURCES:
+        raw = sources.get(name)
+        digest.update(f"\0{name}\0{-1 if raw is None else len(raw)}\0".encode())
+        if raw is not None:
+            digest.update(raw)
+    return digest.hexdigest()[:16]
+
+
+def _parse_market_keywords(config: Any) -> Dict[str, List[str]]:
+    if not isinstance(config, dict) or not all(
+        isinstance(patterns, list) and all(isinstance(pattern, str) for pattern in patterns)
+        for patterns in config.values()
+    ):
+        raise ConfigurationError("market keywords must map market types to lists of patterns")
+    return config
+
+
+def compile_config(config_dir: str = 'config', strict: bool = True,
+                   sources: Optional[Dict[str, Optional[bytes]]] = None) -> CompiledConfig:
+    """
+    Compile the converter configuration files into one artifact.
+
+    Args:
+        config_dir: Directory containing the configuration files
+        strict: Raise on an invalid file instead of recording the error and
+            leaving its section empty
+        sources: Already read source files (read from config_dir if None)
+
+    Returns:
+        CompiledConfig: The compiled artifact
+
+    Raises:
+        ConfigurationError: If ``strict`` and a file is invalid
+    """
+    if sources is None:
+        sources = read_sources(config_dir)
+    loader = ConfigLoader(config_dir)
+    compiled: List[str] = []
+    errors: List[str] = []
+
+    def section(name: str, build: Callable[[Any], Any]) -> Any:
+        raw = sources.get(name)
+        if raw is None:
+            return None
+        try:
+            result = build(json.loads(raw.decode('utf-8')))
+        except Exception as e:
+            if strict:
+                raise ConfigurationError(
+                    f"Invalid configuration file '{Path(config_dir) / name}': {e}",
+                    config_file=str(Path(config_dir) / name), original_exception=e
+                )
+            logger.warning(f"Skipping invalid configuration file {name}: {e}")
+            errors.append(f"{name}: {e}")
+            return None
+        compiled.append(name)
+        return result
+
+    market_type_patterns = section('market_keywords.json', _parse_market_keywords)
+    if market_type_patterns is None:
+        market_rules = default_market_rules()
+        classifiers = None
+    else:
+        classifiers = compile_market_classifiers(market_type_patterns)
+        market_rules = compile_market_rules(market_type_patterns, classifiers)
+
+    extractor = None
+    if market_type_patterns is not None:
+        extractor = section('extractor_patterns.json', lambda config: compile_extractor_patterns(
+            config, market_type_patterns, classifiers
+        ))
+
+    def build_team_aliases(config: Any) -> TeamAliasIndex:
+        loader.validate_team_aliases_config(config)
+        return compile_team_aliases(config)
+
+    def build_market_priorities(config: Any) -> Dict[str, Any]:
+        validate_market_priorities_config(config, Path(config_dir) / 'market_priorities.json')
+        return config
+
+    return CompiledConfig(
+        version=source_version(sources),
+        config_dir=str(config_dir),
+        compiled_at=datetime.now(timezone.utc).isoformat(),
+        extractor=extractor,
+        market_rules=market_rules,
+        team_aliases=section('team_aliases.json', build_team_aliases),
+        market_priorities=section('market_priorities.json', build_market_priorities),
+        sources=tuple(name for name in CONFIG_SOURCES if name in compiled),
+        errors=tuple(errors),
+    )
+
+
+def _cache_path(config_dir: str, version: str) -> Path:
+    return Path(config_dir) / CACHE_DIRNAME / f"{version}.pickle"
+
+
+def _read_cached(config_dir: str, version: str) -> Optional[CompiledConfig]:
+    try:
+        with open(_cache_path(config_dir, version), 'rb') as f:
+            artifact = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable compiled config cache for {version}: {e}")
+        return None
+    if not isinstance(artifact, CompiledConfig) or artifact.version != version:
+        return None
+    return artifact
+
+
+def _write_cached(artifact: CompiledConfig) -> None:
+    """Write the artifact atomically and remove older versions."""
+    path = _cache_path(artifact.config_dir, artifact.version)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        for stale in path.parent.glob('*.pickle'):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except Exception as e:
+        # The cache is an optimisation: an unwritable directory or an
+        # unpicklable import path must not fail the load
+        logger.warning(f"Could not cache compiled config in {path.parent}: {e}")
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def load_compiled_config(config_dir: str = 'config', strict: bool = False,
+                         use_cache: bool = True) -> CompiledConfig:
+    """
+    Compiled config for the current files, from the disk cache when possible.
+
+    Only artifacts compiled without errors are written to the cache.
+    """
+    sources = read_sources(config_dir)
+    version = source_version(sources)
+    if use_cache:
+        cached = _read_cached(config_dir, version)
+        if cached is not None:
+            return cached
+
+    artifact = compile_config(config_dir, strict=strict, sources=sources)
+    if use_cache and not artifact.errors:
+        _write_cached(artifact)
+    return artifact
+
+
+def get_compiled_config(config_dir: str = 'config') -> CompiledConfig:
+    """
+    Compiled config matching the files currently in ``config_dir``.
+
+    Hashes the source files and returns the in-memory artifact when it is
+    current, otherwise loads and caches a new one. Artifacts with invalid
+    sections are returned but not cached, so components report the errors.
+    """
+    key = _config_key(config_dir)
+    version = source_version(read_sources(config_dir))
+    current = _artifacts.get(key)
+    if current is not None and current.version == version:
+        return current
+
+    with _artifacts_lock:
+        current = _artifacts.get(key)
+        if current is not None and current.version == version:
+            return current
+        artifact = load_compiled_config(config_dir)
+        if not artifact.errors:
+            _artifacts[key] = artifact
+        return artifact
+
+
+def current_compiled_config(config_dir: str = 'config') -> Optional[CompiledConfig]:
+    """The in-memory artifact for ``config_dir`` without touching the files."""
+    return _artifacts.get(_config_key(config_dir))
+
+
+def reload_compiled_config(config_dir: str = 'config') -> CompiledConfig:
+    """
+    Recompile ``config_dir`` strictly and swap in the new artifact.
+
+    Returns:
+        CompiledConfig: The artifact now in use
+
+    Raises:
+        ConfigurationError: If a file is invalid; the previous artifact stays in use
+    """
+    key = _config_key(config_dir)
+    with _artifacts_lock:
+        previous = _artifacts.get(key)
+        artifact = load_compiled_config(config_dir, strict=True)
+        _artifacts[key] = artifact
+
+    if previous is None or previous.version != artifact.version:
+        logger.info(f"Compiled config for {config_dir} is now version {artifact.version}"
+                    f" (was {previous.version if previous else 'none'})")
+    return artifact
@@ -63,6 +63,22 @@ class ConfigLoader:
         
         return config
     
+    def validate_team_aliases_config(self, config: Dict[str, Any],
+                                     filename: str = "team_aliases.json") -> None:
+        """
+        Validate an already parsed team aliases configuration.
+        
+        Args:
+            config: Configuration dictionary to validate
+            filename: Name of the file it was read from (for error messages)
+            
+        Raises:
+            ConfigurationError: If configuration is invalid
+        """
+        if not isinstance(config, dict):
+            raise ConfigurationError(f"Configuration file '{self.config_dir / filename}' must contain an object")
+        self._validate_team_aliases_config(config, self.config_dir / filename)
+    
     def _validate_team_aliases_config(self, config: Dict[str, Any], config_path: Path) -> None:
         """
         Validate the structure and content of team aliases configuration.
@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
+from .compiled_config import CompiledConfig, get_compiled_config, reload_compiled_config
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,7 +58,7 @@ class ConfigManager:
             return {}
 
     def _load_all_configs(self):
-        """Load all configuration files."""
+        """Load all configuration files, replacing the loaded set in one step."""
         config_files = [
             "app.json",
             "logging.json",
@@ -66,9 +68,11 @@ class ConfigManager:
             "team_aliases.json"
         ]
 
+        configs = {}
         for filename in config_files:
             name = filename.replace('.json', '')
-            self._configs[name] = self._load_config_file(filename)
+            configs[name] = self._load_config_file(filename)
+        self._configs = configs
 
         # Create AppConfig from loaded data
         self._create_app_config()
@@ -160,11 +164,25 @@ class ConfigManager:
         """Get the logging configuration file path."""
         return self.config_dir / "logging.json"
 
-    def reload_configs(self):
-        """Reload all configurations from files."""
-        self._configs.clear()
+    def get_compiled_config(self) -> CompiledConfig:
+        """Get the precompiled converter configuration for this directory."""
+        return get_compiled_config(str(self.config_dir))
+
+    def reload_configs(self) -> CompiledConfig:
+        """
+        Reload all configurations from files.
+
+        The converter configuration is recompiled first and swapped in
+        atomically; converters switch to it at their next conversion.
+
+        Raises:
+            ConfigurationError: If a converter configuration file is invalid;
+                nothing is reloaded in that case
+        """
+        compiled = reload_compiled_config(str(self.config_dir))
         self._load_all_configs()
-        logger.info("Reloaded all configurations")
+        logger.info(f"Reloaded all configurations (converter config {compiled.version})")
+        return compiled
 
 
 # Global configuration manager instance
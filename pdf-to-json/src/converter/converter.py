@@ -270,31 +270,48 @@ class PDFToJSONConverter:
                 'preview_pages': 0
             }
     
-    def validate_json_file(self, json_path: str, schema_name: str = 'basic') -> Dict[str, Any]:
+    def validate_json_file(self, json_path: str, schema_name: str = 'basic',
+                           all_errors: bool = False) -> Dict[str, Any]:
         """
         Validate an existing JSON file against a schema.
         
+        Files for schemas with a top-level ``games`` array are validated
+        game by game while streaming, so large football outputs are never
+        loaded whole.
+        
         Args:
             json_path: Path to JSON file
             schema_name: Schema name to validate against
+            all_errors: Report every validation error instead of the first
             
         Returns:
             Validation results
         """
         try:
-            import json
-            with open(json_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
-            
-            is_valid, errors = self.schema_validator.validate_json(json_data, schema_name)
+            if self.schema_validator.supports_streaming(schema_name):
+                is_valid, errors, games_checked = self.schema_validator.validate_games_stream(
+                    json_path, schema_name, all_errors=all_errors
+                )
+            else:
+                import json
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    json_data = json.load(f)
+                
+                is_valid, errors = self.schema_validator.validate_json(
+                    json_data, schema_name, all_errors=all_errors
+                )
+                games_checked = None
             
-            return {
+            result = {
                 'file_path': json_path,
                 'schema_name': schema_name,
                 'is_valid': is_valid,
                 'errors': errors,
                 'file_size': Path(json_path).stat().st_size
             }
+            if games_checked is not None:
+                result['games_checked'] = games_checked
+            return result
             
         except Exception as e:
             return {
@@ -7,11 +7,10 @@ This module provides functionality to:
 - Track processing statistics for deduplication and capping actions
 """
 
+import heapq
 import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from collections import defaultdict
-import hashlib
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from .exceptions import ConfigurationError
@@ -19,12 +18,44 @@ from .exceptions import ConfigurationError
 logger = logging.getLogger(__name__)
 
 
+def validate_market_priorities_config(config: Any, config_path: Path) -> Dict[str, int]:
+    """
+    Validate a parsed market priorities configuration.
+    
+    Args:
+        config: Parsed market_priorities.json
+        config_path: Path to the configuration file (for error messages)
+        
+    Returns:
+        Dictionary mapping market types to priority numbers
+        
+    Raises:
+        ConfigurationError: If the configuration is invalid
+    """
+    # Extract market priorities from config
+    if not isinstance(config, dict) or 'market_priorities' not in config:
+        raise ConfigurationError(f"Missing 'market_priorities' section in '{config_path}'")
+    
+    priorities = config['market_priorities']
+    if not isinstance(priorities, dict):
+        raise ConfigurationError(f"'market_priorities' must be a dictionary in '{config_path}'")
+    
+    # Validate priority values
+    for market_type, priority in priorities.items():
+        if not isinstance(priority, int) or priority < 1:
+            raise ConfigurationError(
+                f"Priority for '{market_type}' must be a positive integer in '{config_path}'"
+            )
+    
+    return priorities
+
+
 class DataProcessor:
     """
     Handles deduplication and market capping with priority-based selection.
     
     This class provides functionality to:
-    - Remove exact duplicate markets from games based on content hashing
+    - Remove exact duplicate markets from games keyed on type, description and odds
     - Cap additional markets to configurable limits using priority-based selection
     - Track comprehensive statistics for deduplication and capping actions
     - Load market priorities from configuration files for flexible prioritization
@@ -37,13 +68,16 @@ class DataProcessor:
     to match business requirements. Lower priority numbers indicate higher importance.
     """
     
-    def __init__(self, max_markets: int = None, config_dir: str = "config"):
+    def __init__(self, max_markets: int = None, config_dir: str = "config",
+                 priorities_config: Optional[Dict[str, Any]] = None):
         """
         Initialize DataProcessor with configurable market limits and priorities.
         
         Args:
             max_markets: Maximum number of additional markets per game (None to use config)
             config_dir: Directory containing configuration files (default: "config")
+            priorities_config: Parsed market_priorities.json, e.g. from the compiled
+                converter config (read from config_dir if None)
         """
         self.config_dir = Path(config_dir)
         
@@ -59,7 +93,7 @@ class DataProcessor:
         }
         
         # Load market priorities from configuration (this will set max_markets if not provided)
-        self.market_priorities = self._load_market_priorities()
+        self.market_priorities = self._load_market_priorities(priorities_config)
         
         # Override max_markets if explicitly provided
         if max_markets is not None:
@@ -73,41 +107,16 @@ class DataProcessor:
         """
         Remove exact duplicate markets from games.
         
+        Games are copied only when their markets change; the others are
+        returned as they are.
+        
         Args:
             games: List of game dictionaries with additional_markets
             
         Returns:
             List of games with duplicates removed
         """
-        processed_games = []
-        
-        for game in games:
-            original_market_count = len(game.get('additional_markets', []))
-            
-            # Deduplicate additional markets
-            deduplicated_markets = self._remove_duplicate_markets(game.get('additional_markets', []))
-            duplicates_removed = original_market_count - len(deduplicated_markets)
-            
-            # Update game data
-            game_copy = game.copy()
-            game_copy['additional_markets'] = deduplicated_markets
-            game_copy['processing_info']['duplicates_removed'] = duplicates_removed
-            
-            # Update statistics
-            if duplicates_removed > 0:
-                self.processing_stats['games_with_duplicates'] += 1
-                self.processing_stats['total_duplicates_removed'] += duplicates_removed
-                
-                # Track duplicate details
-                self.processing_stats['duplicate_details'].append({
-                    'game_key': f"{game.get('home_team', 'Unknown')} - {game.get('away_team', 'Unknown')}",
-                    'time': game.get('time', 'Unknown'),
-                    'duplicates_removed': duplicates_removed,
-                    'original_count': original_market_count,
-                    'final_count': len(deduplicated_markets)
-                })
-            
-            processed_games.append(game_copy)
+        processed_games = [self._deduplicate_game(game) for game in games]
         
         self.processing_stats['games_processed'] = len(games)
         logger.info(f"Deduplication completed: {self.processing_stats['total_duplicates_removed']} "
@@ -129,50 +138,8 @@ class DataProcessor:
         if max_markets is None:
             max_markets = self.max_markets
         
-        processed_games = []
-        
-        for game in games:
-            additional_markets = game.get('additional_markets', [])
-            original_count = len(additional_markets)
-            
-            if original_count <= max_markets:
-                # No capping needed
-                processed_games.append(game)
-                continue
-            
-            # Sort markets by priority (lower priority number = higher priority)
-            sorted_markets = self._sort_markets_by_priority(additional_markets)
-            
-            # Cap to maximum limit
-            capped_markets = sorted_markets[:max_markets]
-            excluded_markets = sorted_markets[max_markets:]
-            markets_capped = len(excluded_markets)
-            
-            # Update game data
-            game_copy = game.copy()
-            game_copy['additional_markets'] = capped_markets
-            game_copy['processing_info']['markets_capped'] = True
-            game_copy['total_markets'] = len(capped_markets) + (1 if game.get('main_market') else 0)
-            
-            # Update statistics
-            self.processing_stats['games_with_capping'] += 1
-            self.processing_stats['total_markets_capped'] += markets_capped
-            
-            # Track capping details
-            excluded_market_types = [market.get('market_type', 'unknown') for market in excluded_markets]
-            self.processing_stats['capping_details'].append({
-                'game_key': f"{game.get('home_team', 'Unknown')} - {game.get('away_team', 'Unknown')}",
-                'time': game.get('time', 'Unknown'),
-                'original_count': original_count,
-                'capped_count': len(capped_markets),
-                'markets_removed': markets_capped,
-                'excluded_market_types': excluded_market_types
-            })
-            
-            logger.debug(f"Capped markets for {game.get('home_team')} - {game.get('away_team')}: "
-                        f"{original_count} -> {len(capped_markets)} markets")
-            
-            processed_games.append(game_copy)
+        sort_key = self._priority_sort_key()
+        processed_games = [self._cap_game(game, max_markets, sort_key) for game in games]
         
         logger.info(f"Market capping completed: {self.processing_stats['total_markets_capped']} "
                    f"markets removed from {self.processing_stats['games_with_capping']} games")
@@ -183,6 +150,10 @@ class DataProcessor:
         """
         Run complete processing pipeline: deduplication followed by capping.
         
+        Both steps run in a single pass over the games, with the same results
+        and statistics as calling deduplicate_markets and then
+        cap_additional_markets.
+        
         Args:
             games: List of game dictionaries
             max_markets: Override default max_markets limit
@@ -195,15 +166,121 @@ class DataProcessor:
         # Reset statistics for this processing run
         self._reset_stats()
         
-        # Step 1: Remove duplicates
-        deduplicated_games = self.deduplicate_markets(games)
+        if max_markets is None:
+            max_markets = self.max_markets
+        sort_key = self._priority_sort_key()
         
-        # Step 2: Cap markets
-        processed_games = self.cap_additional_markets(deduplicated_games, max_markets)
+        processed_games = [
+            self._cap_game(self._deduplicate_game(game), max_markets, sort_key)
+            for game in games
+        ]
+        
+        self.processing_stats['games_processed'] = len(games)
+        logger.info(f"Deduplication completed: {self.processing_stats['total_duplicates_removed']} "
+                   f"duplicates removed from {self.processing_stats['games_with_duplicates']} games")
+        logger.info(f"Market capping completed: {self.processing_stats['total_markets_capped']} "
+                   f"markets removed from {self.processing_stats['games_with_capping']} games")
         
         logger.info(f"Data processing completed: {len(processed_games)} games processed")
         return processed_games
     
+    def _deduplicate_game(self, game: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Remove duplicate markets from one game and record the statistics.
+        
+        Args:
+            game: Game dictionary
+            
+        Returns:
+            The game itself if nothing changed, otherwise an updated copy
+        """
+        markets = game.get('additional_markets', [])
+        original_market_count = len(markets)
+        
+        deduplicated_markets = self._remove_duplicate_markets(markets)
+        duplicates_removed = original_market_count - len(deduplicated_markets)
+        
+        # processing_info is shared with the input game, as before
+        game['processing_info']['duplicates_removed'] = duplicates_removed
+        
+        if duplicates_removed > 0:
+            self.processing_stats['games_with_duplicates'] += 1
+            self.processing_stats['total_duplicates_removed'] += duplicates_removed
+            
+            # Track duplicate details
+            self.processing_stats['duplicate_details'].append({
+                'game_key': f"{game.get('home_team', 'Unknown')} - {game.get('away_team', 'Unknown')}",
+                'time': game.get('time', 'Unknown'),
+                'duplicates_removed': duplicates_removed,
+                'original_count': original_market_count,
+                'final_count': len(deduplicated_markets)
+            })
+        
+        if deduplicated_markets is markets and 'additional_markets' in game:
+            return game
+        
+        game_copy = game.copy()
+        game_copy['additional_markets'] = deduplicated_markets
+        return game_copy
+    
+    def _cap_game(self, game: Dict[str, Any], max_markets: int,
+                  sort_key: Callable[[Dict[str, Any]], Tuple[int, str]]) -> Dict[str, Any]:
+        """
+        Cap one game's additional markets and record the statistics.
+        
+        Keeps the ``max_markets`` markets that a stable sort on ``sort_key``
+        would put first, without sorting all of them.
+        
+        Args:
+            game: Game dictionary
+            max_markets: Maximum number of additional markets
+            sort_key: Priority key from _priority_sort_key
+            
+        Returns:
+            The game itself if nothing changed, otherwise an updated copy
+        """
+        additional_markets = game.get('additional_markets', [])
+        original_count = len(additional_markets)
+        
+        if original_count <= max_markets:
+            # No capping needed
+            return game
+        
+        # Index breaks ties so selection is stable like sorted()
+        decorated = [(sort_key(market), index) for index, market in enumerate(additional_markets)]
+        kept = heapq.nsmallest(max_markets, decorated) if max_markets > 0 else []
+        kept_indices = {index for _, index in kept}
+        capped_markets = [additional_markets[index] for _, index in kept]
+        excluded = sorted(item for item in decorated if item[1] not in kept_indices)
+        markets_capped = len(excluded)
+        
+        # Update game data
+        game_copy = game.copy()
+        game_copy['additional_markets'] = capped_markets
+        game_copy['processing_info']['markets_capped'] = True
+        game_copy['total_markets'] = len(capped_markets) + (1 if game.get('main_market') else 0)
+        
+        # Update statistics
+        self.processing_stats['games_with_capping'] += 1
+        self.processing_stats['total_markets_capped'] += markets_capped
+        
+        # Track capping details
+        excluded_market_types = [additional_markets[index].get('market_type', 'unknown')
+                                 for _, index in excluded]
+        self.processing_stats['capping_details'].append({
+            'game_key': f"{game.get('home_team', 'Unknown')} - {game.get('away_team', 'Unknown')}",
+            'time': game.get('time', 'Unknown'),
+            'original_count': original_count,
+            'capped_count': len(capped_markets),
+            'markets_removed': markets_capped,
+            'excluded_market_types': excluded_market_types
+        })
+        
+        logger.debug(f"Capped markets for {game.get('home_team')} - {game.get('away_team')}: "
+                    f"{original_count} -> {len(capped_markets)} markets")
+        
+        return game_copy
+    
     def get_processing_stats(self) -> Dict[str, Any]:
         """
         Get comprehensive processing statistics.
@@ -235,51 +312,54 @@ class DataProcessor:
     
     def _remove_duplicate_markets(self, markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Remove exact duplicate markets based on market content hash.
+        Remove exact duplicate markets based on market content.
         
         Args:
             markets: List of market dictionaries
             
         Returns:
-            List of unique markets
+            List of unique markets; ``markets`` itself when there are no duplicates
         """
         if not markets:
             return markets
         
-        seen_hashes = set()
+        seen_keys = set()
         unique_markets = []
         
         for market in markets:
-            # Create a hash based on market content (excluding priority which might vary)
-            market_hash = self._calculate_market_hash(market)
+            market_key = self._market_key(market)
+            try:
+                is_duplicate = market_key in seen_keys
+            except TypeError:
+                # Unhashable values inside the odds
+                market_key = repr(market_key)
+                is_duplicate = market_key in seen_keys
             
-            if market_hash not in seen_hashes:
-                seen_hashes.add(market_hash)
+            if not is_duplicate:
+                seen_keys.add(market_key)
                 unique_markets.append(market)
         
+        if len(unique_markets) == len(markets):
+            return markets
         return unique_markets
     
-    def _calculate_market_hash(self, market: Dict[str, Any]) -> str:
+    def _market_key(self, market: Dict[str, Any]) -> Tuple[Any, Any, Any]:
         """
-        Calculate a hash for a market based on its essential content.
+        Build the key identifying duplicate markets.
+        
+        Uses market type, description and odds, excluding priority as it might
+        be calculated differently. Odds are frozen in their insertion order.
         
         Args:
             market: Market dictionary
             
         Returns:
-            Hash string representing the market
+            Hashable (market_type, description, odds) tuple
         """
-        # Use market type, description, and odds for hash calculation
-        # Exclude priority as it might be calculated differently
-        hash_content = {
-            'market_type': market.get('market_type', ''),
-            'description': market.get('description', ''),
-            'odds': market.get('odds', {})
-        }
-        
-        # Convert to string and create hash
-        content_str = str(sorted(hash_content.items()))
-        return hashlib.md5(content_str.encode('utf-8')).hexdigest()
+        odds = market.get('odds', {})
+        if isinstance(odds, dict):
+            odds = tuple(odds.items())
+        return (market.get('market_type', ''), market.get('description', ''), odds)
     
     def _sort_markets_by_priority(self, markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -299,6 +379,25 @@ class DataProcessor:
         
         return sorted(markets, key=get_priority)
     
+    def _priority_sort_key(self) -> Callable[[Dict[str, Any]], Tuple[int, str]]:
+        """
+        Build the (priority, market_type) key used to order markets.
+        
+        Same ordering as _sort_markets_by_priority, with the priority table
+        bound once per processing run.
+        """
+        priorities = self.market_priorities
+        
+        def sort_key(market: Dict[str, Any]) -> Tuple[int, str]:
+            market_type = market.get('market_type', 'unknown')
+            if market_type in priorities:
+                return (priorities[market_type], market_type)
+            if 'priority' in market:
+                return (market['priority'], market_type)
+            return (priorities['unknown'], market_type)
+        
+        return sort_key
+    
     def _calculate_market_priority(self, market: Dict[str, Any]) -> int:
         """
         Calculate priority for a market based on its type.
@@ -322,10 +421,13 @@ class DataProcessor:
         # Default to lowest priority
         return self.market_priorities['unknown']
     
-    def _load_market_priorities(self) -> Dict[str, int]:
+    def _load_market_priorities(self, config: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
         """
         Load market priorities from configuration file.
         
+        Args:
+            config: Already parsed configuration to use instead of the file
+        
         Returns:
             Dictionary mapping market types to priority numbers
             
@@ -334,33 +436,21 @@ class DataProcessor:
         """
         config_path = self.config_dir / "market_priorities.json"
         
-        # Use default priorities if config file doesn't exist
-        if not config_path.exists():
-            logger.warning(f"Market priorities config file '{config_path}' not found, using defaults")
-            return self._get_default_market_priorities()
-        
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-        except json.JSONDecodeError as e:
-            raise ConfigurationError(f"Invalid JSON in market priorities config '{config_path}': {e}")
-        except Exception as e:
-            raise ConfigurationError(f"Error reading market priorities config '{config_path}': {e}")
-        
-        # Extract market priorities from config
-        if 'market_priorities' not in config:
-            raise ConfigurationError(f"Missing 'market_priorities' section in '{config_path}'")
-        
-        priorities = config['market_priorities']
-        if not isinstance(priorities, dict):
-            raise ConfigurationError(f"'market_priorities' must be a dictionary in '{config_path}'")
-        
-        # Validate priority values
-        for market_type, priority in priorities.items():
-            if not isinstance(priority, int) or priority < 1:
-                raise ConfigurationError(
-                    f"Priority for '{market_type}' must be a positive integer in '{config_path}'"
-                )
+        if config is None:
+            # Use default priorities if config file doesn't exist
+            if not config_path.exists():
+                logger.warning(f"Market priorities config file '{config_path}' not found, using defaults")
+                return self._get_default_market_priorities()
+            
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ConfigurationError(f"Invalid JSON in market priorities config '{config_path}': {e}")
+            except Exception as e:
+                raise ConfigurationError(f"Error reading market priorities config '{config_path}': {e}")
+        
+        priorities = validate_market_priorities_config(config, config_path)
         
         # Update max_markets from config if specified
         if 'settings' in config and 'max_additional_markets' in config['settings']:
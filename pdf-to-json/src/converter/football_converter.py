@@ -26,6 +26,8 @@ from .data_processor import DataProcessor
 from .day_splitter import DaySplitter
 from .report_generator import ReportGenerator
 from .config_loader import create_default_team_aliases_config
+from .compiled_config import CompiledConfig, current_compiled_config, get_compiled_config
+from .stage_tracing import StageTracer
 from .exceptions import (
     FootballProcessingError, ConfigurationError, ProcessingError,
     ExtractionError, FileSystemError
@@ -49,16 +51,22 @@ class FootballConverter:
     and detailed logging throughout the pipeline.
     """
     
-    def __init__(self, config_dir: str = "config", max_markets: int = 10):
+    def __init__(self, config_dir: str = "config", max_markets: int = 10,
+                 trace_dir: Optional[str] = None, trace_allocations: bool = False):
         """
         Initialize the FootballConverter with all required components.
         
         Args:
             config_dir: Directory containing configuration files
             max_markets: Maximum number of additional markets per game
+            trace_dir: If set, write a Chrome trace JSON per conversion job here
+            trace_allocations: Record per-stage Python allocations with tracemalloc
         """
         self.config_dir = config_dir
         self.max_markets = max_markets
+        self.trace_dir = trace_dir
+        self.trace_allocations = trace_allocations
+        self.last_trace: Optional[StageTracer] = None
         
         # Initialize logger with component context
         self.logger = get_component_logger(
@@ -69,9 +77,14 @@ class FootballConverter:
         
         # Initialize components with error handling
         try:
-            self.extractor = FootballExtractor(config_dir=self.config_dir)
-            self.market_processor = MarketProcessor()
-            self.data_processor = DataProcessor(config_dir=config_dir)
+            # Shared, precompiled configuration; components fall back to their
+            # own loading for sections that could not be compiled
+            self.compiled_config = get_compiled_config(self.config_dir)
+            self.extractor = FootballExtractor(config_dir=self.config_dir,
+                                               patterns=self.compiled_config.extractor)
+            self.market_processor = MarketProcessor(rules=self.compiled_config.market_rules)
+            self.data_processor = DataProcessor(config_dir=config_dir,
+                                                priorities_config=self.compiled_config.market_priorities)
             self.day_splitter = DaySplitter()
             self.report_generator = ReportGenerator()
             
@@ -129,10 +142,15 @@ class FootballConverter:
         Returns:
             Dictionary containing comprehensive processing results
         """
+        # Pick up a configuration reloaded since the last conversion
+        self.refresh_config()
+        
         # Initialize pipeline statistics and logging context
         self._reset_pipeline_stats()
         pipeline_start_time = time.time()
         self.pipeline_stats['start_time'] = datetime.now()
+        tracer = StageTracer(job_id=Path(json_file_path).stem, trace_allocations=self.trace_allocations)
+        self.last_trace = tracer
         
         # Create pipeline-specific logger with context
         pipeline_logger = self.logger.add_context(
@@ -166,70 +184,73 @@ class FootballConverter:
                 )
             
             # Stage 1: Load input data
-            stage_start = time.time()
-            json_content = self._load_input_data(json_file_path)
-            stage_duration = time.time() - stage_start
+            with tracer.stage('data_loading') as span:
+                json_content = self._load_input_data(json_file_path)
+                full_text = json_content.get('content', {}).get('full_text') or ''
+                span.rows_out = full_text.count('\n') + 1 if full_text else 0
             pipeline_logger.info(
-                f"Data loading completed in {stage_duration:.2f}s",
-                context={'stage': 'data_loading', 'duration': stage_duration}
+                f"Data loading completed in {span.wall_time:.2f}s",
+                context={'stage': 'data_loading', 'duration': span.wall_time}
             )
             
             # Stage 2: Extract football data
-            stage_start = time.time()
-            matches = self._run_extraction(json_content)
-            stage_duration = time.time() - stage_start
+            with tracer.stage('extraction', rows_in=span.rows_out) as span:
+                matches = self._run_extraction(json_content)
+                span.rows_out = len(matches)
             pipeline_logger.info(
-                f"Extraction completed in {stage_duration:.2f}s: {len(matches)} matches",
-                context={'stage': 'extraction', 'duration': stage_duration, 'matches_found': len(matches)}
+                f"Extraction completed in {span.wall_time:.2f}s: {len(matches)} matches",
+                context={'stage': 'extraction', 'duration': span.wall_time, 'matches_found': len(matches)}
             )
             
             # Stage 3: Normalize team names
-            stage_start = time.time()
-            normalized_matches = self._run_normalization(matches)
-            stage_duration = time.time() - stage_start
+            with tracer.stage('normalization', rows_in=len(matches)) as span:
+                normalized_matches = self._run_normalization(matches)
+                span.rows_out = len(normalized_matches)
             pipeline_logger.info(
-                f"Normalization completed in {stage_duration:.2f}s",
-                context={'stage': 'normalization', 'duration': stage_duration}
+                f"Normalization completed in {span.wall_time:.2f}s",
+                context={'stage': 'normalization', 'duration': span.wall_time}
             )
             
             # Stage 4: Merge and classify markets
-            stage_start = time.time()
-            merged_games = self._run_merging(normalized_matches)
-            stage_duration = time.time() - stage_start
+            with tracer.stage('merging', rows_in=len(normalized_matches)) as span:
+                merged_games = self._run_merging(normalized_matches)
+                span.rows_out = len(merged_games)
             pipeline_logger.info(
-                f"Merging completed in {stage_duration:.2f}s: {len(merged_games)} games",
-                context={'stage': 'merging', 'duration': stage_duration, 'games_created': len(merged_games)}
+                f"Merging completed in {span.wall_time:.2f}s: {len(merged_games)} games",
+                context={'stage': 'merging', 'duration': span.wall_time, 'games_created': len(merged_games)}
             )
             
             # Stage 5: Process (deduplicate and cap)
-            stage_start = time.time()
-            processed_games = self._run_processing(merged_games)
-            stage_duration = time.time() - stage_start
+            with tracer.stage('processing', rows_in=len(merged_games)) as span:
+                processed_games = self._run_processing(merged_games)
+                span.rows_out = len(processed_games)
             pipeline_logger.info(
-                f"Processing completed in {stage_duration:.2f}s",
-                context={'stage': 'processing', 'duration': stage_duration}
+                f"Processing completed in {span.wall_time:.2f}s",
+                context={'stage': 'processing', 'duration': span.wall_time}
             )
             
             # Stage 6: Split by days
-            stage_start = time.time()
-            daily_files = self._run_splitting(processed_games, output_dir)
-            stage_duration = time.time() - stage_start
+            with tracer.stage('splitting', rows_in=len(processed_games)) as span:
+                daily_files = self._run_splitting(processed_games, output_dir)
+                span.rows_out = len(daily_files)
             pipeline_logger.info(
-                f"Splitting completed in {stage_duration:.2f}s: {len(daily_files)} files",
-                context={'stage': 'splitting', 'duration': stage_duration, 'files_created': len(daily_files)}
+                f"Splitting completed in {span.wall_time:.2f}s: {len(daily_files)} files",
+                context={'stage': 'splitting', 'duration': span.wall_time, 'files_created': len(daily_files)}
             )
             
             # Stage 7: Generate reports
-            stage_start = time.time()
-            report_files = self._run_reporting(processed_games, output_dir)
-            stage_duration = time.time() - stage_start
+            with tracer.stage('reporting', rows_in=len(processed_games)) as span:
+                report_files = self._run_reporting(processed_games, output_dir)
+                span.rows_out = len(report_files)
             pipeline_logger.info(
-                f"Reporting completed in {stage_duration:.2f}s: {len(report_files)} reports",
-                context={'stage': 'reporting', 'duration': stage_duration, 'reports_created': len(report_files)}
+                f"Reporting completed in {span.wall_time:.2f}s: {len(report_files)} reports",
+                context={'stage': 'reporting', 'duration': span.wall_time, 'reports_created': len(report_files)}
             )
             
             # Save merged file
-            merged_file_path = self._save_merged_file(processed_games, output_dir)
+            with tracer.stage('saving', rows_in=len(processed_games)) as span:
+                merged_file_path = self._save_merged_file(processed_games, output_dir)
+                span.rows_out = len(processed_games) if merged_file_path else 0
             
             # Calculate final statistics
             self.pipeline_stats['end_time'] = datetime.now()
@@ -245,13 +266,15 @@ class FootballConverter:
                     'total_games': len(processed_games),
                     'total_processing_time': total_duration,
                     'stages_completed': self.pipeline_stats['stages_completed'],
-                    'stages_failed': self.pipeline_stats['stages_failed']
+                    'stages_failed': self.pipeline_stats['stages_failed'],
+                    'stage_metrics': tracer.summary()
                 },
                 'files_created': {
                     'merged_file': merged_file_path,
                     'daily_files': daily_files,
                     'report_files': report_files
                 },
+                'trace_file': self._write_trace(tracer),
                 'statistics': self._compile_comprehensive_stats(processed_games),
                 'errors': self.pipeline_stats['errors'],
                 'warnings': self.pipeline_stats['warnings']
@@ -306,8 +329,10 @@ class FootballConverter:
                 'processing_summary': {
                     'total_processing_time': total_duration,
                     'stages_completed': self.pipeline_stats['stages_completed'],
-                    'stages_failed': self.pipeline_stats['stages_failed']
+                    'stages_failed': self.pipeline_stats['stages_failed'],
+                    'stage_metrics': tracer.summary()
                 },
+                'trace_file': self._write_trace(tracer),
                 'errors': self.pipeline_stats['errors'],
                 'warnings': self.pipeline_stats['warnings']
             }
@@ -342,12 +367,37 @@ class FootballConverter:
                 'processing_summary': {
                     'total_processing_time': total_duration,
                     'stages_completed': self.pipeline_stats['stages_completed'],
-                    'stages_failed': self.pipeline_stats['stages_failed']
+                    'stages_failed': self.pipeline_stats['stages_failed'],
+                    'stage_metrics': tracer.summary()
                 },
+                'trace_file': self._write_trace(tracer),
                 'errors': self.pipeline_stats['errors'],
                 'warnings': self.pipeline_stats['warnings']
             }
     
+    def _write_trace(self, tracer: StageTracer) -> Optional[str]:
+        """
+        Write the job's Chrome trace if tracing output is configured.
+        
+        Args:
+            tracer: Tracer holding the job's stage spans
+            
+        Returns:
+            Path of the trace file, or None if tracing output is disabled or failed
+        """
+        if not self.trace_dir:
+            return None
+        
+        try:
+            trace_file = tracer.write_chrome_trace(self.trace_dir)
+            self.logger.debug(f"Stage trace written to {trace_file}")
+            return trace_file
+        except Exception as e:
+            warning_msg = f"Failed to write stage trace: {e}"
+            self.logger.warning(warning_msg)
+            self.pipeline_stats['warnings'].append(warning_msg)
+            return None
+    
     def _initialize_team_normalizer(self) -> TeamNormalizer:
         """
         Initialize the team normalizer, creating default config if needed.
@@ -356,7 +406,7 @@ class FootballConverter:
             Initialized TeamNormalizer instance
         """
         try:
-            normalizer = TeamNormalizer(self.config_dir)
+            normalizer = TeamNormalizer(self.config_dir, index=self.compiled_config.team_aliases)
             self.logger.debug("Team normalizer initialized successfully")
             return normalizer
             
@@ -384,6 +434,38 @@ class FootballConverter:
                 self.logger.warning("Attempting to create fallback team normalizer")
                 return self._create_fallback_normalizer()
     
+    def refresh_config(self) -> bool:
+        """
+        Switch the components to the compiled configuration currently in use.
+        
+        ``ConfigManager.reload_configs`` and the config reload endpoint swap
+        the shared artifact; converters check it once per conversion so a
+        run never mixes two configurations.
+        
+        Returns:
+            True if a newer configuration was applied
+        """
+        current = current_compiled_config(self.config_dir)
+        if current is None or current.version == self.compiled_config.version:
+            return False
+        self.apply_compiled_config(current)
+        return True
+    
+    def apply_compiled_config(self, compiled: CompiledConfig) -> None:
+        """Apply a compiled configuration to the pipeline components."""
+        if compiled.extractor is not None:
+            self.extractor.apply_patterns(compiled.extractor)
+        self.market_processor.apply_rules(compiled.market_rules)
+        if compiled.team_aliases is not None:
+            self.team_normalizer.apply_index(compiled.team_aliases)
+        self.data_processor = DataProcessor(config_dir=self.config_dir,
+                                            priorities_config=compiled.market_priorities)
+        self.logger.info(
+            f"Applied compiled configuration {compiled.version}",
+            context={'previous_version': self.compiled_config.version, 'version': compiled.version}
+        )
+        self.compiled_config = compiled
+    
     def _create_fallback_normalizer(self) -> TeamNormalizer:
         """Create a fallback normalizer when configuration fails."""
         # This is a simplified approach - in practice, you might want to create
@@ -785,6 +867,7 @@ class FootballConverter:
         
         stats = {
             'pipeline': pipeline_stats,
+            'config_version': self.compiled_config.version,
             'extraction': {},  # FootballExtractor doesn't have get_stats method
             'normalization': self.team_normalizer.get_stats() if hasattr(self.team_normalizer, 'get_stats') else {},
             'processing': self.data_processor.get_processing_stats(),
@@ -1,29 +1,68 @@
 import re
 import json
-from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Pattern, Tuple
 from datetime import datetime
 import logging
 
+from .market_processor import MarketClassifiers, compile_market_classifiers
+
 logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True)
+class ExtractorPatterns:
+    """Compiled extractor_patterns.json and market_keywords.json."""
+    football_patterns: List[str]
+    time_pattern: str
+    team_pattern: str
+    odds_patterns: List[str]
+    market_type_patterns: Dict[str, List[str]]
+    football_regexes: Tuple[Pattern, ...]
+    time_regex: Pattern
+    team_regex: Pattern
+    odds_regexes: Tuple[Pattern, ...]
+    market_classifiers: MarketClassifiers
+
+
+def compile_extractor_patterns(patterns: Dict[str, Any], market_type_patterns: Dict[str, List[str]],
+                               market_classifiers: Optional[MarketClassifiers] = None) -> ExtractorPatterns:
+    """Compile the extractor's configured patterns (raises re.error on a bad one)."""
+    football_patterns = patterns.get('football_patterns', [])
+    time_pattern = patterns.get('time_pattern', '')
+    team_pattern = patterns.get('team_pattern', '')
+    odds_patterns = patterns.get('odds_patterns', [])
+    return ExtractorPatterns(
+        football_patterns=football_patterns,
+        time_pattern=time_pattern,
+        team_pattern=team_pattern,
+        odds_patterns=odds_patterns,
+        market_type_patterns=market_type_patterns,
+        football_regexes=tuple(re.compile(pattern) for pattern in football_patterns),
+        time_regex=re.compile(time_pattern),
+        team_regex=re.compile(team_pattern),
+        odds_regexes=tuple(re.compile(pattern) for pattern in odds_patterns),
+        market_classifiers=(market_classifiers if market_classifiers is not None
+                            else compile_market_classifiers(market_type_patterns)),
+    )
+
+
 class FootballExtractor:
     """Extract football match data from Tippmix JSON content with enhanced market detection"""
     
-    def __init__(self, config_dir: str = 'config'):
+    def __init__(self, config_dir: str = 'config', patterns: Optional[ExtractorPatterns] = None):
         self.config_dir = config_dir
-        self._load_patterns()
+        if patterns is None:
+            patterns = self._load_patterns()
+        self.apply_patterns(patterns)
 
-    def _load_patterns(self):
+    def _load_patterns(self) -> ExtractorPatterns:
         try:
             with open(f'{self.config_dir}/extractor_patterns.json', 'r', encoding='utf-8') as f:
                 patterns = json.loads(f.read())
-            self.football_patterns = patterns.get('football_patterns', [])
-            self.time_pattern = patterns.get('time_pattern', '')
-            self.team_pattern = patterns.get('team_pattern', '')
-            self.odds_patterns = patterns.get('odds_patterns', [])
 
             with open(f'{self.config_dir}/market_keywords.json', 'r', encoding='utf-8') as f:
-                self.market_type_patterns = json.loads(f.read())
+                market_type_patterns = json.loads(f.read())
 
         except FileNotFoundError as e:
             logger.error(f"Configuration file not found: {e}")
@@ -31,6 +70,16 @@ class FootballExtractor:
         except json.JSONDecodeError as e:
             logger.error(f"Error decoding JSON from a configuration file: {e}")
             raise
+        return compile_extractor_patterns(patterns, market_type_patterns)
+
+    def apply_patterns(self, patterns: ExtractorPatterns) -> None:
+        """Switch to another set of compiled patterns."""
+        self.patterns = patterns
+        self.football_patterns = patterns.football_patterns
+        self.time_pattern = patterns.time_pattern
+        self.team_pattern = patterns.team_pattern
+        self.odds_patterns = patterns.odds_patterns
+        self.market_type_patterns = patterns.market_type_patterns
         
     def extract_football_data(self, json_content: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract football match data from JSON content using a state machine approach"""
@@ -71,8 +120,8 @@ class FootballExtractor:
     def _extract_league(self, line: str) -> Optional[str]:
         """Extract league name from line"""
         # First check for football patterns
-        for pattern in self.football_patterns:
-            match = re.search(pattern, line)
+        for pattern in self.patterns.football_regexes:
+            match = pattern.search(line)
             if match:
                 league = match.group(1).strip()
                 # Clean up league name
@@ -119,14 +168,14 @@ class FootballExtractor:
     def _extract_match_data(self, line: str, league: Optional[str], date: Optional[str]) -> Optional[Dict[str, Any]]:
         """Extract match data from a single line"""
         # Look for time + teams + odds pattern
-        time_match = re.search(self.time_pattern, line)
+        time_match = self.patterns.time_regex.search(line)
         if not time_match:
             return None
             
         time = time_match.group(1)
         
         # Extract teams
-        team_match = re.search(self.team_pattern, line)
+        team_match = self.patterns.team_regex.search(line)
         if not team_match:
             return None
             
@@ -139,8 +188,8 @@ class FootballExtractor:
         
         # Extract odds - try different patterns
         odds_match = None
-        for pattern in self.odds_patterns:
-            odds_match = re.search(pattern, line)
+        for pattern in self.patterns.odds_regexes:
+            odds_match = pattern.search(line)
             if odds_match:
                 break
                 
@@ -409,9 +458,9 @@ class FootballExtractor:
         full_text = f"{raw_line} {home_team} {away_team}".lower()
         
         # Check each market type pattern
-        for market_type, patterns in self.market_type_patterns.items():
+        for market_type, patterns in self.patterns.market_classifiers:
             for pattern in patterns:
-                if re.search(pattern.lower(), full_text, re.IGNORECASE):
+                if pattern.search(full_text):
                     return market_type
         
         # Check for main market indicators
@@ -9,78 +9,215 @@ This module provides functionality to:
 
 import re
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Pattern, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Market type classification patterns - enhanced from FootballExtractor.
+# Used when no market_keywords.json is supplied.
+DEFAULT_MARKET_TYPE_PATTERNS: Dict[str, List[str]] = {
+    'double_chance': [
+        r'Kétesély',
+        r'1X|12|X2',
+        r'Két.*esély'
+    ],
+    'handicap': [
+        r'Hendikep',
+        r'Handicap',
+        r'Hcp',
+        r'[+-]\d+[,\.]\d*'
+    ],
+    'total_goals': [
+        r'Gólszám',
+        r'Összesen.*gól',
+        r'Több.*mint.*\d+[,\.]\d*',
+        r'Kevesebb.*mint.*\d+[,\.]\d*',
+        r'Over.*\d+[,\.]\d*',
+        r'Under.*\d+[,\.]\d*'
+    ],
+    'both_teams_score': [
+        r'Mindkét.*csapat.*gól',
+        r'BTTS',
+        r'Both.*teams.*score',
+        r'Igen.*Nem'
+    ],
+    'half_time': [
+        r'[Ff]élidő',
+        r'HT.*FT',
+        r'Half.*time',
+        r'Melyik.*félidő'
+    ],
+    'first_last_goal': [
+        r'első.*gól',
+        r'utolsó.*gól',
+        r'First.*goal',
+        r'Last.*goal'
+    ],
+    'draw_no_bet': [
+        r'Döntetlennél.*visszajár',
+        r'Draw.*no.*bet',
+        r'DNB'
+    ]
+}
+
+# Keywords that indicate special bet types (not main 1X2 markets)
+SPECIAL_BET_KEYWORDS: Tuple[str, ...] = (
+    'Kétesély', 'Hendikep', 'Gólszám', 'Mindkét csapat',
+    'Döntetlennél', 'félidő', 'Melyik csapat', 'Hazai csapat',
+    'Vendégcsapat', 'Félidő/végeredmény', 'Melyik félidőben',
+    'a tét visszajár', 'szerez gólt', 'szerzi', 'több gól', 'kev.', 'több',
+    'Igen', 'Nem', 'H:', 'V:', 'D:', 'lesz', 'szerez', 'nyeri', 'nyer',
+    'legalább', 'egy', 't', 'mindkét', 'kevesebb', 'több', 'az első', 'az utolsó',
+    'Mindké', 'Melyik', 'melyik', 'a', 'az uolsó gól', 'mindké', 'nyer legalább',
+    'nyer', 'legalább', 'egy félidőt', 'félidőt', 'félidőben', 'több gólt',
+    'szerzi a(z)', 'szerzi az', 'gólt', 'szerez gólt mindkét', 'nyeri mindkét',
+    'nyeri', 'mindkét félidőben', 'kevesebb mint', 'több mint', 'lesz',
+    'Hazai csapat', 'Vendégcsapat', '0-ra nyeri', 'nyer legalább egy',
+    'Ki jut tovább?', 'Ki ju ovább'
+)
+
+# Lower-case substrings that rule out a main 1X2 market
+SPECIAL_BET_INDICATORS: Tuple[str, ...] = (
+    'kétesély', 'hendikep', 'gólszám', 'mindkét csapat',
+    'döntetlennél', 'félidő', 'melyik csapat', 'hazai csapat',
+    'vendégcsapat', 'visszajár', 'szerzi', 'több gól',
+    'kevesebb', 'igen', 'nem', 'első gól', 'utolsó gól',
+    'over', 'under', 'btts', 'több mint', 'kevesebb mint'
+)
+
+# Market type patterns that appear in team names, removed before merging
+MERGE_CLEANUP_PATTERNS: Tuple[str, ...] = (
+    r'\s+1\.\s*félidő.*$',  # Remove "1. félidő" and everything after
+    r'\s+2\.\s*félidő.*$',  # Remove "2. félidő" and everything after
+    r'\s+félidő.*$',        # Remove "félidő" and everything after
+    r'\s+Kétesély.*$',      # Remove "Kétesély" and everything after
+    r'\s+Hendikep.*$',      # Remove "Hendikep" and everything after
+    r'\s+Gólszám.*$',       # Remove "Gólszám" and everything after
+    r'\s+Mindkét.*$',       # Remove "Mindkét" and everything after
+    r'\s+Döntetlennél.*$',  # Remove "Döntetlennél" and everything after
+    r'\s+Melyik.*$',        # Remove "Melyik" and everything after
+    r'\s+Ki\s+jut.*$',      # Remove "Ki jut" and everything after
+    r'\s+\([^)]*\)$',       # Remove parenthetical content at end
+    r'\s+[+-]\d+[,\.]\d*$', # Remove handicap values
+    r'\s+\d+[,\.]\d+$',     # Remove odds at end
+    r'\s+(1X|12|X2)$',      # Remove double chance indicators
+    r'\s+(több|kevesebb).*$', # Remove over/under indicators
+    r'\s+(H:|V:|D:).*$',    # Remove H:, V:, D: indicators
+    r'\s+(Igen|Nem)$',      # Remove Yes/No indicators
+    r'\s+1X2$',             # Remove 1X2 indicator
+)
+
+# Priorities assigned to additional markets by type
+ADDITIONAL_MARKET_PRIORITIES: Dict[str, int] = {
+    'double_chance': 2,
+    'handicap': 3,
+    'total_goals': 4,
+    'both_teams_score': 5,
+    'half_time': 6,
+    'first_last_goal': 7,
+    'draw_no_bet': 8,
+    'unknown': 10
+}
+
+_HANDICAP_VALUE = re.compile(r'[+-]\d+[,\.]\d*')
+_DOUBLE_CHANCE = re.compile(r'\b(1x|12|x2)\b', re.IGNORECASE)
+_MAIN_MATCH_LINE = re.compile(
+    r'^[kpvcsz][a-z]*\s+\d{1,2}:\d{2}.*[a-záéíóöőúüű]+\s*-\s*[a-záéíóöőúüű]+.*\d+[,\.]\d+'
+)
+_HANDICAP_DESCRIPTION = re.compile(r'Hendikep\s+([^)]+)')
+_GOALS_DESCRIPTION = re.compile(r'Gólszám\s+([^)]+)')
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_DASHES = re.compile(r'\s*[-\s]*$')
+
+MarketClassifiers = Tuple[Tuple[str, Tuple[Pattern, ...]], ...]
+
+
+def compile_market_classifiers(market_type_patterns: Dict[str, List[str]]) -> MarketClassifiers:
+    """
+    Compile market type patterns for case-insensitive classification.
+
+    Patterns are lower-cased before compiling, as classification always did,
+    and keep their configured order: the first market type with a matching
+    pattern wins.
+    """
+    return tuple(
+        (market_type, tuple(re.compile(pattern.lower(), re.IGNORECASE) for pattern in patterns))
+        for market_type, patterns in market_type_patterns.items()
+    )
+
+
+@dataclass(frozen=True)
+class MarketRules:
+    """Precompiled market classification and merge-cleaning rules."""
+    market_type_patterns: Dict[str, List[str]]
+    classifiers: MarketClassifiers
+    special_bet_keywords: Tuple[str, ...]
+    special_bet_indicators: Pattern
+    cleanup_patterns: Tuple[Pattern, ...]
+    keyword_filter: Optional[Pattern]
+    keyword_patterns: Tuple[Pattern, ...]
+
+
+def compile_market_rules(market_type_patterns: Optional[Dict[str, List[str]]] = None,
+                         classifiers: Optional[MarketClassifiers] = None) -> MarketRules:
+    """
+    Build MarketRules from market type patterns (the defaults if None).
+
+    Keyword removal keeps one pattern per keyword because the removals are
+    applied in sequence; ``keyword_filter`` matches wherever any of them
+    would, so names without special bet keywords skip them all.
+    """
+    if market_type_patterns is None:
+        market_type_patterns = DEFAULT_MARKET_TYPE_PATTERNS
+    if classifiers is None:
+        classifiers = compile_market_classifiers(market_type_patterns)
+
+    # Only longer keywords are removed, with word boundaries
+    removable = [re.escape(keyword) for keyword in SPECIAL_BET_KEYWORDS if len(keyword) > 3]
+    return MarketRules(
+        market_type_patterns=market_type_patterns,
+        classifiers=classifiers,
+        special_bet_keywords=SPECIAL_BET_KEYWORDS,
+        special_bet_indicators=re.compile(
+            '|'.join(re.escape(indicator) for indicator in SPECIAL_BET_INDICATORS)
+        ),
+        cleanup_patterns=tuple(re.compile(pattern, re.IGNORECASE) for pattern in MERGE_CLEANUP_PATTERNS),
+        keyword_filter=(re.compile(r'\b(?:' + '|'.join(removable) + r')\b', re.IGNORECASE)
+                        if removable else None),
+        keyword_patterns=tuple(re.compile(r'\b' + keyword + r'\b.*?', re.IGNORECASE) for keyword in removable),
+    )
+
+
+_default_rules: Optional[MarketRules] = None
+
+
+def default_market_rules() -> MarketRules:
+    """Rules built from the built-in patterns, compiled once per process."""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = compile_market_rules()
+    return _default_rules
+
 
 class MarketProcessor:
     """Handles market classification and game merging logic"""
     
-    def __init__(self):
-        """Initialize MarketProcessor with market type patterns and classification rules"""
-        
-        # Market type classification patterns - enhanced from FootballExtractor
-        self.market_type_patterns = {
-            'double_chance': [
-                r'Kétesély',
-                r'1X|12|X2',
-                r'Két.*esély'
-            ],
-            'handicap': [
-                r'Hendikep',
-                r'Handicap',
-                r'Hcp',
-                r'[+-]\d+[,\.]\d*'
-            ],
-            'total_goals': [
-                r'Gólszám',
-                r'Összesen.*gól',
-                r'Több.*mint.*\d+[,\.]\d*',
-                r'Kevesebb.*mint.*\d+[,\.]\d*',
-                r'Over.*\d+[,\.]\d*',
-                r'Under.*\d+[,\.]\d*'
-            ],
-            'both_teams_score': [
-                r'Mindkét.*csapat.*gól',
-                r'BTTS',
-                r'Both.*teams.*score',
-                r'Igen.*Nem'
-            ],
-            'half_time': [
-                r'[Ff]élidő',
-                r'HT.*FT',
-                r'Half.*time',
-                r'Melyik.*félidő'
-            ],
-            'first_last_goal': [
-                r'első.*gól',
-                r'utolsó.*gól',
-                r'First.*goal',
-                r'Last.*goal'
-            ],
-            'draw_no_bet': [
-                r'Döntetlennél.*visszajár',
-                r'Draw.*no.*bet',
-                r'DNB'
-            ]
-        }
+    def __init__(self, rules: Optional[MarketRules] = None):
+        """
+        Initialize MarketProcessor with market type patterns and classification rules
         
-        # Keywords that indicate special bet types (not main 1X2 markets)
-        self.special_bet_keywords = [
-            'Kétesély', 'Hendikep', 'Gólszám', 'Mindkét csapat', 
-            'Döntetlennél', 'félidő', 'Melyik csapat', 'Hazai csapat',
-            'Vendégcsapat', 'Félidő/végeredmény', 'Melyik félidőben',
-            'a tét visszajár', 'szerez gólt', 'szerzi', 'több gól', 'kev.', 'több',
-            'Igen', 'Nem', 'H:', 'V:', 'D:', 'lesz', 'szerez', 'nyeri', 'nyer',
-            'legalább', 'egy', 't', 'mindkét', 'kevesebb', 'több', 'az első', 'az utolsó',
-            'Mindké', 'Melyik', 'melyik', 'a', 'az uolsó gól', 'mindké', 'nyer legalább',
-            'nyer', 'legalább', 'egy félidőt', 'félidőt', 'félidőben', 'több gólt',
-            'szerzi a(z)', 'szerzi az', 'gólt', 'szerez gólt mindkét', 'nyeri mindkét',
-            'nyeri', 'mindkét félidőben', 'kevesebb mint', 'több mint', 'lesz',
-            'Hazai csapat', 'Vendégcsapat', '0-ra nyeri', 'nyer legalább egy',
-            'Ki jut tovább?', 'Ki ju ovább'
-        ]
+        Args:
+            rules: Precompiled rules, e.g. from the compiled converter config
+                (the built-in patterns if None)
+        """
+        self.apply_rules(rules or default_market_rules())
+    
+    def apply_rules(self, rules: MarketRules) -> None:
+        """Switch to another set of precompiled rules."""
+        self.rules = rules
+        self.market_type_patterns = rules.market_type_patterns
+        self.special_bet_keywords = list(rules.special_bet_keywords)
         
     def merge_matches_by_game(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -168,9 +305,9 @@ class MarketProcessor:
         full_text = f"{raw_line} {home_team} {away_team}".lower()
         
         # Check each market type pattern
-        for market_type, patterns in self.market_type_patterns.items():
+        for market_type, patterns in self.rules.classifiers:
             for pattern in patterns:
-                if re.search(pattern.lower(), full_text, re.IGNORECASE):
+                if pattern.search(full_text):
                     return market_type
         
         # Check if this looks like a main 1X2 market
@@ -218,25 +355,15 @@ class MarketProcessor:
         full_text = f"{raw_line} {home_team} {away_team}".lower()
         
         # First check for explicit special bet type indicators
-        special_bet_indicators = [
-            'kétesély', 'hendikep', 'gólszám', 'mindkét csapat',
-            'döntetlennél', 'félidő', 'melyik csapat', 'hazai csapat',
-            'vendégcsapat', 'visszajár', 'szerzi', 'több gól',
-            'kevesebb', 'igen', 'nem', 'első gól', 'utolsó gól',
-            'over', 'under', 'btts', 'több mint', 'kevesebb mint'
-        ]
-        
-        # Check if any special bet indicators are present
-        for indicator in special_bet_indicators:
-            if indicator in full_text:
-                return False
+        if self.rules.special_bet_indicators.search(full_text):
+            return False
         
         # Check for handicap patterns
-        if re.search(r'[+-]\d+[,\.]\d*', full_text):
+        if _HANDICAP_VALUE.search(full_text):
             return False
         
         # Check for double chance patterns
-        if re.search(r'\b(1x|12|x2)\b', full_text, re.IGNORECASE):
+        if _DOUBLE_CHANCE.search(full_text):
             return False
         
         # If we have draw odds (3 odds), it's likely a main market
@@ -256,7 +383,7 @@ class MarketProcessor:
         
         # Check if this looks like a proper match line with time and team names
         # Main markets should have a recognizable pattern
-        if re.search(r'^[kpvcsz][a-z]*\s+\d{1,2}:\d{2}.*[a-záéíóöőúüű]+\s*-\s*[a-záéíóöőúüű]+.*\d+[,\.]\d+', raw_line.lower()):
+        if _MAIN_MATCH_LINE.search(raw_line.lower()):
             return True
         
         # If it has team names that look like real teams and odds, it's likely main
@@ -283,44 +410,22 @@ class MarketProcessor:
             Cleaned team name suitable for merging
         """
         cleaned_name = team_name
+        rules = self.rules
         
         # Remove specific market type patterns that appear in team names
-        market_patterns = [
-            r'\s+1\.\s*félidő.*$',  # Remove "1. félidő" and everything after
-            r'\s+2\.\s*félidő.*$',  # Remove "2. félidő" and everything after
-            r'\s+félidő.*$',        # Remove "félidő" and everything after
-            r'\s+Kétesély.*$',      # Remove "Kétesély" and everything after
-            r'\s+Hendikep.*$',      # Remove "Hendikep" and everything after
-            r'\s+Gólszám.*$',       # Remove "Gólszám" and everything after
-            r'\s+Mindkét.*$',       # Remove "Mindkét" and everything after
-            r'\s+Döntetlennél.*$',  # Remove "Döntetlennél" and everything after
-            r'\s+Melyik.*$',        # Remove "Melyik" and everything after
-            r'\s+Ki\s+jut.*$',      # Remove "Ki jut" and everything after
-            r'\s+\([^)]*\)$',       # Remove parenthetical content at end
-            r'\s+[+-]\d+[,\.]\d*$', # Remove handicap values
-            r'\s+\d+[,\.]\d+$',     # Remove odds at end
-            r'\s+(1X|12|X2)$',      # Remove double chance indicators
-            r'\s+(több|kevesebb).*$', # Remove over/under indicators
-            r'\s+(H:|V:|D:).*$',    # Remove H:, V:, D: indicators
-            r'\s+(Igen|Nem)$',      # Remove Yes/No indicators
-            r'\s+1X2$',             # Remove 1X2 indicator
-        ]
-        
-        for pattern in market_patterns:
-            cleaned_name = re.sub(pattern, '', cleaned_name, flags=re.IGNORECASE).strip()
+        for pattern in rules.cleanup_patterns:
+            cleaned_name = pattern.sub('', cleaned_name).strip()
         
         # Remove special bet keywords - be more precise with word boundaries
-        for keyword in self.special_bet_keywords:
-            # Use word boundaries and case-insensitive matching for longer keywords
-            if len(keyword) > 3:
-                pattern = r'\b' + re.escape(keyword) + r'\b.*?'
-                cleaned_name = re.sub(pattern, '', cleaned_name, flags=re.IGNORECASE).strip()
+        if rules.keyword_filter is not None and rules.keyword_filter.search(cleaned_name):
+            for pattern in rules.keyword_patterns:
+                cleaned_name = pattern.sub('', cleaned_name).strip()
         
         # Remove extra spaces and clean up
-        cleaned_name = re.sub(r'\s+', ' ', cleaned_name).strip()
+        cleaned_name = _WHITESPACE.sub(' ', cleaned_name).strip()
         
         # Remove trailing punctuation and dashes
-        cleaned_name = re.sub(r'\s*[-\s]*$', '', cleaned_name).strip()
+        cleaned_name = _TRAILING_DASHES.sub('', cleaned_name).strip()
         
         # If the cleaned name is too short or empty, return the original
         if len(cleaned_name) < 3:
@@ -359,31 +464,21 @@ class MarketProcessor:
         market_info['market_type'] = market_type
         
         # Set priority based on market type
-        market_priorities = {
-            'double_chance': 2,
-            'handicap': 3,
-            'total_goals': 4,
-            'both_teams_score': 5,
-            'half_time': 6,
-            'first_last_goal': 7,
-            'draw_no_bet': 8,
-            'unknown': 10
-        }
-        market_info['priority'] = market_priorities.get(market_type, 10)
+        market_info['priority'] = ADDITIONAL_MARKET_PRIORITIES.get(market_type, 10)
         
         # Generate description based on market type and content
         if 'Kétesély' in raw_line:
             market_info['description'] = 'Kétesély (1X/12/X2)'
         elif 'Hendikep' in raw_line:
             # Extract handicap value if available
-            handicap_match = re.search(r'Hendikep\s+([^)]+)', raw_line)
+            handicap_match = _HANDICAP_DESCRIPTION.search(raw_line)
             if handicap_match:
                 market_info['description'] = f"Hendikep {handicap_match.group(1)}"
             else:
                 market_info['description'] = 'Hendikep'
         elif 'Gólszám' in raw_line:
             # Extract goal line if available
-            goals_match = re.search(r'Gólszám\s+([^)]+)', raw_line)
+            goals_match = _GOALS_DESCRIPTION.search(raw_line)
             if goals_match:
                 market_info['description'] = f"Gólszám {goals_match.group(1)}"
             else:
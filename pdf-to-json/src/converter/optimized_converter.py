@@ -49,6 +49,7 @@ class PerformanceMetrics:
     cache_misses: int = 0
     parallel_tasks_executed: int = 0
     streaming_chunks_processed: int = 0
+    streaming_fallbacks: int = 0
     batch_operations: int = 0
     stage_timings: Dict[str, float] = field(default_factory=dict)
     optimization_flags: List[str] = field(default_factory=list)
@@ -459,37 +460,12 @@ class OptimizedConverter(FootballConverter):
         try:
             self.logger.info(f"Loading input data with streaming from {json_file_path}")
             
-            # Use ijson for streaming parsing
-            json_content = {}
-            
-            async with aiofiles.open(json_file_path, 'rb') as f:
-                # Read file in chunks and parse incrementally
-                parser = ijson.parse(f)
-                current_path = []
-                
-                async for prefix, event, value in self._async_ijson_parse(f):
-                    if event == 'start_map':
-                        if not current_path:
-                            json_content = {}
-                    elif event == 'map_key':
-                        current_path.append(value)
-                    elif event == 'string' or event == 'number' or event == 'boolean':
-                        if len(current_path) == 1 and current_path[0] == 'content':
-                            if 'content' not in json_content:
-                                json_content['content'] = {}
-                        elif len(current_path) == 2 and current_path[0] == 'content':
-                            if 'content' not in json_content:
-                                json_content['content'] = {}
-                            json_content['content'][current_path[1]] = value
-                    elif event == 'end_map':
-                        if current_path:
-                            current_path.pop()
-                    
-                    self.performance_metrics.streaming_chunks_processed += 1
-            
-            # Basic validation
-            if not isinstance(json_content, dict):
-                raise ProcessingError("Input JSON must be a dictionary")
+            # ijson needs a synchronous file object; parse in the thread pool so
+            # only the 'content' section is materialized and the loop stays free
+            loop = asyncio.get_event_loop()
+            json_content = await loop.run_in_executor(
+                self.thread_pool, self._parse_content_section, json_file_path
+            )
             
             if 'content' not in json_content:
                 raise ProcessingError("Input JSON missing 'content' section")
@@ -501,25 +477,19 @@ class OptimizedConverter(FootballConverter):
             
         except Exception as e:
             # Fallback to regular loading if streaming fails
+            self.performance_metrics.streaming_fallbacks += 1
             self.logger.warning(f"Streaming parsing failed, falling back to regular loading: {e}")
             return await self._load_input_data_async(json_file_path)
     
-    async def _async_ijson_parse(self, file_handle):
-        """Async wrapper for ijson parsing."""
-        # This is a simplified implementation - in practice, you might want to use
-        # a more sophisticated async ijson wrapper
-        loop = asyncio.get_event_loop()
-        
-        def parse_chunk():
-            try:
-                return list(ijson.parse(file_handle))
-            except Exception:
-                return []
-        
-        # Run parsing in thread pool to avoid blocking
-        events = await loop.run_in_executor(self.thread_pool, parse_chunk)
-        for event in events:
-            yield event
+    def _parse_content_section(self, json_file_path: str) -> Dict[str, Any]:
+        """Stream the top-level 'content' object out of a JSON file."""
+        json_content: Dict[str, Any] = {}
+        with open(json_file_path, 'rb') as f:
+            for content in ijson.items(f, 'content'):
+                json_content['content'] = content
+                self.performance_metrics.streaming_chunks_processed += 1
+                break
+        return json_content
     
     async def _run_extraction_async(self, json_content: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Run football data extraction asynchronously."""
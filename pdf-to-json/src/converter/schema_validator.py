@@ -2,23 +2,54 @@
 Schema Validator Module
 
 This module provides functionality to validate JSON output against predefined schemas.
+Validators are compiled once per schema and reused; football outputs can be
+validated game by game straight from the file with ijson.
 """
 
 import json
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from contextlib import nullcontext
+from typing import Dict, List, Any, IO, Iterable, Optional, Tuple, Union
 from pathlib import Path
-from jsonschema import validate, ValidationError, SchemaError
+
+import ijson
+from jsonschema import SchemaError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
 
 logger = logging.getLogger(__name__)
 
+BACKENDS = ('jsonschema', 'fastjsonschema')
+
 
 class SchemaValidator:
     """Validate JSON output against predefined schemas."""
     
-    def __init__(self):
-        """Initialize the schema validator."""
+    def __init__(self, backend: str = 'jsonschema'):
+        """
+        Initialize the schema validator.
+        
+        Args:
+            backend: 'jsonschema', or 'fastjsonschema' to compile schemas to
+                Python code for first-error checks. Falls back to jsonschema
+                when fastjsonschema is not installed.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown validation backend: {backend}")
+        if backend == 'fastjsonschema' and fastjsonschema is None:
+            logger.warning("fastjsonschema is not installed, using jsonschema")
+            backend = 'jsonschema'
+        
+        self.backend = backend
         self.schemas = {}
+        # Compiled validators keyed by schema name; dropped when a schema is replaced
+        self._validators: Dict[str, Any] = {}
+        self._fast_validators: Dict[str, Any] = {}
         self._load_default_schemas()
     
     def _load_default_schemas(self):
@@ -27,16 +58,84 @@ class SchemaValidator:
             'basic': self._get_basic_schema(),
             'detailed': self._get_detailed_schema(),
             'minimal': self._get_minimal_schema(),
-            'structured': self._get_structured_schema()
+            'structured': self._get_structured_schema(),
+            'football': self._get_football_schema()
         }
+        self._validators.clear()
+        self._fast_validators.clear()
     
-    def validate_json(self, data: Dict[str, Any], schema_name: str = 'basic') -> Tuple[bool, List[str]]:
+    def _set_schema(self, schema_name: str, schema: Dict[str, Any]) -> None:
+        """Register a schema and forget validators compiled for the old one."""
+        self.schemas[schema_name] = schema
+        for cache in (self._validators, self._fast_validators):
+            for key in [key for key in cache if key.split('#')[0] == schema_name]:
+                del cache[key]
+    
+    def _compile(self, key: str, schema: Dict[str, Any]):
+        """Return the jsonschema validator for ``key``, checking the schema only once."""
+        validator = self._validators.get(key)
+        if validator is None:
+            cls = validator_for(schema)
+            cls.check_schema(schema)
+            validator = cls(schema)
+            self._validators[key] = validator
+        return validator
+    
+    def _compile_fast(self, key: str, schema: Dict[str, Any]):
+        """Return the fastjsonschema validation function for ``key``."""
+        validate = self._fast_validators.get(key)
+        if validate is None:
+            validate = fastjsonschema.compile(schema)
+            self._fast_validators[key] = validate
+        return validate
+    
+    def get_validator(self, schema_name: str):
+        """
+        Get the compiled jsonschema validator for a schema.
+        
+        Raises:
+            KeyError: If the schema is not registered
+            SchemaError: If the schema itself is invalid
+        """
+        return self._compile(schema_name, self.schemas[schema_name])
+    
+    def _check(self, key: str, schema: Dict[str, Any], data: Any, all_errors: bool,
+               max_errors: Optional[int], path_prefix: str = '') -> List[str]:
+        """Validate ``data`` with the cached validator and format the errors."""
+        if not all_errors and self.backend == 'fastjsonschema':
+            try:
+                self._compile_fast(key, schema)(data)
+                return []
+            except fastjsonschema.JsonSchemaValueException as e:
+                return [f"Validation error: {e.message}"]
+        
+        validator = self._compile(key, schema)
+        if not all_errors:
+            if validator.is_valid(data):
+                return []
+            error = best_match(validator.iter_errors(data))
+            return [f"Validation error: {error.message}"]
+        
+        errors = []
+        for error in sorted(validator.iter_errors(data), key=lambda e: list(map(str, e.absolute_path))):
+            path = '/'.join(str(part) for part in error.absolute_path)
+            location = '/'.join(part for part in (path_prefix, path) if part)
+            errors.append(f"Validation error at {location}: {error.message}" if location
+                          else f"Validation error: {error.message}")
+            if max_errors is not None and len(errors) >= max_errors:
+                break
+        return errors
+    
+    def validate_json(self, data: Dict[str, Any], schema_name: str = 'basic',
+                      all_errors: bool = False, max_errors: Optional[int] = None) -> Tuple[bool, List[str]]:
         """
         Validate JSON data against a schema.
         
         Args:
             data: JSON data to validate
             schema_name: Name of the schema to use
+            all_errors: Report every error with its location instead of the most relevant one
+            max_errors: Stop after this many errors in ``all_errors`` mode
             
         Returns:
             Tuple of (is_valid, list_of_errors)
@@ -44,20 +143,126 @@ class SchemaValidator:
         if schema_name not in self.schemas:
             return False, [f"Schema '{schema_name}' not found"]
         
+        try:
+            errors = self._check(schema_name, self.schemas[schema_name], data, all_errors, max_errors)
+        except SchemaError as e:
+            errors = [f"Schema error: {e.message}"]
+        except Exception as e:
+            errors = [f"Unexpected error: {str(e)}"]
+        
+        return not errors, errors
+    
+    def supports_streaming(self, schema_name: str) -> bool:
+        """Whether a schema describes a top-level ``games`` array that can be streamed."""
+        schema = self.schemas.get(schema_name) or {}
+        games = schema.get('properties', {}).get('games', {})
+        return games.get('type') == 'array' and isinstance(games.get('items'), dict)
+    
+    def validate_games_stream(self, source: Union[str, Path, IO[bytes]], schema_name: str = 'football',
+                              all_errors: bool = False,
+                              max_errors: Optional[int] = 100) -> Tuple[bool, List[str], int]:
+        """
+        Validate a football output file without loading it whole.
+        
+        The file is parsed incrementally: each ``games[]`` item is built,
+        validated against the item schema and discarded, and the remaining
+        top-level fields are validated against the schema with ``games``
+        reduced to its array type check.
+        
+        Args:
+            source: Path or binary file object
+            schema_name: Schema with a top-level ``games`` array
+            all_errors: Keep going after the first error
+            max_errors: Stop after this many errors in ``all_errors`` mode
+            
+        Returns:
+            Tuple of (is_valid, list_of_errors, games_checked)
+        """
+        if not self.supports_streaming(schema_name):
+            return False, [f"Schema '{schema_name}' has no games array to stream"], 0
+        
         schema = self.schemas[schema_name]
-        errors = []
+        item_schema = schema['properties']['games']['items']
+        header_schema = dict(schema, properties=dict(schema['properties'], games={'type': 'array'}))
+        header: Dict[str, Any] = {}
+        errors: List[str] = []
+        games_checked = 0
+        
+        def remaining() -> Optional[int]:
+            return None if max_errors is None else max_errors - len(errors)
+        
+        def limit_reached() -> bool:
+            return bool(errors) and (not all_errors or remaining() is not None and remaining() <= 0)
         
         try:
-            validate(instance=data, schema=schema)
-            return True, []
-        except ValidationError as e:
-            errors.append(f"Validation error: {e.message}")
+            opened = open(source, 'rb') if isinstance(source, (str, Path)) else nullcontext(source)
+            with opened as f:
+                for key, value in self._iter_top_level(f):
+                    if key != ('games', 'item'):
+                        header[key] = value
+                        continue
+                    errors.extend(self._check(f"{schema_name}#games", item_schema, value, all_errors,
+                                              remaining(), path_prefix=f"games/{games_checked}"))
+                    games_checked += 1
+                    if limit_reached():
+                        break
+            
+            if not limit_reached():
+                errors.extend(self._check(f"{schema_name}#header", header_schema, header,
+                                          all_errors, remaining()))
         except SchemaError as e:
             errors.append(f"Schema error: {e.message}")
+        except (ijson.JSONError, ValueError) as e:
+            errors.append(f"Invalid JSON: {e}")
         except Exception as e:
             errors.append(f"Unexpected error: {str(e)}")
         
-        return False, errors
+        return not errors, errors, games_checked
+    
+    @staticmethod
+    def _iter_top_level(f: IO[bytes]) -> Iterable[Tuple[Any, Any]]:
+        """
+        Yield top-level fields of a JSON object one at a time.
+        
+        Items of a ``games`` array are yielded individually under the key
+        ``('games', 'item')`` and the array itself as an empty list, so only
+        one game is in memory at a time.
+        
+        Raises:
+            ValueError: If the document is not a JSON object
+        """
+        builder = None
+        depth = 0
+        key = None
+        streaming_games = False
+        
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == '':
+                if event == 'map_key':
+                    key = value
+                elif event not in ('start_map', 'end_map'):
+                    raise ValueError("JSON document must be an object")
+                continue
+            
+            if builder is None:
+                if key == 'games' and prefix == 'games' and event == 'start_array':
+                    streaming_games = True
+                    yield 'games', []
+                    continue
+                if streaming_games and prefix == 'games' and event == 'end_array':
+                    streaming_games = False
+                    continue
+                builder = ijson.ObjectBuilder()
+            
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+            
+            if depth == 0:
+                yield (('games', 'item') if streaming_games else key), builder.value
+                builder = None
     
     def load_custom_schema(self, schema_path: str, schema_name: str) -> bool:
         """
@@ -83,7 +288,7 @@ class SchemaValidator:
             # Validate the schema itself
             self._validate_schema_structure(schema)
             
-            self.schemas[schema_name] = schema
+            self._set_schema(schema_name, schema)
             logger.info(f"Custom schema '{schema_name}' loaded from {schema_path}")
             return True
             
@@ -292,6 +497,47 @@ class SchemaValidator:
             "required": ["document_info"]
         }
     
+    def _get_football_schema(self) -> Dict[str, Any]:
+        """Get schema for merged and daily football game outputs."""
+        odds = {"type": ["number", "null"]}
+        return {
+            "type": "object",
+            "properties": {
+                "processing_info": {"type": "object"},
+                "file_info": {"type": "object"},
+                "extraction_info": {"type": "object"},
+                "games": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "league": {"type": "string"},
+                            "date": {"type": ["string", "null"]},
+                            "time": {"type": "string"},
+                            "home_team": {"type": "string"},
+                            "away_team": {"type": "string"},
+                            "original_home_team": {"type": "string"},
+                            "original_away_team": {"type": "string"},
+                            "main_market": {
+                                "type": ["object", "null"],
+                                "properties": {
+                                    "market_type": {"type": "string"},
+                                    "home_odds": odds,
+                                    "draw_odds": odds,
+                                    "away_odds": odds
+                                }
+                            },
+                            "additional_markets": {"type": "array", "items": {"type": "object"}},
+                            "total_markets": {"type": "integer", "minimum": 0},
+                            "processing_info": {"type": "object"}
+                        },
+                        "required": ["league", "time", "home_team", "away_team"]
+                    }
+                }
+            },
+            "required": ["games"]
+        }
+    
     def create_custom_schema(self, schema_definition: Dict[str, Any], schema_name: str) -> bool:
         """
         Create a custom schema from definition.
@@ -305,7 +551,7 @@ class SchemaValidator:
         """
         try:
             self._validate_schema_structure(schema_definition)
-            self.schemas[schema_name] = schema_definition
+            self._set_schema(schema_name, schema_definition)
             logger.info(f"Custom schema '{schema_name}' created")
             return True
         except Exception as e:
@@ -0,0 +1,340 @@
+"""
+Per-stage instrumentation for the football conversion pipeline.
+
+This module provides lightweight span tracing for pipeline stages:
+- Wall time and CPU time per stage
+- Input and output row counts
+- Resident memory delta, and Python allocations when tracemalloc tracing is enabled
+- Process-wide listeners so exporters (e.g. Prometheus) can observe finished spans
+- The stage each thread is currently executing, for sampling profilers
+- Chrome trace JSON export for offline inspection (chrome://tracing, Perfetto)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+StageListener = Callable[['StageSpan'], None]
+
+_listeners: List[StageListener] = []
+_listeners_lock = threading.Lock()
+
+# Thread id -> name of the stage that thread is currently executing
+_active_stages: Dict[int, str] = {}
+
+# tracemalloc is process-wide; spans from concurrent tracers share it and it
+# is only stopped once the last span relying on it has finished
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False  # started by stage tracers rather than someone else
+_tracemalloc_acquisitions = 0
+
+
+def get_active_stage(thread_id: int) -> Optional[str]:
+    """
+    Get the pipeline stage a thread is currently executing.
+
+    Args:
+        thread_id: Thread identifier as returned by threading.get_ident()
+
+    Returns:
+        Stage name, or None if the thread is not inside a traced stage
+    """
+    return _active_stages.get(thread_id)
+
+
+def _acquire_tracemalloc() -> Tuple[bool, int]:
+    """
+    Start using tracemalloc for a span, starting it if nobody traces yet.
+
+    Returns:
+        Whether the span may own the allocation peak (tracing belongs to the
+        stage tracers and no other span is using it), and the acquisition
+        number used to detect spans that overlap later
+    """
+    global _tracemalloc_users, _tracemalloc_owned, _tracemalloc_acquisitions
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+        _tracemalloc_acquisitions += 1
+        sole_owner = _tracemalloc_owned and _tracemalloc_users == 1
+        if sole_owner:
+            tracemalloc.reset_peak()
+        return sole_owner, _tracemalloc_acquisitions
+
+
+def _release_tracemalloc(sole_owner: bool, acquisition: int) -> Tuple[int, Optional[int]]:
+    """
+    Stop using tracemalloc for a span, stopping it after the last owned span.
+
+    Returns:
+        Current traced bytes and the peak, or None for the peak if other
+        spans shared tracing with this one
+    """
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        current, peak = tracemalloc.get_traced_memory()
+        if not (sole_owner and acquisition == _tracemalloc_acquisitions):
+            peak = None
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+        return current, peak
+
+
+def add_stage_listener(listener: StageListener) -> None:
+    """
+    Register a callback invoked with every finished stage span.
+
+    Args:
+        listener: Callable receiving the finished StageSpan
+    """
+    with _listeners_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_stage_listener(listener: StageListener) -> None:
+    """
+    Unregister a previously added stage listener.
+
+    Args:
+        listener: Callable passed to add_stage_listener
+    """
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+@dataclass
+class StageSpan:
+    """Measurements for a single pipeline stage execution."""
+    stage: str
+    job_id: Optional[str] = None
+    start_offset: float = 0.0  # seconds since the tracer started
+    wall_time: float = 0.0  # seconds
+    cpu_time: float = 0.0  # seconds of CPU time on the stage's thread
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    memory_delta_bytes: int = 0  # resident set size change
+    allocated_bytes: Optional[int] = None  # net Python allocations (tracemalloc only)
+    peak_allocated_bytes: Optional[int] = None  # allocation peak (only for spans that owned tracemalloc alone)
+    success: bool = True
+    error: Optional[str] = None
+    thread_id: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+class StageTracer:
+    """
+    Records one span per pipeline stage for a single conversion job.
+
+    Usage:
+        tracer = StageTracer(job_id="Web__65sz")
+        with tracer.stage('extraction', rows_in=len(lines)) as span:
+            matches = extractor.extract_football_data(content)
+            span.rows_out = len(matches)
+    """
+
+    def __init__(self, job_id: Optional[str] = None, trace_allocations: bool = False):
+        """
+        Initialize the tracer.
+
+        Args:
+            job_id: Identifier attached to every span and the trace file
+            trace_allocations: Track Python allocations with tracemalloc. This
+                gives exact allocated bytes but slows the traced code noticeably.
+                Allocation peaks are only reported when stage tracers started
+                tracemalloc and no other span shared it; resetting a peak
+                someone else is tracking (e.g. a benchmark runner) would
+                corrupt their measurement.
+        """
+        self.job_id = job_id
+        self.trace_allocations = trace_allocations
+        self.spans: List[StageSpan] = []
+        self.started_at = datetime.now()
+        self._origin = time.perf_counter()
+        self._process = psutil.Process(os.getpid()) if psutil else None
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageSpan]:
+        """
+        Measure a pipeline stage.
+
+        Exceptions raised inside the block are recorded on the span and
+        re-raised unchanged.
+
+        Args:
+            name: Stage name
+            rows_in: Number of input rows handed to the stage
+
+        Yields:
+            The span being recorded; set ``rows_out`` on it before leaving the block
+        """
+        thread_id = threading.get_ident()
+        span = StageSpan(stage=name, job_id=self.job_id, rows_in=rows_in, thread_id=thread_id)
+        outer_stage = _active_stages.get(thread_id)
+        _active_stages[thread_id] = name
+
+        if self.trace_allocations:
+            sole_owner, acquisition = _acquire_tracemalloc()
+            allocated_start = tracemalloc.get_traced_memory()[0]
+
+        rss_start = self._rss()
+        # Stages run on a single thread; process CPU time would also count
+        # other jobs converting concurrently
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        span.start_offset = wall_start - self._origin
+
+        try:
+            yield span
+        except BaseException as e:
+            span.success = False
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.wall_time = time.perf_counter() - wall_start
+            span.cpu_time = time.thread_time() - cpu_start
+            span.memory_delta_bytes = self._rss() - rss_start
+
+            if outer_stage is None:
+                _active_stages.pop(thread_id, None)
+            else:
+                _active_stages[thread_id] = outer_stage
+
+            if self.trace_allocations:
+                current, peak = _release_tracemalloc(sole_owner, acquisition)
+                span.allocated_bytes = current - allocated_start
+                if peak is not None:
+                    span.peak_allocated_bytes = peak - allocated_start
+
+            self.spans.append(span)
+            self._notify(span)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-stage measurements keyed by stage name.
+
+        Returns:
+            Dictionary mapping stage name to its span fields
+        """
+        return {
+            span.stage: {
+                'wall_time': span.wall_time,
+                'cpu_time': span.cpu_time,
+                'rows_in': span.rows_in,
+                'rows_out': span.rows_out,
+                'memory_delta_bytes': span.memory_delta_bytes,
+                'allocated_bytes': span.allocated_bytes,
+                'peak_allocated_bytes': span.peak_allocated_bytes,
+                'success': span.success,
+                'error': span.error
+            }
+            for span in self.spans
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Build a Chrome trace event document for the recorded spans.
+
+        Returns:
+            Dictionary in the Trace Event Format (complete "X" events, microseconds)
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [{
+            'name': 'process_name',
+            'ph': 'M',
+            'pid': pid,
+            'args': {'name': f"convert_football {self.job_id or ''}".strip()}
+        }]
+
+        for span in self.spans:
+            events.append({
+                'name': span.stage,
+                'cat': 'pipeline',
+                'ph': 'X',
+                'ts': span.start_offset * 1_000_000,
+                'dur': span.wall_time * 1_000_000,
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': {
+                    'cpu_time_ms': span.cpu_time * 1000,
+                    'rows_in': span.rows_in,
+                    'rows_out': span.rows_out,
+                    'memory_delta_bytes': span.memory_delta_bytes,
+                    'allocated_bytes': span.allocated_bytes,
+                    'peak_allocated_bytes': span.peak_allocated_bytes,
+                    'success': span.success,
+                    'error': span.error
+                }
+            })
+
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'job_id': self.job_id,
+                'started_at': self.started_at.isoformat()
+            }
+        }
+
+    def write_chrome_trace(self, output_dir: str) -> str:
+        """
+        Write the Chrome trace JSON for this job.
+
+        Args:
+            output_dir: Directory to write the trace file into
+
+        Returns:
+            Path of the written trace file
+        """
+        trace_dir = Path(output_dir)
+        trace_dir.mkdir(parents=True, exist_ok=True)
+
+        timestamp = self.started_at.strftime('%Y%m%d_%H%M%S')
+        trace_file = trace_dir / f"{self.job_id or 'job'}_{timestamp}.trace.json"
+
+        with open(trace_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+        return str(trace_file)
+
+    def _rss(self) -> int:
+        if self._process is None:
+            return 0
+        try:
+            return self._process.memory_info().rss
+        except Exception:
+            return 0
+
+    @staticmethod
+    def _notify(span: StageSpan) -> None:
+        with _listeners_lock:
+            listeners = list(_listeners)
+        for listener in listeners:
+            try:
+                listener(span)
+            except Exception as e:
+                logger.warning(f"Stage listener failed for stage {span.stage}: {e}")
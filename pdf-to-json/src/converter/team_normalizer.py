@@ -7,12 +7,48 @@ using alias mapping, heuristic rules, and fuzzy matching.
 import re
 import unicodedata
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Set
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Pattern, Tuple, Set
 from difflib import SequenceMatcher
 
 from .config_loader import load_team_aliases_config
 
 
+@dataclass(frozen=True)
+class TeamAliasIndex:
+    """A validated team aliases configuration with its patterns compiled.
+    
+    Attributes:
+        config: The validated configuration
+        remove_patterns: Compiled heuristic remove patterns, in order
+        replace_patterns: Compiled heuristic replace patterns with their replacements
+        lowered_aliases: (lower-cased alias, normalized name) pairs for fuzzy matching
+    """
+    config: Dict[str, Any]
+    remove_patterns: Tuple[Pattern, ...]
+    replace_patterns: Tuple[Tuple[Pattern, str], ...]
+    lowered_aliases: Tuple[Tuple[str, str], ...]
+
+
+def compile_team_aliases(config: Dict[str, Any]) -> TeamAliasIndex:
+    """Compile a team aliases configuration validated by the config loader.
+    
+    Args:
+        config: Team aliases configuration
+        
+    Returns:
+        TeamAliasIndex for the configuration
+    """
+    heuristics = config["heuristics"]
+    return TeamAliasIndex(
+        config=config,
+        remove_patterns=tuple(re.compile(pattern) for pattern in heuristics["remove_patterns"]),
+        replace_patterns=tuple((re.compile(pattern), replacement)
+                               for pattern, replacement in heuristics["replace_patterns"].items()),
+        lowered_aliases=tuple((alias.lower(), normalized) for alias, normalized in config["aliases"].items()),
+    )
+
+
 class TeamNormalizer:
     """Class for normalizing team names using alias mapping and heuristics.
     
@@ -25,25 +61,49 @@ class TeamNormalizer:
     It also tracks statistics about normalization operations for monitoring and debugging.
     """
     
-    def __init__(self, config_dir: str = "config", config_file: str = "team_aliases.json"):
+    def __init__(self, config_dir: str = "config", config_file: str = "team_aliases.json",
+                 index: Optional[TeamAliasIndex] = None):
         """Initialize the TeamNormalizer with configuration.
         
         Args:
             config_dir: Directory containing configuration files
             config_file: Name of the team aliases configuration file
+            index: Precompiled configuration, e.g. from the compiled converter
+                config (loaded from config_dir/config_file if None)
         """
         self.logger = logging.getLogger(__name__)
-        self.config = load_team_aliases_config(config_dir, config_file)
+        if index is None:
+            index = compile_team_aliases(load_team_aliases_config(config_dir, config_file))
+        self.apply_index(index)
+        
+        # Statistics tracking
+        self.stats = {
+            "total_normalizations": 0,
+            "direct_alias_matches": 0,
+            "heuristic_normalizations": 0,
+            "ocr_corrections": 0,
+            "fuzzy_matches": 0,
+            "unmatched": 0,
+            "unmatched_teams": set()
+        }
+    
+    def apply_index(self, index: TeamAliasIndex) -> None:
+        """Switch to another compiled configuration, keeping the statistics.
+        
+        Args:
+            index: Precompiled team aliases configuration
+        """
+        self.index = index
+        self.config = index.config
         
         # Extract configuration sections
         self.aliases = self.config["aliases"]
         self.heuristics = self.config["heuristics"]
         self.settings = self.config["settings"]
         
-        # Compile regex patterns for better performance
-        self.remove_patterns = [re.compile(pattern) for pattern in self.heuristics["remove_patterns"]]
-        self.replace_patterns = {re.compile(pattern): replacement 
-                               for pattern, replacement in self.heuristics["replace_patterns"].items()}
+        # Compiled regex patterns
+        self.remove_patterns = list(index.remove_patterns)
+        self.replace_patterns = dict(index.replace_patterns)
         
         # OCR error correction mapping
         self.ocr_errors = self.heuristics.get("common_ocr_errors", {})
@@ -57,17 +117,6 @@ class TeamNormalizer:
         self.max_edit_distance = self.settings.get("max_edit_distance", 2)
         self.min_confidence_threshold = self.settings.get("min_confidence_threshold", 0.8)
         self.log_unmatched_teams = self.settings.get("log_unmatched_teams", True)
-        
-        # Statistics tracking
-        self.stats = {
-            "total_normalizations": 0,
-            "direct_alias_matches": 0,
-            "heuristic_normalizations": 0,
-            "ocr_corrections": 0,
-            "fuzzy_matches": 0,
-            "unmatched": 0,
-            "unmatched_teams": set()
-        }
     
     def normalize(self, team_name: str) -> str:
         """Normalize a team name using all available methods.
@@ -225,11 +274,12 @@ class TeamNormalizer:
         """
         best_match = None
         best_ratio = 0.0
+        lowered_name = name.lower()
         
         # Check against all aliases and their normalized forms
-        for alias, normalized in self.aliases.items():
+        for alias, normalized in self.index.lowered_aliases:
             # Calculate similarity ratio
-            ratio = SequenceMatcher(None, name.lower(), alias.lower()).ratio()
+            ratio = SequenceMatcher(None, lowered_name, alias).ratio()
             
             if ratio > best_ratio and ratio >= self.min_confidence_threshold:
                 best_ratio = ratio
@@ -24,4 +24,6 @@ __all__ = [
     # Repositories
     'JobRepository', 'GameRepository', 'SystemMetricsRepository',
     'ProcessingReportRepository', 'AlertRepository', 'WebhookRepository',
+    'add_game_write_listener', 'remove_game_write_listener',
+    'ChunkedDeleteProgress', 'delete_in_chunks',
 ]
\ No newline at end of file
@@ -5,17 +5,23 @@ This module provides automated cleanup procedures for maintaining database
 performance and managing data retention according to configured policies.
 """
 
+import json
 import logging
+import os
+import uuid
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .connection import get_db_session, get_async_db_session
+from .models import Job, JobLog, Game, SystemMetric, ProcessingReport, Alert
+from .partitions import drop_partitions_before, ensure_partitions, is_partitioned
 from .repositories import (
     JobRepository, GameRepository, SystemMetricsRepository,
-    ProcessingReportRepository, AlertRepository
+    ProcessingReportRepository, AlertRepository,
+    ChunkedDeleteProgress, delete_in_chunks
 )
 
 logger = logging.getLogger(__name__)
@@ -31,6 +37,12 @@ class RetentionPolicy:
     processing_reports_days: int = 90
     alerts_resolved_days: int = 60
     job_logs_days: int = 30
+    # Rows deleted per transaction; None deletes each table in one statement
+    delete_batch_size: Optional[int] = None
+    delete_pause_seconds: float = 0.1
+    # Tables retained by dropping daily partitions (system_metrics, job_logs)
+    partitioned_tables: Tuple[str, ...] = ()
+    partition_premake_days: int = 7
 
 
 @dataclass
@@ -40,20 +52,111 @@ class CleanupResult:
     records_deleted: int
     execution_time_seconds: float
     error: Optional[str] = None
+    partitions_dropped: int = 0
 
 
 class DatabaseCleaner:
     """Database cleanup manager with configurable retention policies."""
     
-    def __init__(self, retention_policy: Optional[RetentionPolicy] = None):
+    def __init__(
+        self,
+        retention_policy: Optional[RetentionPolicy] = None,
+        checkpoint_path: Optional[str] = None,
+        progress_callback: Optional[Callable[[str, ChunkedDeleteProgress], None]] = None
+    ):
         """
         Initialize database cleaner.
         
         Args:
             retention_policy: Data retention policy configuration
+            checkpoint_path: JSON file recording where chunked deletes stopped,
+                so an interrupted cleanup resumes instead of starting over
+            progress_callback: Called with the table name and progress after
+                each chunked delete batch
         """
         self.retention_policy = retention_policy or RetentionPolicy()
         self.cleanup_results: List[CleanupResult] = []
+        self.checkpoint_path = checkpoint_path
+        self.progress_callback = progress_callback
+        self.checkpoints: Dict[str, str] = self._load_checkpoints()
+    
+    def _load_checkpoints(self) -> Dict[str, str]:
+        """Read the last deleted primary key per table from the checkpoint file."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cleanup checkpoint {self.checkpoint_path}: {e}")
+            return {}
+    
+    def _save_checkpoints(self) -> None:
+        """Write the checkpoints atomically."""
+        if not self.checkpoint_path:
+            return
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.checkpoints, f)
+        os.replace(temp_path, self.checkpoint_path)
+    
+    def _chunk_options(self, table_name: str) -> Dict[str, Any]:
+        """Keyword arguments for a chunked delete of ``table_name``, empty when disabled."""
+        if not self.retention_policy.delete_batch_size:
+            return {}
+        
+        resume_from = self.checkpoints.get(table_name)
+        if resume_from:
+            logger.info(f"Resuming cleanup of {table_name} after id {resume_from}")
+        
+        return {
+            'batch_size': self.retention_policy.delete_batch_size,
+            'pause_seconds': self.retention_policy.delete_pause_seconds,
+            'resume_from': uuid.UUID(resume_from) if resume_from else None,
+            'progress_callback': lambda progress: self._record_progress(table_name, progress),
+        }
+    
+    def _record_progress(self, table_name: str, progress: ChunkedDeleteProgress) -> None:
+        """Checkpoint and report a chunked delete batch."""
+        if progress.completed:
+            self.checkpoints.pop(table_name, None)
+        else:
+            self.checkpoints[table_name] = str(progress.last_key)
+            logger.info(f"Cleanup of {table_name}: {progress.deleted} records deleted "
+                        f"in {progress.batches} batches")
+        self._save_checkpoints()
+        
+        if self.progress_callback:
+            self.progress_callback(table_name, progress)
+    
+    def _delete_rows(self, session: Session, table_name: str, model, criteria: List[Any]) -> int:
+        """Delete rows matching ``criteria`` in one statement or in chunks."""
+        chunk_options = self._chunk_options(table_name)
+        if chunk_options:
+            return delete_in_chunks(session, model, criteria, **chunk_options).deleted
+        
+        deleted_count = session.query(model).filter(*criteria).delete()
+        session.commit()
+        return deleted_count
+    
+    def _drop_expired_partitions(self, session: Session, table: str, days: int) -> Optional[Tuple[int, int]]:
+        """
+        Retain a partitioned table by dropping whole days.
+        
+        Returns:
+            Optional[Tuple[int, int]]: Partitions dropped and estimated rows,
+            or None when the table is not partitioned
+        """
+        if table not in self.retention_policy.partitioned_tables:
+            return None
+        if not is_partitioned(session, table):
+            logger.warning(f"{table} is configured as partitioned but is a plain table; deleting rows")
+            return None
+        
+        today = datetime.now(timezone.utc).date()
+        ensure_partitions(session, table, today, self.retention_policy.partition_premake_days)
+        dropped, estimated_rows = drop_partitions_before(session, table, today - timedelta(days=days))
+        return len(dropped), estimated_rows
     
     def cleanup_all(self, dry_run: bool = False) -> List[CleanupResult]:
         """
@@ -115,15 +218,18 @@ class DatabaseCleaner:
                 if dry_run:
                     # Count records that would be deleted
                     cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.jobs_completed_days)
-                    count = (session.query(job_repo.Job)
+                    count = (session.query(Job)
                             .filter(
-                                job_repo.Job.status == 'completed',
-                                job_repo.Job.completed_at < cutoff_date
+                                Job.status == 'completed',
+                                Job.completed_at < cutoff_date
                             )
                             .count())
                     deleted_count = count
                 else:
-                    deleted_count = job_repo.cleanup_old_jobs(days=self.retention_policy.jobs_completed_days)
+                    deleted_count = job_repo.cleanup_old_jobs(
+                        days=self.retention_policy.jobs_completed_days,
+                        **self._chunk_options("jobs (completed)")
+                    )
                 
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
@@ -152,23 +258,20 @@ class DatabaseCleaner:
                 
                 if dry_run:
                     cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.jobs_failed_days)
-                    count = (session.query(job_repo.Job)
+                    count = (session.query(Job)
                             .filter(
-                                job_repo.Job.status == 'failed',
-                                job_repo.Job.completed_at < cutoff_date
+                                Job.status == 'failed',
+                                Job.completed_at < cutoff_date
                             )
                             .count())
                     deleted_count = count
                 else:
                     # Custom cleanup for failed jobs with different retention period
                     cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.jobs_failed_days)
-                    deleted_count = (session.query(job_repo.Job)
-                                   .filter(
-                                       job_repo.Job.status == 'failed',
-                                       job_repo.Job.completed_at < cutoff_date
-                                   )
-                                   .delete())
-                    session.commit()
+                    deleted_count = self._delete_rows(session, "jobs (failed)", Job, [
+                        Job.status == 'failed',
+                        Job.completed_at < cutoff_date
+                    ])
                 
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
@@ -197,12 +300,15 @@ class DatabaseCleaner:
                 
                 if dry_run:
                     cutoff_date = datetime.now().date() - timedelta(days=self.retention_policy.games_days)
-                    count = (session.query(game_repo.Game)
-                            .filter(game_repo.Game.date < cutoff_date)
+                    count = (session.query(Game)
+                            .filter(Game.date < cutoff_date)
                             .count())
                     deleted_count = count
                 else:
-                    deleted_count = game_repo.cleanup_old_games(days=self.retention_policy.games_days)
+                    deleted_count = game_repo.cleanup_old_games(
+                        days=self.retention_policy.games_days,
+                        **self._chunk_options("games")
+                    )
                 
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
@@ -224,6 +330,7 @@ class DatabaseCleaner:
     def _cleanup_system_metrics(self, dry_run: bool = False) -> CleanupResult:
         """Clean up old system metrics."""
         start_time = datetime.now()
+        partitions_dropped = 0
         
         try:
             with get_db_session() as session:
@@ -231,19 +338,29 @@ class DatabaseCleaner:
                 
                 if dry_run:
                     cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.system_metrics_days)
-                    count = (session.query(metrics_repo.SystemMetric)
-                            .filter(metrics_repo.SystemMetric.timestamp < cutoff_date)
+                    count = (session.query(SystemMetric)
+                            .filter(SystemMetric.timestamp < cutoff_date)
                             .count())
                     deleted_count = count
                 else:
-                    deleted_count = metrics_repo.cleanup_old_metrics(days=self.retention_policy.system_metrics_days)
+                    partitions = self._drop_expired_partitions(
+                        session, "system_metrics", self.retention_policy.system_metrics_days
+                    )
+                    if partitions:
+                        partitions_dropped, deleted_count = partitions
+                    else:
+                        deleted_count = metrics_repo.cleanup_old_metrics(
+                            days=self.retention_policy.system_metrics_days,
+                            **self._chunk_options("system_metrics")
+                        )
                 
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
                 return CleanupResult(
                     table_name="system_metrics",
                     records_deleted=deleted_count,
-                    execution_time_seconds=execution_time
+                    execution_time_seconds=execution_time,
+                    partitions_dropped=partitions_dropped
                 )
                 
         except Exception as e:
@@ -265,16 +382,16 @@ class DatabaseCleaner:
                 
                 if dry_run:
                     cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.processing_reports_days)
-                    count = (session.query(report_repo.ProcessingReport)
-                            .filter(report_repo.ProcessingReport.generated_at < cutoff_date)
+                    count = (session.query(ProcessingReport)
+                            .filter(ProcessingReport.generated_at < cutoff_date)
                             .count())
                     deleted_count = count
                 else:
                     cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.processing_reports_days)
-                    deleted_count = (session.query(report_repo.ProcessingReport)
-                                   .filter(report_repo.ProcessingReport.generated_at < cutoff_date)
-                                   .delete())
-                    session.commit()
+                    deleted_count = self._delete_rows(
+                        session, "processing_reports", ProcessingReport,
+                        [ProcessingReport.generated_at < cutoff_date]
+                    )
                 
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
@@ -303,22 +420,19 @@ class DatabaseCleaner:
                 
                 if dry_run:
                     cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.alerts_resolved_days)
-                    count = (session.query(alert_repo.Alert)
+                    count = (session.query(Alert)
                             .filter(
-                                alert_repo.Alert.status == 'resolved',
-                                alert_repo.Alert.resolved_at < cutoff_date
+                                Alert.status == 'resolved',
+                                Alert.resolved_at < cutoff_date
                             )
                             .count())
                     deleted_count = count
                 else:
                     cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.alerts_resolved_days)
-                    deleted_count = (session.query(alert_repo.Alert)
-                                   .filter(
-                                       alert_repo.Alert.status == 'resolved',
-                                       alert_repo.Alert.resolved_at < cutoff_date
-                                   )
-                                   .delete())
-                    session.commit()
+                    deleted_count = self._delete_rows(session, "alerts (resolved)", Alert, [
+                        Alert.status == 'resolved',
+                        Alert.resolved_at < cutoff_date
+                    ])
                 
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
@@ -340,6 +454,7 @@ class DatabaseCleaner:
     def _cleanup_job_logs(self, dry_run: bool = False) -> CleanupResult:
         """Clean up old job logs."""
         start_time = datetime.now()
+        partitions_dropped = 0
         
         try:
             with get_db_session() as session:
@@ -347,23 +462,29 @@ class DatabaseCleaner:
                 
                 if dry_run:
                     cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.job_logs_days)
-                    count = (session.query(job_repo.JobLog)
-                            .filter(job_repo.JobLog.timestamp < cutoff_date)
+                    count = (session.query(JobLog)
+                            .filter(JobLog.timestamp < cutoff_date)
                             .count())
                     deleted_count = count
                 else:
-                    cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.job_logs_days)
-                    deleted_count = (session.query(job_repo.JobLog)
-                                   .filter(job_repo.JobLog.timestamp < cutoff_date)
-                                   .delete())
-                    session.commit()
+                    partitions = self._drop_expired_partitions(
+                        session, "job_logs", self.retention_policy.job_logs_days
+                    )
+                    if partitions:
+                        partitions_dropped, deleted_count = partitions
+                    else:
+                        deleted_count = job_repo.cleanup_old_job_logs(
+                            days=self.retention_policy.job_logs_days,
+                            **self._chunk_options("job_logs")
+                        )
                 
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
                 return CleanupResult(
                     table_name="job_logs",
                     records_deleted=deleted_count,
-                    execution_time_seconds=execution_time
+                    execution_time_seconds=execution_time,
+                    partitions_dropped=partitions_dropped
                 )
                 
         except Exception as e:
@@ -392,6 +513,7 @@ class DatabaseCleaner:
                     'table': r.table_name,
                     'records_deleted': r.records_deleted,
                     'execution_time': r.execution_time_seconds,
+                    'partitions_dropped': r.partitions_dropped,
                     'success': r.error is None
                 }
                 for r in self.cleanup_results
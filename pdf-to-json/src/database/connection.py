@@ -66,9 +66,18 @@ class DatabaseManager:
         
         self._initialize_connections()
     
+    @property
+    def is_sqlite(self) -> bool:
+        """Whether the database is a local SQLite file."""
+        return self.database_url.startswith('sqlite')
+    
     def _initialize_connections(self):
         """Initialize database connections and session factories."""
         try:
+            if self.is_sqlite:
+                self._initialize_sqlite_connections()
+                return
+            
             # Create synchronous engine
             self._sync_engine = create_engine(
                 self.database_url,
@@ -126,6 +135,29 @@ class DatabaseManager:
             logger.error(f"Failed to initialize database connections: {e}")
             raise
     
+    def _initialize_sqlite_connections(self):
+        """
+        Initialize a synchronous-only engine for local SQLite databases.
+        
+        SQLite has no schemas, so the ``automation``, ``football`` and
+        ``monitoring`` schemas are mapped onto the main database, and there is
+        no async driver to pool.
+        """
+        self._sync_engine = create_engine(
+            self.database_url,
+            echo=self.echo,
+            connect_args={"check_same_thread": False},
+            execution_options={"schema_translate_map": {"automation": None, "football": None, "monitoring": None}}
+        )
+        self._sync_session_factory = sessionmaker(
+            bind=self._sync_engine,
+            expire_on_commit=False,
+            autoflush=True,
+            autocommit=False
+        )
+        self._setup_event_listeners()
+        logger.info("SQLite database connection initialized")
+    
     def _setup_event_listeners(self):
         """Setup event listeners for connection management."""
         
@@ -11,11 +11,10 @@ from enum import Enum
 from typing import Dict, Any, Optional, List
 from sqlalchemy import (
     Column, String, DateTime, Text, Boolean, Float, Integer,
-    ForeignKey, Index, JSON, Date, ARRAY, UUID
+    ForeignKey, Index, JSON, Date, ARRAY, UUID, Uuid, UniqueConstraint
 )
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.sql import func
 
 Base = declarative_base()
@@ -59,7 +58,7 @@ class Job(Base):
     __table_args__ = {'schema': 'automation'}
     
     # Primary key and identification
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     job_type = Column(String(50), nullable=False)
     status = Column(String(20), nullable=False, default=JobStatus.PENDING.value)
     priority = Column(Integer, nullable=False, default=JobPriority.NORMAL.value)
@@ -136,8 +135,8 @@ class JobLog(Base):
     __tablename__ = 'job_logs'
     __table_args__ = {'schema': 'automation'}
     
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    job_id = Column(PostgresUUID(as_uuid=True), ForeignKey('automation.jobs.id'), nullable=False)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = Column(Uuid(as_uuid=True), ForeignKey('automation.jobs.id'), nullable=False)
     level = Column(String(10), nullable=False)
     message = Column(Text, nullable=False)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
@@ -177,7 +176,7 @@ class SystemMetric(Base):
     __tablename__ = 'system_metrics'
     __table_args__ = {'schema': 'automation'}
     
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     metric_name = Column(String(100), nullable=False)
     metric_value = Column(Float, nullable=False)
@@ -214,7 +213,7 @@ class Game(Base):
     __tablename__ = 'games'
     __table_args__ = {'schema': 'football'}
     
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     league = Column(String(100), nullable=False)
     date = Column(Date, nullable=False)
     iso_date = Column(String(20), nullable=False)
@@ -237,6 +236,7 @@ class Game(Base):
         Index('idx_games_date', 'date'),
         Index('idx_games_teams', 'home_team', 'away_team'),
         Index('idx_games_created_at', 'created_at'),
+        UniqueConstraint('date', 'home_team', 'away_team', name='uq_games_date_teams'),
         {'schema': 'football'}
     )
     
@@ -272,7 +272,7 @@ class ProcessingReport(Base):
     __tablename__ = 'processing_reports'
     __table_args__ = {'schema': 'football'}
     
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     report_type = Column(String(50), nullable=False)
     generated_at = Column(DateTime(timezone=True), server_default=func.now())
     data = Column(JSON, nullable=False)
@@ -305,7 +305,7 @@ class Alert(Base):
     __tablename__ = 'alerts'
     __table_args__ = {'schema': 'monitoring'}
     
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     alert_type = Column(String(50), nullable=False)
     severity = Column(String(20), nullable=False)
     title = Column(String(200), nullable=False)
@@ -348,7 +348,7 @@ class Webhook(Base):
     __tablename__ = 'webhooks'
     __table_args__ = {'schema': 'monitoring'}
     
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     url = Column(Text, nullable=False)
     events = Column(ARRAY(String), nullable=False)
     secret = Column(String(100))
@@ -0,0 +1,186 @@
+"""
+Time-partitioned layout for append-only tables.
+
+``automation.system_metrics`` and ``automation.job_logs`` can be converted to
+PostgreSQL tables partitioned by day on ``timestamp``. Retention then drops
+whole partitions instead of deleting rows, which takes no row locks and
+leaves no dead tuples behind for VACUUM. Partitions are named
+``<table>_pYYYYMMDD`` and hold one UTC day each.
+"""
+
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = 'automation'
+
+# Partitionable tables and the secondary indexes recreated on the partitioned parent
+PARTITIONED_TABLES: Dict[str, Tuple[str, ...]] = {
+    'system_metrics': (
+        'CREATE INDEX idx_system_metrics_timestamp ON automation.system_metrics (timestamp)',
+        'CREATE INDEX idx_system_metrics_name ON automation.system_metrics (metric_name)',
+        'CREATE INDEX idx_system_metrics_component ON automation.system_metrics (component)',
+    ),
+    'job_logs': (
+        'CREATE INDEX idx_job_logs_timestamp ON automation.job_logs (timestamp)',
+        'CREATE INDEX idx_job_logs_job_id ON automation.job_logs (job_id)',
+    ),
+}
+
+_PARTITION_SUFFIX = re.compile(r'_p(\d{8})$')
+
+
+def _check_table(table: str) -> None:
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"Table {table} does not support partitioning")
+
+
+def partition_name(table: str, day: date) -> str:
+    """Name of the partition holding ``day``."""
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def partition_day(name: str) -> Optional[date]:
+    """Day held by a partition, or None if the name does not follow the convention."""
+    match = _PARTITION_SUFFIX.search(name)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), '%Y%m%d').date()
+
+
+def partitions_to_drop(names: Sequence[str], cutoff: date) -> List[str]:
+    """Partitions whose whole day lies before ``cutoff``, oldest first."""
+    expired = [(day, name) for name in names
+               if (day := partition_day(name)) is not None and day < cutoff]
+    return [name for _, name in sorted(expired)]
+
+
+def is_partitioned(session: Session, table: str) -> bool:
+    """Whether ``table`` is a partitioned table on this database."""
+    _check_table(table)
+    if session.get_bind().dialect.name != 'postgresql':
+        return False
+    relkind = session.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+        {'name': f'{SCHEMA}.{table}'}
+    ).scalar()
+    return relkind == 'p'
+
+
+def list_partitions(session: Session, table: str) -> List[str]:
+    """Names of the partitions attached to ``table``."""
+    _check_table(table)
+    rows = session.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(:name)
+        ORDER BY child.relname
+    """), {'name': f'{SCHEMA}.{table}'})
+    return [row[0] for row in rows]
+
+
+def ensure_partitions(session: Session, table: str, start: date, days: int,
+                      commit: bool = True) -> List[str]:
+    """
+    Create the daily partitions for ``days`` days from ``start`` if missing.
+
+    Run this ahead of time (the cleaner does on every run): rows for a day
+    without a partition are rejected.
+
+    Returns:
+        List[str]: Names of the partitions covering the range
+    """
+    _check_table(table)
+    names = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        name = partition_name(table, day)
+        session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA}.{name} PARTITION OF {SCHEMA}.{table} "
+            f"FOR VALUES FROM ('{day.isoformat()} 00:00+00') "
+            f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00+00')"
+        ))
+        names.append(name)
+    if commit:
+        session.commit()
+    return names
+
+
+def drop_partitions_before(session: Session, table: str, cutoff: date) -> Tuple[List[str], int]:
+    """
+    Detach and drop the partitions that only hold rows older than ``cutoff``.
+
+    Returns:
+        Tuple[List[str], int]: Dropped partitions and their estimated row count
+    """
+    _check_table(table)
+    expired = partitions_to_drop(list_partitions(session, table), cutoff)
+    estimated_rows = 0
+    for name in expired:
+        estimated_rows += max(int(session.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"),
+            {'name': f'{SCHEMA}.{name}'}
+        ).scalar() or 0), 0)
+        session.execute(text(f"ALTER TABLE {SCHEMA}.{table} DETACH PARTITION {SCHEMA}.{name}"))
+        session.execute(text(f"DROP TABLE {SCHEMA}.{name}"))
+        session.commit()
+        logger.info(f"Dropped partition {SCHEMA}.{name}")
+    return expired, estimated_rows
+
+
+def convert_to_partitioned(session: Session, table: str, days_ahead: int = 7) -> List[str]:
+    """
+    Rebuild ``table`` as a table partitioned by day on ``timestamp``.
+
+    Existing rows are copied into daily partitions covering their range and
+    ``days_ahead`` days past today. The primary key becomes
+    ``(id, timestamp)`` because PostgreSQL requires the partition key in it.
+    Run during a maintenance window: the copy holds an exclusive lock.
+
+    Returns:
+        List[str]: Names of the partitions created
+    """
+    _check_table(table)
+    if is_partitioned(session, table):
+        return list_partitions(session, table)
+
+    legacy = f'{table}_unpartitioned'
+    today = datetime.now(timezone.utc).date()
+    oldest = session.execute(text(f"SELECT min(timestamp) FROM {SCHEMA}.{table}")).scalar()
+    start = oldest.astimezone(timezone.utc).date() if oldest else today
+
+    session.execute(text(f"LOCK TABLE {SCHEMA}.{table} IN ACCESS EXCLUSIVE MODE"))
+    session.execute(text(f"ALTER TABLE {SCHEMA}.{table} RENAME TO {legacy}"))
+    session.execute(text(f"ALTER TABLE {SCHEMA}.{legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey"))
+    for statement in PARTITIONED_TABLES[table]:
+        index_name = statement.split()[2]
+        session.execute(text(f"ALTER INDEX IF EXISTS {SCHEMA}.{index_name} RENAME TO {index_name}_unpartitioned"))
+    session.execute(text(
+        f"CREATE TABLE {SCHEMA}.{table} (LIKE {SCHEMA}.{legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE (timestamp)"
+    ))
+    session.execute(text(f"ALTER TABLE {SCHEMA}.{table} ALTER COLUMN timestamp SET NOT NULL"))
+    session.execute(text(f"ALTER TABLE {SCHEMA}.{table} ADD PRIMARY KEY (id, timestamp)"))
+    if table == 'job_logs':
+        session.execute(text(
+            f"ALTER TABLE {SCHEMA}.job_logs ADD FOREIGN KEY (job_id) REFERENCES {SCHEMA}.jobs (id)"
+        ))
+    for statement in PARTITIONED_TABLES[table]:
+        session.execute(text(statement))
+
+    names = ensure_partitions(session, table, start, (today - start).days + days_ahead + 1,
+                              commit=False)
+    session.execute(text(
+        f"INSERT INTO {SCHEMA}.{table} SELECT * FROM {SCHEMA}.{legacy} WHERE timestamp IS NOT NULL"
+    ))
+    session.execute(text(f"DROP TABLE {SCHEMA}.{legacy}"))
+    session.commit()
+    logger.info(f"Converted {SCHEMA}.{table} to {len(names)} daily partitions")
+    return names
@@ -6,10 +6,16 @@ for different entities, following the repository pattern for clean separation
 of concerns.
 """
 
+import base64
+import json
+import logging
+import time
 import uuid
-from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any, Union
-from sqlalchemy import and_, or_, desc, asc, func, select, update, delete
+from dataclasses import dataclass
+from datetime import date as date_type, datetime, timezone, timedelta
+from typing import Callable, List, Optional, Dict, Any, Sequence, Tuple, Union
+from sqlalchemy import and_, or_, desc, asc, func, select, update, delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, NoResultFound
@@ -20,6 +26,143 @@ from .models import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+# Columns a games query may project. JSON market blobs are only read when asked for.
+GAME_QUERY_COLUMNS = (
+    'id', 'league', 'date', 'iso_date', 'time', 'home_team', 'away_team',
+    'original_home_team', 'original_away_team', 'quality_score',
+    'main_market', 'additional_markets', 'processing_metadata', 'confidence_scores'
+)
+GAME_DEFAULT_COLUMNS = (
+    'id', 'league', 'date', 'iso_date', 'time', 'home_team', 'away_team', 'quality_score'
+)
+# The keyset columns are always selected so the next page cursor can be built
+GAME_KEYSET_COLUMNS = ('date', 'time', 'id')
+# Natural key of a game, backed by the uq_games_date_teams constraint
+GAME_NATURAL_KEY = ('date', 'home_team', 'away_team')
+
+# Callbacks notified after games are written or deleted
+_game_write_listeners: List[Callable[[int], None]] = []
+
+
+def add_game_write_listener(listener: Callable[[int], None]) -> None:
+    """Register a callback invoked with the row count after games change."""
+    if listener not in _game_write_listeners:
+        _game_write_listeners.append(listener)
+
+
+def remove_game_write_listener(listener: Callable[[int], None]) -> None:
+    """Unregister a game write callback."""
+    if listener in _game_write_listeners:
+        _game_write_listeners.remove(listener)
+
+
+def _notify_game_write(count: int) -> None:
+    """Tell listeners that games changed; listener errors never fail the write."""
+    for listener in list(_game_write_listeners):
+        try:
+            listener(count)
+        except Exception as e:
+            logger.error(f"Game write listener failed: {e}")
+
+
+def encode_game_cursor(row: Dict[str, Any]) -> str:
+    """Encode the keyset position of a game row as an opaque cursor."""
+    key = [row['date'].isoformat(), row['time'], str(row['id'])]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_game_cursor(cursor: str) -> Tuple[date_type, str, uuid.UUID]:
+    """
+    Decode a cursor produced by ``encode_game_cursor``.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        game_date, game_time, game_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date_type.fromisoformat(game_date), str(game_time), uuid.UUID(game_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+@dataclass
+class ChunkedDeleteProgress:
+    """Progress of a chunked delete; ``last_key`` is the resume point."""
+    table_name: str
+    deleted: int = 0
+    batches: int = 0
+    last_key: Optional[uuid.UUID] = None
+    completed: bool = False
+
+
+def delete_in_chunks(
+    session: Session,
+    model,
+    criteria: Sequence[Any],
+    batch_size: int = 5000,
+    pause_seconds: float = 0.0,
+    resume_from: Optional[uuid.UUID] = None,
+    progress_callback: Optional[Callable[[ChunkedDeleteProgress], None]] = None
+) -> ChunkedDeleteProgress:
+    """
+    Delete matching rows in primary key order, one bounded batch per transaction.
+    
+    Each batch selects the next ``batch_size`` ids above the last deleted id
+    and deletes exactly those rows, so locks are held briefly and the scan
+    never revisits the dead rows of earlier batches. The progress callback
+    runs after every committed batch; pass its ``last_key`` back as
+    ``resume_from`` to continue an interrupted run.
+    
+    Args:
+        session: Synchronous session
+        model: Mapped class with an ``id`` primary key
+        criteria: Filter expressions selecting the rows to delete
+        batch_size: Rows deleted per transaction
+        pause_seconds: Sleep between batches to let other writers in
+        resume_from: Primary key to continue after
+        progress_callback: Called with the progress after each batch
+        
+    Returns:
+        ChunkedDeleteProgress: Totals for this run
+    """
+    if isinstance(session, AsyncSession):
+        raise ValueError("Chunked deletes need a synchronous session")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    
+    progress = ChunkedDeleteProgress(table_name=model.__tablename__, last_key=resume_from)
+    while True:
+        query = select(model.id).where(*criteria)
+        if progress.last_key is not None:
+            query = query.where(model.id > progress.last_key)
+        ids = session.scalars(query.order_by(model.id).limit(batch_size)).all()
+        if not ids:
+            break
+        
+        result = session.execute(
+            delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        session.commit()
+        
+        progress.deleted += result.rowcount
+        progress.batches += 1
+        progress.last_key = ids[-1]
+        if progress_callback:
+            progress_callback(progress)
+        if len(ids) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    
+    progress.completed = True
+    if progress_callback:
+        progress_callback(progress)
+    return progress
+
+
 class BaseRepository:
     """Base repository class with common operations."""
     
@@ -253,23 +396,45 @@ class JobRepository(BaseRepository):
         
         return query.all()
     
-    def cleanup_old_jobs(self, days: int = 30) -> int:
-        """Clean up completed jobs older than specified days."""
+    def cleanup_old_jobs(self, days: int = 30, batch_size: Optional[int] = None, **chunk_options) -> int:
+        """
+        Clean up completed jobs older than specified days.
+        
+        With ``batch_size`` the rows are removed by ``delete_in_chunks``;
+        ``chunk_options`` are passed through to it.
+        """
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        criteria = [
+            Job.status.in_([JobStatus.COMPLETED.value, JobStatus.FAILED.value]),
+            Job.completed_at < cutoff_date
+        ]
+        
+        if batch_size:
+            return delete_in_chunks(self.session, Job, criteria, batch_size, **chunk_options).deleted
         
         deleted_count = (self.session.query(Job)
-                        .filter(
-                            and_(
-                                Job.status.in_([JobStatus.COMPLETED.value, JobStatus.FAILED.value]),
-                                Job.completed_at < cutoff_date
-                            )
-                        )
+                        .filter(and_(*criteria))
                         .delete())
         
         if not self.is_async:
             self.session.commit()
         
         return deleted_count
+    
+    def cleanup_old_job_logs(self, days: int = 30, batch_size: Optional[int] = None, **chunk_options) -> int:
+        """Clean up job log entries older than specified days."""
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        criteria = [JobLog.timestamp < cutoff_date]
+        
+        if batch_size:
+            return delete_in_chunks(self.session, JobLog, criteria, batch_size, **chunk_options).deleted
+        
+        deleted_count = self.session.query(JobLog).filter(*criteria).delete()
+        
+        if not self.is_async:
+            self.session.commit()
+        
+        return deleted_count
 
 
 class GameRepository(BaseRepository):
@@ -283,9 +448,127 @@ class GameRepository(BaseRepository):
         if not self.is_async:
             self.session.commit()
             self.session.refresh(game)
+            _notify_game_write(1)
         
         return game
     
+    def query_games(
+        self,
+        date: Optional[date_type] = None,
+        date_from: Optional[date_type] = None,
+        date_to: Optional[date_type] = None,
+        league: Optional[str] = None,
+        home_team: Optional[str] = None,
+        away_team: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Query one page of games ordered by (date, time, id).
+        
+        Pages are addressed by keyset cursor, so deep pages cost the same as
+        the first one. Filters map onto the league, date and teams indexes,
+        and only the requested columns are selected.
+        
+        Args:
+            date: Exact match date
+            date_from: Inclusive lower date bound
+            date_to: Inclusive upper date bound
+            league: League name
+            home_team: Home team name
+            away_team: Away team name (requires home_team to use idx_games_teams)
+            columns: Columns to return, defaults to GAME_DEFAULT_COLUMNS
+            cursor: Cursor of the last row of the previous page
+            limit: Page size
+            offset: Legacy row offset, ignored when a cursor is given
+            
+        Returns:
+            Dictionary with the page rows and the next page cursor
+            
+        Raises:
+            ValueError: On unknown columns or a malformed cursor
+        """
+        requested = list(columns or GAME_DEFAULT_COLUMNS)
+        unknown = set(requested) - set(GAME_QUERY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown game columns: {', '.join(sorted(unknown))}")
+        selected = requested + [name for name in GAME_KEYSET_COLUMNS if name not in requested]
+        
+        query = select(*(getattr(Game, name) for name in selected)).where(
+            *self._game_filters(date, date_from, date_to, league, home_team, away_team)
+        )
+        
+        if cursor:
+            after_date, after_time, after_id = decode_game_cursor(cursor)
+            # Expanded row comparison; the leading date bound keeps it an index range
+            query = query.where(and_(
+                Game.date >= after_date,
+                or_(
+                    Game.date > after_date,
+                    and_(Game.date == after_date, or_(
+                        Game.time > after_time,
+                        and_(Game.time == after_time, Game.id > after_id)
+                    ))
+                )
+            ))
+        elif offset > 0:
+            query = query.offset(offset)
+        
+        # One extra row tells whether another page exists
+        query = query.order_by(asc(Game.date), asc(Game.time), asc(Game.id)).limit(limit + 1)
+        rows = [dict(row._mapping) for row in self.session.execute(query)]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_game_cursor(rows[-1])
+        
+        games = []
+        for row in rows:
+            game = {name: row[name] for name in requested}
+            if 'id' in game:
+                game['id'] = str(game['id'])
+            if 'date' in game:
+                game['date'] = game['date'].isoformat()
+            games.append(game)
+        
+        return {'games': games, 'next_cursor': next_cursor}
+    
+    def count_games(
+        self,
+        date: Optional[date_type] = None,
+        date_from: Optional[date_type] = None,
+        date_to: Optional[date_type] = None,
+        league: Optional[str] = None,
+        home_team: Optional[str] = None,
+        away_team: Optional[str] = None
+    ) -> int:
+        """Count games matching the same filters as ``query_games``."""
+        query = select(func.count()).select_from(Game).where(
+            *self._game_filters(date, date_from, date_to, league, home_team, away_team)
+        )
+        return self.session.execute(query).scalar_one()
+    
+    @staticmethod
+    def _game_filters(date, date_from, date_to, league, home_team, away_team) -> List[Any]:
+        """Build WHERE conditions for game queries."""
+        conditions = []
+        if date is not None:
+            conditions.append(Game.date == date)
+        if date_from is not None:
+            conditions.append(Game.date >= date_from)
+        if date_to is not None:
+            conditions.append(Game.date <= date_to)
+        if league:
+            conditions.append(Game.league == league)
+        if home_team:
+            conditions.append(Game.home_team == home_team)
+        if away_team:
+            conditions.append(Game.away_team == away_team)
+        return conditions
+    
     def get_games_by_date(self, date: datetime.date, league: Optional[str] = None) -> List[Game]:
         """Get games by date and optionally by league."""
         query = self.session.query(Game).filter(Game.date == date)
@@ -304,28 +587,106 @@ class GameRepository(BaseRepository):
         
         return query.all()
     
-    def bulk_create_games(self, games_data: List[Dict[str, Any]]) -> List[Game]:
-        """Bulk create game records."""
-        games = [Game(**game_data) for game_data in games_data]
-        self.session.add_all(games)
-        
-        if not self.is_async:
-            self.session.commit()
-            for game in games:
-                self.session.refresh(game)
+    def bulk_create_games(
+        self,
+        games_data: List[Dict[str, Any]],
+        batch_size: int = 1000,
+        upsert: bool = False,
+        return_games: bool = True
+    ) -> List[Game]:
+        """
+        Bulk create game records.
+        
+        Rows are sent as multi-row INSERT ... RETURNING statements of
+        ``batch_size`` rows, so inserted games come back without a SELECT per
+        row. With ``upsert`` an existing game with the same date and teams is
+        updated in place, which makes re-ingesting a file idempotent.
+        
+        Args:
+            games_data: Game column values
+            batch_size: Rows per INSERT statement
+            upsert: Update games that already exist instead of failing
+            return_games: Return the stored Game objects; skip for pure loads
+            
+        Returns:
+            Stored games, or an empty list when ``return_games`` is False
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        
+        if self.is_async:
+            games = [Game(**game_data) for game_data in games_data]
+            self.session.add_all(games)
+            return games
+        
+        if upsert:
+            # One statement must not touch the same key twice; the last row wins
+            latest = {tuple(game_data[name] for name in GAME_NATURAL_KEY): game_data
+                      for game_data in games_data}
+            games_data = list(latest.values())
+        
+        statement = self._game_upsert_statement() if upsert else insert(Game)
+        if return_games:
+            statement = statement.returning(Game).execution_options(populate_existing=True)
+        
+        games: List[Game] = []
+        for start in range(0, len(games_data), batch_size):
+            batch = games_data[start:start + batch_size]
+            if return_games:
+                games.extend(self.session.scalars(statement, batch).all())
+            else:
+                self.session.execute(statement, batch)
+        
+        self.session.commit()
+        if games_data:
+            _notify_game_write(len(games_data))
         
         return games
     
-    def cleanup_old_games(self, days: int = 90) -> int:
-        """Clean up games older than specified days."""
+    def _game_upsert_statement(self):
+        """Build an INSERT ... ON CONFLICT DO UPDATE on the game natural key."""
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            statement = postgresql.insert(Game)
+        elif dialect == 'sqlite':
+            statement = sqlite.insert(Game)
+        else:
+            raise ValueError(f"Upsert is not supported on {dialect}")
+        
+        excluded = statement.excluded
+        updates = {
+            column.name: excluded[column.name]
+            for column in Game.__table__.columns
+            if column.name not in ('id', 'created_at', 'updated_at') + GAME_NATURAL_KEY
+        }
+        updates['updated_at'] = func.now()
+        return statement.on_conflict_do_update(index_elements=list(GAME_NATURAL_KEY), set_=updates)
+    
+    def cleanup_old_games(self, days: int = 90, batch_size: Optional[int] = None, **chunk_options) -> int:
+        """
+        Clean up games older than specified days.
+        
+        With ``batch_size`` the rows are removed by ``delete_in_chunks``;
+        ``chunk_options`` are passed through to it.
+        """
         cutoff_date = datetime.now().date() - timedelta(days=days)
         
+        if batch_size:
+            deleted_count = delete_in_chunks(
+                self.session, Game, [Game.date < cutoff_date], batch_size, **chunk_options
+            ).deleted
+            if deleted_count:
+                _notify_game_write(deleted_count)
+            return deleted_count
+        
         deleted_count = (self.session.query(Game)
                         .filter(Game.date < cutoff_date)
                         .delete())
         
         if not self.is_async:
             self.session.commit()
+            if deleted_count:
+                _notify_game_write(deleted_count)
         
         return deleted_count
 
@@ -379,10 +740,21 @@ class SystemMetricsRepository(BaseRepository):
         
         return query.all()
     
-    def cleanup_old_metrics(self, days: int = 7) -> int:
-        """Clean up metrics older than specified days."""
+    def cleanup_old_metrics(self, days: int = 7, batch_size: Optional[int] = None, **chunk_options) -> int:
+        """
+        Clean up metrics older than specified days.
+        
+        With ``batch_size`` the rows are removed by ``delete_in_chunks``;
+        ``chunk_options`` are passed through to it.
+        """
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         
+        if batch_size:
+            return delete_in_chunks(
+                self.session, SystemMetric, [SystemMetric.timestamp < cutoff_date],
+                batch_size, **chunk_options
+            ).deleted
+        
         deleted_count = (self.session.query(SystemMetric)
                         .filter(SystemMetric.timestamp < cutoff_date)
                         .delete())
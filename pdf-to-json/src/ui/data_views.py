@@ -0,0 +1,154 @@
+"""
+Data views for the Streamlit UI.
+
+Helpers that turn uploaded or converted JSON into what the pages render: a
+content hash used as the cache key, the parsed document, a summary of its
+records and fixed-size pages of table rows. They have no Streamlit
+dependency; streamlit_app.py wraps them in its caches so a rerun only
+repeats work when the file content changes.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PAGE_SIZES: Tuple[int, ...] = (25, 50, 100, 250)
+
+# Top-level keys holding the record list, in order of preference
+RECORD_KEYS: Tuple[str, ...] = ('games', 'matches', 'pages', 'tables')
+
+# Documents at most this large are shown whole with st.json
+INLINE_JSON_LIMIT = 256 * 1024
+
+
+def content_digest(content: bytes) -> str:
+    """SHA-256 hex digest of ``content``, the cache key for its views."""
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass
+class JsonView:
+    """
+    Parsed JSON document with the record list shown as a paged table.
+
+    ``records`` is the document itself when it is a list, otherwise the list
+    under ``record_key`` (empty when the document has no list of objects).
+    """
+    digest: str
+    size: int
+    data: Any
+    record_key: Optional[str]
+    records: List[Any] = field(default_factory=list)
+    summary: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def inline(self) -> bool:
+        """Whether the document is small enough to render whole."""
+        return self.size <= INLINE_JSON_LIMIT
+
+    def page_count(self, page_size: int) -> int:
+        return max(1, -(-len(self.records) // page_size))
+
+    def page_rows(self, page: int, page_size: int) -> List[Dict[str, Any]]:
+        """Table rows for the 1-based ``page``, clamped to the valid range."""
+        page = min(max(page, 1), self.page_count(page_size))
+        start = (page - 1) * page_size
+        return [flatten_record(record) for record in self.records[start:start + page_size]]
+
+
+def find_records(data: Any) -> Tuple[Optional[str], List[Any]]:
+    """
+    Locate the list of records in a JSON document.
+
+    Returns:
+        Tuple of the top-level key (None for a top-level list) and the list
+    """
+    if isinstance(data, list):
+        return None, data
+    if not isinstance(data, dict):
+        return None, []
+
+    for key in RECORD_KEYS:
+        value = data.get(key)
+        if isinstance(value, list):
+            return key, value
+
+    candidates = [
+        (len(value), key) for key, value in data.items()
+        if isinstance(value, list) and value and isinstance(value[0], dict)
+    ]
+    if not candidates:
+        return None, []
+    _, key = max(candidates)
+    return key, data[key]
+
+
+def flatten_record(record: Any) -> Dict[str, Any]:
+    """
+    One table row per record.
+
+    Scalars are kept, lists become their length and nested objects are
+    flattened one level as ``parent.child``.
+    """
+    if not isinstance(record, dict):
+        return {'value': record}
+
+    row: Dict[str, Any] = {}
+    for key, value in record.items():
+        if isinstance(value, list):
+            row[key] = len(value)
+        elif isinstance(value, dict):
+            for child, child_value in value.items():
+                row[f"{key}.{child}"] = (
+                    json.dumps(child_value, ensure_ascii=False)
+                    if isinstance(child_value, (dict, list)) else child_value
+                )
+        else:
+            row[key] = value
+    return row
+
+
+def summarize_records(records: Sequence[Any]) -> Dict[str, Any]:
+    """Counts shown above the table; football fields are used when present."""
+    summary: Dict[str, Any] = {'records': len(records)}
+    leagues = set()
+    dates = set()
+    markets = 0
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        if 'league' in record:
+            leagues.add(record['league'])
+        if 'date' in record:
+            dates.add(record['date'])
+        additional = record.get('additional_markets')
+        if isinstance(additional, list):
+            markets += len(additional) + (1 if record.get('main_market') else 0)
+
+    if leagues:
+        summary['leagues'] = len(leagues)
+    if dates:
+        summary['dates'] = len(dates)
+    if markets:
+        summary['markets'] = markets
+    return summary
+
+
+def build_json_view(content: bytes, digest: Optional[str] = None) -> JsonView:
+    """
+    Parse ``content`` and compute its summary.
+
+    Raises:
+        ValueError: If the content is not valid JSON
+    """
+    data = json.loads(content)
+    record_key, records = find_records(data)
+    return JsonView(
+        digest=digest or content_digest(content),
+        size=len(content),
+        data=data,
+        record_key=record_key,
+        records=records,
+        summary=summarize_records(records),
+    )
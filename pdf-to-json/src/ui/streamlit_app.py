@@ -11,13 +11,14 @@ import time
 from pathlib import Path
 import tempfile
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 # Add parent directory to path for imports
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from converter.converter import PDFToJSONConverter
+from ui.data_views import PAGE_SIZES, JsonView, build_json_view, content_digest
 
 # Page configuration
 st.set_page_config(
@@ -69,15 +70,130 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_resource(show_spinner=False)
+def get_converter() -> PDFToJSONConverter:
+    """One converter shared by all sessions and reruns."""
+    return PDFToJSONConverter()
+
+
 def initialize_converter():
     """Initialize the PDF converter."""
-    if 'converter' not in st.session_state:
-        try:
-            st.session_state.converter = PDFToJSONConverter()
-        except Exception as e:
-            st.error(f"Failed to initialize converter: {e}")
-            return None
-    return st.session_state.converter
+    try:
+        return get_converter()
+    except Exception as e:
+        st.error(f"Failed to initialize converter: {e}")
+        return None
+
+
+def uploaded_content(uploaded_file) -> Tuple[str, bytes]:
+    """
+    Content hash and bytes of an uploaded file.
+
+    The hash is remembered per upload so reruns do not rehash large files.
+    """
+    content = uploaded_file.getvalue()
+    digests = st.session_state.setdefault('upload_digests', {})
+    key = (uploaded_file.file_id, uploaded_file.size)
+    if key not in digests:
+        digests[key] = content_digest(content)
+    return digests[key], content
+
+
+@st.cache_resource(max_entries=8, show_spinner="Parsing JSON...")
+def load_json_view(digest: str, _content: bytes) -> JsonView:
+    """
+    Parsed document and summary for a content hash.
+
+    Kept as a shared resource rather than copied on every rerun; callers
+    must not modify it.
+    """
+    return build_json_view(_content, digest)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def page_frame(digest: str, page: int, page_size: int, _view: JsonView) -> pd.DataFrame:
+    """Table of one page of a document's records."""
+    return pd.DataFrame(_view.page_rows(page, page_size))
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def convert_pdf_content(digest: str, filename: str, json_type: str, config_path: Optional[str],
+                        validate_output: bool, extract_tables: bool,
+                        _content: bytes) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """
+    Convert PDF content once per content hash and options.
+
+    Returns:
+        Tuple of the conversion result and the JSON output (None on failure)
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+        tmp_file.write(_content)
+        tmp_pdf_path = tmp_file.name
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as tmp_output:
+        tmp_json_path = tmp_output.name
+
+    try:
+        result = get_converter().convert_file(
+            tmp_pdf_path,
+            tmp_json_path,
+            json_type,
+            config_path,
+            validate_output,
+            extract_tables
+        )
+        json_content = None
+        if result['success']:
+            with open(tmp_json_path, 'rb') as f:
+                json_content = f.read()
+        return result, json_content
+    finally:
+        os.unlink(tmp_pdf_path)
+        if os.path.exists(tmp_json_path):
+            os.unlink(tmp_json_path)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def validate_json_content(digest: str, schema_name: str, _content: bytes) -> Dict[str, Any]:
+    """Validate JSON content once per content hash and schema."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as tmp_file:
+        tmp_file.write(_content)
+        tmp_json_path = tmp_file.name
+    try:
+        return get_converter().validate_json_file(tmp_json_path, schema_name)
+    finally:
+        os.unlink(tmp_json_path)
+
+
+def render_json_view(view: JsonView, key: str) -> None:
+    """Summary metrics and a paged table of a document's records."""
+    columns = st.columns(len(view.summary) + 1)
+    columns[0].metric("Size", f"{view.size / 1024:.1f} KB")
+    for column, (name, value) in zip(columns[1:], view.summary.items()):
+        column.metric(name.capitalize(), f"{value:,}")
+
+    if view.records:
+        page_key = f"{key}_page"
+        col1, col2 = st.columns(2)
+        with col1:
+            page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+        page_count = view.page_count(page_size)
+        # A larger page size can leave the remembered page out of range
+        if st.session_state.get(page_key, 1) > page_count:
+            st.session_state[page_key] = page_count
+        with col2:
+            page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key=page_key)
+
+        first = (page - 1) * page_size + 1
+        last = min(page * page_size, len(view.records))
+        label = f"'{view.record_key}'" if view.record_key else "records"
+        st.caption(f"Showing {label} {first:,}-{last:,} of {len(view.records):,}")
+        st.dataframe(page_frame(view.digest, page, page_size, view), use_container_width=True)
+
+    if view.inline:
+        with st.expander("Raw JSON"):
+            st.json(view.data)
+    else:
+        st.caption("The document is too large to show as raw JSON; download it to inspect it whole.")
 
 
 def main():
@@ -163,96 +279,78 @@ def convert_page(converter):
                 help="Path to structure configuration file (optional)"
             )
         
-        # Convert button
+        # Results stay on screen across reruns (paging, widget changes) for
+        # as long as the file and options match the last conversion
+        digest, content = uploaded_content(uploaded_file)
+        request = (digest, uploaded_file.name, json_type, config_path or None,
+                   validate_output, extract_tables)
         if st.button("🚀 Convert to JSON", type="primary"):
+            st.session_state.convert_request = request
+
+        if st.session_state.get('convert_request') == request:
             with st.spinner("Converting PDF to JSON..."):
                 try:
-                    # Save uploaded file temporarily
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                        tmp_file.write(uploaded_file.getvalue())
-                        tmp_pdf_path = tmp_file.name
-                    
-                    # Generate output path
-                    output_filename = f"{Path(uploaded_file.name).stem}.json"
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as tmp_output:
-                        tmp_json_path = tmp_output.name
-                    
-                    # Convert PDF
-                    result = converter.convert_file(
-                        tmp_pdf_path,
-                        tmp_json_path,
-                        json_type,
-                        config_path if config_path else None,
-                        validate_output,
-                        extract_tables
-                    )
-                    
-                    # Clean up temporary PDF
-                    os.unlink(tmp_pdf_path)
-                    
-                    if result['success']:
-                        # Success message
-                        st.markdown('<div class="success-box">', unsafe_allow_html=True)
-                        st.success("✅ Conversion completed successfully!")
-                        st.markdown('</div>', unsafe_allow_html=True)
-                        
-                        # Display metrics
-                        col1, col2, col3, col4 = st.columns(4)
-                        
-                        with col1:
-                            st.metric("Pages", result['page_count'])
-                        
-                        with col2:
-                            st.metric("Words", f"{result['total_words']:,}")
-                        
-                        with col3:
-                            st.metric("Processing Time", f"{result['processing_time']:.2f}s")
-                        
-                        with col4:
-                            st.metric("File Size", f"{result['file_size'] / 1024:.1f} KB")
-                        
-                        # Download button
-                        with open(tmp_json_path, 'r', encoding='utf-8') as f:
-                            json_content = f.read()
-                        
-                        st.download_button(
-                            label="📥 Download JSON",
-                            data=json_content,
-                            file_name=output_filename,
-                            mime="application/json"
-                        )
-                        
-                        # Show JSON preview
-                        st.subheader("📄 JSON Preview")
-                        json_data = json.loads(json_content)
-                        st.json(json_data)
-                        
-                        # Clean up temporary JSON
-                        os.unlink(tmp_json_path)
-                        
-                    else:
-                        # Error message
-                        st.markdown('<div class="error-box">', unsafe_allow_html=True)
-                        st.error("❌ Conversion failed!")
-                        st.markdown('</div>', unsafe_allow_html=True)
-                        
-                        for error in result['errors']:
-                            st.error(f"Error: {error}")
-                        
-                        # Clean up temporary JSON
-                        if os.path.exists(tmp_json_path):
-                            os.unlink(tmp_json_path)
-                    
-                    # Show warnings if any
-                    if result.get('warnings'):
-                        st.markdown('<div class="info-box">', unsafe_allow_html=True)
-                        st.warning("⚠️ Warnings:")
-                        for warning in result['warnings']:
-                            st.write(f"- {warning}")
-                        st.markdown('</div>', unsafe_allow_html=True)
-                
+                    result, json_content = convert_pdf_content(*request, _content=content)
                 except Exception as e:
                     st.error(f"An error occurred: {e}")
+                    return
+
+            output_filename = f"{Path(uploaded_file.name).stem}.json"
+
+            if result['success']:
+                # Success message
+                st.markdown('<div class="success-box">', unsafe_allow_html=True)
+                st.success("✅ Conversion completed successfully!")
+                st.markdown('</div>', unsafe_allow_html=True)
+
+                # Display metrics
+                col1, col2, col3, col4 = st.columns(4)
+
+                with col1:
+                    st.metric("Pages", result['page_count'])
+
+                with col2:
+                    st.metric("Words", f"{result['total_words']:,}")
+
+                with col3:
+                    st.metric("Processing Time", f"{result['processing_time']:.2f}s")
+
+                with col4:
+                    st.metric("File Size", f"{result['file_size'] / 1024:.1f} KB")
+
+                # Download button
+                st.download_button(
+                    label="📥 Download JSON",
+                    data=json_content,
+                    file_name=output_filename,
+                    mime="application/json"
+                )
+
+                # Show JSON preview
+                st.subheader("📄 JSON Preview")
+                try:
+                    view = load_json_view(content_digest(json_content), json_content)
+                except ValueError as e:
+                    st.error(f"Could not parse the JSON output: {e}")
+                else:
+                    render_json_view(view, key="convert")
+
+            else:
+                # Error message
+                st.markdown('<div class="error-box">', unsafe_allow_html=True)
+                st.error("❌ Conversion failed!")
+                st.markdown('</div>', unsafe_allow_html=True)
+
+                for error in result['errors']:
+                    st.error(f"Error: {error}")
+
+            # Show warnings if any
+            if result.get('warnings'):
+                st.markdown('<div class="info-box">', unsafe_allow_html=True)
+                st.warning("⚠️ Warnings:")
+                for warning in result['warnings']:
+                    st.write(f"- {warning}")
+                st.markdown('</div>', unsafe_allow_html=True)
 
 
 def preview_page(converter):
@@ -353,37 +451,42 @@ def validate_page(converter):
             help="Choose the schema to validate against"
         )
         
+        digest, content = uploaded_content(uploaded_file)
+        request = (digest, schema_name)
         if st.button("🔍 Validate JSON", type="primary"):
+            st.session_state.validate_request = request
+
+        if st.session_state.get('validate_request') == request:
             with st.spinner("Validating JSON..."):
                 try:
-                    # Save uploaded file temporarily
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as tmp_file:
-                        tmp_file.write(uploaded_file.getvalue())
-                        tmp_json_path = tmp_file.name
-                    
-                    # Validate JSON
-                    validation_result = converter.validate_json_file(tmp_json_path, schema_name)
-                    
-                    # Clean up
-                    os.unlink(tmp_json_path)
-                    
-                    if validation_result['is_valid']:
-                        st.markdown('<div class="success-box">', unsafe_allow_html=True)
-                        st.success(f"✅ JSON is valid according to '{schema_name}' schema!")
-                        st.markdown('</div>', unsafe_allow_html=True)
-                        
-                        st.metric("File Size", f"{validation_result['file_size'] / 1024:.1f} KB")
-                    else:
-                        st.markdown('<div class="error-box">', unsafe_allow_html=True)
-                        st.error(f"❌ JSON is invalid according to '{schema_name}' schema!")
-                        st.markdown('</div>', unsafe_allow_html=True)
-                        
-                        st.error("Validation errors:")
-                        for error in validation_result['errors']:
-                            st.write(f"- {error}")
-                
+                    validation_result = validate_json_content(digest, schema_name, _content=content)
                 except Exception as e:
                     st.error(f"An error occurred: {e}")
+                    validation_result = None
+
+            if validation_result and validation_result['is_valid']:
+                st.markdown('<div class="success-box">', unsafe_allow_html=True)
+                st.success(f"✅ JSON is valid according to '{schema_name}' schema!")
+                st.markdown('</div>', unsafe_allow_html=True)
+
+                st.metric("File Size", f"{validation_result['file_size'] / 1024:.1f} KB")
+            elif validation_result:
+                st.markdown('<div class="error-box">', unsafe_allow_html=True)
+                st.error(f"❌ JSON is invalid according to '{schema_name}' schema!")
+                st.markdown('</div>', unsafe_allow_html=True)
+
+                st.error("Validation errors:")
+                for error in validation_result['errors']:
+                    st.write(f"- {error}")
+
+        # Browse the uploaded document
+        st.subheader("📄 Contents")
+        try:
+            view = load_json_view(digest, content)
+        except ValueError as e:
+            st.error(f"Could not parse the JSON file: {e}")
+        else:
+            render_json_view(view, key="validate")
 
 
 def batch_page(converter):
@@ -0,0 +1,181 @@
+"""
+Unit tests for the compiled converter configuration and its hot reload.
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from converter import compiled_config as compiled_config_module
+from converter.compiled_config import (
+    CONFIG_SOURCES, compile_config, current_compiled_config, get_compiled_config,
+    load_compiled_config, reload_compiled_config
+)
+from converter.config_manager import ConfigManager
+from converter.exceptions import ConfigurationError
+from converter.football_converter import FootballConverter
+from converter.market_processor import MarketProcessor
+
+REPO_CONFIG = Path(__file__).parent.parent / "config"
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    """Each test starts without in-memory artifacts."""
+    monkeypatch.setattr(compiled_config_module, "_artifacts", {})
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    """Copy of the repository's converter configuration."""
+    directory = tmp_path / "config"
+    directory.mkdir()
+    for name in CONFIG_SOURCES:
+        shutil.copy(REPO_CONFIG / name, directory / name)
+    return directory
+
+
+def update_json(path: Path, change) -> None:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    change(data)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def make_match(home_team: str, raw_line: str, draw_odds=None) -> dict:
+    return {
+        "league": "NB I", "date": "2025. augusztus 5.", "time": "K 20:00",
+        "home_team": home_team, "away_team": "Chelsea",
+        "home_odds": 1.5, "draw_odds": draw_odds, "away_odds": 2.5, "raw_line": raw_line,
+    }
+
+
+class TestCompileConfig:
+    """Test compiling the configuration files."""
+
+    def test_all_sections_compiled(self, config_dir):
+        compiled = compile_config(str(config_dir))
+
+        assert compiled.sources == CONFIG_SOURCES
+        assert compiled.errors == ()
+        assert compiled.extractor.time_regex.search("K 20:00").group(1) == "K 20:00"
+        assert "double_chance" in compiled.market_rules.market_type_patterns
+        assert compiled.team_aliases.config["aliases"]["FTC"] == "Ferencváros"
+        assert compiled.market_priorities["market_priorities"]["1x2"] == 1
+
+    def test_version_follows_file_contents(self, config_dir):
+        first = compile_config(str(config_dir)).version
+        assert compile_config(str(config_dir)).version == first
+
+        update_json(config_dir / "team_aliases.json", lambda data: data["aliases"].update({"X": "Y"}))
+
+        assert compile_config(str(config_dir)).version != first
+
+    def test_missing_market_keywords_uses_built_in_rules(self, config_dir):
+        (config_dir / "market_keywords.json").unlink()
+
+        compiled = compile_config(str(config_dir))
+
+        assert compiled.extractor is None
+        assert compiled.market_rules is MarketProcessor().rules
+
+    def test_strict_mode_rejects_invalid_file(self, config_dir):
+        (config_dir / "extractor_patterns.json").write_text('{"time_pattern": "(unclosed"}')
+
+        with pytest.raises(ConfigurationError):
+            compile_config(str(config_dir))
+
+        lenient = compile_config(str(config_dir), strict=False)
+        assert lenient.extractor is None
+        assert lenient.errors[0].startswith("extractor_patterns.json")
+
+    def test_compiled_rules_match_built_in_rules(self, config_dir):
+        """The shipped market_keywords.json classifies like the built-in patterns."""
+        compiled = MarketProcessor(rules=compile_config(str(config_dir)).market_rules)
+        built_in = MarketProcessor()
+        matches = [
+            make_match("Arsenal", "K 20:00 65110 Arsenal - Chelsea 2,50 3,20 2,80", draw_odds=3.2),
+            make_match("Arsenal Hendikep (-1)", "K 20:00 Arsenal Hendikep (-1) - Chelsea 3,50 1,30"),
+            make_match("Arsenal Gólszám több mint 2.5", "K 20:00 Arsenal Gólszám - Chelsea 1,85 1,95"),
+            make_match("Arsenal Kétesély 1X", "K 20:00 Arsenal Kétesély 1X - Chelsea 12 1,25 3,75"),
+        ]
+
+        assert compiled.merge_matches_by_game(matches) == built_in.merge_matches_by_game(matches)
+
+
+class TestArtifactCaches:
+    """Test the in-memory and on-disk caches."""
+
+    def test_memory_cache_reused_until_files_change(self, config_dir):
+        first = get_compiled_config(str(config_dir))
+        assert get_compiled_config(str(config_dir)) is first
+
+        update_json(config_dir / "market_keywords.json", lambda data: data.update({"corners": ["Szöglet"]}))
+        second = get_compiled_config(str(config_dir))
+
+        assert second is not first
+        assert "corners" in second.market_rules.market_type_patterns
+
+    def test_disk_cache_skips_compilation(self, config_dir):
+        written = load_compiled_config(str(config_dir))
+        assert (config_dir / ".compiled" / f"{written.version}.pickle").exists()
+
+        with patch.object(compiled_config_module, "compile_config") as compile_mock:
+            cached = load_compiled_config(str(config_dir))
+
+        compile_mock.assert_not_called()
+        assert cached.version == written.version
+        assert cached.extractor.team_regex.pattern == written.extractor.team_regex.pattern
+
+    def test_invalid_artifacts_are_not_cached(self, config_dir):
+        (config_dir / "team_aliases.json").write_text('{"aliases": {}}')
+
+        compiled = get_compiled_config(str(config_dir))
+
+        assert compiled.team_aliases is None
+        assert current_compiled_config(str(config_dir)) is None
+        assert not list((config_dir / ".compiled").glob("*.pickle"))
+
+
+class TestReload:
+    """Test atomic reloads and converters picking them up."""
+
+    def test_failed_reload_keeps_previous_artifact(self, config_dir):
+        previous = reload_compiled_config(str(config_dir))
+        (config_dir / "market_priorities.json").write_text('{"market_priorities": {"1x2": 0}}')
+
+        with pytest.raises(ConfigurationError):
+            reload_compiled_config(str(config_dir))
+
+        assert current_compiled_config(str(config_dir)) is previous
+
+    def test_converter_switches_at_next_conversion(self, config_dir):
+        converter = FootballConverter(config_dir=str(config_dir))
+        match = make_match("Arsenal Szöglet", "K 20:00 Arsenal Szöglet - Chelsea 1,50 2,50")
+        assert converter.market_processor.classify_market_type(match) != "corners"
+        assert not converter.refresh_config()
+
+        update_json(config_dir / "market_keywords.json", lambda data: data.update({"corners": ["Szöglet"]}))
+        reloaded = reload_compiled_config(str(config_dir))
+
+        assert converter.refresh_config()
+        assert converter.compiled_config is reloaded
+        assert converter.market_processor.classify_market_type(match) == "corners"
+        assert "corners" in converter.extractor.market_type_patterns
+
+    def test_config_manager_reload(self, config_dir):
+        manager = ConfigManager(str(config_dir))
+        first = manager.get_compiled_config()
+
+        update_json(config_dir / "team_aliases.json", lambda data: data["aliases"].update({"Fradi": "Ferencváros"}))
+        compiled = manager.reload_configs()
+
+        assert compiled.version != first.version
+        assert compiled.team_aliases.config["aliases"]["Fradi"] == "Ferencváros"
+        assert manager.get_config("team_aliases")["aliases"]["Fradi"] == "Ferencváros"
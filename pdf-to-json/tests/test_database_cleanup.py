@@ -0,0 +1,186 @@
+"""
+Unit tests for chunked retention cleanup and partition retention helpers.
+"""
+
+import json
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from database import connection
+from database.cleanup import DatabaseCleaner, RetentionPolicy
+from database.models import Base, Job, SystemMetric
+from database.partitions import partition_day, partition_name, partitions_to_drop
+from database.repositories import SystemMetricsRepository, delete_in_chunks
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Global SQLite database with the tables SQLite can represent."""
+    db_manager = connection.DatabaseManager(f"sqlite:///{tmp_path / 'cleanup.db'}")
+    # webhooks uses a PostgreSQL ARRAY column
+    tables = [table for table in Base.metadata.sorted_tables if table.name != "webhooks"]
+    Base.metadata.create_all(db_manager.sync_engine, tables=tables)
+    monkeypatch.setattr(connection, "_db_manager", db_manager)
+    yield db_manager
+    db_manager.close_connections()
+
+
+def add_metrics(manager, old: int, recent: int) -> None:
+    """Insert ``old`` metrics past retention and ``recent`` ones within it."""
+    now = datetime.now(timezone.utc)
+    with manager.get_session() as session:
+        session.add_all(
+            [SystemMetric(metric_name="cpu", metric_value=1.0, timestamp=now - timedelta(days=60))
+             for _ in range(old)]
+            + [SystemMetric(metric_name="cpu", metric_value=1.0, timestamp=now) for _ in range(recent)]
+        )
+        session.commit()
+
+
+def count_metrics(manager) -> int:
+    with manager.get_session() as session:
+        return session.query(SystemMetric).count()
+
+
+class TestDeleteInChunks:
+    """Test bounded, resumable deletes."""
+
+    def test_deletes_in_bounded_batches(self, manager):
+        """Every matching row is deleted, batch_size rows at a time."""
+        add_metrics(manager, old=23, recent=5)
+        reports = []
+
+        with manager.get_session() as session:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+            progress = delete_in_chunks(
+                session, SystemMetric, [SystemMetric.timestamp < cutoff],
+                batch_size=10, progress_callback=lambda p: reports.append((p.deleted, p.completed))
+            )
+
+        assert progress.deleted == 23
+        assert progress.batches == 3
+        assert progress.completed
+        assert reports == [(10, False), (20, False), (23, False), (23, True)]
+        assert count_metrics(manager) == 5
+
+    def test_resume_skips_keys_already_visited(self, manager):
+        """Resuming continues after the checkpointed primary key."""
+        add_metrics(manager, old=10, recent=0)
+        with manager.get_session() as session:
+            ids = sorted(session.scalars(SystemMetric.__table__.select().with_only_columns(SystemMetric.id)))
+            progress = delete_in_chunks(session, SystemMetric, [], batch_size=100, resume_from=ids[5])
+
+        assert progress.deleted == 4
+        assert count_metrics(manager) == 6
+
+    def test_repository_chunked_mode(self, manager):
+        """Repositories delete in chunks when given a batch size."""
+        add_metrics(manager, old=12, recent=3)
+
+        with manager.get_session() as session:
+            deleted = SystemMetricsRepository(session).cleanup_old_metrics(
+                days=30, batch_size=5, pause_seconds=0
+            )
+
+        assert deleted == 12
+        assert count_metrics(manager) == 3
+
+    def test_batch_size_must_be_positive(self, manager):
+        with manager.get_session() as session:
+            with pytest.raises(ValueError):
+                delete_in_chunks(session, SystemMetric, [], batch_size=0)
+
+
+class TestDatabaseCleaner:
+    """Test cleanup procedures against SQLite."""
+
+    def test_chunked_cleanup_all(self, manager, tmp_path):
+        """Chunked cleanup removes expired rows and clears its checkpoints."""
+        add_metrics(manager, old=15, recent=2)
+        old = datetime.now(timezone.utc) - timedelta(days=200)
+        with manager.get_session() as session:
+            session.add_all([
+                Job(job_type="convert", status="failed", completed_at=old),
+                Job(job_type="convert", status="completed", completed_at=old),
+                Job(job_type="convert", status="pending"),
+            ])
+            session.commit()
+        checkpoint = tmp_path / "checkpoint.json"
+        progress = []
+
+        cleaner = DatabaseCleaner(
+            RetentionPolicy(delete_batch_size=4, delete_pause_seconds=0),
+            checkpoint_path=str(checkpoint),
+            progress_callback=lambda table, p: progress.append(table),
+        )
+        results = {result.table_name: result for result in cleaner.cleanup_all()}
+
+        assert all(result.error is None for result in results.values())
+        assert results["system_metrics"].records_deleted == 15
+        assert results["jobs (completed)"].records_deleted == 2
+        assert "system_metrics" in progress
+        assert count_metrics(manager) == 2
+        with manager.get_session() as session:
+            assert session.query(Job).count() == 1
+        assert json.loads(checkpoint.read_text()) == {}
+
+    def test_resumes_from_checkpoint(self, manager, tmp_path):
+        """A checkpoint left by an interrupted run is picked up."""
+        add_metrics(manager, old=8, recent=0)
+        with manager.get_session() as session:
+            ids = sorted(session.scalars(SystemMetric.__table__.select().with_only_columns(SystemMetric.id)))
+        checkpoint = tmp_path / "checkpoint.json"
+        checkpoint.write_text(json.dumps({"system_metrics": str(ids[2])}))
+
+        cleaner = DatabaseCleaner(
+            RetentionPolicy(delete_batch_size=100, delete_pause_seconds=0),
+            checkpoint_path=str(checkpoint),
+        )
+        result = cleaner._cleanup_system_metrics()
+
+        assert result.records_deleted == 5
+        assert "system_metrics" not in cleaner.checkpoints
+
+    def test_dry_run_counts_without_deleting(self, manager):
+        add_metrics(manager, old=3, recent=1)
+
+        result = DatabaseCleaner()._cleanup_system_metrics(dry_run=True)
+
+        assert result.records_deleted == 3
+        assert count_metrics(manager) == 4
+
+    def test_partitioned_tables_fall_back_on_sqlite(self, manager):
+        """Partition retention only applies to partitioned PostgreSQL tables."""
+        add_metrics(manager, old=3, recent=1)
+
+        cleaner = DatabaseCleaner(RetentionPolicy(partitioned_tables=("system_metrics",)))
+        result = cleaner._cleanup_system_metrics()
+
+        assert result.records_deleted == 3
+        assert result.partitions_dropped == 0
+
+
+class TestPartitionNames:
+    """Test the daily partition naming convention."""
+
+    def test_round_trip(self):
+        name = partition_name("job_logs", date(2025, 3, 9))
+
+        assert name == "job_logs_p20250309"
+        assert partition_day(name) == date(2025, 3, 9)
+        assert partition_day("job_logs_default") is None
+
+    def test_partitions_to_drop(self):
+        """Only whole days before the cutoff are dropped, oldest first."""
+        names = ["system_metrics_p20250103", "system_metrics_p20250101",
+                 "system_metrics_p20250104", "system_metrics_default"]
+
+        assert partitions_to_drop(names, date(2025, 1, 4)) == [
+            "system_metrics_p20250101", "system_metrics_p20250103"
+        ]
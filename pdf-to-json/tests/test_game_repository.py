@@ -0,0 +1,173 @@
+"""
+Unit tests for keyset-paginated game queries on SQLite.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from database.connection import DatabaseManager
+from database.models import Game
+from database.repositories import (
+    GameRepository, add_game_write_listener, decode_game_cursor, remove_game_write_listener
+)
+
+
+def make_game(index: int, league: str = "NB I") -> dict:
+    """Build game data spread over a few days and kickoff times."""
+    return {
+        "league": league,
+        "date": date(2025, 8, 1) + timedelta(days=index % 3),
+        "iso_date": (date(2025, 8, 1) + timedelta(days=index % 3)).isoformat(),
+        "time": f"{12 + index % 2}:00",
+        "home_team": f"Home {index % 4}",
+        "away_team": f"{league} Away {index}",
+        "original_home_team": f"Home {index % 4}",
+        "original_away_team": f"{league} Away {index}",
+        "main_market": {"odds": [1.5, 3.2, 4.0]},
+        "quality_score": 0.9,
+    }
+
+
+@pytest.fixture
+def session():
+    """In-memory SQLite session with the games table."""
+    manager = DatabaseManager("sqlite://")
+    Game.__table__.create(manager.sync_engine)
+    with manager.get_session() as db_session:
+        yield db_session
+
+
+@pytest.fixture
+def repository(session):
+    """Game repository populated with 25 games."""
+    repo = GameRepository(session)
+    repo.bulk_create_games([make_game(index) for index in range(20)])
+    repo.bulk_create_games([make_game(index, league="Premier League") for index in range(5)])
+    return repo
+
+
+def sort_key(game: dict):
+    return game["date"], game["time"], game["id"]
+
+
+class TestGameQueries:
+    """Test paginated game queries."""
+
+    def test_cursor_pages_cover_all_rows_in_order(self, repository):
+        """Following next_cursor visits every game once, in keyset order."""
+        seen = []
+        cursor = None
+        while True:
+            page = repository.query_games(cursor=cursor, limit=7, columns=["id", "date", "time"])
+            seen.extend(page["games"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(seen) == 25
+        assert len({game["id"] for game in seen}) == 25
+        assert seen == sorted(seen, key=sort_key)
+
+    def test_filters(self, repository):
+        """League, date and team filters narrow the result."""
+        league = repository.query_games(league="Premier League", limit=100)["games"]
+        assert len(league) == 5
+        assert all(game["league"] == "Premier League" for game in league)
+
+        day = repository.query_games(date=date(2025, 8, 2), limit=100)["games"]
+        assert day and all(game["date"] == "2025-08-02" for game in day)
+
+        team = repository.query_games(home_team="Home 1", league="NB I", limit=100)["games"]
+        assert len(team) == 5
+
+        assert repository.count_games(league="Premier League") == 5
+        assert repository.count_games(date_from=date(2025, 8, 2), date_to=date(2025, 8, 2)) == len(day)
+
+    def test_projection(self, repository):
+        """Only the requested columns are returned; markets need asking for."""
+        default = repository.query_games(limit=1)["games"][0]
+        assert "main_market" not in default
+
+        projected = repository.query_games(limit=1, columns=["home_team", "main_market"])["games"][0]
+        assert set(projected) == {"home_team", "main_market"}
+        assert projected["main_market"] == {"odds": [1.5, 3.2, 4.0]}
+
+    def test_rejects_unknown_columns_and_bad_cursors(self, repository):
+        """Invalid input raises ValueError."""
+        with pytest.raises(ValueError):
+            repository.query_games(columns=["password"])
+        with pytest.raises(ValueError):
+            repository.query_games(cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            decode_game_cursor("")
+
+    def test_write_listener(self, session):
+        """Bulk inserts notify write listeners with the row count."""
+        counts = []
+        add_game_write_listener(counts.append)
+        try:
+            GameRepository(session).bulk_create_games([make_game(index) for index in range(3)])
+        finally:
+            remove_game_write_listener(counts.append)
+
+        assert counts == [3]
+
+
+class TestBulkIngestion:
+    """Test batched inserts and upserts."""
+
+    def test_batches_return_stored_games(self, session):
+        """Games come back with ids across several batches."""
+        games = GameRepository(session).bulk_create_games(
+            [make_game(index) for index in range(25)], batch_size=7
+        )
+
+        assert len(games) == 25
+        assert all(game.id is not None for game in games)
+        assert session.query(Game).count() == 25
+
+    def test_duplicate_insert_fails_without_upsert(self, session):
+        """Plain inserts keep the natural key unique."""
+        repo = GameRepository(session)
+        repo.bulk_create_games([make_game(1)])
+
+        with pytest.raises(IntegrityError):
+            repo.bulk_create_games([make_game(1)])
+        session.rollback()
+
+    def test_upsert_is_idempotent(self, session):
+        """Re-ingesting the same games updates them in place."""
+        repo = GameRepository(session)
+        repo.bulk_create_games([make_game(index) for index in range(10)], upsert=True)
+        first_ids = {game.home_team + game.away_team: game.id for game in session.query(Game)}
+
+        changed = [dict(make_game(index), quality_score=0.5) for index in range(10)]
+        games = repo.bulk_create_games(changed, upsert=True, batch_size=4)
+
+        assert session.query(Game).count() == 10
+        assert {game.home_team + game.away_team: game.id for game in games} == first_ids
+        assert all(game.quality_score == 0.5 for game in session.query(Game))
+
+    def test_upsert_collapses_duplicates_in_input(self, session):
+        """The last row for a natural key wins within one call."""
+        rows = [make_game(1), dict(make_game(1), quality_score=0.1)]
+
+        GameRepository(session).bulk_create_games(rows, upsert=True)
+
+        assert [game.quality_score for game in session.query(Game)] == [0.1]
+
+    def test_load_without_returning(self, session):
+        """Pure loads skip building Game objects."""
+        games = GameRepository(session).bulk_create_games(
+            [make_game(index) for index in range(5)], return_games=False
+        )
+
+        assert games == []
+        assert session.query(Game).count() == 5
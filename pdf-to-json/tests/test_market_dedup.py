@@ -0,0 +1,96 @@
+"""
+Unit tests for single-pass market deduplication and capping in DataProcessor.
+"""
+
+import copy
+import random
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from converter.data_processor import DataProcessor
+
+MARKET_TYPES = ["double_chance", "handicap", "total_goals", "both_teams_score", "corners", "unknown"]
+
+
+def make_game(index: int, markets: list) -> dict:
+    return {
+        "home_team": f"Home {index}", "away_team": f"Away {index}", "time": "K 20:00",
+        "main_market": {"market_type": "1x2"},
+        "additional_markets": markets,
+        "total_markets": len(markets) + 1,
+        "processing_info": {"markets_capped": False, "duplicates_removed": 0},
+    }
+
+
+def random_games(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    games = []
+    for index in range(count):
+        markets = []
+        for market_index in range(rng.randint(0, 25)):
+            if markets and rng.random() < 0.2:
+                markets.append(dict(rng.choice(markets)))
+                continue
+            market = {
+                "market_type": rng.choice(MARKET_TYPES),
+                "description": f"Market {rng.randint(0, 5)}",
+                "odds": {"home_odds": rng.choice([1.5, 2.0, 2.5]), "away_odds": rng.choice([1.5, 3.0])},
+            }
+            if rng.random() < 0.3:
+                market["priority"] = rng.randint(1, 20)
+            markets.append(market)
+        games.append(make_game(index, markets))
+    return games
+
+
+class TestSinglePass:
+    """Test process_games against the separate deduplicate and cap steps."""
+
+    def test_matches_separate_steps(self):
+        games = random_games(200)
+
+        single = DataProcessor(max_markets=6)
+        combined = single.process_games(copy.deepcopy(games))
+
+        steps = DataProcessor(max_markets=6)
+        separate = steps.cap_additional_markets(steps.deduplicate_markets(copy.deepcopy(games)))
+
+        assert combined == separate
+        assert single.get_processing_stats() == steps.get_processing_stats()
+
+    def test_capping_keeps_stable_priority_order(self):
+        markets = [
+            {"market_type": "unknown", "description": "a", "odds": {}},
+            {"market_type": "total_goals", "description": "b", "odds": {}},
+            {"market_type": "double_chance", "description": "c", "odds": {}},
+            {"market_type": "total_goals", "description": "d", "odds": {}},
+        ]
+        processor = DataProcessor(max_markets=2)
+
+        result = processor.process_games([make_game(0, markets)])[0]
+
+        assert [m["description"] for m in result["additional_markets"]] == ["c", "b"]
+        assert result["processing_info"]["markets_capped"] is True
+        details = processor.get_processing_stats()["capping"]["details"][0]
+        assert details["excluded_market_types"] == ["total_goals", "unknown"]
+
+    def test_duplicates_keyed_on_type_description_and_odds(self):
+        markets = [
+            {"market_type": "handicap", "description": "H", "odds": {"home_odds": 1.5}, "priority": 3},
+            {"market_type": "handicap", "description": "H", "odds": {"home_odds": 1.5}, "priority": 9},
+            {"market_type": "handicap", "description": "H", "odds": {"home_odds": 1.6}},
+        ]
+        processor = DataProcessor()
+
+        result = processor.process_games([make_game(0, markets)])[0]
+
+        assert result["additional_markets"] == [markets[0], markets[2]]
+        assert result["processing_info"]["duplicates_removed"] == 1
+
+    def test_untouched_games_are_not_copied(self):
+        game = make_game(0, [{"market_type": "handicap", "description": "H", "odds": {}}])
+
+        assert DataProcessor().process_games([game])[0] is game
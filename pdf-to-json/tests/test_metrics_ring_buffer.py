@@ -0,0 +1,106 @@
+"""
+Unit tests for the metrics ring buffer and non-blocking metrics collection.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from automation.config import MonitoringConfig
+from automation.exceptions import MonitoringError
+from automation.monitoring import HEALTH_SERIES, MetricRingBuffer, MetricsCollector
+
+
+class TestMetricRingBuffer:
+    """Test the array-backed ring buffer."""
+
+    def test_overwrites_oldest_when_full(self):
+        """Only the newest ``capacity`` samples are kept, in order."""
+        buffer = MetricRingBuffer(3, ["value"])
+        for second in range(5):
+            buffer.append(float(second), {"value": second * 10.0})
+
+        assert len(buffer) == 3
+        assert buffer.window("value", 0.0) == [20.0, 30.0, 40.0]
+
+    def test_window_selects_by_timestamp(self):
+        """Windows start at the first sample at or after the cutoff."""
+        buffer = MetricRingBuffer(4, ["value"])
+        for second in range(6):
+            buffer.append(float(second), {"value": float(second)})
+
+        assert buffer.window("value", 3.0) == [3.0, 4.0, 5.0]
+        assert buffer.window("value", 3.5) == [4.0, 5.0]
+        assert buffer.window("value", 10.0) == []
+
+    def test_aggregate(self):
+        """Min, max and nearest-rank percentiles are computed over the window."""
+        buffer = MetricRingBuffer(200, ["value"])
+        for second in range(1, 101):
+            buffer.append(float(second), {"value": float(second)})
+
+        stats = buffer.aggregate("value", 0.0)
+        assert stats == {"count": 100, "min": 1.0, "max": 100.0, "p50": 50.0, "p95": 95.0}
+
+        recent = buffer.aggregate("value", 91.0)
+        assert recent["count"] == 10
+        assert recent["min"] == 91.0
+        assert recent["p95"] == 100.0
+
+    def test_empty_aggregate(self):
+        """An empty window has no statistics."""
+        buffer = MetricRingBuffer(2, ["value"])
+
+        assert buffer.aggregate("value", 0.0)["count"] == 0
+        assert buffer.aggregate("value", 0.0)["p50"] is None
+
+    def test_capacity_must_be_positive(self):
+        """A zero capacity is rejected."""
+        with pytest.raises(MonitoringError):
+            MetricRingBuffer(0, ["value"])
+
+
+class TestMetricsCollector:
+    """Test metrics collection into the ring buffer."""
+
+    @pytest.mark.asyncio
+    async def test_collect_does_not_block_event_loop(self):
+        """Collection returns quickly and is served from the ring buffer."""
+        collector = MetricsCollector(MonitoringConfig())
+
+        started = time.perf_counter()
+        health = await collector.collect_metrics()
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.5
+        assert 0.0 <= health.cpu_usage_percent <= 100.0
+
+        recent = collector.get_recent_metrics(minutes=5)
+        assert len(recent) == 1
+        assert recent[0].timestamp == health.timestamp
+        assert recent[0].memory_usage_percent == health.memory_usage_percent
+        assert recent[0].components_healthy is False
+
+        aggregates = collector.get_metric_aggregates(minutes=5)
+        assert set(aggregates) == set(HEALTH_SERIES)
+        assert aggregates["memory_usage_percent"]["count"] == 1
+
+    def test_cpu_usage_from_time_deltas(self):
+        """CPU usage is the busy share of CPU time since the last sample."""
+        collector = MetricsCollector(MonitoringConfig())
+        times = type(collector._last_cpu_times)
+        base = {name: 0.0 for name in times._fields}
+        collector._last_cpu_times = times(**base)
+        busy = dict(base, user=3.0, idle=1.0)
+
+        with patch("automation.monitoring.psutil.cpu_times", return_value=times(**busy)):
+            cpu_percent, _, _ = collector._sample_system()
+
+        assert cpu_percent == pytest.approx(75.0)
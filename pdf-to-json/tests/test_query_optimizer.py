@@ -0,0 +1,136 @@
+"""
+Unit tests for query fingerprinting, latency histograms and sampled query statistics.
+"""
+
+import random
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from automation.config import PerformanceConfig
+from automation.performance_monitor import DatabasePerformanceMonitor
+from automation.query_optimizer import (
+    LatencyHistogram, QueryFingerprintCache, QueryOptimizer, normalize_query
+)
+
+
+class TestQueryFingerprintCache:
+    """Test the bounded fingerprint cache."""
+    
+    def test_literals_share_fingerprint(self):
+        """Statements differing only in literals map to one fingerprint."""
+        cache = QueryFingerprintCache(max_size=10)
+        first = cache.get("SELECT * FROM games WHERE id = 1")
+        second = cache.get("SELECT * FROM games WHERE id = 2")
+        
+        assert first.query_hash == second.query_hash
+        assert first.normalized_query == normalize_query("select * from games where id = 3")
+    
+    def test_repeat_statement_is_a_hit(self):
+        """The second lookup of a statement does not normalize again."""
+        cache = QueryFingerprintCache(max_size=10)
+        statement = "SELECT * FROM jobs WHERE status = ?"
+        
+        assert cache.get(statement) is cache.get(statement)
+        assert cache.get_stats()['hits'] == 1
+        assert cache.get_stats()['misses'] == 1
+    
+    def test_eviction_is_lru(self):
+        """A hot statement survives a stream of one-off statements."""
+        cache = QueryFingerprintCache(max_size=3)
+        hot = "SELECT * FROM games WHERE league = ?"
+        cache.get(hot)
+        
+        for i in range(10):
+            cache.get(f"SELECT * FROM table_{i}")
+            cache.get(hot)
+        
+        assert len(cache) == 3
+        misses = cache.misses
+        cache.get(hot)
+        assert cache.misses == misses
+
+
+class TestLatencyHistogram:
+    """Test histogram bucketing and percentile estimates."""
+    
+    def test_empty_histogram(self):
+        """An empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+        
+        assert histogram.percentile(95) == 0.0
+        assert histogram.to_dict()['count'] == 0
+        assert histogram.to_dict()['min'] == 0.0
+    
+    def test_bucket_counts_and_bounds(self):
+        """Values land in the first bucket whose bound covers them."""
+        histogram = LatencyHistogram(bounds=(0.01, 0.1, 1.0))
+        for value in (0.005, 0.01, 0.05, 0.5, 5.0):
+            histogram.record(value)
+        
+        data = histogram.to_dict()
+        assert data['buckets'] == {'0.01': 2, '0.1': 1, '1.0': 1, '+Inf': 1}
+        assert data['count'] == 5
+        assert data['sum'] == pytest.approx(5.565)
+        assert data['min'] == 0.005
+        assert data['max'] == 5.0
+    
+    def test_percentiles_use_bucket_upper_bounds(self):
+        """Percentiles are the upper bound of their bucket, capped at the maximum."""
+        histogram = LatencyHistogram(bounds=(0.01, 0.1, 1.0))
+        for _ in range(90):
+            histogram.record(0.002)
+        for _ in range(10):
+            histogram.record(0.2)
+        
+        assert histogram.percentile(50) == 0.01
+        assert histogram.percentile(95) == 0.2
+        assert histogram.percentile(99) == 0.2
+
+
+class TestSampledQueryStatistics:
+    """Test that sampled statistics estimate the full load."""
+    
+    def test_optimizer_scales_counts_by_sample_rate(self):
+        """Recorded counts are scaled by 1 / sample rate; raw counts are kept."""
+        random.seed(7)
+        optimizer = QueryOptimizer(PerformanceConfig(query_sample_rate=0.1))
+        
+        for i in range(5000):
+            query_hash = optimizer.analyze_query(f"SELECT * FROM games WHERE id = {i}", 0.001)
+        
+        analysis = optimizer.get_query_analysis(query_hash)
+        assert analysis.sampled_count < 1000
+        assert analysis.execution_count == round(analysis.sampled_count * 10)
+        assert 4000 < analysis.execution_count < 6000
+        assert analysis.total_time == pytest.approx(analysis.execution_count * 0.001)
+    
+    def test_optimizer_unsampled_counts_are_exact(self):
+        """With sampling off every call is counted once."""
+        optimizer = QueryOptimizer(PerformanceConfig())
+        
+        for _ in range(25):
+            query_hash = optimizer.analyze_query("SELECT * FROM jobs WHERE id = 1", 0.002)
+        
+        analysis = optimizer.get_query_analysis(query_hash)
+        assert analysis.execution_count == 25
+        assert analysis.sampled_count == 25
+    
+    def test_database_monitor_scales_counts(self):
+        """DatabasePerformanceMonitor reports estimated query counts."""
+        monitor = DatabasePerformanceMonitor(PerformanceConfig(query_sample_rate=0.5))
+        
+        for _ in range(4):
+            context = Mock()
+            context._query_start_time = 0.0
+            monitor._after_cursor_execute(None, None, "SELECT * FROM jobs", None, context, False)
+        
+        stats = next(iter(monitor.get_query_statistics().values()))
+        assert stats['sampled_count'] == 4
+        assert stats['count'] == 8
+        assert monitor.collect_database_metrics().query_count == 8
@@ -0,0 +1,234 @@
+"""
+Unit tests for the token bucket rate limiter and its configuration.
+
+Tests refill on the monotonic clock, idle eviction, the identifier bound,
+the Redis-backed path and its local fallback.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from automation import config as automation_config
+from automation.cache_manager import CacheStrategy
+from automation.exceptions import AutomationConfigError
+from automation.security import SecurityConfig, SecurityManager, TokenBucketRateLimiter
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Patch the limiter's monotonic clock."""
+    fake = FakeClock()
+    with patch("automation.security.time.monotonic", fake):
+        yield fake
+
+
+class TestTokenBucketRateLimiter:
+    """Test in-process token buckets."""
+
+    def test_burst_then_reject(self, clock):
+        """A fresh identifier gets exactly burst_size requests."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst_size=3)
+
+        results = [limiter.is_allowed("client")[0] for _ in range(4)]
+
+        assert results == [True, True, True, False]
+        allowed, info = limiter.is_allowed("client")
+        assert not allowed
+        assert info["remaining"] == 0
+        assert info["retry_after"] >= 1
+
+    def test_refill_over_time(self, clock):
+        """Tokens refill at requests_per_minute / 60 per second."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst_size=2)
+        limiter.is_allowed("client")
+        limiter.is_allowed("client")
+        assert not limiter.is_allowed("client")[0]
+
+        clock.now += 1.0
+        assert limiter.is_allowed("client")[0]
+        assert not limiter.is_allowed("client")[0]
+
+        # Refill never exceeds the bucket capacity
+        clock.now += 100.0
+        assert [limiter.is_allowed("client")[0] for _ in range(3)] == [True, True, False]
+
+    def test_identifiers_are_independent(self, clock):
+        """Exhausting one bucket does not affect another."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst_size=1)
+
+        assert limiter.is_allowed("a")[0]
+        assert not limiter.is_allowed("a")[0]
+        assert limiter.is_allowed("b")[0]
+
+    def test_idle_buckets_are_evicted(self, clock):
+        """Buckets idle longer than the timeout are dropped."""
+        limiter = TokenBucketRateLimiter(
+            requests_per_minute=60, burst_size=5, idle_timeout_seconds=10
+        )
+        limiter.is_allowed("idle")
+        clock.now += 5
+        limiter.is_allowed("active")
+
+        clock.now += 6
+        limiter.is_allowed("active")
+
+        assert "idle" not in limiter.buckets
+        assert "active" in limiter.buckets
+        assert limiter.evicted_identifiers == 1
+
+    def test_default_idle_timeout_is_full_refill_time(self):
+        """By default a bucket is evicted only once it would be full again."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=120, burst_size=10)
+
+        assert limiter.idle_timeout_seconds == pytest.approx(5.0)
+
+    def test_max_identifiers_bound(self, clock):
+        """The least recently used identifiers are dropped beyond the bound."""
+        limiter = TokenBucketRateLimiter(
+            requests_per_minute=60, burst_size=5, max_identifiers=3
+        )
+        for identifier in ("a", "b", "c"):
+            limiter.is_allowed(identifier)
+        limiter.is_allowed("a")
+        limiter.is_allowed("d")
+
+        assert list(limiter.buckets) == ["c", "a", "d"]
+        assert limiter.get_stats()["tracked_identifiers"] == 3
+        assert limiter.get_stats()["evicted_identifiers"] == 1
+
+
+class TestRedisRateLimiting:
+    """Test the shared Redis bucket path."""
+
+    @pytest.mark.asyncio
+    async def test_uses_redis_script(self, clock):
+        """Decisions come from the Redis script when it answers."""
+        cache_manager = Mock()
+        cache_manager.run_script = AsyncMock(return_value=[1, "4.5"])
+        limiter = TokenBucketRateLimiter(
+            requests_per_minute=60, burst_size=5, cache_manager=cache_manager
+        )
+
+        allowed, info = await limiter.is_allowed_async("client")
+
+        assert allowed
+        assert info["remaining"] == 4
+        kwargs = cache_manager.run_script.call_args.kwargs
+        assert kwargs["keys"] == ["client"]
+        assert kwargs["strategy"] == CacheStrategy.RATE_LIMITING
+        assert kwargs["args"][:2] == [5.0, 1.0]
+        assert not limiter.buckets
+
+    @pytest.mark.asyncio
+    async def test_redis_rejection(self, clock):
+        """A rejected Redis decision carries retry information."""
+        cache_manager = Mock()
+        cache_manager.run_script = AsyncMock(return_value=[0, "0.25"])
+        limiter = TokenBucketRateLimiter(
+            requests_per_minute=60, burst_size=5, cache_manager=cache_manager
+        )
+
+        allowed, info = await limiter.is_allowed_async("client")
+
+        assert not allowed
+        assert info["retry_after"] == 1
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_redis_unavailable(self, clock):
+        """Local buckets are used when the script returns None."""
+        cache_manager = Mock()
+        cache_manager.run_script = AsyncMock(return_value=None)
+        limiter = TokenBucketRateLimiter(
+            requests_per_minute=60, burst_size=1, cache_manager=cache_manager
+        )
+
+        assert (await limiter.is_allowed_async("client"))[0]
+        assert not (await limiter.is_allowed_async("client"))[0]
+        assert "client" in limiter.buckets
+
+    @pytest.mark.asyncio
+    async def test_no_cache_manager_uses_local_buckets(self, clock):
+        """Without a cache manager the async path is the local path."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst_size=1)
+
+        assert (await limiter.is_allowed_async("client"))[0]
+        assert not (await limiter.is_allowed_async("client"))[0]
+
+
+class TestRateLimitConfig:
+    """Test rate limit settings validation and wiring."""
+
+    @pytest.mark.parametrize("field_name", [
+        "rate_limit_requests_per_minute",
+        "rate_limit_burst_size",
+        "rate_limit_max_identifiers",
+        "rate_limit_idle_timeout_seconds",
+    ])
+    def test_non_positive_values_rejected(self, field_name):
+        """Zero would otherwise divide by zero in the limiter."""
+        with pytest.raises(ValueError):
+            SecurityConfig(**{field_name: 0})
+
+    def test_unknown_algorithm_rejected(self):
+        """Only known algorithms are accepted."""
+        with pytest.raises(ValueError):
+            SecurityConfig(rate_limit_algorithm="leaky")
+
+    def test_loaded_config_validation(self):
+        """The loaded automation config validates the same settings."""
+        with pytest.raises(AutomationConfigError):
+            automation_config.SecurityConfig(api_rate_limit_per_minute=0)
+        with pytest.raises(AutomationConfigError):
+            automation_config.SecurityConfig(rate_limit_algorithm="leaky")
+
+    def test_from_automation_config(self):
+        """Loaded settings map onto the security module's config."""
+        loaded = automation_config.SecurityConfig(
+            api_rate_limit_per_minute=30,
+            rate_limit_burst_size=7,
+            rate_limit_algorithm="sliding_window",
+            rate_limit_use_redis=True,
+        )
+
+        config = SecurityConfig.from_automation_config(loaded)
+
+        assert config.rate_limit_requests_per_minute == 30
+        assert config.rate_limit_burst_size == 7
+        assert config.rate_limit_algorithm == "sliding_window"
+        assert config.rate_limit_use_redis
+
+    def test_attach_cache_manager_when_redis_enabled(self):
+        """A cache manager attached after startup reaches the limiter."""
+        manager = SecurityManager(SecurityConfig(rate_limit_use_redis=True))
+        cache_manager = Mock()
+
+        manager.attach_cache_manager(cache_manager)
+
+        assert manager.rate_limiter.cache_manager is cache_manager
+
+        manager.configure(SecurityConfig(rate_limit_use_redis=True, rate_limit_burst_size=3))
+        assert manager.rate_limiter.cache_manager is cache_manager
+
+    def test_attach_cache_manager_ignored_when_redis_disabled(self):
+        """Local limiting stays local unless Redis is enabled."""
+        manager = SecurityManager(SecurityConfig())
+
+        manager.attach_cache_manager(Mock())
+
+        assert manager.rate_limiter.cache_manager is None
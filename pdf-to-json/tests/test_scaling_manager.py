@@ -0,0 +1,139 @@
+"""
+Unit tests for consistent-hash worker selection in the scaling manager.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from automation.exceptions import ScalingManagerError
+from automation.scaling_manager import (
+    ConsistentHashRing, LoadBalancingStrategy, ScalingConfig, ScalingManager, job_affinity_key
+)
+
+
+def build_ring(count: int, virtual_nodes: int = 128) -> ConsistentHashRing:
+    """Build a ring with ``count`` workers."""
+    ring = ConsistentHashRing(virtual_nodes)
+    for index in range(count):
+        ring.add_node(f"worker-{index}")
+    return ring
+
+
+class TestConsistentHashRing:
+    """Test ring ownership and membership changes."""
+
+    def test_same_key_same_node(self):
+        """A key always maps to the same node."""
+        ring = build_ring(5)
+
+        assert ring.get_node("league:2025-08-05") == ring.get_node("league:2025-08-05")
+
+    def test_join_moves_about_one_nth(self):
+        """Adding a node only moves keys onto that node."""
+        ring = build_ring(8)
+        keys = [f"key-{index}" for index in range(5000)]
+        before = {key: ring.get_node(key) for key in keys}
+
+        ring.add_node("worker-8")
+        moved = [key for key in keys if ring.get_node(key) != before[key]]
+
+        assert all(ring.get_node(key) == "worker-8" for key in moved)
+        assert 0.05 < len(moved) / len(keys) < 0.2
+
+    def test_leave_moves_only_departed_keys(self):
+        """Removing a node only moves the keys it owned."""
+        ring = build_ring(8)
+        keys = [f"key-{index}" for index in range(5000)]
+        before = {key: ring.get_node(key) for key in keys}
+
+        ring.remove_node("worker-3")
+
+        for key in keys:
+            if before[key] != "worker-3":
+                assert ring.get_node(key) == before[key]
+            else:
+                assert ring.get_node(key) != "worker-3"
+        assert "worker-3" not in ring
+
+    def test_iter_nodes_yields_each_node_once(self):
+        """Fallback order visits every node exactly once, owner first."""
+        ring = build_ring(4)
+
+        order = list(ring.iter_nodes("some-key"))
+
+        assert order[0] == ring.get_node("some-key")
+        assert sorted(order) == [f"worker-{index}" for index in range(4)]
+
+    def test_empty_ring(self):
+        """An empty ring owns nothing."""
+        assert ConsistentHashRing().get_node("key") is None
+
+    def test_virtual_nodes_must_be_positive(self):
+        """A ring without points is rejected."""
+        with pytest.raises(ScalingManagerError):
+            ConsistentHashRing(0)
+
+
+class TestJobAffinityKey:
+    """Test affinity key derivation."""
+
+    def test_key_precedence(self):
+        """Explicit keys beat content hashes, which beat league/date buckets."""
+        assert job_affinity_key({"affinity_key": "a", "content_hash": "b"}) == "a"
+        assert job_affinity_key({"content_hash": "b", "league": "NB I"}) == "content:b"
+        assert job_affinity_key({"league": "NB I", "date": "2025-08-05"}) == "bucket:NB I:2025-08-05"
+        assert job_affinity_key({}) is None
+
+
+class TestConsistentHashAssignment:
+    """Test job assignment through the scaling manager."""
+
+    async def _manager(self, workers: int) -> ScalingManager:
+        manager = ScalingManager(ScalingConfig(
+            load_balancing_strategy=LoadBalancingStrategy.CONSISTENT_HASH
+        ))
+        for index in range(workers):
+            await manager.register_worker(f"worker-{index}", "127.0.0.1", 9000 + index, max_jobs=1)
+            await manager.update_worker_heartbeat(f"worker-{index}")
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_related_jobs_share_worker(self):
+        """Jobs with the same affinity key land on the ring owner."""
+        manager = await self._manager(4)
+        requirements = {"league": "NB I", "date": "2025-08-05"}
+        owner = manager.hash_ring.get_node(job_affinity_key(requirements))
+
+        first = await manager.assign_job("job-1", requirements)
+        await manager.job_completed(first, "job-1")
+        second = await manager.assign_job("job-2", requirements)
+
+        assert first == second == owner
+
+    @pytest.mark.asyncio
+    async def test_busy_owner_spills_to_successor(self):
+        """A full owner hands the job to the next worker clockwise."""
+        manager = await self._manager(4)
+        requirements = {"content_hash": "abc"}
+        order = list(manager.hash_ring.iter_nodes(job_affinity_key(requirements)))
+
+        first = await manager.assign_job("job-1", requirements)
+        second = await manager.assign_job("job-2", requirements)
+
+        assert first == order[0]
+        assert second == order[1]
+
+    @pytest.mark.asyncio
+    async def test_deregister_removes_from_ring(self):
+        """Deregistered workers leave the ring."""
+        manager = await self._manager(3)
+
+        await manager.deregister_worker("worker-1")
+
+        assert "worker-1" not in manager.hash_ring
+        assert len(manager.hash_ring) == 2
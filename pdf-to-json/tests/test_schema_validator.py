@@ -0,0 +1,169 @@
+"""
+Unit tests for cached schema validators and streaming football validation.
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from converter import schema_validator as schema_validator_module
+from converter.schema_validator import SchemaValidator
+
+
+def make_game(index: int) -> dict:
+    return {
+        "league": "NB I",
+        "date": "2025-08-05",
+        "time": "18:00",
+        "home_team": f"Home {index}",
+        "away_team": f"Away {index}",
+        "main_market": {"market_type": "1x2", "home_odds": 1.5, "draw_odds": 3.2, "away_odds": 4.0},
+        "additional_markets": [],
+        "total_markets": 1,
+    }
+
+
+def football_output(games: list) -> dict:
+    return {"processing_info": {"total_games": len(games)}, "games": games}
+
+
+def as_file(data: dict) -> io.BytesIO:
+    return io.BytesIO(json.dumps(data).encode())
+
+
+@pytest.fixture
+def validator():
+    return SchemaValidator()
+
+
+class TestValidatorCache:
+    """Test compiled validator reuse."""
+
+    def test_validator_compiled_once(self, validator):
+        """The schema is checked once and its validator reused."""
+        with patch.object(schema_validator_module, "validator_for",
+                          wraps=schema_validator_module.validator_for) as factory:
+            for _ in range(3):
+                validator.validate_json(football_output([make_game(1)]), "football")
+
+        assert factory.call_count == 1
+        assert validator.get_validator("football") is validator.get_validator("football")
+
+    def test_replacing_schema_drops_cached_validator(self, validator):
+        """A schema registered under an existing name is used from then on."""
+        schema = {"type": "object", "properties": {"a": {"type": "string"}}, "required": ["a"]}
+        validator.create_custom_schema(schema, "custom")
+        assert not validator.validate_json({}, "custom")[0]
+
+        validator.create_custom_schema({"type": "object", "properties": {}}, "custom")
+
+        assert validator.validate_json({}, "custom") == (True, [])
+
+    def test_unknown_schema(self, validator):
+        assert validator.validate_json({}, "missing") == (False, ["Schema 'missing' not found"])
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            SchemaValidator(backend="nope")
+
+    def test_fast_backend_falls_back_without_package(self):
+        """The jsonschema backend is used when fastjsonschema is missing."""
+        with patch.object(schema_validator_module, "fastjsonschema", None):
+            assert SchemaValidator(backend="fastjsonschema").backend == "jsonschema"
+
+
+class TestAllErrors:
+    """Test first-error and all-errors modes."""
+
+    def test_first_error_mode_reports_one_error(self, validator):
+        games = [dict(make_game(1), time=5), dict(make_game(2), league=None)]
+
+        is_valid, errors = validator.validate_json(football_output(games), "football")
+
+        assert not is_valid
+        assert len(errors) == 1
+        assert errors[0].startswith("Validation error: ")
+
+    def test_all_errors_mode_reports_each_location(self, validator):
+        games = [dict(make_game(1), time=5), make_game(2), dict(make_game(3), league=None)]
+
+        is_valid, errors = validator.validate_json(football_output(games), "football", all_errors=True)
+
+        assert not is_valid
+        assert errors == [
+            "Validation error at games/0/time: 5 is not of type 'string'",
+            "Validation error at games/2/league: None is not of type 'string'",
+        ]
+
+    def test_max_errors(self, validator):
+        games = [dict(make_game(index), time=index) for index in range(10)]
+
+        _, errors = validator.validate_json(football_output(games), "football",
+                                            all_errors=True, max_errors=3)
+
+        assert len(errors) == 3
+
+
+class TestStreamingValidation:
+    """Test game-by-game validation of football outputs."""
+
+    def test_valid_file(self, validator, tmp_path):
+        path = tmp_path / "games.json"
+        path.write_text(json.dumps(football_output([make_game(index) for index in range(50)])))
+
+        assert validator.validate_games_stream(path) == (True, [], 50)
+
+    def test_matches_in_memory_validation(self, validator):
+        """Streaming reports the same errors as validating the loaded document."""
+        data = football_output([make_game(0), dict(make_game(1), home_team=7), make_game(2)])
+        data["processing_info"] = "not an object"
+
+        _, in_memory = validator.validate_json(data, "football", all_errors=True)
+        is_valid, streamed, checked = validator.validate_games_stream(as_file(data), all_errors=True)
+
+        assert not is_valid
+        assert checked == 3
+        assert sorted(streamed) == sorted(in_memory)
+
+    def test_stops_at_first_invalid_game(self, validator):
+        data = football_output([make_game(0), dict(make_game(1), time=None)] +
+                               [make_game(index) for index in range(2, 100)])
+
+        is_valid, errors, checked = validator.validate_games_stream(as_file(data))
+
+        assert not is_valid
+        assert checked == 2
+        assert len(errors) == 1
+
+    def test_missing_games_and_wrong_types(self, validator):
+        assert not validator.validate_games_stream(as_file({"file_info": {}}))[0]
+        assert not validator.validate_games_stream(as_file({"games": {"a": 1}}))[0]
+        assert not validator.validate_games_stream(io.BytesIO(b"[1, 2]"))[0]
+        assert not validator.validate_games_stream(io.BytesIO(b'{"games": [{"league"'))[0]
+
+    def test_schema_without_games_array(self, validator):
+        assert not validator.supports_streaming("basic")
+        assert validator.validate_games_stream(as_file({}), "basic")[0] is False
+
+
+class TestConverterIntegration:
+    """Test file validation through the converter."""
+
+    def test_validate_json_file_streams_football_outputs(self, tmp_path):
+        from converter.converter import PDFToJSONConverter
+
+        path = tmp_path / "games.json"
+        path.write_text(json.dumps(football_output([make_game(1), dict(make_game(2), time=1)])))
+
+        result = PDFToJSONConverter().validate_json_file(str(path), "football", all_errors=True)
+
+        assert not result["is_valid"]
+        assert result["games_checked"] == 2
+        assert result["errors"] == ["Validation error at games/1/time: 1 is not of type 'string'"]
@@ -0,0 +1,163 @@
+"""
+Unit tests for the pure-ASGI security middleware.
+"""
+
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI, WebSocket
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from automation.security import SecurityConfig
+from automation.security_middleware import SecurityASGIMiddleware, create_security_middleware_stack
+
+
+def build_app(**config):
+    """App with the security middleware and a few routes."""
+    app = FastAPI()
+    manager = create_security_middleware_stack(app, SecurityConfig(**config))
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/items")
+    async def items(q: str = ""):
+        return {"q": q}
+
+    @app.get("/server")
+    async def server():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for index in range(3):
+                yield f"chunk-{index}\n".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.post("/api/v1/upload")
+    async def upload():
+        return {"uploaded": True}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app, manager
+
+
+class TestSecurityASGIMiddleware:
+    """Test checks and header injection."""
+
+    def test_installed_as_single_middleware(self):
+        app, _ = build_app()
+
+        assert [middleware.cls for middleware in app.user_middleware] == [SecurityASGIMiddleware]
+
+    def test_security_and_rate_limit_headers(self):
+        app, _ = build_app(rate_limit_burst_size=5)
+        response = TestClient(app).get("/items")
+
+        assert response.status_code == 200
+        assert response.headers["x-frame-options"] == "DENY"
+        assert response.headers["server"] == "Football-Automation-API"
+        assert response.headers["x-ratelimit-limit"] == "100"
+        assert response.headers["x-ratelimit-remaining"] == "4"
+        assert "strict-transport-security" not in response.headers
+
+    def test_hsts_behind_https_proxy(self):
+        app, _ = build_app()
+        response = TestClient(app).get("/items", headers={"X-Forwarded-Proto": "https"})
+
+        assert "strict-transport-security" in response.headers
+
+    def test_skip_paths_are_not_rate_limited(self):
+        app, _ = build_app(rate_limit_burst_size=1)
+        client = TestClient(app)
+
+        statuses = [client.get("/health").status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 200]
+        assert client.get("/health").headers["x-content-type-options"] == "nosniff"
+
+    def test_rate_limit_rejection(self):
+        app, _ = build_app(rate_limit_burst_size=2)
+        client = TestClient(app)
+
+        statuses = [client.get("/items").status_code for _ in range(3)]
+        rejected = client.get("/items")
+
+        assert statuses == [200, 200, 429]
+        assert rejected.json()["error"] == "Rate limit exceeded"
+        assert rejected.headers["x-ratelimit-remaining"] == "0"
+        assert int(rejected.headers["retry-after"]) >= 1
+
+    def test_ip_whitelist(self):
+        app, _ = build_app(enable_ip_whitelisting=True, allowed_ips=["10.0.0.1"])
+        client = TestClient(app)
+
+        assert client.get("/items", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 403
+        assert client.get("/items", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+
+    def test_query_validation(self):
+        app, _ = build_app()
+        client = TestClient(app)
+
+        response = client.get("/items", params={"q": "<script>alert(1)</script>"})
+
+        assert response.status_code == 400
+        assert response.json()["param"] == "q"
+        assert client.get("/items", params={"q": "NB I"}).status_code == 200
+
+    def test_upload_checks(self):
+        app, _ = build_app(max_file_size_mb=1)
+        client = TestClient(app)
+
+        assert client.post("/api/v1/upload", json={}).status_code == 400
+        too_large = client.post("/api/v1/upload", files={"file": ("a.pdf", b"x" * (1024 * 1024 + 1))})
+        assert too_large.status_code == 413
+        assert client.post("/api/v1/upload", files={"file": ("a.pdf", b"%PDF")}).status_code == 200
+
+    def test_streaming_response_passes_through(self):
+        app, _ = build_app()
+
+        with TestClient(app).stream("GET", "/stream") as response:
+            chunks = list(response.iter_lines())
+
+        assert chunks == ["chunk-0", "chunk-1", "chunk-2"]
+        assert response.headers["x-frame-options"] == "DENY"
+
+    def test_unhandled_error_returns_generic_500(self):
+        app, _ = build_app()
+        response = TestClient(app, raise_server_exceptions=False).get("/boom")
+
+        assert response.status_code == 500
+        assert response.json() == {"error": "Internal server error"}
+
+    def test_configure_applies_to_installed_middleware(self):
+        app, manager = build_app(enable_rate_limiting=False)
+        client = TestClient(app)
+        assert client.get("/items").status_code == 200
+
+        manager.configure(SecurityConfig(rate_limit_burst_size=1))
+
+        assert client.get("/items").status_code == 200
+        assert client.get("/items").status_code == 429
+
+    def test_websocket_and_lifespan_pass_through(self):
+        app, _ = build_app(rate_limit_burst_size=1)
+
+        @app.websocket("/ws")
+        async def ws(websocket: WebSocket):
+            await websocket.accept()
+            await websocket.send_text("hi")
+            await websocket.close()
+
+        with TestClient(app) as client:
+            with client.websocket_connect("/ws") as websocket:
+                assert websocket.receive_text() == "hi"
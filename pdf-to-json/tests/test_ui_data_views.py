@@ -0,0 +1,100 @@
+"""
+Unit tests for the Streamlit UI data views.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ui.data_views import (
+    INLINE_JSON_LIMIT, build_json_view, content_digest, find_records, flatten_record
+)
+
+
+def football_output(games: int) -> bytes:
+    return json.dumps({
+        "metadata": {"processing_date": "2025-08-05"},
+        "games": [
+            {
+                "league": f"League {index % 3}", "date": "2025-08-05", "time": "K 20:00",
+                "home_team": f"Home {index}", "away_team": f"Away {index}",
+                "main_market": {"market_type": "1x2", "home_odds": 2.0},
+                "additional_markets": [{"market_type": "handicap"}] * (index % 4),
+                "processing_info": {"markets_capped": False},
+            }
+            for index in range(games)
+        ],
+    }).encode("utf-8")
+
+
+class TestFindRecords:
+    """Test locating the record list of a document."""
+
+    def test_known_key_preferred(self):
+        data = {"games": [], "other": [{"a": 1}, {"a": 2}]}
+        assert find_records(data) == ("games", [])
+
+    def test_largest_list_of_objects(self):
+        data = {"info": {"total": 2}, "tags": ["x"], "rows": [{"a": 1}, {"a": 2}], "few": [{"b": 1}]}
+        assert find_records(data) == ("rows", [{"a": 1}, {"a": 2}])
+
+    def test_top_level_list_and_scalars(self):
+        assert find_records([1, 2]) == (None, [1, 2])
+        assert find_records({"a": 1}) == (None, [])
+        assert find_records("text") == (None, [])
+
+
+class TestJsonView:
+    """Test building and paging a view."""
+
+    def test_summary_and_digest(self):
+        content = football_output(10)
+        view = build_json_view(content)
+
+        assert view.digest == content_digest(content)
+        assert view.record_key == "games"
+        assert view.summary == {"records": 10, "leagues": 3, "dates": 1, "markets": 10 + 13}
+        assert view.inline
+
+    def test_pages(self):
+        view = build_json_view(football_output(60))
+
+        assert view.page_count(25) == 3
+        assert [row["home_team"] for row in view.page_rows(3, 25)] == [f"Home {i}" for i in range(50, 60)]
+        # Out-of-range pages are clamped
+        assert view.page_rows(9, 25) == view.page_rows(3, 25)
+        assert view.page_rows(0, 25) == view.page_rows(1, 25)
+
+    def test_empty_document_has_one_page(self):
+        view = build_json_view(b'{"games": []}')
+        assert view.page_count(25) == 1
+        assert view.page_rows(1, 25) == []
+
+    def test_large_documents_not_inline(self):
+        view = build_json_view(football_output(INLINE_JSON_LIMIT // 100))
+        assert not view.inline
+
+    def test_invalid_json(self):
+        with pytest.raises(ValueError):
+            build_json_view(b"{not json")
+
+
+def test_flatten_record():
+    row = flatten_record({
+        "home_team": "Arsenal",
+        "main_market": {"home_odds": 1.5, "odds": {"x": 1}},
+        "additional_markets": [{}, {}],
+    })
+
+    assert row == {
+        "home_team": "Arsenal",
+        "main_market.home_odds": 1.5,
+        "main_market.odds": '{"x": 1}',
+        "additional_markets": 2,
+    }
+    assert flatten_record(5) == {"value": 5}
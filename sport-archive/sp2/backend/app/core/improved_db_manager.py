@@ -5,12 +5,90 @@ Javított adatbázis struktúra - egy meccshez több fogadási opció
 
 import sqlite3
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Trigram FTS5 árnyékindexek a részleges (LIKE '%...%') kereséshez.
+# A triggerek tartják szinkronban őket az alaptáblákkal.
+SEARCH_INDEX_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS matches_fts USING fts5(
+        team_home, team_away, match_day, source_pdf,
+        content='matches', content_rowid='id', tokenize='trigram'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS matches_fts_insert AFTER INSERT ON matches BEGIN
+        INSERT INTO matches_fts (rowid, team_home, team_away, match_day, source_pdf)
+        VALUES (new.id, new.team_home, new.team_away, new.match_day, new.source_pdf);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS matches_fts_delete AFTER DELETE ON matches BEGIN
+        INSERT INTO matches_fts (matches_fts, rowid, team_home, team_away, match_day, source_pdf)
+        VALUES ('delete', old.id, old.team_home, old.team_away, old.match_day, old.source_pdf);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS matches_fts_update AFTER UPDATE ON matches BEGIN
+        INSERT INTO matches_fts (matches_fts, rowid, team_home, team_away, match_day, source_pdf)
+        VALUES ('delete', old.id, old.team_home, old.team_away, old.match_day, old.source_pdf);
+        INSERT INTO matches_fts (rowid, team_home, team_away, match_day, source_pdf)
+        VALUES (new.id, new.team_home, new.team_away, new.match_day, new.source_pdf);
+    END
+    ''',
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS betting_options_fts USING fts5(
+        bet_type, content='betting_options', content_rowid='id', tokenize='trigram'
+    )
+    ''',
+    # Kötegelt mentéskor (deferred = 1) a fogadási opciók egyetlen
+    # INSERT ... SELECT-tel kerülnek az indexbe, soronkénti trigger helyett
+    '''
+    CREATE TABLE IF NOT EXISTS search_index_control (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        deferred INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    "INSERT OR IGNORE INTO search_index_control (id, deferred) VALUES (1, 0)",
+    "DROP TRIGGER IF EXISTS betting_options_fts_insert",
+    '''
+    CREATE TRIGGER betting_options_fts_insert AFTER INSERT ON betting_options
+    WHEN (SELECT deferred FROM search_index_control WHERE id = 1) = 0
+    BEGIN
+        INSERT INTO betting_options_fts (rowid, bet_type) VALUES (new.id, new.bet_type);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS betting_options_fts_delete AFTER DELETE ON betting_options BEGIN
+        INSERT INTO betting_options_fts (betting_options_fts, rowid, bet_type)
+        VALUES ('delete', old.id, old.bet_type);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS betting_options_fts_update AFTER UPDATE ON betting_options BEGIN
+        INSERT INTO betting_options_fts (betting_options_fts, rowid, bet_type)
+        VALUES ('delete', old.id, old.bet_type);
+        INSERT INTO betting_options_fts (rowid, bet_type) VALUES (new.id, new.bet_type);
+    END
+    ''',
+]
+
+INSERT_MATCH_SQL = '''
+    INSERT OR REPLACE INTO matches
+    (match_id, team_home, team_away, match_time, match_day, source_pdf)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_BETTING_OPTION_SQL = '''
+    INSERT INTO betting_options
+    (match_id, bet_type, bet_description, odds_1, odds_2, odds_3, raw_line, line_number)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
 class ImprovedDatabaseManager:
     """Javított adatbázis kezelő - egy meccshez több fogadási opció"""
 
@@ -22,6 +100,8 @@ class ImprovedDatabaseManager:
     def setup_database(self):
         """Javított adatbázis tábla létrehozása"""
         conn = sqlite3.connect(self.db_path)
+        # WAL: az írások nem blokkolják az API olvasásait; a fájlban megmarad
+        conn.execute("PRAGMA journal_mode = WAL")
         cursor = conn.cursor()
 
         # Fő meccs tábla
@@ -60,46 +140,103 @@ class ImprovedDatabaseManager:
             ON betting_options (match_id)
         ''')
 
+        # Indexek az API rendezéseihez, hogy a lapozás ne olvassa végig a táblát
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_matches_match_time
+            ON matches (match_time, id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_matches_team_home
+            ON matches (team_home, id)
+        ''')
+
+        self.search_index = self.setup_search_index(cursor)
+
         conn.commit()
         conn.close()
         logger.info(f"Javított adatbázis inicializálva: {self.db_path}")
 
+    def setup_search_index(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        FTS5 trigram keresőindexek és triggereik létrehozása
+
+        Meglévő adatbázisnál az indexek a már tárolt sorokból épülnek fel.
+        Ha az SQLite nem támogatja az FTS5 trigram tokenizert (3.34 előtt),
+        az API LIKE kereséssel működik tovább.
+
+        Returns:
+            bool: True, ha a keresőindexek elérhetők
+        """
+        existing = {
+            row[0] for row in cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name IN ('matches_fts', 'betting_options_fts')"
+            )
+        }
+        try:
+            for statement in SEARCH_INDEX_SCHEMA:
+                cursor.execute(statement)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 trigram keresőindex nem hozható létre, LIKE keresés marad: {e}")
+            return False
+
+        if 'matches_fts' not in existing:
+            cursor.execute("INSERT INTO matches_fts (matches_fts) VALUES ('rebuild')")
+        if 'betting_options_fts' not in existing:
+            cursor.execute("INSERT INTO betting_options_fts (betting_options_fts) VALUES ('rebuild')")
+        return True
+
+    def _connect_for_writing(self) -> sqlite3.Connection:
+        """Írási kapcsolat: WAL mellett NORMAL szinkronizálás, nagyobb lapgyorsítótár"""
+        conn = sqlite3.connect(self.db_path)
+        # Az INSERT OR REPLACE által törölt sorra is fusson le a keresőindex
+        # törlő triggere
+        conn.execute("PRAGMA recursive_triggers = ON")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA cache_size = -65536")  # 64 MiB
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    @staticmethod
+    def _match_row(match_data: Dict[str, Any]) -> tuple:
+        return (
+            match_data['match_id'],
+            match_data['team_home'],
+            match_data['team_away'],
+            match_data.get('match_time'),
+            match_data.get('match_day'),
+            match_data.get('source_pdf')
+        )
+
+    @staticmethod
+    def _betting_option_rows(match_id: str, betting_options: List[Dict[str, Any]]) -> List[tuple]:
+        return [
+            (
+                match_id,
+                bet_option.get('bet_type', 'unknown'),
+                bet_option.get('bet_description', ''),
+                bet_option.get('odds_1'),
+                bet_option.get('odds_2'),
+                bet_option.get('odds_3'),
+                bet_option.get('raw_line', ''),
+                bet_option.get('line_number', 0)
+            )
+            for bet_option in betting_options
+        ]
+
     def save_match_with_bets(self, match_data: Dict[str, Any], betting_options: List[Dict[str, Any]]):
         """Meccs mentése az összes fogadási opcióval"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect_for_writing()
         cursor = conn.cursor()
 
         try:
             # Fő meccs mentése
-            cursor.execute('''
-                INSERT OR REPLACE INTO matches
-                (match_id, team_home, team_away, match_time, match_day, source_pdf)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                match_data['match_id'],
-                match_data['team_home'],
-                match_data['team_away'],
-                match_data.get('match_time'),
-                match_data.get('match_day'),
-                match_data.get('source_pdf')
-            ))
+            cursor.execute(INSERT_MATCH_SQL, self._match_row(match_data))
 
             # Fogadási opciók mentése
-            for bet_option in betting_options:
-                cursor.execute('''
-                    INSERT INTO betting_options
-                    (match_id, bet_type, bet_description, odds_1, odds_2, odds_3, raw_line, line_number)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    match_data['match_id'],
-                    bet_option.get('bet_type', 'unknown'),
-                    bet_option.get('bet_description', ''),
-                    bet_option.get('odds_1'),
-                    bet_option.get('odds_2'),
-                    bet_option.get('odds_3'),
-                    bet_option.get('raw_line', ''),
-                    bet_option.get('line_number', 0)
-                ))
+            cursor.executemany(
+                INSERT_BETTING_OPTION_SQL,
+                self._betting_option_rows(match_data['match_id'], betting_options)
+            )
 
             conn.commit()
             return True
@@ -111,6 +248,58 @@ class ImprovedDatabaseManager:
         finally:
             conn.close()
 
+    def save_matches_with_bets(self, matches: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]) -> int:
+        """
+        Egy PDF összes meccsének mentése egyetlen tranzakcióban
+
+        Ugyanazt az eredményt adja, mintha a meccseket sorban egyenként
+        mentenénk save_match_with_bets-szel, de egy kapcsolattal és két
+        executemany utasítással. Hiba esetén a köteg visszagörgetődik, és a
+        meccsek egyenként mentődnek.
+
+        Args:
+            matches: (meccs adatok, fogadási opciók) párok a PDF sorrendjében
+
+        Returns:
+            int: A sikeresen mentett meccsek száma
+        """
+        if not matches:
+            return 0
+
+        conn = self._connect_for_writing()
+        try:
+            match_rows = [self._match_row(match_data) for match_data, _ in matches]
+            bet_rows = [
+                row
+                for match_data, betting_options in matches
+                for row in self._betting_option_rows(match_data['match_id'], betting_options)
+            ]
+            with conn:
+                conn.executemany(INSERT_MATCH_SQL, match_rows)
+                if self.search_index:
+                    # Az index frissítése a tranzakción belül, így más kapcsolat
+                    # sosem látja a halasztott állapotot
+                    conn.execute("UPDATE search_index_control SET deferred = 1 WHERE id = 1")
+                    first_new_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM betting_options").fetchone()[0]
+                conn.executemany(INSERT_BETTING_OPTION_SQL, bet_rows)
+                if self.search_index:
+                    conn.execute("""
+                        INSERT INTO betting_options_fts (rowid, bet_type)
+                        SELECT id, bet_type FROM betting_options WHERE id > ?
+                    """, (first_new_id,))
+                    conn.execute("UPDATE search_index_control SET deferred = 0 WHERE id = 1")
+            return len(matches)
+
+        except Exception as e:
+            logger.warning(f"Kötegelt mentés sikertelen, meccsenkénti mentés: {e}")
+        finally:
+            conn.close()
+
+        return sum(
+            1 for match_data, betting_options in matches
+            if self.save_match_with_bets(match_data, betting_options)
+        )
+
     def get_matches_with_bets(self) -> List[Dict[str, Any]]:
         """Összes meccs lekérése a fogadási opciókkal"""
         conn = sqlite3.connect(self.db_path)
@@ -164,6 +353,9 @@ class ImprovedDatabaseManager:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
+        cursor.execute("DROP TABLE IF EXISTS betting_options_fts")
+        cursor.execute("DROP TABLE IF EXISTS search_index_control")
+        cursor.execute("DROP TABLE IF EXISTS matches_fts")
         cursor.execute("DROP TABLE IF EXISTS betting_options")
         cursor.execute("DROP TABLE IF EXISTS matches")
 
@@ -93,8 +93,8 @@ class ImprovedPDFProcessor:
 
             logger.info(f"Kinyert meccsk: {len(matches)}")
 
-            # Mentés az adatbázisba
-            saved_matches = 0
+            # Mentés az adatbázisba, PDF-enként egy tranzakcióban
+            matches_to_save = []
             for match in matches:
                 match_data = {
                     'match_id': match.match_id,
@@ -117,8 +117,9 @@ class ImprovedPDFProcessor:
                         'line_number': bet_option.line_number
                     })
 
-                if self.db_manager.save_match_with_bets(match_data, betting_options):
-                    saved_matches += 1
+                matches_to_save.append((match_data, betting_options))
+
+            saved_matches = self.db_manager.save_matches_with_bets(matches_to_save)
 
             self.processed_pdfs.add(pdf_path.name)
 
@@ -3,11 +3,16 @@
 Optimalizált PDF feldolgozó - tiszta architektúrával
 """
 
+import multiprocessing
 import os
+import queue
 import subprocess
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import logging
 
@@ -17,17 +22,43 @@ from match_extractor import MatchExtractor, MatchData, MatchFormat
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Írási kapcsolatok beállításai: WAL naplózás mellett a NORMAL szinkronizálás
+# csak checkpointkor vár a lemezre, a nagyobb lapgyorsítótár pedig a
+# UNIQUE index ellenőrzését gyorsítja tömeges beszúráskor
+SQLITE_WRITE_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",  # 64 MiB
+    "PRAGMA temp_store = MEMORY",
+)
+
+MATCH_COLUMNS = (
+    "match_id, teams, time_info, day_info, odds_1, odds_2, odds_3, "
+    "match_type, raw_line, source_pdf, line_number"
+)
+
+def connect_for_writing(db_path: Path) -> sqlite3.Connection:
+    """Írásra hangolt adatbázis kapcsolat"""
+    conn = sqlite3.connect(db_path)
+    for pragma in SQLITE_WRITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 class DatabaseManager:
     """Adatbázis kezelő osztály"""
 
-    def __init__(self, db_path: str = "data/optimized_sport_data.db"):
+    def __init__(self, db_path: str = "data/optimized_sport_data.db", use_staging: bool = False):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
+        # True: a meccsek egy ideiglenes staging táblába kerülnek, és egyetlen
+        # INSERT ... SELECT szűri ki a duplikátumokat
+        self.use_staging = use_staging
         self.setup_database()
 
     def setup_database(self):
         """Adatbázis tábla létrehozása"""
         conn = sqlite3.connect(self.db_path)
+        # A WAL mód az adatbázis fájlban marad, elég egyszer beállítani
+        conn.execute("PRAGMA journal_mode = WAL")
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -53,49 +84,105 @@ class DatabaseManager:
         conn.close()
         logger.info(f"Adatbázis inicializálva: {self.db_path}")
 
-    def save_matches(self, matches: List[MatchData], source_pdf: str) -> int:
-        """Meccsek mentése adatbázisba"""
+    def save_matches(self, matches: List[MatchData], source_pdf: str,
+                     conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Meccsek mentése adatbázisba, PDF-enként egy tranzakcióban
+
+        A sorok előre elkészített tuple-ökként, executemany-vel kerülnek be.
+        Ha a köteg hibára fut, a tranzakció visszagörgetődik, és a meccsek
+        soronként mentődnek, hogy a hibás sorok ne vigyék el a többit.
+
+        Args:
+            conn: Meglévő írási kapcsolat (pl. az író szálé); ha nincs megadva,
+                a mentés saját kapcsolatot nyit és zár
+
+        Returns:
+            int: Az újonnan mentett meccsek száma (a duplikátumok nélkül)
+        """
         if not matches:
             return 0
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        saved_count = 0
-        for match in matches:
-            try:
-                cursor.execute('''
-                    INSERT OR IGNORE INTO matches
-                    (match_id, teams, time_info, day_info, odds_1, odds_2, odds_3,
-                     match_type, raw_line, source_pdf, line_number)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    match.match_id,
-                    match.teams,
-                    match.time_info,
-                    match.day_info,
-                    match.odds[0],
-                    match.odds[1],
-                    match.odds[2],
-                    match.match_type.value,
-                    match.raw_line,
-                    source_pdf,
-                    match.line_number
-                ))
-
-                if cursor.rowcount > 0:
-                    saved_count += 1
-
-            except sqlite3.Error as e:
-                logger.error(f"Hiba meccs mentésekor: {e}")
-                continue
+        rows = [self._match_row(match, source_pdf) for match in matches]
 
-        conn.commit()
-        conn.close()
+        own_connection = conn is None
+        if own_connection:
+            conn = connect_for_writing(self.db_path)
+        try:
+            with conn:
+                if self.use_staging:
+                    saved_count = self._insert_via_staging(conn, rows)
+                else:
+                    saved_count = conn.executemany(
+                        f"INSERT OR IGNORE INTO matches ({MATCH_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows
+                    ).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Kötegelt mentés sikertelen, soronkénti mentés: {e}")
+            saved_count = self._save_rows_one_by_one(conn, rows)
+        finally:
+            if own_connection:
+                conn.close()
 
         logger.info(f"Mentett meccsek: {saved_count}/{len(matches)}")
         return saved_count
 
+    @staticmethod
+    def _match_row(match: MatchData, source_pdf: str) -> tuple:
+        """Egy meccs beszúrandó sora"""
+        return (
+            match.match_id,
+            match.teams,
+            match.time_info,
+            match.day_info,
+            match.odds[0],
+            match.odds[1],
+            match.odds[2],
+            match.match_type.value,
+            match.raw_line,
+            source_pdf,
+            match.line_number
+        )
+
+    @staticmethod
+    def _insert_via_staging(conn: sqlite3.Connection, rows: List[tuple]) -> int:
+        """Betöltés staging táblába, majd duplikátumszűrés egyetlen INSERT ... SELECT-tel"""
+        conn.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS staging_matches AS
+            SELECT {MATCH_COLUMNS} FROM matches WHERE 0
+        """)
+        conn.execute("DELETE FROM staging_matches")
+        conn.executemany(
+            f"INSERT INTO staging_matches ({MATCH_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        # A staging sorrendje megegyezik a PDF sorrendjével: az első előfordulás marad meg
+        saved_count = conn.execute(f"""
+            INSERT OR IGNORE INTO matches ({MATCH_COLUMNS})
+            SELECT {MATCH_COLUMNS} FROM staging_matches ORDER BY rowid
+        """).rowcount
+        conn.execute("DELETE FROM staging_matches")
+        return saved_count
+
+    @staticmethod
+    def _save_rows_one_by_one(conn: sqlite3.Connection, rows: List[tuple]) -> int:
+        """Soronkénti mentés, a hibás sorok kihagyásával"""
+        saved_count = 0
+        with conn:
+            for row in rows:
+                try:
+                    cursor = conn.execute(
+                        f"INSERT OR IGNORE INTO matches ({MATCH_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        row
+                    )
+                    if cursor.rowcount > 0:
+                        saved_count += 1
+
+                except sqlite3.Error as e:
+                    logger.error(f"Hiba meccs mentésekor: {e}")
+                    continue
+        return saved_count
+
     def get_statistics(self) -> Dict[str, Any]:
         """Adatbázis statisztikák"""
         conn = sqlite3.connect(self.db_path)
@@ -163,6 +250,27 @@ class PDFTextExtractor:
             logger.error(f"Kivétel: {e}")
             return None
 
+# Process pool workerenként egy MatchExtractor (a regexek egyszer fordulnak)
+_worker_extractor: Optional[MatchExtractor] = None
+
+def extract_matches_from_text(text: str) -> Tuple[List[MatchData], float]:
+    """
+    Meccsek kinyerése a szövegből (process pool worker)
+
+    A statisztikák a szülő folyamatban készülnek: a csapatlista egy set
+    sorrendjét követi, ami folyamatonként más string hash-től függ.
+
+    Returns:
+        Tuple: (meccsek, eltelt másodpercek)
+    """
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = MatchExtractor()
+
+    started = time.perf_counter()
+    matches = _worker_extractor.extract_from_text(text)
+    return matches, time.perf_counter() - started
+
 class SzerencseMixProcessor:
     """Fő feldolgozó osztály - tiszta architektúrával"""
 
@@ -178,19 +286,50 @@ class SzerencseMixProcessor:
         logger.info(f"PDF feldolgozás kezdése: {pdf_path.name}")
 
         # 1. Szöveg kinyerése
+        started = time.perf_counter()
         text = self.pdf_extractor.extract_text(pdf_path)
+        text_seconds = time.perf_counter() - started
         if not text:
-            return {'error': 'Szöveg kinyerés sikertelen', 'pdf': pdf_path.name}
+            return self._text_error(pdf_path)
 
         # 2. Meccsek keresése
+        started = time.perf_counter()
         matches = self.extractor.extract_from_text(text)
+        match_stats = self.extractor.get_statistics(matches)
+        extract_seconds = time.perf_counter() - started
+
+        # 3. Adatbázisba mentés és 4. statisztikák
+        return self._save_result(pdf_path, text, matches, match_stats, text_seconds, extract_seconds)
+
+    @staticmethod
+    def _text_error(pdf_path: Path) -> Dict[str, Any]:
+        return {'error': 'Szöveg kinyerés sikertelen', 'pdf': pdf_path.name}
+
+    @staticmethod
+    def _failure(pdf_path: Path, error: Exception) -> Dict[str, Any]:
+        logger.error(f"Hiba {pdf_path.name} feldolgozásakor: {error}")
+        return {
+            'pdf': pdf_path.name,
+            'error': str(error),
+            'success': False
+        }
+
+    def _save_result(self, pdf_path: Path, text: str, matches: List[MatchData],
+                     match_stats: Dict[str, Any], text_seconds: float, extract_seconds: float,
+                     conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+        """Meccsek mentése és a PDF eredményének összeállítása, szakaszonkénti időkkel"""
         logger.info(f"Talált meccsek: {len(matches)}")
 
-        # 3. Adatbázisba mentés
-        saved_count = self.db_manager.save_matches(matches, pdf_path.name)
+        started = time.perf_counter()
+        saved_count = self.db_manager.save_matches(matches, pdf_path.name, conn=conn)
+        save_seconds = time.perf_counter() - started
 
-        # 4. Statisztikák
-        match_stats = self.extractor.get_statistics(matches)
+        timings = {
+            'text_extraction': round(text_seconds, 4),
+            'match_extraction': round(extract_seconds, 4),
+            'database': round(save_seconds, 4),
+            'total': round(text_seconds + extract_seconds + save_seconds, 4),
+        }
 
         result = {
             'pdf': pdf_path.name,
@@ -198,14 +337,37 @@ class SzerencseMixProcessor:
             'saved_matches': saved_count,
             'text_length': len(text),
             'statistics': match_stats,
-            'success': True
+            'success': True,
+            'timings': timings
         }
 
-        logger.info(f"PDF feldolgozás kész: {saved_count} meccs mentve")
+        logger.info(
+            f"PDF feldolgozás kész: {saved_count} meccs mentve "
+            f"(pdftotext {timings['text_extraction']:.2f}s, kinyerés {timings['match_extraction']:.2f}s, "
+            f"mentés {timings['database']:.2f}s)"
+        )
         return result
 
-    def process_directory(self, directory: Path, pattern: str = "*.pdf") -> List[Dict[str, Any]]:
-        """Mappa összes PDF-jének feldolgozása"""
+    def process_directory(self, directory: Path, pattern: str = "*.pdf",
+                          workers: int = 1) -> List[Dict[str, Any]]:
+        """
+        Mappa összes PDF-jének feldolgozása
+
+        workers > 1 esetén párhuzamosan: egyszerre ennyi pdftotext folyamat
+        fut, a meccskinyerés egy ennyi folyamatos process poolban történik,
+        és egyetlen író szál menti az eredményeket a saját SQLite
+        kapcsolatán. Az író a fájlok sorrendjében ment, így az adatbázis és
+        az eredménylista ugyanaz, mint soros feldolgozásnál.
+
+        Args:
+            directory: PDF-eket tartalmazó mappa
+            pattern: Fájlnév minta
+            workers: Párhuzamos pdftotext folyamatok és kinyerő workerek száma
+
+        Returns:
+            List: PDF-enkénti eredmények a fájlok sorrendjében, sikeres
+            feldolgozásnál szakaszonkénti időkkel ('timings')
+        """
         pdf_files = list(directory.glob(pattern))
 
         if not pdf_files:
@@ -214,21 +376,111 @@ class SzerencseMixProcessor:
 
         logger.info(f"PDF fájlok feldolgozása: {len(pdf_files)} fájl")
 
+        if workers > 1:
+            return self._process_files_parallel(pdf_files, workers)
+
         results = []
         for pdf_path in pdf_files:
             try:
                 result = self.process_pdf(pdf_path)
                 results.append(result)
             except Exception as e:
-                logger.error(f"Hiba {pdf_path.name} feldolgozásakor: {e}")
-                results.append({
-                    'pdf': pdf_path.name,
-                    'error': str(e),
-                    'success': False
-                })
+                results.append(self._failure(pdf_path, e))
 
         return results
 
+    def _process_files_parallel(self, pdf_files: List[Path], workers: int) -> List[Dict[str, Any]]:
+        """pdftotext szálak -> kinyerő process pool -> egyetlen író szál"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pdf_files)
+        # (index, szakasz, adat) elemek az író szálnak
+        write_queue: "queue.Queue[Tuple[int, str, Any]]" = queue.Queue()
+        writer_errors: List[BaseException] = []
+
+        writer = threading.Thread(
+            target=self._write_in_order,
+            args=(pdf_files, write_queue, results, writer_errors),
+            name="szerencsemix-writer",
+            daemon=True
+        )
+        writer.start()
+
+        def extract_text(pdf_path: Path) -> Tuple[Optional[str], float]:
+            logger.info(f"PDF feldolgozás kezdése: {pdf_path.name}")
+            started = time.perf_counter()
+            return self.pdf_extractor.extract_text(pdf_path), time.perf_counter() - started
+
+        def forward(index: int, text: str, text_seconds: float, future: Future) -> None:
+            try:
+                matches, extract_seconds = future.result()
+                started = time.perf_counter()
+                match_stats = self.extractor.get_statistics(matches)
+                extract_seconds += time.perf_counter() - started
+            except Exception as e:
+                write_queue.put((index, 'failed', e))
+                return
+            write_queue.put((index, 'extracted', (text, matches, match_stats, text_seconds, extract_seconds)))
+
+        # spawn: a fork-olt worker megörökölné a párhuzamosan induló pdftotext
+        # folyamatok pipe-jait és az író szál SQLite kapcsolatát
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdftotext") as text_pool, \
+                ProcessPoolExecutor(max_workers=workers,
+                                    mp_context=multiprocessing.get_context("spawn")) as extract_pool:
+            text_futures = {text_pool.submit(extract_text, pdf_path): index
+                            for index, pdf_path in enumerate(pdf_files)}
+
+            for text_future in as_completed(text_futures):
+                index = text_futures[text_future]
+                try:
+                    text, text_seconds = text_future.result()
+                    if not text:
+                        write_queue.put((index, 'no_text', None))
+                        continue
+                    extract_future = extract_pool.submit(extract_matches_from_text, text)
+                except Exception as e:
+                    write_queue.put((index, 'failed', e))
+                    continue
+                extract_future.add_done_callback(
+                    lambda future, index=index, text=text, text_seconds=text_seconds:
+                        forward(index, text, text_seconds, future)
+                )
+
+        writer.join()
+        if writer_errors:
+            raise writer_errors[0]
+        return results
+
+    def _write_in_order(self, pdf_files: List[Path], write_queue: "queue.Queue[Tuple[int, str, Any]]",
+                        results: List[Optional[Dict[str, Any]]], writer_errors: List[BaseException]) -> None:
+        """Író szál: a PDF-eket a fájlok sorrendjében menti, egyetlen kapcsolaton"""
+        pending: Dict[int, Tuple[str, Any]] = {}
+        next_index = 0
+        conn = None
+        try:
+            conn = connect_for_writing(self.db_manager.db_path)
+            while next_index < len(pdf_files):
+                index, stage, payload = write_queue.get()
+                pending[index] = (stage, payload)
+
+                while next_index in pending:
+                    stage, payload = pending.pop(next_index)
+                    pdf_path = pdf_files[next_index]
+                    if stage == 'no_text':
+                        results[next_index] = self._text_error(pdf_path)
+                    elif stage == 'failed':
+                        results[next_index] = self._failure(pdf_path, payload)
+                    else:
+                        try:
+                            results[next_index] = self._save_result(pdf_path, *payload, conn=conn)
+                        except Exception as e:
+                            results[next_index] = self._failure(pdf_path, e)
+                    next_index += 1
+
+        except BaseException as e:
+            writer_errors.append(e)
+        finally:
+            if conn is not None:
+                conn.close()
+
     def get_summary(self) -> Dict[str, Any]:
         """Feldolgozás összesítője"""
         return self.db_manager.get_statistics()
@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict, Any
@@ -16,6 +17,16 @@ from typing import Optional, List, Dict, Any
 # Database path
 DB_PATH = Path(__file__).parent.parent / "shared" / "data" / "optimized_sport_data.db"
 
+# Az IN lekérdezések paramétereinek maximális száma egy utasításban
+IN_QUERY_CHUNK_SIZE = 500
+
+# Részleges keresés a trigram FTS5 indexeken át, ha az adatbázisban megvannak
+# (False: mindig LIKE, pl. összehasonlításhoz)
+USE_FTS = True
+
+# A trigram index legalább ennyi karakteres keresőszónál használható
+FTS_MIN_TERM_LENGTH = 3
+
 # Pydantic models
 class BettingOption(BaseModel):
     bet_type: str
@@ -74,15 +85,70 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Szálanként egy megosztott, csak olvasható kapcsolat
+_read_connections = threading.local()
+
 def get_db_connection():
-    """Database kapcsolat létrehozása"""
-    if not DB_PATH.exists():
+    """
+    Csak olvasható database kapcsolat, szálanként egyszer megnyitva
+
+    A kapcsolatot a kérések újrahasznosítják, ezért nem szabad lezárni.
+    Ha a database fájlt lecserélték (pl. reimport_db.py), új kapcsolat nyílik.
+    """
+    try:
+        stat = DB_PATH.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=500, detail=f"Database nem található: {DB_PATH}")
 
-    conn = sqlite3.connect(str(DB_PATH))
+    file_id = (stat.st_dev, stat.st_ino)
+    conn = getattr(_read_connections, "conn", None)
+    if conn is not None and _read_connections.file_id == file_id:
+        return conn
+
+    if conn is not None:
+        conn.close()
+    conn = sqlite3.connect(f"{DB_PATH.resolve().as_uri()}?mode=ro", uri=True)
     conn.row_factory = sqlite3.Row  # Dict-szerű hozzáférés
+    _read_connections.conn = conn
+    _read_connections.file_id = file_id
+    _read_connections.search_indexes = {
+        row["name"] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('matches_fts', 'betting_options_fts')"
+        )
+    }
     return conn
 
+def substring_condition(alias: str, columns: List[str], term: str, fts_table: str):
+    """
+    Részleges keresés feltétele: bármelyik oszlop tartalmazza a keresőszót
+
+    Ha van trigram FTS5 index, az index szűri elő a sorokat, a LIKE pedig
+    csak ezeken fut, így az eredmény ugyanaz, mint a puszta LIKE-kal.
+    A túl rövid vagy LIKE helyettesítő karaktert (% _) tartalmazó
+    keresőszó csak LIKE-kal kereshető.
+
+    Returns:
+        Tuple: (SQL feltétel, paraméterek)
+    """
+    like_clause = " OR ".join(f"{alias}.{column} LIKE ?" for column in columns)
+    params = [f"%{term}%"] * len(columns)
+
+    use_index = (
+        USE_FTS
+        and fts_table in getattr(_read_connections, "search_indexes", ())
+        and len(term) >= FTS_MIN_TERM_LENGTH
+        and "%" not in term and "_" not in term
+    )
+    if not use_index:
+        return f"({like_clause})", params
+
+    phrase = '"' + term.replace('"', '""') + '"'
+    match_query = f"{{{' '.join(columns)}}} : {phrase}"
+    return (
+        f"{alias}.id IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?) AND ({like_clause})",
+        [match_query] + params
+    )
+
 @app.get("/")
 async def root():
     """API státusz"""
@@ -109,34 +175,30 @@ async def get_matches(
     try:
         conn = get_db_connection()
 
-        # Base query for matches with betting options
-        query = """
-        SELECT m.id, m.match_id, m.team_home, m.team_away, m.match_time, m.match_day,
-               m.source_pdf, m.extracted_at,
-               b.bet_type, b.bet_description, b.odds_1, b.odds_2, b.odds_3,
-               b.raw_line, b.line_number
-        FROM matches m
-        LEFT JOIN betting_options b ON m.match_id = b.match_id
-        WHERE 1=1
-        """
+        # Szűrők alkalmazása
+        conditions = []
         params = []
 
-        # Szűrők alkalmazása
+        def add_condition(condition):
+            conditions.append(condition[0])
+            params.extend(condition[1])
+
         if day_info:
-            query += " AND m.match_day LIKE ?"
-            params.append(f"%{day_info}%")
+            add_condition(substring_condition("m", ["match_day"], day_info, "matches_fts"))
 
         if team:
-            query += " AND (m.team_home LIKE ? OR m.team_away LIKE ?)"
-            params.extend([f"%{team}%", f"%{team}%"])
+            add_condition(substring_condition("m", ["team_home", "team_away"], team, "matches_fts"))
 
         if bet_type:
-            query += " AND b.bet_type LIKE ?"
-            params.append(f"%{bet_type}%")
+            # Csak azok a meccsek, amelyeknek van ilyen fogadási opciója
+            bet_condition, bet_params = substring_condition("b", ["bet_type"], bet_type, "betting_options_fts")
+            conditions.append(f"m.match_id IN (SELECT b.match_id FROM betting_options b WHERE {bet_condition})")
+            params.extend(bet_params)
 
         if source_pdf:
-            query += " AND m.source_pdf LIKE ?"
-            params.append(f"%{source_pdf}%")
+            add_condition(substring_condition("m", ["source_pdf"], source_pdf, "matches_fts"))
+
+        where_clause = " AND ".join(conditions) or "1=1"
 
         # Sorting
         sort_field_map = {
@@ -148,51 +210,66 @@ async def get_matches(
         sort_field = sort_field_map.get(sort_by, "m.id")
         sort_direction = "ASC" if sort_order.lower() == "asc" else "DESC"
 
-        query += f" ORDER BY {sort_field} {sort_direction}, b.bet_type"
-
-        # Execute query
-        cursor = conn.execute(query, params)
-        rows = cursor.fetchall()
-
-        # Group by match_id
+        # 1. fázis: találatok száma és az oldal meccsei, paginálás SQL-ben.
+        # Az id a stabil sorrendet adja azonos rendezési kulcsú meccseknél.
+        total_count = conn.execute(
+            f"SELECT COUNT(*) FROM matches m WHERE {where_clause}", params
+        ).fetchone()[0]
+
+        cursor = conn.execute(f"""
+            SELECT m.id, m.match_id, m.team_home, m.team_away, m.match_time, m.match_day,
+                   m.source_pdf, m.extracted_at
+            FROM matches m
+            WHERE {where_clause}
+            ORDER BY {sort_field} {sort_direction}, m.id {sort_direction}
+            LIMIT ? OFFSET ?
+        """, params + [max(limit, 0), offset])
+
+        paginated_matches = []
         matches_dict = {}
-        for row in rows:
-            match_id = row["match_id"]
-
-            if match_id not in matches_dict:
-                matches_dict[match_id] = {
-                    "id": row["id"],
-                    "match_id": row["match_id"],
-                    "team_home": row["team_home"],
-                    "team_away": row["team_away"],
-                    "match_time": row["match_time"],
-                    "match_day": row["match_day"],
-                    "source_pdf": row["source_pdf"],
-                    "extracted_at": row["extracted_at"],
-                    "betting_options": []
-                }
-
-            # Add betting option if exists
-            if row["bet_type"]:
-                matches_dict[match_id]["betting_options"].append({
-                    "bet_type": row["bet_type"],
-                    "bet_description": row["bet_description"],
-                    "odds_1": row["odds_1"],
-                    "odds_2": row["odds_2"],
-                    "odds_3": row["odds_3"],
-                    "raw_line": row["raw_line"],
-                    "line_number": row["line_number"]
-                })
-
-        # Convert to list and apply pagination
-        matches = list(matches_dict.values())
-        total_count = len(matches)
-
-        # Apply pagination
-        paginated_matches = matches[offset:offset + limit]
-
-        # Close connection
-        conn.close()
+        for row in cursor.fetchall():
+            match = {
+                "id": row["id"],
+                "match_id": row["match_id"],
+                "team_home": row["team_home"],
+                "team_away": row["team_away"],
+                "match_time": row["match_time"],
+                "match_day": row["match_day"],
+                "source_pdf": row["source_pdf"],
+                "extracted_at": row["extracted_at"],
+                "betting_options": []
+            }
+            paginated_matches.append(match)
+            matches_dict[row["match_id"]] = match
+
+        # 2. fázis: fogadási opciók csak az oldal meccseihez, IN lekérdezéssel
+        match_ids = list(matches_dict)
+        for start in range(0, len(match_ids), IN_QUERY_CHUNK_SIZE):
+            chunk = match_ids[start:start + IN_QUERY_CHUNK_SIZE]
+            bet_query = f"""
+                SELECT match_id, bet_type, bet_description, odds_1, odds_2, odds_3,
+                       raw_line, line_number
+                FROM betting_options
+                WHERE match_id IN ({", ".join("?" * len(chunk))})
+            """
+            bet_params = list(chunk)
+            if bet_type:
+                bet_query += " AND bet_type LIKE ?"
+                bet_params.append(f"%{bet_type}%")
+            bet_query += " ORDER BY bet_type, id"
+
+            for row in conn.execute(bet_query, bet_params):
+                # Add betting option if exists
+                if row["bet_type"]:
+                    matches_dict[row["match_id"]]["betting_options"].append({
+                        "bet_type": row["bet_type"],
+                        "bet_description": row["bet_description"],
+                        "odds_1": row["odds_1"],
+                        "odds_2": row["odds_2"],
+                        "odds_3": row["odds_3"],
+                        "raw_line": row["raw_line"],
+                        "line_number": row["line_number"]
+                    })
 
         return {
             "matches": paginated_matches,
@@ -266,8 +343,6 @@ async def get_statistics():
         """)
         top_teams = [dict(row) for row in cursor.fetchall()]
 
-        conn.close()
-
         return {
             "total_matches": total_matches,
             "total_betting_options": total_betting_options,
@@ -284,31 +359,33 @@ async def get_statistics():
 
 @app.get("/api/teams")
 async def get_teams(search: Optional[str] = Query(default=None, description="Csapat keresés")):
-    """Csapatok/Meccsek listázása"""
+    """Csapatok listázása (hazai és vendég csapatnevek)"""
 
     try:
         conn = get_db_connection()
 
         if search:
-            cursor = conn.execute("""
-                SELECT DISTINCT teams
-                FROM matches
-                WHERE teams LIKE ?
-                ORDER BY teams
+            condition, params = substring_condition("m", ["team_home", "team_away"], search, "matches_fts")
+            cursor = conn.execute(f"""
+                SELECT team FROM (
+                    SELECT m.team_home AS team FROM matches m WHERE {condition}
+                    UNION
+                    SELECT m.team_away AS team FROM matches m WHERE {condition}
+                )
+                WHERE team LIKE ?
+                ORDER BY team
                 LIMIT 50
-            """, [f"%{search}%"])
+            """, params + params + [f"%{search}%"])
         else:
             cursor = conn.execute("""
-                SELECT DISTINCT teams
-                FROM matches
-                WHERE teams IS NOT NULL
-                ORDER BY teams
+                SELECT team_home AS team FROM matches WHERE team_home IS NOT NULL
+                UNION
+                SELECT team_away AS team FROM matches WHERE team_away IS NOT NULL
+                ORDER BY team
                 LIMIT 100
             """)
 
-        teams = [row["teams"] for row in cursor.fetchall()]
-
-        conn.close()
+        teams = [row["team"] for row in cursor.fetchall()]
 
         return {"teams": teams}
 
@@ -332,8 +409,6 @@ async def get_sources():
 
         sources = [dict(row) for row in cursor.fetchall()]
 
-        conn.close()
-
         return {"sources": sources}
 
     except Exception as e:
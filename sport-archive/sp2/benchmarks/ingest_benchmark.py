@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark az adatbázis mentéshez
+
+Egy szintetikus szezon mappát (PDF-enként meccsek és fogadási opciók) ment
+el a régi módon és a kötegelt úton is, mindkét adatbázis kezelővel:
+
+- ImprovedDatabaseManager: meccsenként új kapcsolat és commit, szemben a
+  PDF-enként egy tranzakciós save_matches_with_bets-szel
+- DatabaseManager: soronkénti INSERT OR IGNORE, szemben az executemany-s
+  és a staging táblás mentéssel
+
+Ellenőrzi, hogy a táblák tartalma azonos, és kiírja a soronkénti áteresztést.
+
+Usage:
+    python benchmarks/ingest_benchmark.py
+    python benchmarks/ingest_benchmark.py --pdfs 30 --matches 1500 --bets 8
+"""
+
+import argparse
+import logging
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from matches_api_benchmark import BACKEND_DIR, BET_TYPES, load_module
+
+sys.path.insert(0, str(BACKEND_DIR / "app" / "core"))
+
+from match_extractor import MatchData, MatchFormat
+from pdf_processor_optimized import DatabaseManager
+
+improved_db_manager = load_module("sp2_improved_db_manager", BACKEND_DIR / "app" / "core" / "improved_db_manager.py")
+ImprovedDatabaseManager = improved_db_manager.ImprovedDatabaseManager
+
+
+class LegacyImprovedDatabaseManager(ImprovedDatabaseManager):
+    """Rollback journal, alapértelmezett szinkronizálás, meccsenkénti mentés"""
+
+    def setup_database(self):
+        super().setup_database()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+
+    def _connect_for_writing(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA recursive_triggers = ON")
+        return conn
+
+
+class LegacyDatabaseManager(DatabaseManager):
+    """Rollback journal, soronkénti INSERT OR IGNORE és rowcount ellenőrzés"""
+
+    def setup_database(self):
+        super().setup_database()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+
+    def save_matches(self, matches: List[MatchData], source_pdf: str) -> int:
+        conn = sqlite3.connect(self.db_path)
+        saved_count = self._save_rows_one_by_one(conn, [self._match_row(match, source_pdf) for match in matches])
+        conn.close()
+        return saved_count
+
+
+def make_season(pdfs: int, matches: int, bets: int, seed: int = 42) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """PDF-enként meccsek; minden huszadik meccs egy korábbi ismétlése (duplikátum)"""
+    rng = random.Random(seed)
+    season = []
+    for pdf_index in range(pdfs):
+        pdf_matches = []
+        for index in range(matches):
+            if pdf_matches and index % 20 == 0:
+                pdf_matches.append(pdf_matches[rng.randrange(len(pdf_matches))])
+                continue
+            match_id = f"{pdf_index:03d}{index:05d}"
+            pdf_matches.append({
+                "match_id": match_id,
+                "team_home": f"Hazai {rng.randrange(500)}",
+                "team_away": f"Vendég {rng.randrange(500)}",
+                "match_time": f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+                "match_day": rng.choice(["K", "Sze", "Cs", "P", "Szo", "V", "H"]),
+                "odds": [round(rng.uniform(1.1, 9.0), 2) for _ in range(3 * bets)],
+                "line": index,
+            })
+        season.append((f"Web__{pdf_index:02d}sz__P__06-{pdf_index + 1:02d}.pdf", pdf_matches))
+    return season
+
+
+def improved_batch(pdf_name: str, matches: List[Dict[str, Any]], bets: int) -> List[Tuple[Dict, List[Dict]]]:
+    """(meccs adatok, fogadási opciók) párok, ahogy az ImprovedPDFProcessor adja át"""
+    batch = []
+    for match in matches:
+        match_data = {key: match[key] for key in ("match_id", "team_home", "team_away", "match_time", "match_day")}
+        match_data["source_pdf"] = pdf_name
+        betting_options = [
+            {"bet_type": BET_TYPES[bet % len(BET_TYPES)], "bet_description": f"Opció {bet}",
+             "odds_1": match["odds"][3 * bet], "odds_2": match["odds"][3 * bet + 1],
+             "odds_3": match["odds"][3 * bet + 2], "raw_line": f"{match['match_id']} {bet}",
+             "line_number": match["line"] * bets + bet}
+            for bet in range(bets)
+        ]
+        batch.append((match_data, betting_options))
+    return batch
+
+
+def match_data_list(matches: List[Dict[str, Any]]) -> List[MatchData]:
+    """MatchData objektumok, ahogy a MatchExtractor adja"""
+    return [
+        MatchData(
+            match_id=match["match_id"], teams=f"{match['team_home']} - {match['team_away']}",
+            time_info=match["match_time"], day_info=match["match_day"], odds=tuple(match["odds"][:3]),
+            match_type=MatchFormat.P_FORMAT, raw_line=f"P {match['match_time']} {match['match_id']}",
+            line_number=match["line"]
+        )
+        for match in matches
+    ]
+
+
+def table_contents(db_path: Path, table: str) -> List[tuple]:
+    """Tábla sorai az extracted_at időbélyeg nélkül"""
+    conn = sqlite3.connect(db_path)
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[1] != "extracted_at"]
+    rows = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def run(workdir: Path, name: str, manager_class, save, season, **kwargs) -> Tuple[float, int, Path]:
+    """Szezon mentése; (másodperc, mentett meccsek, adatbázis) hármast ad"""
+    db_path = workdir / f"{name}.db"
+    manager = manager_class(str(db_path), **kwargs)
+    started = time.perf_counter()
+    saved = sum(save(manager, pdf_name, matches) for pdf_name, matches in season)
+    return time.perf_counter() - started, saved, db_path
+
+
+def main() -> int:
+    """Benchmark futtatása, visszatérési érték a kilépési kód"""
+    parser = argparse.ArgumentParser(description="sp2 adatbázis mentés benchmark")
+    parser.add_argument("--pdfs", type=int, default=30, help="PDF-ek száma a szezon mappában")
+    parser.add_argument("--matches", type=int, default=400, help="Meccsek PDF-enként")
+    parser.add_argument("--bets", type=int, default=8, help="Fogadási opciók meccsenként")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    season = make_season(args.pdfs, args.matches, args.bets)
+    match_count = args.pdfs * args.matches
+    print(f"Season: {args.pdfs} PDFs, {match_count:,} matches, {match_count * args.bets:,} betting options")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+
+        def per_match(manager, pdf_name, matches):
+            return sum(manager.save_match_with_bets(data, options)
+                       for data, options in improved_batch(pdf_name, matches, args.bets))
+
+        def batched(manager, pdf_name, matches):
+            return manager.save_matches_with_bets(improved_batch(pdf_name, matches, args.bets))
+
+        def save_matches(manager, pdf_name, matches):
+            return manager.save_matches(match_data_list(matches), pdf_name)
+
+        improved = {
+            "per match": run(workdir, "improved_legacy", LegacyImprovedDatabaseManager, per_match, season),
+            "batched": run(workdir, "improved_batched", ImprovedDatabaseManager, batched, season),
+        }
+        legacy_schema = {
+            "row by row": run(workdir, "legacy_rows", LegacyDatabaseManager, save_matches, season),
+            "executemany": run(workdir, "legacy_batched", DatabaseManager, save_matches, season),
+            "staging": run(workdir, "legacy_staging", DatabaseManager, save_matches, season, use_staging=True),
+        }
+
+        failures = []
+        for label, results, tables, rows_per_match in (
+            ("ImprovedDatabaseManager", improved, ("matches", "betting_options"), 1 + args.bets),
+            ("DatabaseManager", legacy_schema, ("matches",), 1),
+        ):
+            print(label)
+            baseline_seconds, baseline_saved, baseline_db = next(iter(results.values()))
+            for name, (seconds, saved, db_path) in results.items():
+                rows_per_second = match_count * rows_per_match / seconds
+                print(f"  {name:<12} {seconds:8.2f} s  {rows_per_second:>11,.0f} rows/s  "
+                      f"{baseline_seconds / seconds:6.1f}x  saved {saved:,}")
+                if saved != baseline_saved or any(
+                    table_contents(db_path, table) != table_contents(baseline_db, table) for table in tables
+                ):
+                    failures.append(f"{label} {name} stored different rows")
+
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        return 1
+    if improved["batched"][0] * 10 > improved["per match"][0]:
+        print("FAIL: batched ingestion was less than 10x faster than per-match saves")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark a /api/matches lapozásához
+
+Generál egy adatbázist sok meccsel és fogadási opcióval, majd összeveti a
+régi lekérdezést (teljes JOIN, csoportosítás és szeletelés Pythonban, új
+kapcsolat kérésenként) a kétfázisú, SQL-ben lapozó endpointtal. Ellenőrzi,
+hogy az oldalak tartalma azonos, és több adatbázis méretnél kiírja az
+oldalankénti késleltetést.
+
+Usage:
+    python benchmarks/matches_api_benchmark.py
+    python benchmarks/matches_api_benchmark.py --matches 20000 50000 --bets 40
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+
+BET_TYPES = ["main", "goal", "corner", "card", "handicap", "half_time", "double_chance"]
+
+
+def load_module(name: str, path: Path):
+    """Backend modul betöltése a fájl útvonala alapján"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def populate_database(db_path: Path, matches: int, bets_per_match: int, seed: int = 42) -> None:
+    """Adatbázis feltöltése szintetikus meccsekkel és fogadási opciókkal"""
+    db_manager = load_module("sp2_improved_db_manager", BACKEND_DIR / "app" / "core" / "improved_db_manager.py")
+    db_manager.ImprovedDatabaseManager(str(db_path))
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO matches (match_id, team_home, team_away, match_time, match_day, source_pdf)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (f"M{index:08d}", f"Hazai {index % 997}", f"Vendég {index % 991}",
+                 f"{rng.randrange(24):02d}:{rng.randrange(60):02d}:{index:08d}",
+                 ["Hétfő", "Kedd", "Szerda", "Csütörtök", "Péntek", "Szombat", "Vasárnap"][index % 7],
+                 f"Web__{index // 500}__SZERENCSEMIX.pdf")
+                for index in range(matches)
+            )
+        )
+        conn.executemany(
+            "INSERT INTO betting_options"
+            " (match_id, bet_type, bet_description, odds_1, odds_2, odds_3, raw_line, line_number)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (f"M{index:08d}", rng.choice(BET_TYPES), f"Opció {bet}",
+                 round(rng.uniform(1.1, 9.0), 2), round(rng.uniform(1.1, 9.0), 2), None,
+                 f"P 20:00 {index} Hazai - Vendég {bet}", bet)
+                for index in range(matches)
+                for bet in range(bets_per_match)
+            )
+        )
+    conn.close()
+
+
+def legacy_get_matches(db_path: Path, limit: int, offset: int, bet_type: str = None) -> Dict[str, Any]:
+    """A régi endpoint lekérdezése: minden sor beolvasva, lapozás Pythonban"""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    query = """
+    SELECT m.id, m.match_id, m.team_home, m.team_away, m.match_time, m.match_day,
+           m.source_pdf, m.extracted_at,
+           b.bet_type, b.bet_description, b.odds_1, b.odds_2, b.odds_3,
+           b.raw_line, b.line_number
+    FROM matches m
+    LEFT JOIN betting_options b ON m.match_id = b.match_id
+    WHERE 1=1
+    """
+    params = []
+    if bet_type:
+        query += " AND b.bet_type LIKE ?"
+        params.append(f"%{bet_type}%")
+    query += " ORDER BY m.match_time DESC, b.bet_type, b.id"
+
+    matches_dict = {}
+    for row in conn.execute(query, params).fetchall():
+        match = matches_dict.setdefault(row["match_id"], {
+            "id": row["id"], "match_id": row["match_id"], "team_home": row["team_home"],
+            "team_away": row["team_away"], "match_time": row["match_time"],
+            "match_day": row["match_day"], "source_pdf": row["source_pdf"],
+            "extracted_at": row["extracted_at"], "betting_options": []
+        })
+        if row["bet_type"]:
+            match["betting_options"].append({
+                "bet_type": row["bet_type"], "bet_description": row["bet_description"],
+                "odds_1": row["odds_1"], "odds_2": row["odds_2"], "odds_3": row["odds_3"],
+                "raw_line": row["raw_line"], "line_number": row["line_number"]
+            })
+    conn.close()
+
+    matches = list(matches_dict.values())
+    page = matches[offset:offset + limit]
+    return {"matches": page, "total": len(matches), "limit": limit, "offset": offset,
+            "has_more": offset + len(page) < len(matches)}
+
+
+def timed(action, runs: int) -> float:
+    """Medián futási idő ezredmásodpercben"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    """Benchmark futtatása, visszatérési érték a kilépési kód"""
+    parser = argparse.ArgumentParser(description="/api/matches lapozás benchmark")
+    parser.add_argument("--matches", type=int, nargs="+", default=[5_000, 20_000],
+                        help="Meccsek száma adatbázisonként")
+    parser.add_argument("--bets", type=int, default=50, help="Fogadási opciók meccsenként")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    api = load_module("sp2_backend_main", BACKEND_DIR / "main.py")
+    results: List[Dict[str, float]] = []
+
+    for matches in args.matches:
+        with tempfile.TemporaryDirectory() as workdir:
+            db_path = Path(workdir) / "sport_data.db"
+            populate_database(db_path, matches, args.bets)
+            api.DB_PATH = db_path
+            deep_offset = matches - args.limit
+
+            def page(offset: int, bet_type: str = None) -> Dict[str, Any]:
+                return asyncio.run(api.get_matches(
+                    limit=args.limit, offset=offset, day_info=None, team=None, bet_type=bet_type,
+                    source_pdf=None, sort_by="time", sort_order="desc"
+                ))
+
+            for offset, bet_type in ((0, None), (deep_offset, None), (0, "corner")):
+                if page(offset, bet_type) != legacy_get_matches(db_path, args.limit, offset, bet_type):
+                    print(f"FAIL: page at offset {offset} (bet_type={bet_type}) differs from the legacy query")
+                    return 1
+
+            result = {
+                "matches": matches,
+                "legacy": timed(lambda: legacy_get_matches(db_path, args.limit, 0), 1),
+                "first": timed(lambda: page(0), args.runs),
+                "deep": timed(lambda: page(deep_offset), args.runs),
+                "filtered": timed(lambda: page(0, "corner"), args.runs),
+            }
+            results.append(result)
+            api._read_connections.__dict__.clear()
+
+        print(f"{matches:>9,} matches {matches * args.bets:>11,} bets  "
+              f"legacy {result['legacy']:9.1f} ms  first page {result['first']:7.1f} ms  "
+              f"last page {result['deep']:7.1f} ms  bet_type filter {result['filtered']:7.1f} ms")
+
+    if any(result["first"] >= result["legacy"] for result in results):
+        print("FAIL: SQL pagination was not faster than the legacy query")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
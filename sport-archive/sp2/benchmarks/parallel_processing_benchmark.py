@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark a párhuzamos mappafeldolgozáshoz
+
+Szintetikus SzerencseMix PDF-eket generál (reportlab-bal, P formátumú
+sorokkal), vagy egy meglévő mappát használ, és a SzerencseMixProcessor
+process_directory metódusát futtatja sorosan és workers > 1 mellett is,
+külön adatbázisokba.
+
+Ellenőrzi, hogy a PDF-enkénti eredmények (az időmérések nélkül) és a
+matches tábla tartalma azonos, majd kiírja a teljes futási időket és a
+PDF-enkénti szakaszidőket (pdftotext, meccskinyerés, mentés).
+
+A pdftotext (poppler-utils) szükséges.
+
+Usage:
+    python benchmarks/parallel_processing_benchmark.py
+    python benchmarks/parallel_processing_benchmark.py --pdfs 24 --matches 2000 --workers 8
+    python benchmarks/parallel_processing_benchmark.py --directory ../../pdf/organized/2024
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from matches_api_benchmark import BACKEND_DIR
+
+sys.path.insert(0, str(BACKEND_DIR / "app" / "core"))
+
+from pdf_processor_optimized import MATCH_COLUMNS, SzerencseMixProcessor
+
+TEAMS = ["Ferencváros", "Újpest", "Debrecen", "Paks", "Kisvárda", "Puskás AFC",
+         "Zalaegerszeg", "Kecskemét", "MTK", "Fehérvár", "Diósgyőr", "Győr"]
+
+
+def generate_pdfs(directory: Path, pdfs: int, matches: int, seed: int = 42) -> None:
+    """PDF-enként ``matches`` P formátumú meccssor, oldalanként 60"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    rng = random.Random(seed)
+    for pdf_index in range(pdfs):
+        pdf = canvas.Canvas(str(directory / f"szerencsemix_{pdf_index:03d}.pdf"), pagesize=A4)
+        pdf.setFont("Courier", 8)
+        for line_index in range(matches):
+            if line_index and line_index % 60 == 0:
+                pdf.showPage()
+                pdf.setFont("Courier", 8)
+            home, away = rng.sample(TEAMS, 2)
+            odds = " ".join(f"{rng.uniform(1.1, 9.9):.2f}".replace(".", ",") for _ in range(3))
+            line = (f"P {rng.randrange(24):02d}:{rng.choice(['00', '15', '30', '45'])} "
+                    f"{pdf_index * matches + line_index:05d} {home} - {away} {odds}")
+            pdf.drawString(40, 800 - (line_index % 60) * 12, line)
+        pdf.save()
+
+
+def run(directory: Path, db_path: Path, workers: int) -> Tuple[List[Dict[str, Any]], float]:
+    """Egy teljes process_directory futás; (eredmények, másodpercek)"""
+    processor = SzerencseMixProcessor(db_path=str(db_path))
+    started = time.perf_counter()
+    results = processor.process_directory(directory, workers=workers)
+    return results, time.perf_counter() - started
+
+
+def without_timings(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{key: value for key, value in result.items() if key != 'timings'} for result in results]
+
+
+def table_rows(db_path: Path) -> List[tuple]:
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(f"SELECT id, {MATCH_COLUMNS} FROM matches ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def stage_totals(results: List[Dict[str, Any]]) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for result in results:
+        for stage, seconds in result.get('timings', {}).items():
+            totals[stage] = totals.get(stage, 0.0) + seconds
+    return totals
+
+
+def main() -> int:
+    """Benchmark futtatása, visszatérési érték a kilépési kód"""
+    parser = argparse.ArgumentParser(description="Párhuzamos PDF mappafeldolgozás benchmark")
+    parser.add_argument("--directory", type=Path, help="Meglévő PDF mappa (alapból generált)")
+    parser.add_argument("--pdfs", type=int, default=16, help="Generált PDF-ek száma")
+    parser.add_argument("--matches", type=int, default=1200, help="Meccsek PDF-enként")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    if shutil.which("pdftotext") is None:
+        print("pdftotext nem elérhető. Telepítsd: sudo apt-get install poppler-utils")
+        return 2
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        directory = args.directory
+        if directory is None:
+            directory = workdir / "pdf"
+            directory.mkdir()
+            generate_pdfs(directory, args.pdfs, args.matches)
+
+        serial_results, serial_seconds = run(directory, workdir / "serial.db", workers=1)
+        parallel_results, parallel_seconds = run(directory, workdir / "parallel.db", workers=args.workers)
+        same_rows = table_rows(workdir / "serial.db") == table_rows(workdir / "parallel.db")
+
+    pdf_count = len(serial_results)
+    print(f"PDF-ek: {pdf_count}  Workerek: {args.workers}")
+    print(f"{'soros':<12} {serial_seconds:7.2f} s  {pdf_count / serial_seconds:8.2f} PDF/s")
+    print(f"{'párhuzamos':<12} {parallel_seconds:7.2f} s  {pdf_count / parallel_seconds:8.2f} PDF/s")
+    print(f"Gyorsulás: {serial_seconds / parallel_seconds:.2f}x")
+
+    print("\nSzakaszidők összesen (soros / párhuzamos, s):")
+    serial_totals, parallel_totals = stage_totals(serial_results), stage_totals(parallel_results)
+    for stage in ('text_extraction', 'match_extraction', 'database', 'total'):
+        print(f"  {stage:<18} {serial_totals.get(stage, 0.0):8.2f} / {parallel_totals.get(stage, 0.0):8.2f}")
+
+    print("\nPDF-enként (párhuzamos, s):")
+    for result in parallel_results:
+        timings = result.get('timings')
+        if timings is None:
+            print(f"  {result['pdf']:<32} hiba: {result.get('error')}")
+            continue
+        print(f"  {result['pdf']:<32} pdftotext {timings['text_extraction']:6.3f}  "
+              f"kinyerés {timings['match_extraction']:6.3f}  mentés {timings['database']:6.3f}  "
+              f"meccs {result['saved_matches']}")
+
+    if without_timings(parallel_results) != without_timings(serial_results) or not same_rows:
+        print("FAIL: a párhuzamos feldolgozás eredménye eltér a sorostól")
+        return 1
+    if parallel_seconds >= serial_seconds:
+        print("FAIL: nincs gyorsulás a soros feldolgozáshoz képest")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
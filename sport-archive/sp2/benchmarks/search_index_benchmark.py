@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark a trigram FTS5 keresőindexhez
+
+Generál egy egymillió soros meccs adatbázist sok különböző csapatnévvel,
+majd a /api/matches és /api/teams részleges kereséseit lefuttatja LIKE-kal
+és az FTS5 indexen át is. Ellenőrzi, hogy az eredmények azonosak, és kiírja
+a lekérdezésenkénti medián késleltetést.
+
+Usage:
+    python benchmarks/search_index_benchmark.py
+    python benchmarks/search_index_benchmark.py --matches 200000 --runs 10
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from matches_api_benchmark import BACKEND_DIR, BET_TYPES, load_module
+
+SYLLABLES = ["fe", "ren", "cvá", "ros", "új", "pest", "deb", "re", "cen", "győr", "ka", "pos",
+             "vár", "da", "zala", "eger", "szeg", "pécs", "ma", "tó", "kis", "na", "gy", "bu"]
+DAYS = ["Hétfő", "Kedd", "Szerda", "Csütörtök", "Péntek", "Szombat", "Vasárnap"]
+
+
+def team_names(count: int, rng: random.Random) -> List[str]:
+    """Változatos, magyaros csapatnevek"""
+    names = set()
+    while len(names) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        names.add(f"{name} {rng.choice(['FC', 'SE', 'KSE', 'ETO', 'VSC', 'TE'])}")
+    return sorted(names)
+
+
+def populate_database(db_path: Path, matches: int, bets_per_match: int, seed: int = 42) -> List[str]:
+    """Adatbázis feltöltése a triggereken át indexelt sorokkal; a csapatneveket adja vissza"""
+    db_manager = load_module("sp2_improved_db_manager", BACKEND_DIR / "app" / "core" / "improved_db_manager.py")
+    db_manager.ImprovedDatabaseManager(str(db_path))
+
+    rng = random.Random(seed)
+    teams = team_names(20_000, rng)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO matches (match_id, team_home, team_away, match_time, match_day, source_pdf)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (f"M{index:08d}", rng.choice(teams), rng.choice(teams),
+                 f"{rng.randrange(24):02d}:{rng.randrange(60):02d}", DAYS[index % 7],
+                 f"Web__{index // 400:05d}__SZERENCSEMIX.pdf")
+                for index in range(matches)
+            )
+        )
+        conn.executemany(
+            "INSERT INTO betting_options (match_id, bet_type, bet_description, odds_1, odds_2, line_number)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (f"M{index:08d}", rng.choice(BET_TYPES), f"Opció {bet}", 1.5, 2.5, bet)
+                for index in range(matches)
+                for bet in range(bets_per_match)
+            )
+        )
+    conn.close()
+    return teams
+
+
+def timed(action: Callable[[], object], runs: int) -> float:
+    """Medián futási idő ezredmásodpercben"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    """Benchmark futtatása, visszatérési érték a kilépési kód"""
+    parser = argparse.ArgumentParser(description="FTS5 trigram keresőindex benchmark")
+    parser.add_argument("--matches", type=int, default=1_000_000)
+    parser.add_argument("--bets", type=int, default=1, help="Fogadási opciók meccsenként")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    api = load_module("sp2_backend_main", BACKEND_DIR / "main.py")
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = Path(workdir) / "sport_data.db"
+        started = time.perf_counter()
+        teams = populate_database(db_path, args.matches, args.bets)
+        print(f"Database: {args.matches:,} matches, {args.matches * args.bets:,} betting options "
+              f"({time.perf_counter() - started:.1f} s to build, {db_path.stat().st_size / 2 ** 20:.0f} MB)")
+        api.DB_PATH = db_path
+
+        team = rng.choice(teams)
+        term = team[2:7].strip()
+        pdf_term = f"{args.matches // 800:05d}"
+        queries: Dict[str, Callable[[], object]] = {
+            f"matches team='{term}'": lambda: asyncio.run(api.get_matches(
+                limit=50, offset=0, day_info=None, team=term, bet_type=None,
+                source_pdf=None, sort_by="time", sort_order="desc")),
+            f"matches team='{team}'": lambda: asyncio.run(api.get_matches(
+                limit=50, offset=0, day_info=None, team=team, bet_type=None,
+                source_pdf=None, sort_by="time", sort_order="desc")),
+            f"matches source_pdf='{pdf_term}'": lambda: asyncio.run(api.get_matches(
+                limit=50, offset=0, day_info=None, team=None, bet_type=None,
+                source_pdf=pdf_term, sort_by="time", sort_order="desc")),
+            f"teams search='{term}'": lambda: asyncio.run(api.get_teams(search=term)),
+        }
+
+        slower = []
+        for name, query in queries.items():
+            api.USE_FTS = False
+            like_result = query()
+            like_ms = timed(query, args.runs)
+            api.USE_FTS = True
+            fts_result = query()
+            fts_ms = timed(query, args.runs)
+
+            if fts_result != like_result:
+                print(f"FAIL: {name} returned different results with the FTS index")
+                return 1
+            if fts_ms >= like_ms:
+                slower.append(name)
+            total = like_result.get("total", len(like_result.get("teams", [])))
+            print(f"{name:<40} {total:>7,} hits  LIKE {like_ms:8.1f} ms  FTS {fts_ms:8.1f} ms  "
+                  f"({like_ms / fts_ms:5.1f}x)")
+
+        api._read_connections.__dict__.clear()
+
+    if slower:
+        print(f"FAIL: the FTS index was not faster for {', '.join(slower)}")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
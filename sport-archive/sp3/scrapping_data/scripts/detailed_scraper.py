@@ -11,6 +11,7 @@ Kimenet: data/YYYY/MM/DD/matches/YYYYMMDD_team1_vs_team2.json
 
 import json
 import logging
+import os
 from datetime import date, datetime
 from typing import List, Dict, Any, Optional
 import concurrent.futures
@@ -18,33 +19,45 @@ import time
 
 from .sources.flashscore import FlashScoreScraper
 from .sources.eredmenyek import EredmenyekScraper
+from .sources.fetcher import HttpCache
 from .utils.json_handler import JSONHandler
 from .utils.date_utils import get_today_date, get_date_string
 from .utils.validators import MatchValidator
+from .utils.scrape_scheduler import ScrapeScheduler
 
 class DetailedMatchScraper:
     """Scrape detailed match information from multiple sources."""
 
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, fetch_mode: str = 'live', cache_dir: Optional[str] = None):
         """
         Initialize detailed match scraper.
 
         Args:
             base_path: Base directory path for data storage
+            fetch_mode: 'live', 'record' or 'replay' (replay serves stored pages only)
+            cache_dir: Page cache / fixture directory (defaults to <base_path>/cache/pages)
         """
         self.base_path = base_path
         self.json_handler = JSONHandler(base_path)
         self.validator = MatchValidator()
         self.logger = logging.getLogger(__name__)
 
+        # Shared page cache, so re-runs for the same date reuse downloaded pages
+        self.cache = HttpCache(cache_dir or os.path.join(base_path, 'cache', 'pages'))
+
         # Initialize scrapers
         self.scrapers = {
-            'flashscore': FlashScoreScraper(),
-            'eredmenyek': EredmenyekScraper()
+            'flashscore': FlashScoreScraper(cache=self.cache, fetch_mode=fetch_mode),
+            'eredmenyek': EredmenyekScraper(cache=self.cache, fetch_mode=fetch_mode)
         }
 
         # Configuration
-        self.max_workers = 2  # Number of concurrent scrapers
+        self.max_workers = 4  # Concurrent page fetches in bulk scraping
+        self.parse_workers = 2  # Concurrent page parsers in bulk scraping
+        self.requests_per_second_per_host = 1.0  # Token bucket refill rate per host
+        self.host_burst = 2  # Token bucket capacity per host
+        self.max_retries = 2  # Retries of a failed page fetch
+        self.retry_backoff = 1.0  # Seconds before the first retry, doubled after each
         self.timeout_per_match = 30  # Seconds per match
         self.delay_between_matches = 1  # Seconds between matches
 
@@ -83,27 +96,42 @@ class DetailedMatchScraper:
 
             end_time = time.time()
 
-            if match_details:
-                # Validate detailed match data
-                is_valid, errors = self.validator.validate_detailed_match(match_details)
-
-                if is_valid:
-                    match_details['scraping_time'] = end_time - start_time
-                    match_details['scraped_at'] = datetime.now().isoformat()
-
-                    self.logger.info(f"Successfully scraped match details in {end_time - start_time:.2f}s")
-                    return match_details
-                else:
-                    self.logger.warning(f"Invalid match details: {errors}")
-                    return None
-            else:
-                self.logger.warning(f"No match details found for {match_url}")
-                return None
+            return self._validated_details(match_details, match_url, end_time - start_time)
 
         except Exception as e:
             self.logger.error(f"Error scraping match details from {source}: {e}")
             return None
 
+    def _validated_details(self, match_details: Optional[Dict[str, Any]], match_url: str,
+                           scraping_time: float) -> Optional[Dict[str, Any]]:
+        """
+        Validate scraped match details and stamp timing metadata.
+
+        Args:
+            match_details: Details returned by a scraper (or None)
+            match_url: URL of the match page
+            scraping_time: Seconds spent fetching and parsing
+
+        Returns:
+            The details if valid, otherwise None
+        """
+        if not match_details:
+            self.logger.warning(f"No match details found for {match_url}")
+            return None
+
+        # Validate detailed match data
+        is_valid, errors = self.validator.validate_detailed_match(match_details)
+
+        if not is_valid:
+            self.logger.warning(f"Invalid match details: {errors}")
+            return None
+
+        match_details['scraping_time'] = scraping_time
+        match_details['scraped_at'] = datetime.now().isoformat()
+
+        self.logger.info(f"Successfully scraped match details in {scraping_time:.2f}s")
+        return match_details
+
     def scrape_daily_match_details(self, target_date: Optional[date] = None,
                                   sources: Optional[List[str]] = None) -> Dict[str, Any]:
         """
@@ -372,17 +400,41 @@ class DetailedMatchScraper:
                 'coverage_percentage': 0
             }
 
-        # Get existing detailed match files
-        detailed_files = self.json_handler.get_existing_match_files(target_date)
+        existing_ids = self._existing_match_ids(target_date)
+        return self._coverage_statistics(target_date, daily_matches, existing_ids)
 
-        # Count matches with details
-        matches_with_details = 0
-        for match in daily_matches:
-            match_id = self._generate_match_id(match)
-            expected_file = f"match_{match_id}.json"
+    def _existing_match_ids(self, target_date: date) -> set:
+        """
+        Collect the ids of detailed match files already saved for a date.
+
+        Args:
+            target_date: Date to scan
 
-            if any(expected_file in file_path for file_path in detailed_files):
-                matches_with_details += 1
+        Returns:
+            Set of match ids (file names without 'match_' and '.json')
+        """
+        existing_ids = set()
+        for file_path in self.json_handler.get_existing_match_files(target_date):
+            filename = os.path.basename(file_path)
+            existing_ids.add(filename[len('match_'):-len('.json')])
+        return existing_ids
+
+    def _coverage_statistics(self, target_date: date, daily_matches: List[Dict[str, Any]],
+                             existing_ids: set) -> Dict[str, Any]:
+        """
+        Coverage statistics from an in-memory set of saved match ids.
+
+        Args:
+            target_date: Date of the matches
+            daily_matches: Daily match list
+            existing_ids: Ids of saved detailed match files
+
+        Returns:
+            Dictionary with scraping statistics
+        """
+        matches_with_details = sum(
+            1 for match in daily_matches if self._generate_match_id(match) in existing_ids
+        )
 
         total_matches = len(daily_matches)
         coverage_percentage = (matches_with_details / total_matches * 100) if total_matches > 0 else 0
@@ -392,7 +444,7 @@ class DetailedMatchScraper:
             'total_matches': total_matches,
             'matches_with_details': matches_with_details,
             'coverage_percentage': coverage_percentage,
-            'detailed_files_count': len(detailed_files)
+            'detailed_files_count': len(existing_ids)
         }
 
     def bulk_scrape_missing_details(self, target_date: Optional[date] = None,
@@ -413,8 +465,13 @@ class DetailedMatchScraper:
         if sources is None:
             sources = list(self.scrapers.keys())
 
+        # Load daily matches and the saved match ids once; both statistics
+        # below are computed from this in-memory set
+        daily_matches = self.json_handler.load_daily_matches(target_date) or []
+        existing_ids = self._existing_match_ids(target_date)
+
         # Get current statistics
-        stats = self.get_scraping_statistics(target_date)
+        stats = self._coverage_statistics(target_date, daily_matches, existing_ids)
 
         if stats['coverage_percentage'] >= 95:
             self.logger.info(f"High coverage already achieved: {stats['coverage_percentage']:.1f}%")
@@ -425,8 +482,6 @@ class DetailedMatchScraper:
                 'stats': stats
             }
 
-        # Load daily matches
-        daily_matches = self.json_handler.load_daily_matches(target_date)
         if not daily_matches:
             return {
                 'date': get_date_string(target_date),
@@ -434,15 +489,6 @@ class DetailedMatchScraper:
                 'scraped_new': 0
             }
 
-        # Find matches without details
-        detailed_files = self.json_handler.get_existing_match_files(target_date)
-        existing_ids = set()
-        for file_path in detailed_files:
-            filename = file_path.split('/')[-1]
-            if filename.startswith('match_') and filename.endswith('.json'):
-                match_id = filename[6:-5]  # Remove 'match_' and '.json'
-                existing_ids.add(match_id)
-
         # Find missing matches
         missing_matches = []
         for match in daily_matches:
@@ -453,22 +499,24 @@ class DetailedMatchScraper:
 
         self.logger.info(f"Found {len(missing_matches)} matches missing detailed information")
 
-        # Scrape missing details
+        # Scrape missing details: bounded fetch pool with per-host token
+        # buckets, parsing in a separate pool, saving in this thread
+        scheduler = self._create_scheduler()
         scraped_count = 0
-        for match in missing_matches:
-            match_details = self.scrape_match_details(match['match_url'], match['source'])
-
+        for match, match_details in scheduler.run(missing_matches):
             if match_details:
                 merged_match = self._merge_match_data(match, match_details)
                 match_id = self._generate_match_id(merged_match)
                 self.json_handler.save_detailed_match(merged_match, target_date, match_id)
+                existing_ids.add(match_id)
                 scraped_count += 1
 
-            # Add delay
-            time.sleep(self.delay_between_matches)
-
         # Get updated statistics
-        updated_stats = self.get_scraping_statistics(target_date)
+        updated_stats = self._coverage_statistics(target_date, daily_matches, existing_ids)
+        scheduler_stats = scheduler.stats.snapshot()
+        self.logger.info(f"Bulk scraping: {scheduler_stats['parsed']} parsed, "
+                         f"{scheduler_stats['failed']} failed, {scheduler_stats['retries']} retries, "
+                         f"{scheduler_stats['throughput']:.2f} matches/s")
 
         return {
             'date': get_date_string(target_date),
@@ -476,9 +524,38 @@ class DetailedMatchScraper:
             'missing_matches': len(missing_matches),
             'scraped_new': scraped_count,
             'before_stats': stats,
-            'after_stats': updated_stats
+            'after_stats': updated_stats,
+            'scheduler_stats': scheduler_stats
         }
 
+    def _create_scheduler(self) -> ScrapeScheduler:
+        """Scheduler for bulk scraping, configured from this scraper's settings."""
+        return ScrapeScheduler(
+            fetch=self._fetch_match_page,
+            parse=self._parse_match_page,
+            url_of=lambda match: match['match_url'],
+            fetch_workers=self.max_workers,
+            parse_workers=self.parse_workers,
+            requests_per_second=self.requests_per_second_per_host,
+            burst=self.host_burst,
+            max_retries=self.max_retries,
+            retry_backoff=self.retry_backoff
+        )
+
+    def _fetch_match_page(self, match: Dict[str, Any]) -> bytes:
+        """Fetch stage of bulk scraping: raw page content of a match."""
+        scraper = self.scrapers[match['source']]
+        return scraper.fetch_match_page(match['match_url'], match.get('status'),
+                                        timeout=self.timeout_per_match)
+
+    def _parse_match_page(self, match: Dict[str, Any], content: bytes) -> Optional[Dict[str, Any]]:
+        """Parse stage of bulk scraping: validated match details or None."""
+        scraper = self.scrapers[match['source']]
+        start_time = time.time()
+        soup = scraper.parse_detail_page(content)
+        match_details = scraper.parse_match_details(soup, match['match_url'])
+        return self._validated_details(match_details, match['match_url'], time.time() - start_time)
+
     def _should_scrape_match(self, match: Dict[str, Any], target_date: date) -> tuple[bool, str]:
         """
         Determine if a match should be scraped based on its status and time.
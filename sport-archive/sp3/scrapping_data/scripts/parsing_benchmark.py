@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Detail Page Parsing Benchmark
+=============================
+
+Offline pages/second of FlashScoreScraper.parse_match_details with the
+old parsing setup (full html.parser tree) against the current one
+(lxml when installed, restricted to the #detail subtree). Both runs must
+produce identical match details.
+
+Pages come from saved HTML files (--pages), a recorded page cache
+(--fixtures, see replay_benchmark.py) or are generated: FlashScore-like
+detail pages with header, menus, scripts and a sidebar match list around
+the #detail container.
+
+Usage:
+    python scripts/parsing_benchmark.py
+    python scripts/parsing_benchmark.py --generate 300 --repeat 3
+    python scripts/parsing_benchmark.py --fixtures data/cache/pages
+"""
+import sys
+import os
+import argparse
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from bs4 import BeautifulSoup
+
+from sources.fetcher import HttpCache
+from sources.flashscore import FlashScoreScraper
+from sources.html_parsing import HTML_PARSER
+
+TEAMS = ["Bolivar", "The Strongest", "Always Ready", "Blooming", "Wilstermann", "Oriente Petrolero",
+         "CF Montreal", "Forge FC", "Nacional Potosi", "Real Tomayapo", "Aurora", "Guabira"]
+BOOKMAKERS = ["bet365", "Unibet", "William Hill", "1xBet", "Betfair", "Pinnacle", "Tipsport", "Bwin"]
+
+
+def generate_page(rng: random.Random, index: int) -> Tuple[str, bytes]:
+    """One FlashScore-like match detail page with realistic surrounding noise."""
+    home, away = rng.sample(TEAMS, 2)
+    noise_script = "var cjs = {" + ",".join(f'"k{i}":"{rng.random()}"' for i in range(1500)) + "};"
+    menu = "".join(f'<li class="menuTop__item"><a href="/football/{i}/">League {i}</a></li>' for i in range(120))
+    sidebar = "".join(
+        f'<div class="event__match event__match--scheduled"><div class="event__time">{rng.randrange(24):02d}:00</div>'
+        f'<div class="event__participant">{rng.choice(TEAMS)}</div><div class="event__participant">{rng.choice(TEAMS)}</div>'
+        f'<a href="/match/{index}{i}/">match</a></div>'
+        for i in range(250)
+    )
+    odds = "".join(
+        f'<div class="ui-table__row"><div class="ui-table__cell">{bookmaker}</div>'
+        + "".join(f'<div class="ui-table__cell">{rng.uniform(1.2, 9.5):.2f}</div>' for _ in range(3))
+        + "</div>"
+        for bookmaker in rng.sample(BOOKMAKERS, 6)
+    )
+    possession = rng.randrange(30, 70)
+    stats = (
+        f'<div class="stat__row">Ball Possession {possession}% - {100 - possession}%</div>'
+        f'<div class="stat__row">Total shots {rng.randrange(20)} - {rng.randrange(20)}</div>'
+        f'<div class="stat__row">Corner Kicks {rng.randrange(12)} - {rng.randrange(12)}</div>'
+        f'<div class="stat__row">Fouls {rng.randrange(25)} - {rng.randrange(25)}</div>'
+    )
+    events = "".join(
+        f'<div class="smv__event"><div class="smv__eventTime">{minute}\'</div>'
+        f'<div class="smv__eventType">{rng.choice(["Goal", "Yellow card", "Substitution"])}</div>'
+        f'<div class="smv__eventPlayer">Player {rng.randrange(99)}</div></div>'
+        for minute in sorted(rng.sample(range(1, 95), 10))
+    )
+    home_goals, away_goals = rng.randrange(5), rng.randrange(5)
+
+    html = f"""<!DOCTYPE html><html><head><title>{home} - {away}</title>
+<script>{noise_script}</script><style>.menuTop__item {{ display: inline; }}</style></head>
+<body><header><ul class="menuTop">{menu}</ul></header>
+<div id="detail" class="container__detail">
+<div class="duelParticipant">
+<div class="duelParticipant__startTime"><div>10.07.2025 {rng.randrange(12, 23)}:{rng.choice(['00', '30'])}</div></div>
+<div class="duelParticipant__home"><div class="participant__participantName">{home}</div></div>
+<div class="detailScore__wrapper"><span>{home_goals}</span><span>-</span><span>{away_goals}</span></div>
+<div class="detailScore__status">Finished</div>
+<div class="duelParticipant__away"><div class="participant__participantName">{away}</div></div>
+</div>
+<div class="oddsComparison"><div class="ui-table">{odds}</div></div>
+<div class="stats__section">{stats}</div>
+<div class="smv__events">{events}</div>
+</div>
+<aside class="sidebar">{sidebar}</aside>
+<footer>Copyright FlashScore</footer></body></html>"""
+    return f"https://www.flashscore.com/match/bench{index:04d}/", html.encode('utf-8')
+
+
+def load_pages(args) -> List[Tuple[str, bytes]]:
+    if args.pages:
+        return [(f"https://www.flashscore.com/match/{path.stem}/", path.read_bytes())
+                for path in sorted(Path(args.pages).glob("*.html"))]
+    if args.fixtures:
+        cache = HttpCache(args.fixtures)
+        return [(url, cache.get(url)['content']) for url in cache.urls()]
+    rng = random.Random(42)
+    return [generate_page(rng, index) for index in range(args.generate)]
+
+
+def without_timestamps(details: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in (details or {}).items() if key != 'scraped_at'}
+
+
+def run(scraper: FlashScoreScraper, pages: List[Tuple[str, bytes]], repeat: int,
+        parse: Callable[[bytes], BeautifulSoup]) -> Tuple[List[Dict[str, Any]], float]:
+    """Parse every page repeat times; (details of the last pass, seconds)."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        results = [without_timestamps(scraper.parse_match_details(parse(content), url))
+                   for url, content in pages]
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FlashScore detail page parsing benchmark')
+    parser.add_argument('--pages', type=str, help='Directory of saved detail pages (*.html)')
+    parser.add_argument('--fixtures', type=str, help='Recorded page cache directory')
+    parser.add_argument('--generate', type=int, default=100, help='Generated pages when no input is given')
+    parser.add_argument('--repeat', type=int, default=2, help='Passes over all pages')
+    args = parser.parse_args()
+
+    pages = load_pages(args)
+    if not pages:
+        print("❌ No pages to parse")
+        return 2
+
+    logging.disable(logging.WARNING)
+    scraper = FlashScoreScraper(use_selenium=False)
+    total = len(pages) * args.repeat
+
+    before, before_seconds = run(scraper, pages, args.repeat,
+                                 lambda content: BeautifulSoup(content, 'html.parser'))
+    after, after_seconds = run(scraper, pages, args.repeat, scraper.parse_detail_page)
+
+    size = sum(len(content) for _, content in pages) / len(pages) / 1024
+    print(f"📄 Pages: {len(pages)} (avg {size:.0f} KiB)  Passes: {args.repeat}")
+    print(f"🐢 html.parser, full tree:    {total / before_seconds:8.1f} pages/s")
+    print(f"🚀 {HTML_PARSER}, #detail subtree: {total / after_seconds:8.1f} pages/s")
+    print(f"⚡ Speedup: {before_seconds / after_seconds:.2f}x")
+
+    if before != after:
+        mismatches = sum(1 for old, new in zip(before, after) if old != new)
+        print(f"❌ FAIL: {mismatches} pages parsed differently")
+        return 1
+
+    print("✅ PASS: identical match details")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Replay Parsing Benchmark
+========================
+
+Offline parsing throughput of FlashScoreScraper.get_match_details against
+stored HTML fixtures - no browser and no network.
+
+Fixtures are recorded once with fetch_mode='record' (for example
+DetailedMatchScraper(base_path, fetch_mode='record')), which stores every
+fetched match page in the page cache directory. Existing HTML files can
+also be imported as fixtures with --import-html.
+
+Usage:
+    python scripts/replay_benchmark.py --fixtures data/cache/pages
+    python scripts/replay_benchmark.py --fixtures /tmp/fixtures --import-html saved_pages/ --repeat 5
+"""
+import sys
+import os
+import argparse
+import logging
+import time
+from pathlib import Path
+
+# Paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from sources.fetcher import HttpCache
+from sources.flashscore import FlashScoreScraper
+
+
+def import_html_fixtures(cache: HttpCache, html_dir: str, url_prefix: str) -> int:
+    """Store *.html files as finished match fixtures, keyed by <url_prefix>/<file stem>/."""
+    count = 0
+    for html_path in sorted(Path(html_dir).glob("*.html")):
+        cache.put(f"{url_prefix.rstrip('/')}/{html_path.stem}/", html_path.read_bytes(), 'finished')
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline FlashScore parsing benchmark (replay mode)')
+    parser.add_argument('--fixtures', type=str, required=True, help='Page cache / fixture directory')
+    parser.add_argument('--import-html', type=str, help='Directory of saved HTML pages to import first')
+    parser.add_argument('--url-prefix', type=str, default='https://www.flashscore.com/match',
+                        help='URL prefix for imported HTML pages')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over all fixtures')
+    args = parser.parse_args()
+
+    cache = HttpCache(args.fixtures)
+    if args.import_html:
+        imported = import_html_fixtures(cache, args.import_html, args.url_prefix)
+        print(f"📥 Imported {imported} HTML fixtures")
+
+    urls = cache.urls()
+    if not urls:
+        print(f"❌ No fixtures found in {args.fixtures}")
+        return 1
+
+    logging.disable(logging.WARNING)
+    scraper = FlashScoreScraper(use_selenium=False, cache=cache, fetch_mode='replay')
+
+    parsed = 0
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for url in urls:
+            if scraper.get_match_details(url):
+                parsed += 1
+    elapsed = time.perf_counter() - started
+
+    pages = len(urls) * args.repeat
+    print(f"📄 Fixtures: {len(urls)}  Passes: {args.repeat}")
+    print(f"⏱️  {elapsed:.2f} s  {pages / elapsed:.1f} pages/s  {elapsed / pages * 1000:.1f} ms/page")
+    print(f"✅ Parsed with details: {parsed}/{pages}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
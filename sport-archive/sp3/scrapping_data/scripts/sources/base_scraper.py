@@ -8,7 +8,7 @@ az összes specifikus scraper örököl.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
 import time
@@ -16,12 +16,19 @@ import logging
 from datetime import datetime, date
 import random
 
+from .fetcher import HttpCache, PageFetcher
+from .html_parsing import parse_html
+
 class BaseScraper(ABC):
     """
     Alap scraper osztály
     """
 
-    def __init__(self, source_name: str, base_url: str, delay_range: tuple = (1, 3)):
+    # A meccs részletes oldalából csak ennek megfelelő rész épül fává (None = teljes oldal)
+    detail_parse_only: Optional[SoupStrainer] = None
+
+    def __init__(self, source_name: str, base_url: str, delay_range: tuple = (1, 3),
+                 cache: Optional[HttpCache] = None, fetch_mode: str = 'live'):
         """
         Inicializálás
 
@@ -29,6 +36,8 @@ class BaseScraper(ABC):
             source_name: Az adatforrás neve
             base_url: Az alap URL az forráshoz
             delay_range: Minimális és maximális késleltetés a kérések között (másodpercben)
+            cache: Lemezes HTTP gyorsítótár (None esetén minden kérés a hálózatra megy)
+            fetch_mode: Lekérési mód ('live', 'record' vagy 'replay')
         """
         self.source_name = source_name
         self.base_url = base_url
@@ -46,8 +55,11 @@ class BaseScraper(ABC):
             'Upgrade-Insecure-Requests': '1',
         })
 
+        self.fetcher = PageFetcher(self.session, cache, fetch_mode)
+
     def get_page(self, url: str, params: Optional[Dict] = None,
-                 timeout: int = 30) -> Optional[BeautifulSoup]:
+                 timeout: int = 30, match_status: Optional[str] = None,
+                 parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
         """
         Oldal tartalmának lekérése és BeautifulSoup objektum visszaadása.
 
@@ -55,6 +67,8 @@ class BaseScraper(ABC):
             url: A lekérni kívánt URL
             params: Lekérdezési paraméterek
             timeout: Kérés időtúllépése másodpercben
+            match_status: A meccs állapota, ez szabja meg a tárolt oldal élettartamát
+            parse_only: Csak az oldal ennek megfelelő része épül fává
 
         Returns:
             BeautifulSoup objektum vagy None hiba esetén
@@ -62,14 +76,15 @@ class BaseScraper(ABC):
         try:
             self.logger.info(f"Oldal lekérése: {url}")
 
-            response = self.session.get(url, params=params, timeout=timeout)
-            response.raise_for_status()
+            result = self.fetcher.fetch(url, params=params, timeout=timeout,
+                                        match_status=match_status)
 
-            # Késleltetés hozzáadása a tiszteletteljes lekérdezés érdekében
-            self._add_delay()
+            # Késleltetés csak valódi kérés után, a tárolt oldal nem terheli a forrást
+            if result.network:
+                self._add_delay()
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-            self.logger.info(f"Sikeres oldallekérés: {url}")
+            soup = parse_html(result.content, parse_only)
+            self.logger.info(f"Sikeres oldallekérés{' (gyorsítótárból)' if result.from_cache else ''}: {url}")
 
             return soup
 
@@ -80,6 +95,31 @@ class BaseScraper(ABC):
             self.logger.error(f"Váratlan hiba az oldal lekérésekor {url}: {e}")
             return None
 
+    def fetch_match_page(self, match_url: str, match_status: Optional[str] = None,
+                         timeout: int = 30) -> bytes:
+        """
+        Meccs oldal nyers tartalmának lekérése késleltetés és feldolgozás nélkül.
+
+        Párhuzamos ütemezőhöz készült: a kérések közti szünetet a hívó
+        (host-onkénti token bucket) adja, a HTML feldolgozása külön történik.
+
+        Args:
+            match_url: A meccs oldalának URL-je
+            match_status: A meccs állapota, ez szabja meg a tárolt oldal élettartamát
+            timeout: Kérés időtúllépése másodpercben
+
+        Returns:
+            Az oldal tartalma
+
+        Raises:
+            requests.RequestException: Hálózati vagy HTTP hiba esetén
+        """
+        return self.fetcher.fetch(match_url, timeout=timeout, match_status=match_status).content
+
+    def parse_detail_page(self, content) -> BeautifulSoup:
+        """Letöltött meccs oldal feldolgozása, csak a részletes adatokat tartalmazó részfával."""
+        return parse_html(content, self.detail_parse_only)
+
     def _add_delay(self):
         """Véletlenszerű késleltetés hozzáadása a kérések között."""
         delay = random.uniform(*self.delay_range)
@@ -16,6 +16,7 @@ import logging
 from datetime import datetime, date
 import random
 import os
+import threading
 
 try:
     from selenium import webdriver
@@ -39,6 +40,8 @@ except ImportError:
     NoSuchElementException = Exception
 
 from .base_scraper import BaseScraper
+from .fetcher import HttpCache
+from .html_parsing import parse_html
 
 class EnhancedBaseScraper(BaseScraper):
     """
@@ -46,7 +49,8 @@ class EnhancedBaseScraper(BaseScraper):
     """
 
     def __init__(self, source_name: str, base_url: str, delay_range: tuple = (1, 3),
-                 use_selenium: bool = False, headless: bool = True):
+                 use_selenium: bool = False, headless: bool = True,
+                 cache: Optional[HttpCache] = None, fetch_mode: str = 'live'):
         """
         Initialize enhanced scraper
 
@@ -56,14 +60,18 @@ class EnhancedBaseScraper(BaseScraper):
             delay_range: Min and max delay between requests (seconds)
             use_selenium: Whether to use Selenium for JavaScript rendering
             headless: Whether to run browser in headless mode
+            cache: On-disk HTTP cache shared by requests and Selenium fetches
+            fetch_mode: 'live', 'record' or 'replay' (replay never starts a browser)
         """
-        super().__init__(source_name, base_url, delay_range)
+        super().__init__(source_name, base_url, delay_range, cache=cache, fetch_mode=fetch_mode)
 
         self.use_selenium = use_selenium and SELENIUM_AVAILABLE
         self.headless = headless
         self.driver = None
+        # A WebDriver nem szálbiztos, egyszerre egy oldal renderelhető vele
+        self._driver_lock = threading.Lock()
 
-        if self.use_selenium:
+        if self.use_selenium and not self.fetcher.offline:
             self.setup_selenium()
 
         if use_selenium and not SELENIUM_AVAILABLE:
@@ -128,7 +136,7 @@ class EnhancedBaseScraper(BaseScraper):
             return False
 
         try:
-            time.sleep(2)
+            self.wait_for_document_ready()
 
             # Common selectors for cookie banners and modals
             dismiss_selectors = [
@@ -153,7 +161,7 @@ class EnhancedBaseScraper(BaseScraper):
                         if element.is_displayed() and element.is_enabled():
                             element.click()
                             self.logger.debug(f"Dismissed modal/cookie: {selector}")
-                            time.sleep(1)
+                            self._wait_until_gone(element)
                             break
                 except:
                     continue
@@ -185,6 +193,40 @@ class EnhancedBaseScraper(BaseScraper):
             self.logger.warning(f"Cookie/modal handling failed: {e}")
             return False
 
+    def wait_for_document_ready(self, timeout=10):
+        """Wait until the browser reports the document as fully loaded"""
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
+            return True
+        except TimeoutException:
+            self.logger.debug("Document did not reach readyState 'complete'")
+            return False
+
+    def _wait_until_gone(self, element, timeout=2):
+        """Wait for a clicked banner/modal element to be hidden or detached"""
+        try:
+            WebDriverWait(self.driver, timeout).until(EC.invisibility_of_element(element))
+        except TimeoutException:
+            pass
+
+    def wait_for_dom_stable(self, timeout=3, poll_interval=0.25):
+        """Wait until the DOM element count stops changing between two polls"""
+        last_count = [-1]
+
+        def settled(driver):
+            count = driver.execute_script("return document.getElementsByTagName('*').length")
+            stable = count == last_count[0]
+            last_count[0] = count
+            return stable
+
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=poll_interval).until(settled)
+            return True
+        except TimeoutException:
+            return False
+
     def wait_for_content_load(self, timeout=20):
         """Wait for content to load with various strategies"""
         if not self.driver:
@@ -193,73 +235,105 @@ class EnhancedBaseScraper(BaseScraper):
         try:
             wait = WebDriverWait(self.driver, timeout)
 
-            # Common content indicators
-            content_indicators = [
-                (".event__match", "Match events"),
-                ("[class*='incident']", "Match incidents"),
-                (".tableCellParticipant__name", "Team names"),
-                ("[class*='fixture']", "Fixtures"),
-                (".detailScore__wrapper", "Match scores"),
-                ("[class*='match']", "Match containers"),
-                ("[class*='event']", "Event containers")
-            ]
-
-            for selector, description in content_indicators:
-                try:
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    self.logger.debug(f"Content loaded: {description}")
-                    return True
-                except TimeoutException:
-                    continue
+            # Common content indicators, waited for as one selector so the
+            # first one to appear wins instead of timing out one by one
+            content_indicators = ", ".join([
+                ".event__match",
+                "[class*='incident']",
+                ".tableCellParticipant__name",
+                "[class*='fixture']",
+                ".detailScore__wrapper",
+                "[class*='match']",
+                "[class*='event']"
+            ])
 
-            # If no specific content found, wait for general page load
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(3)  # Additional wait for dynamic content
+            try:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, content_indicators)))
+                self.logger.debug("Content loaded")
+                return True
+            except TimeoutException:
+                pass
+
+            # If no specific content found, wait for the page to settle
+            self.wait_for_dom_stable()
             return True
 
         except Exception as e:
             self.logger.warning(f"Content load wait failed: {e}")
             return False
 
-    def get_page_selenium(self, url: str, wait_for_content: bool = True) -> Optional[BeautifulSoup]:
+    def _render_page(self, url: str, wait_for_content: bool) -> str:
+        """Load a page in the browser and return the rendered source"""
+        self.logger.info(f"Fetching with Selenium: {url}")
+        self.driver.get(url)
+
+        # Handle cookies and modals
+        self.handle_cookies_and_modals()
+
+        # Wait for content if requested
+        if wait_for_content:
+            self.wait_for_content_load()
+
+        page_source = self.driver.page_source
+        self.logger.debug(f"Page content length: {len(page_source)}")
+        return page_source
+
+    def get_page_selenium(self, url: str, wait_for_content: bool = True,
+                          match_status: Optional[str] = None,
+                          parse_only=None) -> Optional[BeautifulSoup]:
         """
         Get page content using Selenium
 
+        Rendered pages go through the fetcher cache, so a fresh cached copy
+        (or a replay fixture) is returned without touching the browser.
+
         Args:
             url: URL to fetch
             wait_for_content: Whether to wait for dynamic content to load
+            match_status: Match status, decides how long the cached page stays fresh
+            parse_only: SoupStrainer limiting which part of the page is parsed
 
         Returns:
             BeautifulSoup object or None
         """
-        if not self.driver:
+        if not self.driver and not self.fetcher.offline:
             self.logger.error("Selenium driver not available")
             return None
 
         try:
-            self.logger.info(f"Fetching with Selenium: {url}")
-            self.driver.get(url)
+            result = self.fetcher.fetch_rendered(
+                url, lambda: self._render_page(url, wait_for_content), match_status
+            )
+            if result.from_cache:
+                self.logger.info(f"Using cached rendered page: {url}")
+            return parse_html(result.content, parse_only)
 
-            # Handle cookies and modals
-            self.handle_cookies_and_modals()
+        except Exception as e:
+            self.logger.error(f"Selenium page fetch failed for {url}: {e}")
+            return None
 
-            # Wait for content if requested
-            if wait_for_content:
-                self.wait_for_content_load()
+    def fetch_match_page(self, match_url: str, match_status: Optional[str] = None,
+                         timeout: int = 30) -> bytes:
+        """
+        Fetch raw match page content, rendered with Selenium when it is in use
 
-            # Get page source and parse
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+        Browser renders are serialized because a single WebDriver cannot be
+        shared between threads; plain requests fetches run concurrently.
 
-            self.logger.debug(f"Page content length: {len(page_source)}")
-            return soup
+        Raises:
+            requests.RequestException: On network or HTTP errors
+        """
+        if self.use_selenium and (self.driver or self.fetcher.offline):
+            def render():
+                with self._driver_lock:
+                    return self._render_page(match_url, wait_for_content=True)
+            return self.fetcher.fetch_rendered(match_url, render, match_status).content
 
-        except Exception as e:
-            self.logger.error(f"Selenium page fetch failed for {url}: {e}")
-            return None
+        return super().fetch_match_page(match_url, match_status, timeout)
 
     def get_page(self, url: str, params: Optional[Dict] = None,
-                 timeout: int = 30, force_selenium: bool = False) -> Optional[BeautifulSoup]:
+                 timeout: int = 30, force_selenium: bool = False,
+                 match_status: Optional[str] = None, parse_only=None) -> Optional[BeautifulSoup]:
         """
         Get page content using requests or Selenium
 
@@ -268,16 +342,18 @@ class EnhancedBaseScraper(BaseScraper):
             params: Query parameters
             timeout: Request timeout
             force_selenium: Force use of Selenium even if use_selenium is False
+            match_status: Match status, decides how long the cached page stays fresh
+            parse_only: SoupStrainer limiting which part of the page is parsed
 
         Returns:
             BeautifulSoup object or None
         """
-        # Use Selenium if available and requested
-        if (self.use_selenium or force_selenium) and self.driver:
-            return self.get_page_selenium(url)
+        # Use Selenium if available and requested (replay needs no browser)
+        if (self.use_selenium or force_selenium) and (self.driver or self.fetcher.offline):
+            return self.get_page_selenium(url, match_status=match_status, parse_only=parse_only)
 
         # Fall back to parent method (requests)
-        return super().get_page(url, params, timeout)
+        return super().get_page(url, params, timeout, match_status=match_status, parse_only=parse_only)
 
     def close(self):
         """Clean up resources"""
@@ -13,17 +13,26 @@ import re
 import json
 
 from .base_scraper import BaseScraper
+from .fetcher import HttpCache
 
 
 class EredmenyekScraper(BaseScraper):
     """Scraper for Eredmenyek.com data."""
 
-    def __init__(self):
-        """Initialize Eredmenyek.com scraper."""
+    def __init__(self, cache: Optional[HttpCache] = None, fetch_mode: str = 'live'):
+        """
+        Initialize Eredmenyek.com scraper.
+
+        Args:
+            cache: On-disk HTTP cache (None fetches every page from the network)
+            fetch_mode: 'live', 'record' or 'replay'
+        """
         super().__init__(
             source_name="eredmenyek",
             base_url="https://www.eredmenyek.com",
-            delay_range=(1, 2)  # Shorter delay for this site
+            delay_range=(1, 2),  # Shorter delay for this site
+            cache=cache,
+            fetch_mode=fetch_mode
         )
 
         # Eredmenyek specific headers
@@ -178,6 +187,26 @@ class EredmenyekScraper(BaseScraper):
             if not soup:
                 return None
 
+            return self.parse_match_details(soup, match_url)
+
+        except Exception as e:
+            self.logger.error(f"Error getting match details from Eredmenyek: {e}")
+            return None
+
+    def parse_match_details(self, soup: BeautifulSoup, match_url: str,
+                            base_match_data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Parse detailed match information from an already fetched match page.
+
+        Args:
+            soup: Parsed match page
+            match_url: URL of the match page
+            base_match_data: Unused, accepted for a common signature with FlashScore
+
+        Returns:
+            Detailed match dictionary or None if error
+        """
+        try:
             # Extract basic match info
             match_details = self._extract_basic_match_info(soup)
 
@@ -197,7 +226,7 @@ class EredmenyekScraper(BaseScraper):
             return match_details
 
         except Exception as e:
-            self.logger.error(f"Error getting match details from Eredmenyek: {e}")
+            self.logger.error(f"Error parsing match details from Eredmenyek: {e}")
             return None
 
     def _extract_basic_match_info(self, soup: BeautifulSoup) -> Dict[str, Any]:
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Oldal lekérő réteg HTTP gyorsítótárral
+======================================
+
+A scraperek ezen keresztül kérik le az oldalakat. A lemezes gyorsítótár
+tiszteletben tartja az ETag és Last-Modified fejléceket (feltételes
+kérés, 304 esetén a tárolt tartalom marad), az URL-enkénti élettartam
+pedig a meccs állapotától függ: befejezett meccs oldala sosem avul el.
+
+Módok:
+    live   - normál működés, gyorsítótárral ha meg van adva
+    record - mindig a hálózatról kér, és minden oldalt eltárol
+    replay - csak a tárolt oldalakat adja vissza, hálózat nélkül
+"""
+
+import hashlib
+import json
+import os
+import time
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+import requests
+
+# Élettartam másodpercben a meccs állapota szerint (None = sosem avul el)
+STATUS_TTLS: Dict[str, Optional[float]] = {
+    'finished': None,
+    'live': 60,
+    'scheduled': 15 * 60,
+    'postponed': 6 * 3600,
+    'cancelled': 6 * 3600,
+}
+DEFAULT_TTL = 10 * 60
+
+FETCH_MODES = ('live', 'record', 'replay')
+
+
+class FixtureNotFound(LookupError):
+    """Replay módban nincs tárolt oldal az URL-hez."""
+
+
+@dataclass
+class FetchResult:
+    """Egy lekérés eredménye."""
+    url: str
+    content: bytes
+    from_cache: bool
+    # Történt-e hálózati forgalom (304 válasz esetén is igen)
+    network: bool
+
+
+def ttl_for_status(status: Optional[str]) -> Optional[float]:
+    """Élettartam a meccs állapota alapján."""
+    if not status:
+        return DEFAULT_TTL
+    return STATUS_TTLS.get(status.lower(), DEFAULT_TTL)
+
+
+class HttpCache:
+    """
+    Lemezes gyorsítótár
+
+    URL-enként két fájl: <sha256>.html a tartalom, <sha256>.json a
+    metaadat (url, letöltés ideje, etag, last_modified, állapot,
+    lejárat). Az írás ideiglenes fájlon és atomi cserén keresztül
+    történik, így a gyorsítótár több scraperből is használható.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.html", self.cache_dir / f"{key}.json"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Tárolt bejegyzés metaadata, 'content' kulccsal kiegészítve."""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            meta['content'] = body_path.read_bytes()
+        except (OSError, json.JSONDecodeError):
+            return None
+        return meta
+
+    def put(self, url: str, content: bytes, status: Optional[str] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict[str, Any]:
+        """Oldal eltárolása, a lejárat az állapotból számolva."""
+        body_path, _ = self._paths(url)
+        self._write(body_path, content)
+        meta = {'url': url, 'etag': etag, 'last_modified': last_modified}
+        return self._save_meta(url, meta, status)
+
+    def touch(self, url: str, meta: Dict[str, Any], status: Optional[str] = None) -> Dict[str, Any]:
+        """Érvényesség megújítása a tartalom újraírása nélkül (pl. 304 után)."""
+        return self._save_meta(url, meta, status or meta.get('status'))
+
+    def _save_meta(self, url: str, meta: Dict[str, Any], status: Optional[str]) -> Dict[str, Any]:
+        now = time.time()
+        ttl = ttl_for_status(status)
+        meta = {key: value for key, value in meta.items() if key != 'content'}
+        meta.update({
+            'fetched_at': now,
+            'status': status,
+            'expires_at': None if ttl is None else now + ttl,
+        })
+        _, meta_path = self._paths(url)
+        self._write(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+        return meta
+
+    def set_status(self, url: str, status: str) -> bool:
+        """Tárolt bejegyzés állapotának átírása, a lejárat újraszámolásával."""
+        meta = self.get(url)
+        if meta is None:
+            return False
+        ttl = ttl_for_status(status)
+        meta.pop('content')
+        meta['status'] = status
+        meta['expires_at'] = None if ttl is None else meta['fetched_at'] + ttl
+        _, meta_path = self._paths(url)
+        self._write(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+        return True
+
+    def urls(self) -> List[str]:
+        """Az összes tárolt URL (pl. replay fixture-ök bejárásához)."""
+        urls = []
+        for meta_path in sorted(self.cache_dir.glob("*.json")):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    urls.append(json.load(f)['url'])
+            except (OSError, json.JSONDecodeError, KeyError):
+                continue
+        return urls
+
+    @staticmethod
+    def is_fresh(meta: Dict[str, Any]) -> bool:
+        expires_at = meta.get('expires_at')
+        return expires_at is None or time.time() < expires_at
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+class PageFetcher:
+    """
+    Oldal lekérő a scraperek session-jére építve
+
+    Gyorsítótár nélkül (cache=None, live mód) minden kérés a hálózatra
+    megy, ugyanúgy, mint a korábbi közvetlen session.get hívások.
+    """
+
+    def __init__(self, session: requests.Session, cache: Optional[HttpCache] = None,
+                 mode: str = 'live'):
+        if mode not in FETCH_MODES:
+            raise ValueError(f"Ismeretlen lekérési mód: {mode}")
+        if mode != 'live' and cache is None:
+            raise ValueError(f"A(z) {mode} módhoz gyorsítótár könyvtár szükséges")
+
+        self.session = session
+        self.cache = cache
+        self.mode = mode
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def offline(self) -> bool:
+        """Replay módban nincs hálózati forgalom."""
+        return self.mode == 'replay'
+
+    @staticmethod
+    def cache_key(url: str, params: Optional[Dict] = None) -> str:
+        return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """Tárolt bejegyzés, ha módtól függően felhasználható."""
+        if self.cache is None or self.mode == 'record':
+            return None
+        meta = self.cache.get(key)
+        if meta is None and self.offline:
+            raise FixtureNotFound(f"Nincs tárolt oldal: {key}")
+        return meta
+
+    def fetch(self, url: str, params: Optional[Dict] = None, timeout: int = 30,
+              match_status: Optional[str] = None) -> FetchResult:
+        """
+        Oldal lekérése requests-szel
+
+        Friss tárolt bejegyzésnél nincs kérés; elavultnál feltételes kérés
+        megy ki, és 304 válasznál a tárolt tartalom érvényessége megújul.
+
+        Raises:
+            requests.RequestException: hálózati vagy HTTP hiba
+            FixtureNotFound: replay módban hiányzó oldal
+        """
+        key = self.cache_key(url, params)
+        meta = self._cached(key)
+
+        if meta is not None and (self.offline or self.cache.is_fresh(meta)):
+            return FetchResult(url, meta['content'], from_cache=True, network=False)
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self.session.get(url, params=params, timeout=timeout, headers=headers or None)
+
+        if response.status_code == 304 and meta is not None:
+            self.logger.debug(f"Nem változott (304): {url}")
+            self.cache.touch(key, meta, match_status)
+            return FetchResult(url, meta['content'], from_cache=True, network=True)
+
+        response.raise_for_status()
+
+        if self.cache is not None:
+            self.cache.put(key, response.content, match_status,
+                           etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'))
+        return FetchResult(url, response.content, from_cache=False, network=True)
+
+    def fetch_rendered(self, url: str, render: Callable[[], str],
+                       match_status: Optional[str] = None) -> FetchResult:
+        """
+        JavaScript-tel renderelt oldal lekérése (pl. Selenium)
+
+        A böngészőből nincs feltételes kérés, ezért itt csak az
+        élettartam számít: friss bejegyzésnél a render nem fut le.
+        """
+        meta = self._cached(url)
+        if meta is not None and (self.offline or self.cache.is_fresh(meta)):
+            return FetchResult(url, meta['content'], from_cache=True, network=False)
+
+        content = render().encode('utf-8')
+        if self.cache is not None:
+            self.cache.put(url, content, match_status)
+        return FetchResult(url, content, from_cache=False, network=True)
+
+    def mark_status(self, url: str, status: Optional[str]) -> bool:
+        """
+        Tárolt oldal állapotának frissítése, ha az oldalból derül ki
+
+        Például egy 'live' állapottal letöltött oldalról kiderül, hogy a
+        meccs már véget ért - ettől kezdve a bejegyzés sosem avul el.
+        """
+        if self.cache is None or not status or self.offline:
+            return False
+        return self.cache.set_status(url, status)
@@ -14,16 +14,98 @@ import re
 import json
 import time
 
+import soupsieve as sv
+
 from .enhanced_base_scraper import EnhancedBaseScraper
+from .fetcher import HttpCache
+from .html_parsing import DETAIL_PAGE_STRAINER
+
+# Részletes oldal szelektorai - egyszer fordítva, oldalanként csak kiértékelve
+FINISHED_STATUS_SELECTOR = sv.compile(".detailScore__status, .fixedHeaderDuel__detailStatus")
+HOME_CONTAINER_SELECTOR = sv.compile(".duelParticipant__home")
+AWAY_CONTAINER_SELECTOR = sv.compile(".duelParticipant__away")
+PARTICIPANT_NAME_SELECTOR = sv.compile(".participant__participantName")
+ODDS_SECTION_SELECTORS = [sv.compile(selector) for selector in [
+    "div[class*='odds']",
+    "[data-testid*='odds']",
+    ".odds",
+    "[class*='bookmaker']",
+    ".ui-table"
+]]
+ODDS_ROW_SELECTORS = [sv.compile(selector) for selector in [
+    "div[class*='ui-table__row']",
+    "tr",
+    "[class*='row']",
+    "div[class*='bookmaker']"
+]]
+ODDS_CELL_SELECTORS = [sv.compile(selector) for selector in [
+    "div[class*='ui-table__cell']",
+    "td",
+    "span",
+    "[class*='cell']"
+]]
+STATS_SECTION_SELECTORS = [sv.compile(selector) for selector in [
+    "div[class*='stats']",
+    "[data-testid*='stat']",
+    ".stat",
+    "[class*='statistic']",
+    "[class*='matchStatistics']"
+]]
+STAT_ELEMENT_SELECTOR = sv.compile("[class*='stat']")
+MATCH_TIME_SELECTORS = [sv.compile(selector) for selector in [
+    ".duelParticipant__startTime",
+    ".startTime",
+    ".fixedHeaderDuel__startTime",
+    ".duel__time",
+    "[data-time]",
+    "[class*='time']",
+    "[class*='Time']"
+]]
+
+DETAIL_SCORE_CLASS = re.compile(r"detailScore")
+EVENTS_CLASS = re.compile(r"events")
+EVENT_CLASS = re.compile(r"event")
+EVENT_TIME_CLASS = re.compile(r"eventTime")
+EVENT_TYPE_CLASS = re.compile(r"eventType")
+EVENT_PLAYER_CLASS = re.compile(r"eventPlayer")
+
+# Statisztika típusok kulcsszavai, és kulcsszavanként a három előre fordított minta
+STAT_TYPES = {
+    'possession': ['possession', 'ball possession'],
+    'shots': ['shots', 'total shots'],
+    'shots_on_target': ['shots on target', 'on target'],
+    'corners': ['corners', 'corner kicks'],
+    'fouls': ['fouls', 'total fouls'],
+    'yellow_cards': ['yellow cards', 'yellow'],
+    'red_cards': ['red cards', 'red'],
+    'passes': ['passes', 'total passes'],
+    'pass_accuracy': ['pass accuracy', 'passing %']
+}
+STAT_PATTERNS = {
+    stat_name: [
+        [re.compile(pattern, re.IGNORECASE) for pattern in (
+            # Look for patterns like "Possession 65% - 35%" or "Shots 12 - 8"
+            rf'{keyword}\s*(\d+)%?\s*-\s*(\d+)%?',
+            rf'{keyword}:\s*(\d+)%?\s*-\s*(\d+)%?',
+            rf'(\d+)%?\s*-\s*(\d+)%?\s*{keyword}',
+        )]
+        for keyword in keywords
+    ]
+    for stat_name, keywords in STAT_TYPES.items()
+}
 
 class FlashScoreScraper(EnhancedBaseScraper):
     """
     Enhanced FlashScore scraper with Selenium support
     """
 
-    def __init__(self, headless: bool = True, use_selenium: bool = True, target_teams: Optional[List[str]] = None):
+    detail_parse_only = DETAIL_PAGE_STRAINER
+
+    def __init__(self, headless: bool = True, use_selenium: bool = True, target_teams: Optional[List[str]] = None,
+                 cache: Optional[HttpCache] = None, fetch_mode: str = 'live'):
         self.base_url = "https://www.flashscore.com"
-        super().__init__("flashscore", self.base_url, use_selenium=use_selenium, headless=headless)
+        super().__init__("flashscore", self.base_url, use_selenium=use_selenium, headless=headless,
+                         cache=cache, fetch_mode=fetch_mode)
 
         # Team list can be configured or loaded from external source
         self.target_teams = target_teams or []  # Teams to filter for
@@ -461,7 +543,10 @@ class FlashScoreScraper(EnhancedBaseScraper):
         try:
             # Use Selenium to fetch the page content
             self.logger.info(f"Fetching match details with Selenium: {match_url}")
-            soup = self.get_page(match_url, force_selenium=True, timeout=20)  # Increased timeout
+            # A lista szerinti állapot adja a tárolt oldal élettartamát
+            list_status = base_match_data.get('status') if base_match_data else None
+            soup = self.get_page(match_url, force_selenium=True, timeout=20,  # Increased timeout
+                                 match_status=list_status, parse_only=self.detail_parse_only)
 
             if not soup:
                 self.logger.warning(f"Failed to fetch page content for {match_url}")
@@ -483,8 +568,32 @@ class FlashScoreScraper(EnhancedBaseScraper):
                     return fallback_data
                 return None
 
+            return self.parse_match_details(soup, match_url, base_match_data)
+
+        except Exception as e:
+            self.logger.error(f"Error getting FlashScore match details from {match_url}: {e}")
+            return None
+
+    def parse_match_details(self, soup: BeautifulSoup, match_url: str,
+                            base_match_data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Részletes meccs információk kinyerése egy már letöltött oldalból
+
+        Args:
+            soup: A meccs oldala
+            match_url: A meccs URL-je
+            base_match_data: Optional base match data from list parsing (contains match_time, etc.)
+
+        Returns:
+            Részletes meccs adatok vagy None
+        """
+        try:
             details = {}
 
+            # Ha az oldal szerint a meccs már véget ért, a tárolt oldal sosem avul el
+            if self._page_shows_finished(soup):
+                self.fetcher.mark_status(match_url, 'finished')
+
             # Extract basic match info
             self._extract_basic_info(soup, details)
 
@@ -554,9 +663,15 @@ class FlashScoreScraper(EnhancedBaseScraper):
             return details
 
         except Exception as e:
-            self.logger.error(f"Error getting FlashScore match details from {match_url}: {e}")
+            self.logger.error(f"Error parsing FlashScore match details from {match_url}: {e}")
             return None
 
+    def _page_shows_finished(self, soup: BeautifulSoup) -> bool:
+        """A részletes oldal állapotjelzője szerint véget ért-e a meccs."""
+        status_elem = soup.select_one(FINISHED_STATUS_SELECTOR)
+        status_text = self._safe_extract_text(status_elem).lower()
+        return status_text in ("finished", "after penalties", "after extra time")
+
     def _extract_basic_info(self, soup: BeautifulSoup, info: Dict[str, Any]):
         """Extract basic match information."""
         try:
@@ -565,13 +680,13 @@ class FlashScoreScraper(EnhancedBaseScraper):
             away_team_elem = None
 
             # Try detail page selectors first
-            home_container = soup.select_one(".duelParticipant__home")
+            home_container = soup.select_one(HOME_CONTAINER_SELECTOR)
             if home_container:
-                home_team_elem = home_container.select_one(".participant__participantName")
+                home_team_elem = home_container.select_one(PARTICIPANT_NAME_SELECTOR)
 
-            away_container = soup.select_one(".duelParticipant__away")
+            away_container = soup.select_one(AWAY_CONTAINER_SELECTOR)
             if away_container:
-                away_team_elem = away_container.select_one(".participant__participantName")
+                away_team_elem = away_container.select_one(PARTICIPANT_NAME_SELECTOR)
 
             # Fallback to list page selectors if detail page selectors don't work
             if not home_team_elem:
@@ -597,7 +712,7 @@ class FlashScoreScraper(EnhancedBaseScraper):
             score_text = ""
 
             # Try detail page score selectors
-            score_elements = soup.find_all("div", class_=re.compile(r"detailScore"))
+            score_elements = soup.find_all("div", class_=DETAIL_SCORE_CLASS)
             for elem in score_elements:
                 text = self._safe_extract_text(elem)
                 # Look for pattern like "2-2" in the text
@@ -608,7 +723,7 @@ class FlashScoreScraper(EnhancedBaseScraper):
 
             # Fallback to other score selectors if needed
             if not score_text:
-                score_elem = soup.find("div", class_=re.compile(r"detailScore"))
+                score_elem = soup.find("div", class_=DETAIL_SCORE_CLASS)
                 if score_elem:
                     home_score_elem = score_elem.find("span", class_="detailScore__home")
                     away_score_elem = score_elem.find("span", class_="detailScore__away")
@@ -648,19 +763,12 @@ class FlashScoreScraper(EnhancedBaseScraper):
         try:
             # Try multiple selectors for odds section
             odds_section = None
-            odds_selectors = [
-                "div[class*='odds']",
-                "[data-testid*='odds']",
-                ".odds",
-                "[class*='bookmaker']",
-                ".ui-table"
-            ]
 
-            for selector in odds_selectors:
+            for selector in ODDS_SECTION_SELECTORS:
                 try:
                     odds_section = soup.select_one(selector)
                     if odds_section:
-                        self.logger.debug(f"Found odds section with selector: {selector}")
+                        self.logger.debug(f"Found odds section with selector: {selector.pattern}")
                         break
                 except Exception:
                     continue
@@ -672,35 +780,21 @@ class FlashScoreScraper(EnhancedBaseScraper):
             odds_data = {}
 
             # Try multiple row selectors
-            row_selectors = [
-                "div[class*='ui-table__row']",
-                "tr",
-                "[class*='row']",
-                "div[class*='bookmaker']"
-            ]
-
             odds_rows = []
-            for selector in row_selectors:
+            for selector in ODDS_ROW_SELECTORS:
                 try:
                     rows = odds_section.select(selector)
                     if rows:
                         odds_rows = rows
-                        self.logger.debug(f"Found {len(rows)} odds rows with selector: {selector}")
+                        self.logger.debug(f"Found {len(rows)} odds rows with selector: {selector.pattern}")
                         break
                 except Exception:
                     continue
 
             for row in odds_rows:
                 # Try to extract cells
-                cell_selectors = [
-                    "div[class*='ui-table__cell']",
-                    "td",
-                    "span",
-                    "[class*='cell']"
-                ]
-
                 cells = []
-                for selector in cell_selectors:
+                for selector in ODDS_CELL_SELECTORS:
                     try:
                         cells = row.select(selector)
                         if len(cells) >= 3:  # Need at least 3 for odds
@@ -744,15 +838,8 @@ class FlashScoreScraper(EnhancedBaseScraper):
         try:
             # Try multiple selectors for stats section
             stats_section = None
-            stats_selectors = [
-                "div[class*='stats']",
-                "[data-testid*='stat']",
-                ".stat",
-                "[class*='statistic']",
-                "[class*='matchStatistics']"
-            ]
 
-            for selector in stats_selectors:
+            for selector in STATS_SECTION_SELECTORS:
                 try:
                     sections = soup.select(selector)
                     if sections:
@@ -761,7 +848,7 @@ class FlashScoreScraper(EnhancedBaseScraper):
                             text = self._safe_extract_text(section).lower()
                             if any(keyword in text for keyword in ['possession', 'shots', 'corners', 'fouls', '%']):
                                 stats_section = section
-                                self.logger.debug(f"Found stats section with selector: {selector}")
+                                self.logger.debug(f"Found stats section with selector: {selector.pattern}")
                                 break
                         if stats_section:
                             break
@@ -774,33 +861,13 @@ class FlashScoreScraper(EnhancedBaseScraper):
 
             stats = {}
 
-            # Look for common statistics patterns
-            stat_types = {
-                'possession': ['possession', 'ball possession'],
-                'shots': ['shots', 'total shots'],
-                'shots_on_target': ['shots on target', 'on target'],
-                'corners': ['corners', 'corner kicks'],
-                'fouls': ['fouls', 'total fouls'],
-                'yellow_cards': ['yellow cards', 'yellow'],
-                'red_cards': ['red cards', 'red'],
-                'passes': ['passes', 'total passes'],
-                'pass_accuracy': ['pass accuracy', 'passing %']
-            }
-
-            # Try to extract stats using various patterns
+            # Try to extract stats using the precompiled STAT_PATTERNS
             page_text = soup.get_text()
 
-            for stat_name, keywords in stat_types.items():
-                for keyword in keywords:
-                    # Look for patterns like "Possession 65% - 35%" or "Shots 12 - 8"
-                    patterns = [
-                        rf'{keyword}\s*(\d+)%?\s*-\s*(\d+)%?',
-                        rf'{keyword}:\s*(\d+)%?\s*-\s*(\d+)%?',
-                        rf'(\d+)%?\s*-\s*(\d+)%?\s*{keyword}',
-                    ]
-
+            for stat_name, keyword_patterns in STAT_PATTERNS.items():
+                for patterns in keyword_patterns:
                     for pattern in patterns:
-                        match = re.search(pattern, page_text, re.IGNORECASE)
+                        match = pattern.search(page_text)
                         if match:
                             home_value = match.group(1)
                             away_value = match.group(2)
@@ -815,7 +882,7 @@ class FlashScoreScraper(EnhancedBaseScraper):
 
             # Alternative approach: look for structured stat elements
             if not stats:
-                stat_elements = soup.select("[class*='stat']")
+                stat_elements = soup.select(STAT_ELEMENT_SELECTOR)
                 for elem in stat_elements:
                     elem_text = self._safe_extract_text(elem)
 
@@ -894,17 +961,17 @@ class FlashScoreScraper(EnhancedBaseScraper):
     def _extract_match_events(self, soup: BeautifulSoup, details: Dict[str, Any]):
         """Extract match events (goals, cards, etc.)."""
         try:
-            events_section = soup.find("div", class_=re.compile(r"events"))
+            events_section = soup.find("div", class_=EVENTS_CLASS)
             if not events_section:
                 return
 
             events = []
-            event_rows = events_section.find_all("div", class_=re.compile(r"event"))
+            event_rows = events_section.find_all("div", class_=EVENT_CLASS)
 
             for event in event_rows:
-                event_time_elem = event.find("div", class_=re.compile(r"eventTime"))
-                event_type_elem = event.find("div", class_=re.compile(r"eventType"))
-                event_player_elem = event.find("div", class_=re.compile(r"eventPlayer"))
+                event_time_elem = event.find("div", class_=EVENT_TIME_CLASS)
+                event_type_elem = event.find("div", class_=EVENT_TYPE_CLASS)
+                event_player_elem = event.find("div", class_=EVENT_PLAYER_CLASS)
 
                 event_time = self._safe_extract_text(event_time_elem) if event_time_elem else ""
                 event_type = self._safe_extract_text(event_type_elem) if event_type_elem else ""
@@ -927,17 +994,7 @@ class FlashScoreScraper(EnhancedBaseScraper):
         """Extract match time from detail page HTML."""
         try:
             # Try various selectors for time information
-            time_selectors = [
-                ".duelParticipant__startTime",
-                ".startTime",
-                ".fixedHeaderDuel__startTime",
-                ".duel__time",
-                "[data-time]",
-                "[class*='time']",
-                "[class*='Time']"
-            ]
-
-            for selector in time_selectors:
+            for selector in MATCH_TIME_SELECTORS:
                 try:
                     elements = soup.select(selector)
                     for elem in elements:
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+HTML feldolgozó réteg
+=====================
+
+Közös BeautifulSoup építés a scrapereknek: lxml parser, ha telepítve
+van (többszörösen gyorsabb a beépített html.parser-nél), és opcionális
+SoupStrainer, amellyel csak az oldal releváns része épül fel fává.
+"""
+
+from typing import Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# FlashScore meccs oldal: a csapatok, eredmény, állapot, odds, statisztika
+# és események mind a #detail konténeren belül vannak, a fejléc, a
+# menük és a többi meccs listája nem kell
+DETAIL_PAGE_STRAINER = SoupStrainer(id='detail')
+
+
+def parse_html(content: Union[str, bytes],
+               parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Oldal feldolgozása BeautifulSoup fává.
+
+    Ha a szűrt feldolgozás egyetlen elemet sem talál (más oldalszerkezet),
+    a teljes oldal kerül feldolgozásra, így a szűrés sosem veszít adatot.
+
+    Args:
+        content: Az oldal HTML tartalma
+        parse_only: Csak az ennek megfelelő részfák épülnek fel
+
+    Returns:
+        BeautifulSoup objektum
+    """
+    if parse_only is not None:
+        soup = BeautifulSoup(content, HTML_PARSER, parse_only=parse_only)
+        if soup.find(True) is not None:
+            return soup
+
+    return BeautifulSoup(content, HTML_PARSER)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Párhuzamos letöltés ütemező
+===========================
+
+Korlátos számú letöltő szál host-onkénti token bucket-tel, a letöltött
+oldalak feldolgozása pedig külön szálkészletben fut, így a lassú
+oldalak nem tartják fel a letöltéseket és fordítva.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+
+class TokenBucket:
+    """Thread-safe token bucket; a negative balance holds reservations of waiting callers."""
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, waiting until it is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """One token bucket per host, created on first use."""
+
+    def __init__(self, rate: float, capacity: float,
+                 host_rates: Optional[Dict[str, float]] = None, **bucket_kwargs):
+        self.rate = rate
+        self.capacity = capacity
+        self.host_rates = dict(host_rates or {})
+        self._bucket_kwargs = bucket_kwargs
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Wait for the URL's host; returns seconds spent waiting."""
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.host_rates.get(host, self.rate), self.capacity,
+                                     **self._bucket_kwargs)
+                self._buckets[host] = bucket
+        return bucket.acquire()
+
+
+@dataclass
+class SchedulerStats:
+    """Counters of a scheduler run."""
+    submitted: int = 0
+    fetched: int = 0
+    parsed: int = 0
+    failed: int = 0
+    retries: int = 0
+    fetch_queue_depth: int = 0
+    parse_queue_depth: int = 0
+    max_fetch_queue_depth: int = 0
+    max_parse_queue_depth: int = 0
+    rate_limit_wait: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus throughput (parsed pages per second) as a plain dict."""
+        with self._lock:
+            elapsed = self.elapsed
+            return {
+                'submitted': self.submitted,
+                'fetched': self.fetched,
+                'parsed': self.parsed,
+                'failed': self.failed,
+                'retries': self.retries,
+                'fetch_queue_depth': self.fetch_queue_depth,
+                'parse_queue_depth': self.parse_queue_depth,
+                'max_fetch_queue_depth': self.max_fetch_queue_depth,
+                'max_parse_queue_depth': self.max_parse_queue_depth,
+                'rate_limit_wait': round(self.rate_limit_wait, 3),
+                'elapsed': round(elapsed, 3),
+                'throughput': round(self.parsed / elapsed, 3) if elapsed > 0 else 0.0,
+            }
+
+
+class ScrapeScheduler:
+    """
+    Fetch jobs concurrently with per-host politeness and parse them in a separate pool.
+
+    fetch(job) returns the raw page content and raises on failure; failures
+    listed in retry_exceptions (except HTTP 4xx responses) are retried with
+    exponential backoff. parse(job, content) returns the result, or None
+    when the page held nothing usable.
+    """
+
+    def __init__(self, fetch: Callable[[Any], bytes], parse: Callable[[Any, bytes], Any],
+                 url_of: Callable[[Any], str],
+                 fetch_workers: int = 4, parse_workers: int = 2,
+                 requests_per_second: float = 1.0, burst: int = 2,
+                 host_rates: Optional[Dict[str, float]] = None,
+                 max_retries: int = 2, retry_backoff: float = 1.0,
+                 retry_exceptions: Tuple[type, ...] = (requests.RequestException,),
+                 sleep: Callable[[float], None] = time.sleep):
+        self.fetch = fetch
+        self.parse = parse
+        self.url_of = url_of
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_exceptions = retry_exceptions
+        self._sleep = sleep
+        self.limiter = HostRateLimiter(requests_per_second, burst, host_rates, sleep=sleep)
+        self.stats = SchedulerStats()
+        self.logger = logging.getLogger(__name__)
+
+    def _update(self, **deltas):
+        stats = self.stats
+        with stats._lock:
+            for name, delta in deltas.items():
+                setattr(stats, name, getattr(stats, name) + delta)
+            stats.max_fetch_queue_depth = max(stats.max_fetch_queue_depth, stats.fetch_queue_depth)
+            stats.max_parse_queue_depth = max(stats.max_parse_queue_depth, stats.parse_queue_depth)
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Client errors (4xx except 429) will not succeed on a retry."""
+        response = getattr(error, 'response', None)
+        if isinstance(error, requests.HTTPError) and response is not None:
+            return response.status_code >= 500 or response.status_code == 429
+        return True
+
+    def _fetch_with_retries(self, job) -> Optional[bytes]:
+        url = self.url_of(job)
+        for attempt in range(self.max_retries + 1):
+            self._update(rate_limit_wait=self.limiter.acquire(url))
+            try:
+                return self.fetch(job)
+            except self.retry_exceptions as e:
+                if not self._is_retryable(e) or attempt == self.max_retries:
+                    self.logger.warning(f"Giving up on {url} after {attempt + 1} attempts: {e}")
+                    return None
+                self._update(retries=1)
+                self.logger.info(f"Retrying {url} ({attempt + 1}/{self.max_retries}): {e}")
+                self._sleep(self.retry_backoff * 2 ** attempt)
+            except Exception as e:
+                self.logger.warning(f"Fetch failed for {url}: {e}")
+                return None
+
+    def run(self, jobs: Iterable[Any]) -> Iterator[Tuple[Any, Any]]:
+        """
+        Process all jobs, yielding (job, result) in completion order.
+
+        Failed fetches and pages that parse to nothing yield (job, None).
+        Consuming the iterator in the caller's thread keeps result handling
+        (saving files, updating indexes) single-threaded.
+        """
+        jobs = list(jobs)
+        results: "queue.Queue[Tuple[Any, Any]]" = queue.Queue()
+        self.stats.started_at = time.monotonic()
+        self.stats.finished_at = None
+        self._update(submitted=len(jobs), fetch_queue_depth=len(jobs))
+
+        with ThreadPoolExecutor(self.fetch_workers, thread_name_prefix="fetch") as fetch_pool, \
+                ThreadPoolExecutor(self.parse_workers, thread_name_prefix="parse") as parse_pool:
+
+            def parse_task(job, content):
+                self._update(parse_queue_depth=-1)
+                try:
+                    result = self.parse(job, content)
+                except Exception as e:
+                    self.logger.warning(f"Parse failed for {self.url_of(job)}: {e}")
+                    result = None
+                if result is None:
+                    self._update(failed=1)
+                else:
+                    self._update(parsed=1)
+                results.put((job, result))
+
+            def fetch_task(job):
+                self._update(fetch_queue_depth=-1)
+                content = self._fetch_with_retries(job)
+                if content is None:
+                    self._update(failed=1)
+                    results.put((job, None))
+                    return
+                self._update(fetched=1, parse_queue_depth=1)
+                parse_pool.submit(parse_task, job, content)
+
+            for job in jobs:
+                fetch_pool.submit(fetch_task, job)
+
+            for _ in jobs:
+                yield results.get()
+
+        self.stats.finished_at = time.monotonic()
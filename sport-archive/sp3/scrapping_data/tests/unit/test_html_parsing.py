@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+"""
+Test the detail page parsing layer: #detail subtree parsing gives the same match details
+"""
+
+import os
+import random
+import sys
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from scripts.sources.flashscore import FlashScoreScraper
+from scripts.sources.html_parsing import DETAIL_PAGE_STRAINER, parse_html
+from parsing_benchmark import generate_page, without_timestamps
+
+def test_detail_subtree_parsing_matches_full_tree():
+    scraper = FlashScoreScraper(use_selenium=False)
+    rng = random.Random(7)
+
+    for index in range(5):
+        url, content = generate_page(rng, index)
+        full = scraper.parse_match_details(BeautifulSoup(content, 'html.parser'), url)
+        strained = scraper.parse_match_details(scraper.parse_detail_page(content), url)
+
+        assert without_timestamps(strained) == without_timestamps(full)
+        assert strained['betting_odds'] and strained['events']
+
+def test_pages_without_detail_container_are_parsed_fully():
+    content = "<html><body><div class='duelParticipant__home'>Home</div></body></html>"
+    soup = parse_html(content, DETAIL_PAGE_STRAINER)
+
+    assert soup.select_one(".duelParticipant__home").get_text() == "Home"
+
+if __name__ == "__main__":
+    test_detail_subtree_parsing_matches_full_tree()
+    test_pages_without_detail_container_are_parsed_fully()
+    print("All HTML parsing tests passed")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+"""
+Test the page fetcher: HTTP cache (ETag / TTL by match status) and replay mode
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from scripts.sources.fetcher import FixtureNotFound, HttpCache, PageFetcher
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local stand-in for a match page that supports ETag revalidation"""
+
+    requests_seen = []
+
+    def do_GET(self):
+        StubHandler.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = f"<html><body>{self.path}</body></html>".encode('utf-8')
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = HTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def expire(cache, url):
+    """Make a cached entry stale as if its TTL had run out"""
+    meta_path = cache._paths(url)[1]
+    meta = json.loads(meta_path.read_text(encoding='utf-8'))
+    meta['expires_at'] = 0
+    meta_path.write_text(json.dumps(meta), encoding='utf-8')
+
+def test_fresh_entries_skip_the_network():
+    server, base_url = start_server()
+    StubHandler.requests_seen = []
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = PageFetcher(requests.Session(), HttpCache(cache_dir))
+
+            first = fetcher.fetch(f"{base_url}/match/1", match_status='finished')
+            second = fetcher.fetch(f"{base_url}/match/1", match_status='finished')
+
+            assert first.network and not first.from_cache
+            assert second.from_cache and not second.network
+            assert second.content == first.content
+            assert len(StubHandler.requests_seen) == 1
+    finally:
+        server.shutdown()
+
+def test_stale_entries_are_revalidated_with_etag():
+    server, base_url = start_server()
+    StubHandler.requests_seen = []
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = HttpCache(cache_dir)
+            fetcher = PageFetcher(requests.Session(), cache)
+            url = f"{base_url}/match/2"
+
+            first = fetcher.fetch(url, match_status='live')
+            expire(cache, url)
+
+            revalidated = fetcher.fetch(url, match_status='live')
+
+            assert StubHandler.requests_seen[-1] == ('/match/2', '"v1"')
+            assert revalidated.from_cache and revalidated.network
+            assert revalidated.content == first.content
+            assert cache.is_fresh(cache.get(url))
+    finally:
+        server.shutdown()
+
+def test_finished_status_never_expires():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HttpCache(cache_dir)
+        cache.put("https://example.com/match/3", b"<html></html>", 'live')
+        assert cache.get("https://example.com/match/3")['expires_at'] is not None
+
+        fetcher = PageFetcher(requests.Session(), cache)
+        assert fetcher.mark_status("https://example.com/match/3", 'finished')
+        assert cache.get("https://example.com/match/3")['expires_at'] is None
+
+def test_replay_serves_fixtures_without_network():
+    server, base_url = start_server()
+    StubHandler.requests_seen = []
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            url = f"{base_url}/match/4"
+            recorded = PageFetcher(requests.Session(), HttpCache(cache_dir), mode='record').fetch(url)
+            rendered = PageFetcher(requests.Session(), HttpCache(cache_dir), mode='record').fetch_rendered(
+                f"{base_url}/rendered", lambda: "<html>rendered</html>")
+            server.shutdown()
+
+            replay = PageFetcher(requests.Session(), HttpCache(cache_dir), mode='replay')
+            assert replay.fetch(url).content == recorded.content
+            assert replay.fetch_rendered(f"{base_url}/rendered", lambda: 1 / 0).content == rendered.content
+            assert sorted(HttpCache(cache_dir).urls()) == sorted([url, f"{base_url}/rendered"])
+
+            try:
+                replay.fetch(f"{base_url}/missing")
+                assert False, "missing fixture should raise"
+            except FixtureNotFound:
+                pass
+            assert len(StubHandler.requests_seen) == 1
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    test_fresh_entries_skip_the_network()
+    test_stale_entries_are_revalidated_with_etag()
+    test_finished_status_never_expires()
+    test_replay_serves_fixtures_without_network()
+    print("All page fetcher tests passed")
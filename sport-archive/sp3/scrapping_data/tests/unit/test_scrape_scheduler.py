@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+Test bulk detail scraping through the scheduler against a local HTTP stand-in
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from scripts.detailed_scraper import DetailedMatchScraper
+from scripts.utils.scrape_scheduler import TokenBucket
+
+TARGET_DATE = date(2025, 7, 10)
+
+MATCH_PAGE = """<html><body>
+<div class="duelParticipant__startTime">10.07.2025 {hour}:00</div>
+<div class="duelParticipant__home"><div class="participant__participantName">{home}</div></div>
+<div class="duelParticipant__away"><div class="participant__participantName">{away}</div></div>
+<div class="detailScore__wrapper"><span>2</span><span>-</span><span>1</span></div>
+<div class="detailScore__status">Finished</div>
+</body></html>"""
+
+class FlashScoreStandIn(BaseHTTPRequestHandler):
+    """Serves saved-style FlashScore detail pages; /match/flaky/ fails once with 503"""
+
+    hits = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with FlashScoreStandIn.lock:
+            FlashScoreStandIn.hits[self.path] = FlashScoreStandIn.hits.get(self.path, 0) + 1
+            hits = FlashScoreStandIn.hits[self.path]
+
+        if self.path == '/match/flaky/' and hits == 1:
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.path == '/match/missing/':
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        number = sum(map(ord, self.path)) % 10
+        body = MATCH_PAGE.format(hour=12 + number, home=f"Home {self.path}",
+                                 away=f"Away {self.path}").encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def make_matches(base_url, names):
+    return [{
+        'home_team': f"Home {name}",
+        'away_team': f"Away {name}",
+        'league': 'Test League',
+        'match_time': f"{12 + i}:00",
+        'status': 'finished',
+        'source': 'flashscore',
+        'match_url': f"{base_url}/match/{name}/"
+    } for i, name in enumerate(names)]
+
+def test_token_bucket_spaces_requests_after_burst():
+    now = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(5):
+        bucket.acquire()
+
+    assert waits == [0.5, 0.5, 0.5]
+
+def test_bulk_scrape_missing_details_with_scheduler():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlashScoreStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    FlashScoreStandIn.hits = {}
+
+    try:
+        with tempfile.TemporaryDirectory() as base_path:
+            scraper = DetailedMatchScraper(base_path)
+            scraper.requests_per_second_per_host = 50.0
+            scraper.retry_backoff = 0.01
+
+            names = ['a', 'b', 'c', 'd', 'flaky', 'missing']
+            matches = make_matches(base_url, names)
+            scraper.json_handler.save_daily_matches(matches, TARGET_DATE)
+
+            # One match already has details and must not be fetched again
+            scraper.json_handler.save_detailed_match(
+                dict(matches[0]), TARGET_DATE, scraper._generate_match_id(matches[0]))
+
+            result = scraper.bulk_scrape_missing_details(TARGET_DATE)
+            stats = result['scheduler_stats']
+
+            assert result['missing_matches'] == 5
+            assert result['scraped_new'] == 4
+            assert stats['parsed'] == 4 and stats['failed'] == 1
+            assert stats['retries'] == 1  # 503 is retried, 404 is not
+            assert stats['fetch_queue_depth'] == 0 and stats['parse_queue_depth'] == 0
+            assert stats['max_fetch_queue_depth'] == 5
+            assert stats['throughput'] > 0
+            assert '/match/a/' not in FlashScoreStandIn.hits
+
+            assert result['before_stats']['matches_with_details'] == 1
+            assert result['after_stats']['matches_with_details'] == 5
+            assert result['after_stats'] == scraper.get_scraping_statistics(TARGET_DATE)
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_token_bucket_spaces_requests_after_burst()
+    test_bulk_scrape_missing_details_with_scheduler()
+    print("All scrape scheduler tests passed")
@@ -18,6 +18,76 @@ def get_team_form(df, team_col, goals_for_col, goals_against_col, result_col, te
     win_rate = np.mean(prev_matches[result_col] == 'H') if team_col == 'HomeTeam' else np.mean(prev_matches[result_col] == 'A')
     return pd.Series([avg_goal_diff, win_rate])
 
+def _previous_match_windows(df, team_col, n=5):
+    """
+    Row positions of each row's last n earlier matches of the same team in team_col,
+    newest first, padded with -1.
+
+    Same selection as get_team_stats/get_team_form: only rows with the same team in
+    team_col and a strictly earlier Date count, so a row never sees its own result
+    (nor other matches of the same day). Sorts once by team and date instead of
+    filtering the whole frame per row; several matches of one team on the same
+    earlier day are taken in row order.
+    """
+    window = np.full((len(df), n), -1, dtype=np.int64)
+    valid = (df[team_col].notna() & df['Date'].notna()).to_numpy()
+    positions = np.flatnonzero(valid)
+    if len(positions) == 0 or n <= 0:
+        return window
+
+    teams = pd.factorize(df[team_col].iloc[positions])[0]
+    dates = df['Date'].iloc[positions].to_numpy()
+    order = np.lexsort((dates, teams))
+    positions, teams, dates = positions[order], teams[order], dates[order]
+
+    index = np.arange(len(positions))
+    new_team = np.r_[True, teams[1:] != teams[:-1]]
+    new_date = new_team | np.r_[True, dates[1:] != dates[:-1]]
+    team_start = np.maximum.accumulate(np.where(new_team, index, 0))
+    date_start = np.maximum.accumulate(np.where(new_date, index, 0))
+
+    previous = date_start[:, None] - 1 - np.arange(n)
+    window[positions] = np.where(previous >= team_start[:, None],
+                                 positions[np.maximum(previous, 0)], -1)
+    return window
+
+def _window_mean(values, window):
+    """NaN-skipping mean of values over each window row (summed newest first, like Series.mean)."""
+    gathered = values[np.maximum(window, 0)]
+    present = (window >= 0) & ~np.isnan(gathered)
+    total = np.where(present, gathered, 0.0).sum(axis=1)
+    count = present.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / count
+
+def _window_rate(hits, window):
+    """Share of window rows where hits is True."""
+    matches = window >= 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (hits[np.maximum(window, 0)] & matches).sum(axis=1) / matches.sum(axis=1)
+
+def rolling_team_features(df, team_col, goals_for_col, goals_against_col, result_col, win_result, n=5):
+    """
+    get_team_stats and get_team_form for every row at once.
+
+    Returns a DataFrame (same index as df) with WinRate, AvgGF, AvgGA, LastN_GD and
+    LastN_WinRate columns; rows without earlier matches get 0, as in the per-row functions.
+    """
+    window = _previous_match_windows(df, team_col, n)
+    goals_for = df[goals_for_col].to_numpy(dtype=float)
+    goals_against = df[goals_against_col].to_numpy(dtype=float)
+    results = df[result_col]
+
+    features = pd.DataFrame({
+        'WinRate': _window_rate((results == 'W').to_numpy(), window),
+        'AvgGF': _window_mean(goals_for, window),
+        'AvgGA': _window_mean(goals_against, window),
+        'LastN_GD': _window_mean(goals_for - goals_against, window),
+        'LastN_WinRate': _window_rate((results == win_result).to_numpy(), window),
+    }, index=df.index)
+    features[window[:, 0] < 0] = 0
+    return features
+
 def create_features(df: pd.DataFrame) -> pd.DataFrame:
     """Creates all features for the model."""
     # Odds-based features
@@ -30,13 +100,11 @@ def create_features(df: pd.DataFrame) -> pd.DataFrame:
     df['OddsRatioHomeAway'] = df['B365H'] / df['B365A']
 
     # Historical team performance
-    home_stats = df.apply(lambda row: get_team_stats(
-        df, 'HomeTeam', 'FTHG', 'FTAG', 'FTR', row['HomeTeam'], row['Date']), axis=1)
-    df[['Home_WinRate', 'Home_AvgGF', 'Home_AvgGA']] = home_stats
+    home = rolling_team_features(df, 'HomeTeam', 'FTHG', 'FTAG', 'FTR', 'H')
+    df[['Home_WinRate', 'Home_AvgGF', 'Home_AvgGA']] = home[['WinRate', 'AvgGF', 'AvgGA']].to_numpy()
 
-    away_stats = df.apply(lambda row: get_team_stats(
-        df, 'AwayTeam', 'FTAG', 'FTHG', 'FTR', row['AwayTeam'], row['Date']), axis=1)
-    df[['Away_WinRate', 'Away_AvgGF', 'Away_AvgGA']] = away_stats
+    away = rolling_team_features(df, 'AwayTeam', 'FTAG', 'FTHG', 'FTR', 'A')
+    df[['Away_WinRate', 'Away_AvgGF', 'Away_AvgGA']] = away[['WinRate', 'AvgGF', 'AvgGA']].to_numpy()
 
     # New features: Attack Strength
     epsilon = 1e-6 # Small value to prevent division by zero
@@ -44,12 +112,7 @@ def create_features(df: pd.DataFrame) -> pd.DataFrame:
     df['AwayAttackStrength'] = df['Away_AvgGF'] / (df['Home_AvgGA'] + epsilon)
 
     # Team form
-    home_form = df.apply(lambda row: get_team_form(
-        df, 'HomeTeam', 'FTHG', 'FTAG', 'FTR', row['HomeTeam'], row['Date']), axis=1)
-    df[['Home_Last5_GD', 'Home_Last5_WinRate']] = home_form
-
-    away_form = df.apply(lambda row: get_team_form(
-        df, 'AwayTeam', 'FTAG', 'FTHG', 'FTR', row['AwayTeam'], row['Date']), axis=1)
-    df[['Away_Last5_GD', 'Away_Last5_WinRate']] = away_form
+    df[['Home_Last5_GD', 'Home_Last5_WinRate']] = home[['LastN_GD', 'LastN_WinRate']].to_numpy()
+    df[['Away_Last5_GD', 'Away_Last5_WinRate']] = away[['LastN_GD', 'LastN_WinRate']].to_numpy()
 
     return df
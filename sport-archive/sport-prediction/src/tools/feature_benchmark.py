@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Feature engineering benchmark
+=============================
+
+A create_features csapat előzmény jellemzőinek (utolsó 5 meccs győzelmi
+aránya, lőtt/kapott gól átlag, gólkülönbség) sebessége a régi soronkénti
+df.apply + get_team_stats/get_team_form és az egyszer rendező, csapatonként
+csúszó ablakos rolling_team_features között.
+
+A régi út soronként az egész táblát szűri (O(n²)), ezért csak --verify
+méretig fut; ott a két eredménynek pontosan egyeznie kell.
+
+Használat:
+    python src/tools/feature_benchmark.py
+    python src/tools/feature_benchmark.py --sizes 10000 100000 --verify 3000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from feature_engineering import create_features, get_team_form, get_team_stats
+
+HISTORY_COLUMNS = ['Home_WinRate', 'Home_AvgGF', 'Home_AvgGA', 'Away_WinRate', 'Away_AvgGF', 'Away_AvgGA',
+                   'HomeAttackStrength', 'AwayAttackStrength',
+                   'Home_Last5_GD', 'Home_Last5_WinRate', 'Away_Last5_GD', 'Away_Last5_WinRate']
+
+
+def generate_matches(size, seed=42):
+    """Szintetikus bajnokság: csapatonként legfeljebb egy meccs naponta, néhány hiányzó gól."""
+    rng = np.random.default_rng(seed)
+    teams = max(20, size // 500)
+    per_day = teams // 2
+    days = -(-size // per_day)
+
+    home, away = [], []
+    for _ in range(days):
+        pairing = rng.permutation(teams)
+        home.append(pairing[:per_day])
+        away.append(pairing[per_day:2 * per_day])
+    home = np.concatenate(home)[:size]
+    away = np.concatenate(away)[:size]
+    dates = pd.Timestamp('2000-08-01') + pd.to_timedelta(np.arange(size) // per_day, unit='D')
+
+    fthg = rng.poisson(1.5, size).astype(float)
+    ftag = rng.poisson(1.1, size).astype(float)
+    fthg[rng.random(size) < 0.01] = np.nan
+    ftr = np.where(fthg > ftag, 'H', np.where(fthg < ftag, 'A', 'D'))
+
+    df = pd.DataFrame({
+        'Date': dates,
+        'HomeTeam': [f"Team {i}" for i in home],
+        'AwayTeam': [f"Team {i}" for i in away],
+        'FTHG': fthg,
+        'FTAG': ftag,
+        'FTR': ftr,
+        'B365H': rng.uniform(1.2, 6.0, size),
+        'B365D': rng.uniform(2.8, 4.5, size),
+        'B365A': rng.uniform(1.2, 8.0, size),
+        'B365>2.5': rng.uniform(1.4, 2.6, size),
+    })
+    # Nem időrendben érkező sorok
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def legacy_create_features(df):
+    """A korábbi soronkénti számítás (csak a csapat előzmény oszlopok)."""
+    home_stats = df.apply(lambda row: get_team_stats(
+        df, 'HomeTeam', 'FTHG', 'FTAG', 'FTR', row['HomeTeam'], row['Date']), axis=1)
+    df[['Home_WinRate', 'Home_AvgGF', 'Home_AvgGA']] = home_stats
+
+    away_stats = df.apply(lambda row: get_team_stats(
+        df, 'AwayTeam', 'FTAG', 'FTHG', 'FTR', row['AwayTeam'], row['Date']), axis=1)
+    df[['Away_WinRate', 'Away_AvgGF', 'Away_AvgGA']] = away_stats
+
+    epsilon = 1e-6
+    df['HomeAttackStrength'] = df['Home_AvgGF'] / (df['Away_AvgGA'] + epsilon)
+    df['AwayAttackStrength'] = df['Away_AvgGF'] / (df['Home_AvgGA'] + epsilon)
+
+    home_form = df.apply(lambda row: get_team_form(
+        df, 'HomeTeam', 'FTHG', 'FTAG', 'FTR', row['HomeTeam'], row['Date']), axis=1)
+    df[['Home_Last5_GD', 'Home_Last5_WinRate']] = home_form
+
+    away_form = df.apply(lambda row: get_team_form(
+        df, 'AwayTeam', 'FTAG', 'FTHG', 'FTR', row['AwayTeam'], row['Date']), axis=1)
+    df[['Away_Last5_GD', 'Away_Last5_WinRate']] = away_form
+    return df
+
+
+def timed(function, df):
+    started = time.perf_counter()
+    result = function(df.copy())
+    return result, time.perf_counter() - started
+
+
+def identical(old, new):
+    """Bitre azonos értékek (NaN a NaN-nal egyezik)."""
+    old = old[HISTORY_COLUMNS].to_numpy(dtype=float)
+    new = new[HISTORY_COLUMNS].to_numpy(dtype=float)
+    return np.array_equal(old, new, equal_nan=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='create_features benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help='Meccsek száma futásonként')
+    parser.add_argument('--verify', type=int, default=10_000,
+                        help='Eddig a méretig fut a régi soronkénti számítás is')
+    args = parser.parse_args()
+
+    failed = False
+    for size in args.sizes:
+        df = generate_matches(size)
+        new, new_seconds = timed(create_features, df)
+        line = f"📊 {size:>9,} meccs: rolling {new_seconds:8.2f}s"
+
+        if size <= args.verify:
+            old, old_seconds = timed(legacy_create_features, df)
+            ok = identical(old, new)
+            failed |= not ok
+            line += f" | df.apply {old_seconds:8.2f}s | ⚡ {old_seconds / new_seconds:7.1f}x | "
+            line += "✅ azonos" if ok else "❌ ELTÉR"
+        print(line)
+
+    if failed:
+        print("❌ FAIL: a két számítás eredménye eltér")
+        return 1
+    print("✅ PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
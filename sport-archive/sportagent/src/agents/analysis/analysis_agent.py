@@ -67,38 +67,61 @@ class AnalysisAgent:
         """
         logger.info(f"Elemzés kezdése: {len(matches)} mérkőzés")
 
-        results = {
-            'total_matches': len(matches),
-            'analyzed_matches': 0,
-            'detailed_analysis': [],
-            'key_insights': [],
-            'market_opportunities': [],
-            'risk_warnings': [],
-            'summary_stats': {}
-        }
-
-        predictions = []
+        detailed_analysis = []
 
         for match_data in matches:
             try:
-                # Egyedi mérkőzés elemzése
-                match_analysis = self._analyze_single_match(match_data)
+                # Egyedi mérkőzés elemzése és tárolása
+                match_analysis = self.analyze_match(match_data)
 
                 if match_analysis:
-                    results['detailed_analysis'].append(match_analysis)
-                    results['analyzed_matches'] += 1
-
-                    # Predikció tárolása
-                    if 'prediction' in match_analysis:
-                        predictions.append(match_analysis['prediction'])
-
-                    # Elemzés tárolása az adatbázisban
-                    match_id = self._generate_match_id(match_data)
-                    self.data_storage.store_analysis(match_id, match_analysis)
+                    detailed_analysis.append(match_analysis)
 
             except Exception as e:
                 logger.error(f"Hiba a mérkőzés elemzése során: {e}")
 
+        return self.summarize_analysis(matches, detailed_analysis)
+
+    def analyze_match(self, match_data: Dict) -> Optional[Dict[str, Any]]:
+        """
+        Egy mérkőzés elemzése és tárolása
+
+        Streamelt feldolgozásnál így egy meccs elemzése elindulhat, amint
+        a statisztikái elkészültek; az összesítés a summarize_analysis.
+        """
+        match_analysis = self._analyze_single_match(match_data)
+
+        if match_analysis:
+            # Elemzés tárolása az adatbázisban
+            match_id = self._generate_match_id(match_data)
+            self.data_storage.store_analysis(match_id, match_analysis)
+
+        return match_analysis
+
+    def summarize_analysis(self, matches: List[Dict], detailed_analysis: List[Dict]) -> Dict[str, Any]:
+        """
+        Egyedi elemzések összesítése
+
+        Args:
+            matches: Az összes mérkőzés
+            detailed_analysis: A sikeres elemzések, a mérkőzések sorrendjében
+        """
+        results = {
+            'total_matches': len(matches),
+            'analyzed_matches': len(detailed_analysis),
+            'detailed_analysis': list(detailed_analysis),
+            'key_insights': [],
+            'market_opportunities': [],
+            'risk_warnings': [],
+            'summary_stats': {}
+        }
+
+        # Predikciók
+        predictions = [
+            match_analysis['prediction'] for match_analysis in detailed_analysis
+            if 'prediction' in match_analysis
+        ]
+
         # Aggregált elemzések
         results['key_insights'] = self._generate_key_insights(results['detailed_analysis'])
         results['market_opportunities'] = self._identify_market_opportunities(results['detailed_analysis'])
@@ -5,7 +5,7 @@ Intelligens fogadási stratégiák és bankroll menedzsment
 
 import math
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
@@ -84,6 +84,51 @@ class BettingStrategyAgent:
         """
         logger.info(f"Fogadási stratégiák generálása: {len(matches)} mérkőzés")
 
+        # Egyedi mérkőzés stratégiák (lustán, a summarize_strategies hibakezelésén belül)
+        match_recommendations = (
+            self.generate_match_strategies(match_analysis)
+            for match_analysis in analysis.get('detailed_analysis', [])
+        )
+        return self.summarize_strategies(matches, analysis, match_recommendations)
+
+    def generate_match_strategies(self, match_analysis: Dict) -> List[Dict]:
+        """
+        Egy mérkőzés fogadási ajánlásai és a stratégia tárolása
+
+        Streamelt feldolgozásnál így egy meccs stratégiája elkészülhet,
+        amint az elemzése megvan; az összesítés a summarize_strategies.
+        """
+        recommendations = self._generate_match_strategies(match_analysis)
+
+        # Stratégia tárolása
+        match_id = match_analysis.get('match_id', '')
+        if match_id:
+            strategy_data = {
+                'strategy_type': 'comprehensive',
+                'recommended_bets': recommendations,
+                'bankroll_allocation': self._calculate_match_bankroll(recommendations),
+                'expected_roi': self._calculate_expected_roi(recommendations),
+                'risk_level': self._assess_overall_risk(recommendations),
+                'confidence': self._calculate_strategy_confidence(recommendations),
+                'reasoning': self._generate_strategy_reasoning(match_analysis, recommendations)
+            }
+            self.data_storage.store_strategy(match_id, strategy_data)
+
+        return recommendations
+
+    def summarize_strategies(self,
+                             matches: List[Dict],
+                             analysis: Dict,
+                             match_recommendations: Iterable[List[Dict]]) -> Dict[str, Any]:
+        """
+        Mérkőzésenkénti ajánlások összesítése
+
+        Args:
+            matches: Az összes mérkőzés
+            analysis: Az elemzés összesítője
+            match_recommendations: Mérkőzésenkénti ajánlások, a részletes
+                elemzések sorrendjében
+        """
         results = {
             'total_matches': len(matches),
             'analyzed_matches': len(analysis.get('detailed_analysis', [])),
@@ -99,30 +144,12 @@ class BettingStrategyAgent:
         }
 
         try:
-            detailed_analysis = analysis.get('detailed_analysis', [])
-
-            # Egyedi mérkőzés stratégiák
-            for match_analysis in detailed_analysis:
-                recommendations = self._generate_match_strategies(match_analysis)
+            for recommendations in match_recommendations:
                 results['recommendations'].extend(recommendations)
 
                 # Kategorizálás kockázat szerint
                 self._categorize_recommendations(recommendations, results)
 
-                # Stratégia tárolása
-                match_id = match_analysis.get('match_id', '')
-                if match_id:
-                    strategy_data = {
-                        'strategy_type': 'comprehensive',
-                        'recommended_bets': recommendations,
-                        'bankroll_allocation': self._calculate_match_bankroll(recommendations),
-                        'expected_roi': self._calculate_expected_roi(recommendations),
-                        'risk_level': self._assess_overall_risk(recommendations),
-                        'confidence': self._calculate_strategy_confidence(recommendations),
-                        'reasoning': self._generate_strategy_reasoning(match_analysis, recommendations)
-                    }
-                    self.data_storage.store_strategy(match_id, strategy_data)
-
             # Komplex stratégiák
             results['accumulator_suggestions'] = self._generate_accumulator_strategies(results['recommendations'])
             results['bankroll_strategy'] = self._generate_bankroll_strategy(results['recommendations'])
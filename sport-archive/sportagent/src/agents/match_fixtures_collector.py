@@ -3,7 +3,8 @@ Match Fixtures Collector - Specializált mérkőzés fixture-ök gyűjtése
 Csak mai és holnapi meccsekre koncentrál: dátum, időpont, csapatok, bajnokság, odds
 """
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve as sv
 import re
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
@@ -15,6 +16,28 @@ import json
 from ..utils.logger import Logger
 from ..config import Config
 
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Csak a body épül fává - a fejléc (title, meta, script) nem kell a kinyeréshez
+BODY_STRAINER = SoupStrainer('body')
+
+# Forrásonkénti fixture konténer szelektorok, egyszer fordítva
+BBC_FIXTURE_SELECTOR = sv.compile(', '.join([
+    '.fixture-team', '.fixture-list', '.match-list', '.fixture', '.game', '.match'
+]))
+ESPN_FIXTURE_SELECTOR = sv.compile(', '.join([
+    '.scoreboard', '.schedule-item', '.game-strip', '.event-card'
+]))
+SKY_SPORTS_FIXTURE_SELECTOR = sv.compile(', '.join([
+    '.fixres__item', '.match-fixture', '.fixture-list-item'
+]))
+TIME_CLASS_PATTERN = re.compile(r'time|kick.*off|start')
+TEXT_ELEMENT_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'div', 'span', 'p', 'a']
+
 class MatchFixturesCollector:
     """
     Specializált mérkőzés fixture-ök gyűjtője
@@ -141,7 +164,7 @@ class MatchFixturesCollector:
                     response = requests.get(url, headers=headers, timeout=10)
 
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self._parse_html(response.text)
 
                         # BBC fixture specifikus parseolás
                         fixtures.extend(self._parse_bbc_fixtures(soup, date, day_name))
@@ -163,26 +186,14 @@ class MatchFixturesCollector:
         fixtures = []
 
         try:
-            # Különböző BBC fixture formátumok
-            selectors = [
-                '.fixture-team',
-                '.fixture-list',
-                '.match-list',
-                '.fixture',
-                '.game',
-                '.match'
-            ]
-
-            for selector in selectors:
-                elements = soup.find_all(class_=selector)
-
-                for element in elements:
-                    try:
-                        fixture = self._extract_fixture_from_element(element, 'bbc_sport', date, day_name)
-                        if fixture:
-                            fixtures.append(fixture)
-                    except Exception as e:
-                        continue
+            # Különböző BBC fixture formátumok, egyetlen bejárással
+            for element in soup.select(BBC_FIXTURE_SELECTOR):
+                try:
+                    fixture = self._extract_fixture_from_element(element, 'bbc_sport', date, day_name)
+                    if fixture:
+                        fixtures.append(fixture)
+                except Exception as e:
+                    continue
 
             # Általános szöveg keresés is
             fixtures.extend(self._extract_fixtures_from_text(soup, 'bbc_sport', date, day_name))
@@ -211,7 +222,7 @@ class MatchFixturesCollector:
                     response = requests.get(url, headers=headers, timeout=10)
 
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self._parse_html(response.text)
                         fixtures.extend(self._parse_espn_fixtures(soup, date, day_name))
 
                 except Exception as e:
@@ -232,23 +243,13 @@ class MatchFixturesCollector:
 
         try:
             # ESPN specifikus selectorok
-            selectors = [
-                '.scoreboard',
-                '.schedule-item',
-                '.game-strip',
-                '.event-card'
-            ]
-
-            for selector in selectors:
-                elements = soup.find_all(class_=selector)
-
-                for element in elements:
-                    try:
-                        fixture = self._extract_fixture_from_element(element, 'espn', date, day_name)
-                        if fixture:
-                            fixtures.append(fixture)
-                    except Exception as e:
-                        continue
+            for element in soup.select(ESPN_FIXTURE_SELECTOR):
+                try:
+                    fixture = self._extract_fixture_from_element(element, 'espn', date, day_name)
+                    if fixture:
+                        fixtures.append(fixture)
+                except Exception as e:
+                    continue
 
             fixtures.extend(self._extract_fixtures_from_text(soup, 'espn', date, day_name))
 
@@ -276,7 +277,7 @@ class MatchFixturesCollector:
                     response = requests.get(url, headers=headers, timeout=10)
 
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self._parse_html(response.text)
                         fixtures.extend(self._parse_sky_sports_fixtures(soup, date, day_name))
 
                 except Exception as e:
@@ -296,22 +297,13 @@ class MatchFixturesCollector:
         fixtures = []
 
         try:
-            selectors = [
-                '.fixres__item',
-                '.match-fixture',
-                '.fixture-list-item'
-            ]
-
-            for selector in selectors:
-                elements = soup.find_all(class_=selector)
-
-                for element in elements:
-                    try:
-                        fixture = self._extract_fixture_from_element(element, 'sky_sports', date, day_name)
-                        if fixture:
-                            fixtures.append(fixture)
-                    except Exception as e:
-                        continue
+            for element in soup.select(SKY_SPORTS_FIXTURE_SELECTOR):
+                try:
+                    fixture = self._extract_fixture_from_element(element, 'sky_sports', date, day_name)
+                    if fixture:
+                        fixtures.append(fixture)
+                except Exception as e:
+                    continue
 
             fixtures.extend(self._extract_fixtures_from_text(soup, 'sky_sports', date, day_name))
 
@@ -339,7 +331,7 @@ class MatchFixturesCollector:
                     response = requests.get(url, headers=headers, timeout=10)
 
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self._parse_html(response.text)
                         fixtures.extend(self._parse_goal_fixtures(soup, date, day_name))
 
                 except Exception as e:
@@ -384,7 +376,7 @@ class MatchFixturesCollector:
                     response = requests.get(url, headers=headers, timeout=10)
 
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self._parse_html(response.text)
                         fixtures.extend(self._extract_fixtures_from_text(soup, 'livescore', date, day_name))
 
                 except Exception as e:
@@ -415,7 +407,7 @@ class MatchFixturesCollector:
                     response = requests.get(url, headers=headers, timeout=10)
 
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self._parse_html(response.text)
                         fixtures.extend(self._extract_fixtures_from_text(soup, 'flashscore', date, day_name))
 
                 except Exception as e:
@@ -446,7 +438,7 @@ class MatchFixturesCollector:
                     response = requests.get(url, headers=headers, timeout=10)
 
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self._parse_html(response.text)
                         fixtures.extend(self._extract_fixtures_from_text(soup, 'sofascore', date, day_name))
 
                 except Exception as e:
@@ -477,7 +469,7 @@ class MatchFixturesCollector:
                     response = requests.get(url, headers=headers, timeout=10)
 
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self._parse_html(response.text)
                         fixtures.extend(self._extract_fixtures_from_text(soup, 'transfermarkt', date, day_name))
 
                 except Exception as e:
@@ -490,6 +482,16 @@ class MatchFixturesCollector:
             self.logger.warning(f"Hiba Transfermarkt gyűjtés során: {str(e)}")
             return []
 
+    def _parse_html(self, html: str) -> BeautifulSoup:
+        """
+        Oldal feldolgozása gyors parserrel (lxml, ha elérhető), csak a body részfával
+        """
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=BODY_STRAINER)
+        if soup.find(True) is None:
+            # Body nélküli töredék - teljes feldolgozás
+            soup = BeautifulSoup(html, HTML_PARSER)
+        return soup
+
     def _extract_fixture_from_element(self, element, source: str, date: str, day_name: str) -> Optional[Dict[str, Any]]:
         """
         HTML elemből mérkőzés adatok kinyerése
@@ -510,7 +512,7 @@ class MatchFixturesCollector:
 
             # Időpont keresése az elemben
             if fixture:
-                time_elem = element.find(class_=re.compile(r'time|kick.*off|start'))
+                time_elem = element.find(class_=TIME_CLASS_PATTERN)
                 if time_elem:
                     time_text = time_elem.get_text(strip=True)
                     parsed_time = self._parse_match_time(time_text)
@@ -531,7 +533,7 @@ class MatchFixturesCollector:
 
         try:
             # Minden szöveges elem átnézése
-            elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'div', 'span', 'p', 'a'])
+            elements = soup.find_all(TEXT_ELEMENT_TAGS)
 
             for element in elements:
                 try:
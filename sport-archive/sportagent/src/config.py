@@ -23,6 +23,13 @@ class Config:
         self.REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '1.0'))
         self.MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
 
+        # Párhuzamos statisztika gyűjtés: szálak száma (1 = soros) és
+        # forrásonkénti minimális időköz a kérések között (alapból REQUEST_DELAY)
+        self.STATS_MAX_WORKERS = int(os.getenv('STATS_MAX_WORKERS', '8'))
+        self.SOURCE_REQUEST_DELAYS = {
+            'demo_data': 0.0
+        }
+
         # Adatbázis beállítások
         self.DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///sportagent.db')
 
@@ -5,12 +5,16 @@ Kezeli a különböző ügynökök közötti adatcserét
 
 import json
 import os
+import re
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Set
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
 from ..utils.logger import Logger
+from .record_log import RecordLog
 
 logger = Logger().get_logger()
 
@@ -76,25 +80,56 @@ class BettingStrategy:
     reasoning: str
     created_at: str
 
+# Napló tömörítés: legalább ennyi sornál, ha az elavult sorok aránya nagyobb
+COMPACTION_MIN_LINES = 1000
+COMPACTION_GARBAGE_RATIO = 0.5
+
 class DataStorage:
     """
     Központi adattárolás és menedzsment osztály
+
+    A módosított rekordok append-only JSON Lines naplókba kerülnek
+    (data/store): a meccsek dátum szerinti partíciókba, az elemzések és
+    stratégiák egy-egy naplóba. Egy mentés költsége így a változás
+    méretével arányos, nem a teljes előzményével. A meccs partíciók
+    lustán, az első rájuk vonatkozó lekérdezéskor töltődnek be, a
+    get_matches szűrői pedig dátum, liga és csapat indexekből dolgoznak.
+    A sok elavult sort tartalmazó naplókat háttérszál tömöríti.
     """
 
-    def __init__(self):
-        self.base_path = Path("data")
+    def __init__(self, base_path: str = "data"):
+        self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
 
-        # Adatbázis fájlok
+        # Régi, teljes újraírású fájlok - csak az első indításkori átvételhez
         self.matches_file = self.base_path / "matches.json"
         self.analysis_file = self.base_path / "analysis.json"
         self.strategies_file = self.base_path / "strategies.json"
         self.historical_file = self.base_path / "historical.json"
 
-        # Memóriában tárolt adatok
+        # Napló alapú tároló
+        self.store_path = self.base_path / "store"
+        self.matches_path = self.store_path / "matches"
+        self._analysis_log = RecordLog(self.store_path / "analysis.jsonl")
+        self._strategies_log = RecordLog(self.store_path / "strategies.jsonl")
+        self._match_logs: Dict[str, RecordLog] = {}  # betöltött partíciók
+
+        # Memóriában tárolt (betöltött) adatok
         self.matches: Dict[str, MatchData] = {}
         self.analysis: Dict[str, AnalysisResult] = {}
         self.strategies: Dict[str, BettingStrategy] = {}
+        self._records_loaded = False
+
+        # Meccs indexek: kulcs -> meccs azonosítók, sorrend az első mentés szerint
+        self._match_order: Dict[str, int] = {}
+        self._last_seq = 0
+        self._by_date: Dict[str, Set[str]] = {}
+        self._by_league: Dict[str, Set[str]] = {}
+        self._by_team: Dict[str, Set[str]] = {}
+        self._dirty_matches: Set[str] = set()
+
+        self._lock = threading.RLock()
+        self._compactions: Dict[Path, threading.Thread] = {}
 
         # Betöltés
         self._load_data()
@@ -102,65 +137,211 @@ class DataStorage:
         logger.info("DataStorage inicializálva")
 
     def _load_data(self):
-        """Adatok betöltése fájlokból"""
+        """Tároló előkészítése - a rekordok csak első használatkor töltődnek be"""
         try:
-            # Mérkőzések betöltése
-            if self.matches_file.exists():
-                with open(self.matches_file, 'r', encoding='utf-8') as f:
-                    matches_data = json.load(f)
-                    self.matches = {
-                        k: MatchData(**v) for k, v in matches_data.items()
-                    }
-
-            # Elemzések betöltése
-            if self.analysis_file.exists():
-                with open(self.analysis_file, 'r', encoding='utf-8') as f:
-                    analysis_data = json.load(f)
-                    self.analysis = {
-                        k: AnalysisResult(**v) for k, v in analysis_data.items()
-                    }
-
-            # Stratégiák betöltése
-            if self.strategies_file.exists():
-                with open(self.strategies_file, 'r', encoding='utf-8') as f:
-                    strategies_data = json.load(f)
-                    self.strategies = {
-                        k: BettingStrategy(**v) for k, v in strategies_data.items()
-                    }
-
-            logger.info(f"Betöltve: {len(self.matches)} meccs, {len(self.analysis)} elemzés, {len(self.strategies)} stratégia")
+            if not self.store_path.exists():
+                self._migrate_legacy_files()
+
+            partitions = len(list(self.matches_path.glob('*.jsonl')))
+            logger.info(f"Napló alapú tároló: {partitions} meccs partíció (lusta betöltés)")
 
         except Exception as e:
             logger.error(f"Hiba az adatok betöltése során: {e}")
 
-    def _save_data(self):
-        """Adatok mentése fájlokba"""
-        try:
-            # Mérkőzések mentése
-            matches_data = {k: asdict(v) for k, v in self.matches.items()}
-            with open(self.matches_file, 'w', encoding='utf-8') as f:
-                json.dump(matches_data, f, ensure_ascii=False, indent=2)
+    def _migrate_legacy_files(self):
+        """A régi matches/analysis/strategies.json tartalmának átírása naplókba"""
+        legacy = {}
+        for name, path in (('matches', self.matches_file), ('analysis', self.analysis_file),
+                           ('strategies', self.strategies_file)):
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    legacy[name] = json.load(f)
+
+        self.matches_path.mkdir(parents=True, exist_ok=True)
+
+        partitions: Dict[str, List[Dict[str, Any]]] = {}
+        for match_id, data in legacy.get('matches', {}).items():
+            partitions.setdefault(self._partition_name(data.get('date', '')), []).append(
+                {'id': match_id, 'seq': self._next_seq(), 'data': data}
+            )
+        for name, entries in partitions.items():
+            RecordLog(self.matches_path / f"{name}.jsonl").append(entries)
+
+        self._analysis_log.append({'id': k, 'data': v} for k, v in legacy.get('analysis', {}).items())
+        self._strategies_log.append({'id': k, 'data': v} for k, v in legacy.get('strategies', {}).items())
+
+        if legacy:
+            logger.info(f"Régi JSON fájlok átvéve: {sum(len(v) for v in legacy.values())} rekord")
+
+    # --- Meccs partíciók és indexek ---
 
-            # Elemzések mentése
-            analysis_data = {k: asdict(v) for k, v in self.analysis.items()}
-            with open(self.analysis_file, 'w', encoding='utf-8') as f:
-                json.dump(analysis_data, f, ensure_ascii=False, indent=2)
+    @staticmethod
+    def _partition_name(date: str) -> str:
+        """Partíció (fájl) név a meccs dátumából"""
+        return re.sub(r'[^0-9A-Za-z_-]', '_', date or '') or '_undated'
 
-            # Stratégiák mentése
-            strategies_data = {k: asdict(v) for k, v in self.strategies.items()}
-            with open(self.strategies_file, 'w', encoding='utf-8') as f:
-                json.dump(strategies_data, f, ensure_ascii=False, indent=2)
+    def _next_seq(self) -> int:
+        self._last_seq = max(time.time_ns(), self._last_seq + 1)
+        return self._last_seq
 
-            logger.info("Adatok sikeresen mentve")
+    def _ensure_partition(self, name: str) -> RecordLog:
+        """Egy dátum partíció betöltése, ha még nincs a memóriában"""
+        log = self._match_logs.get(name)
+        if log is not None:
+            return log
 
+        log = RecordLog(self.matches_path / f"{name}.jsonl")
+        for entry in log.load().values():
+            seq = entry.get('seq', 0)
+            self._last_seq = max(self._last_seq, seq)
+            self._put_match(MatchData(**entry['data']), seq)
+        self._match_logs[name] = log
+        return log
+
+    def _ensure_all_partitions(self):
+        for path in sorted(self.matches_path.glob('*.jsonl')):
+            self._ensure_partition(path.stem)
+
+    def _ensure_partitions_for_ids(self, match_ids: Iterable[str]):
+        """
+        A meccs azonosítókhoz tartozó partíciók betöltése
+
+        Az azonosító a dátummal végződik, így elég a hozzá illő partíciót
+        betölteni; ha egyik sem illik, minden partíció betöltődik.
+        """
+        missing = [match_id for match_id in match_ids if match_id not in self.matches]
+        if not missing:
+            return
+
+        names = [path.stem for path in self.matches_path.glob('*.jsonl')]
+        for match_id in missing:
+            matching = [name for name in names if match_id.endswith(f"-{name.lower()}")]
+            if not matching:
+                self._ensure_all_partitions()
+                return
+            for name in matching:
+                self._ensure_partition(name)
+
+    def _put_match(self, match: MatchData, seq: Optional[int] = None) -> int:
+        """Meccs felvétele a memóriába és az indexekbe; visszaadja a sorszámát"""
+        previous = self.matches.get(match.id)
+        if previous is not None:
+            self._unindex_match(previous)
+        seq = self._match_order.get(match.id) or seq or self._next_seq()
+
+        self.matches[match.id] = match
+        self._match_order[match.id] = seq
+        self._by_date.setdefault(match.date, set()).add(match.id)
+        self._by_league.setdefault((match.league or '').lower(), set()).add(match.id)
+        for team in {(match.home_team or '').lower(), (match.away_team or '').lower()}:
+            self._by_team.setdefault(team, set()).add(match.id)
+        return seq
+
+    def _unindex_match(self, match: MatchData):
+        keys = (
+            (self._by_date, match.date),
+            (self._by_league, (match.league or '').lower()),
+            (self._by_team, (match.home_team or '').lower()),
+            (self._by_team, (match.away_team or '').lower()),
+        )
+        for index, key in keys:
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(match.id)
+                if not ids:
+                    del index[key]
+
+    def _remove_match(self, match_id: str):
+        match = self.matches.pop(match_id)
+        self._unindex_match(match)
+        del self._match_order[match_id]
+
+    @staticmethod
+    def _ids_containing(index: Dict[str, Set[str]], text: str) -> Set[str]:
+        """Azonosítók azokról a kulcsokról, amelyek tartalmazzák a szöveget"""
+        text = text.lower()
+        ids: Set[str] = set()
+        for key, key_ids in index.items():
+            if text in key:
+                ids |= key_ids
+        return ids
+
+    # --- Naplók írása és tömörítése ---
+
+    def _ensure_records_loaded(self):
+        """Elemzések és stratégiák betöltése első használatkor"""
+        if self._records_loaded:
+            return
+        self.analysis = {k: AnalysisResult(**v['data']) for k, v in self._analysis_log.load().items()}
+        self.strategies = {k: BettingStrategy(**v['data']) for k, v in self._strategies_log.load().items()}
+        self._records_loaded = True
+
+    def _append(self, log: RecordLog, entries: List[Dict[str, Any]], live_delta: int = 0):
+        """Bejegyzések naplóba írása, szükség esetén háttér tömörítéssel"""
+        try:
+            log.append(entries, live_delta)
         except Exception as e:
             logger.error(f"Hiba az adatok mentése során: {e}")
+            return
+        self._schedule_compaction(log)
+
+    def _append_matches(self, matches: Iterable[MatchData], new_ids: Set[str] = frozenset()):
+        """Meccsek aktuális állapotának naplózása, partíciónként egy írással"""
+        by_partition: Dict[str, List[Dict[str, Any]]] = {}
+        for match in matches:
+            by_partition.setdefault(self._partition_name(match.date), []).append(
+                {'id': match.id, 'seq': self._match_order[match.id], 'data': asdict(match)}
+            )
+        for name, entries in by_partition.items():
+            added = sum(1 for entry in entries if entry['id'] in new_ids)
+            self._append(self._match_logs[name], entries, added)
+
+    def _schedule_compaction(self, log: RecordLog):
+        """Tömörítés indítása háttérszálon, ha a naplóban sok az elavult sor"""
+        if not log.needs_compaction(COMPACTION_MIN_LINES, COMPACTION_GARBAGE_RATIO):
+            return
+        running = self._compactions.get(log.path)
+        if running is not None and running.is_alive():
+            return
+
+        thread = threading.Thread(target=self._compact_log, args=(log,),
+                                  name=f"compact-{log.path.stem}", daemon=True)
+        self._compactions[log.path] = thread
+        thread.start()
+
+    def _compact_log(self, log: RecordLog):
+        try:
+            with self._lock:
+                removed = log.compact()
+            if removed:
+                logger.info(f"Napló tömörítve: {log.path.name}, {removed} elavult sor törölve")
+        except Exception as e:
+            logger.error(f"Hiba a napló tömörítése során ({log.path.name}): {e}")
+
+    def compact(self):
+        """
+        Az összes betöltött napló tömörítése azonnal
+
+        Megvárja a futó háttér tömörítéseket is.
+        """
+        self.wait_for_compaction()
+        with self._lock:
+            for log in [*self._match_logs.values(), self._analysis_log, self._strategies_log]:
+                self._compact_log(log)
+
+    def wait_for_compaction(self):
+        """Futó háttér tömörítések bevárása"""
+        for thread in list(self._compactions.values()):
+            thread.join()
+
+    # --- Mérkőzések ---
 
     def store_matches(self, matches: List[Dict]) -> int:
         """
         Mérkőzések tárolása
         """
         stored_count = 0
+        stored: List[MatchData] = []
 
         for match_data in matches:
             try:
@@ -194,13 +375,22 @@ class DataStorage:
                     last_updated=datetime.now().isoformat()
                 )
 
-                self.matches[match_id] = match
+                stored.append(match)
                 stored_count += 1
 
             except Exception as e:
                 logger.error(f"Hiba a mérkőzés tárolása során: {e}")
 
-        self._save_data()
+        with self._lock:
+            new_ids: Set[str] = set()
+            for match in stored:
+                self._ensure_partition(self._partition_name(match.date))
+                if match.id not in self.matches:
+                    new_ids.add(match.id)
+                self._put_match(match)
+            # Egy kötegen belül ismétlődő meccsből csak az utolsó állapot kell
+            self._append_matches({match.id: match for match in stored}.values(), new_ids)
+
         logger.info(f"{stored_count} mérkőzés tárolva")
         return stored_count
 
@@ -210,21 +400,29 @@ class DataStorage:
                    team: Optional[str] = None) -> List[MatchData]:
         """
         Mérkőzések lekérése szűrési feltételekkel
-        """
-        matches = list(self.matches.values())
 
-        if date:
-            matches = [m for m in matches if m.date == date]
+        Dátummal csak az adott nap partíciója töltődik be; a szűrés az
+        indexeken történik, az eredmény a mentés sorrendjét követi.
+        """
+        with self._lock:
+            if date:
+                self._ensure_partition(self._partition_name(date))
+                ids = set(self._by_date.get(date, ()))
+            else:
+                self._ensure_all_partitions()
+                ids = None
 
-        if league:
-            matches = [m for m in matches if league.lower() in m.league.lower()]
+            if league:
+                league_ids = self._ids_containing(self._by_league, league)
+                ids = league_ids if ids is None else ids & league_ids
 
-        if team:
-            matches = [m for m in matches if
-                      team.lower() in m.home_team.lower() or
-                      team.lower() in m.away_team.lower()]
+            if team:
+                team_ids = self._ids_containing(self._by_team, team)
+                ids = team_ids if ids is None else ids & team_ids
 
-        return matches
+            if ids is None:
+                ids = self.matches.keys()
+            return [self.matches[match_id] for match_id in sorted(ids, key=self._match_order.__getitem__)]
 
     def store_analysis(self, match_id: str, analysis: Dict) -> bool:
         """
@@ -241,8 +439,11 @@ class DataStorage:
                 created_at=datetime.now().isoformat()
             )
 
-            self.analysis[match_id] = analysis_result
-            self._save_data()
+            with self._lock:
+                self._ensure_records_loaded()
+                is_new = match_id not in self.analysis
+                self.analysis[match_id] = analysis_result
+                self._append(self._analysis_log, [{'id': match_id, 'data': asdict(analysis_result)}], int(is_new))
 
             logger.info(f"Elemzés tárolva: {match_id}")
             return True
@@ -255,13 +456,17 @@ class DataStorage:
         """
         Elemzés lekérése
         """
-        return self.analysis.get(match_id)
+        with self._lock:
+            self._ensure_records_loaded()
+            return self.analysis.get(match_id)
 
     def get_all_analysis(self) -> Dict[str, AnalysisResult]:
         """
         Összes elemzés lekérése
         """
-        return self.analysis
+        with self._lock:
+            self._ensure_records_loaded()
+            return self.analysis
 
     def store_strategy(self, match_id: str, strategy: Dict) -> bool:
         """
@@ -280,8 +485,11 @@ class DataStorage:
                 created_at=datetime.now().isoformat()
             )
 
-            self.strategies[match_id] = betting_strategy
-            self._save_data()
+            with self._lock:
+                self._ensure_records_loaded()
+                is_new = match_id not in self.strategies
+                self.strategies[match_id] = betting_strategy
+                self._append(self._strategies_log, [{'id': match_id, 'data': asdict(betting_strategy)}], int(is_new))
 
             logger.info(f"Stratégia tárolva: {match_id}")
             return True
@@ -294,18 +502,26 @@ class DataStorage:
         """
         Fogadási stratégia lekérése
         """
-        return self.strategies.get(match_id)
+        with self._lock:
+            self._ensure_records_loaded()
+            return self.strategies.get(match_id)
 
     def get_all_strategies(self) -> Dict[str, BettingStrategy]:
         """
         Összes stratégia lekérése
         """
-        return self.strategies
+        with self._lock:
+            self._ensure_records_loaded()
+            return self.strategies
 
     def get_storage_stats(self) -> Dict[str, Any]:
         """
         Tárolási statisztikák
         """
+        with self._lock:
+            self._ensure_all_partitions()
+            self._ensure_records_loaded()
+
         return {
             'total_matches': len(self.matches),
             'total_analysis': len(self.analysis),
@@ -324,21 +540,36 @@ class DataStorage:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
 
-        # Régi mérkőzések törlése
-        old_matches = [
-            mid for mid, match in self.matches.items()
-            if datetime.fromisoformat(match.last_updated) < cutoff_date
-        ]
-
-        for match_id in old_matches:
-            del self.matches[match_id]
-            # Kapcsolódó elemzés és stratégia is törlődik
-            if match_id in self.analysis:
-                del self.analysis[match_id]
-            if match_id in self.strategies:
-                del self.strategies[match_id]
-
-        self._save_data()
+        with self._lock:
+            self._ensure_all_partitions()
+            self._ensure_records_loaded()
+
+            # Régi mérkőzések törlése
+            old_matches = [
+                mid for mid, match in self.matches.items()
+                if datetime.fromisoformat(match.last_updated) < cutoff_date
+            ]
+
+            tombstones: Dict[str, List[Dict[str, Any]]] = {}
+            deleted_analysis = []
+            deleted_strategies = []
+            for match_id in old_matches:
+                name = self._partition_name(self.matches[match_id].date)
+                tombstones.setdefault(name, []).append({'id': match_id, 'deleted': True})
+                self._remove_match(match_id)
+                # Kapcsolódó elemzés és stratégia is törlődik
+                if match_id in self.analysis:
+                    del self.analysis[match_id]
+                    deleted_analysis.append({'id': match_id, 'deleted': True})
+                if match_id in self.strategies:
+                    del self.strategies[match_id]
+                    deleted_strategies.append({'id': match_id, 'deleted': True})
+
+            for name, entries in tombstones.items():
+                self._append(self._match_logs[name], entries, -len(entries))
+            self._append(self._analysis_log, deleted_analysis, -len(deleted_analysis))
+            self._append(self._strategies_log, deleted_strategies, -len(deleted_strategies))
+
         logger.info(f"Törölt régi adatok: {len(old_matches)} mérkőzés")
 
     def save_complete_analysis(self, results: Dict, filename: str):
@@ -368,6 +599,10 @@ class DataStorage:
 
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
+            with self._lock:
+                self._ensure_all_partitions()
+                self._ensure_records_loaded()
+
             # Egyszerű CSV export pandas nélkül
             if data_type == 'matches':
                 data = [asdict(match) for match in self.matches.values()]
@@ -411,21 +646,32 @@ class DataStorage:
                 stored_count = self.store_matches(matches)
                 logger.info(f"Tárolva {stored_count} mérkőzés")
 
-            # Odds adatok frissítése
             odds_data = scraped_data.get('odds', {})
-            self._update_odds_data(odds_data)
-
-            # Statisztikák frissítése
             statistics_data = scraped_data.get('statistics', {})
-            self._update_statistics_data(statistics_data)
-
-            # Hírek frissítése
             news_data = scraped_data.get('news', {})
-            self._update_news_data(news_data)
-
-            # Social adatok frissítése
             social_data = scraped_data.get('social', {})
-            self._update_social_data(social_data)
+
+            with self._lock:
+                self._ensure_partitions_for_ids(
+                    {*odds_data, *statistics_data, *news_data, *social_data}
+                )
+
+                # Odds adatok frissítése
+                self._update_odds_data(odds_data)
+
+                # Statisztikák frissítése
+                self._update_statistics_data(statistics_data)
+
+                # Hírek frissítése
+                self._update_news_data(news_data)
+
+                # Social adatok frissítése
+                self._update_social_data(social_data)
+
+                # A frissített meccsek új állapotának naplózása
+                dirty = [self.matches[match_id] for match_id in self._dirty_matches if match_id in self.matches]
+                self._dirty_matches.clear()
+                self._append_matches(dirty)
 
             return True
 
@@ -443,6 +689,7 @@ class DataStorage:
                     match.odds_over_under = odds.get('over_under')
                     match.odds_both_teams_score = odds.get('both_teams_score')
                     match.last_updated = datetime.now().isoformat()
+                    self._dirty_matches.add(match_id)
         except Exception as e:
             logger.error(f"Hiba az odds adatok frissítése során: {e}")
 
@@ -456,6 +703,7 @@ class DataStorage:
                     match.away_form = stats.get('away_form')
                     match.head_to_head = stats.get('head_to_head')
                     match.last_updated = datetime.now().isoformat()
+                    self._dirty_matches.add(match_id)
         except Exception as e:
             logger.error(f"Hiba a statisztikai adatok frissítése során: {e}")
 
@@ -467,6 +715,7 @@ class DataStorage:
                     match = self.matches[match_id]
                     match.news_sentiment = news.get('sentiment')
                     match.last_updated = datetime.now().isoformat()
+                    self._dirty_matches.add(match_id)
         except Exception as e:
             logger.error(f"Hiba a hírek adatok frissítése során: {e}")
 
@@ -478,5 +727,6 @@ class DataStorage:
                     match = self.matches[match_id]
                     match.social_buzz = social.get('buzz')
                     match.last_updated = datetime.now().isoformat()
+                    self._dirty_matches.add(match_id)
         except Exception as e:
             logger.error(f"Hiba a social adatok frissítése során: {e}")
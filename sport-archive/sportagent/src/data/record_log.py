@@ -0,0 +1,120 @@
+"""
+Napló alapú (append-only) rekordtárolás
+Minden módosítás egy új JSON sorként kerül a fájl végére, a tömörítés
+pedig csak a rekordok legutolsó állapotát tartja meg
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from ..utils.logger import Logger
+
+logger = Logger().get_logger()
+
+class RecordLog:
+    """
+    Egy JSON Lines napló fájl
+
+    Soronként egy bejegyzés: {"id": ..., "data": {...}} a rekord új
+    állapota, {"id": ..., "deleted": true} a törlése. Betöltéskor azonos
+    azonosítónál a későbbi sor nyer, a rekordok sorrendje az első
+    megjelenésüké.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Sorok a fájlban és élő rekordok - ebből látszik, mennyi a szemét
+        self.lines = 0
+        self.live = 0
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Napló beolvasása
+
+        Returns:
+            Dict: azonosító -> a rekord legutolsó bejegyzése
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        self.lines = 0
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Félbeszakadt írás maradéka, a többi sor érvényes
+                        logger.warning(f"Hibás napló sor kihagyva: {self.path.name}:{line_number}")
+                        continue
+
+                    self.lines += 1
+                    if entry.get('deleted'):
+                        entries.pop(entry['id'], None)
+                    else:
+                        entries[entry['id']] = entry
+
+        self.live = len(entries)
+        return entries
+
+    def append(self, entries: Iterable[Dict[str, Any]], live_delta: int = 0) -> int:
+        """
+        Bejegyzések hozzáfűzése egyetlen írással
+
+        Args:
+            entries: Új bejegyzések
+            live_delta: Az élő rekordok számának változása
+
+        Returns:
+            int: A kiírt sorok száma
+        """
+        lines = [json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n' for entry in entries]
+        if not lines:
+            return 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+
+        self.lines += len(lines)
+        self.live += live_delta
+        return len(lines)
+
+    def needs_compaction(self, min_lines: int, max_garbage_ratio: float) -> bool:
+        """Megéri-e tömöríteni: elég hosszú és sok benne az elavult sor"""
+        if self.lines < min_lines:
+            return False
+        return (self.lines - self.live) / self.lines > max_garbage_ratio
+
+    def compact(self) -> Optional[int]:
+        """
+        Napló újraírása csak az élő rekordokkal
+
+        Az új fájl egy ideiglenes fájlba készül, és atomi cserével lép a
+        régi helyére; ha nem maradt élő rekord, a fájl törlődik.
+
+        Returns:
+            Optional[int]: Az eltávolított sorok száma (None, ha nincs fájl)
+        """
+        if not self.path.exists():
+            return None
+
+        entries = self.load()
+        removed = self.lines - len(entries)
+
+        if not entries:
+            self.path.unlink()
+            self.lines = self.live = 0
+            return removed
+
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.path)
+
+        self.lines = self.live = len(entries)
+        return removed
@@ -3,8 +3,9 @@ Clean Multi-Agent Sport System
 Tiszta, egyszerű multi-ügynök rendszer a meglévő jó komponensekkel
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 from rich.console import Console
 from rich.panel import Panel
@@ -15,7 +16,9 @@ from .agents.match_fixtures_collector import MatchFixturesCollector
 from .agents.match_statistics_agent import MatchStatisticsAgent
 from .agents.analysis_agent import AnalysisAgent
 from .agents.betting_strategy_agent import BettingStrategyAgent
+from .config import Config
 from .utils.logger import Logger
+from .utils.rate_limiter import SourceRateLimiter
 from .data.data_storage import DataStorage
 
 console = Console()
@@ -33,7 +36,9 @@ class CleanSportOrchestrator:
     """
 
     def __init__(self):
+        self.config = Config()
         self.data_storage = DataStorage()
+        self.rate_limiter = SourceRateLimiter(self.config.REQUEST_DELAY, self.config.SOURCE_REQUEST_DELAYS)
 
         # Fő ügynökök inicializálása
         self.fixtures_collector = MatchFixturesCollector()
@@ -50,12 +55,14 @@ class CleanSportOrchestrator:
 
         logger.info("Clean Sport Orchestrator inicializálva")
 
-    def run_daily_analysis(self, date_option: str = "today") -> Dict:
+    def run_daily_analysis(self, date_option: str = "today", max_workers: Optional[int] = None) -> Dict:
         """
         Napi sportanalízis futtatása
 
         Args:
             date_option: "today", "tomorrow", vagy "both"
+            max_workers: Statisztika gyűjtő szálak száma (alapból
+                Config.STATS_MAX_WORKERS); 1 esetén minden fázis sorosan fut
 
         Returns:
             Dict: Teljes análízis eredménye
@@ -92,59 +99,12 @@ class CleanSportOrchestrator:
                 console.print("❌ Nem találtunk meccseket", style="red")
                 return results
 
-            # 2. STATISZTIKÁK GYŰJTÉSE
-            console.print("\n📊 [bold yellow]2. FÁZIS: Statisztikák gyűjtése[/bold yellow]")
-
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                task = progress.add_task("Statisztikák elemzése...", total=len(matches))
-
-                statistics = {}
-                for i, match in enumerate(matches):
-                    try:
-                        match_stats = self.statistics_agent.analyze_match(match)
-                        statistics[match['id']] = match_stats
-                        progress.advance(task)
-                    except Exception as e:
-                        logger.error(f"Statisztika hiba {match.get('id')}: {e}")
-                        progress.advance(task)
-
-                results['statistics'] = statistics
-                progress.update(task, description=f"✅ {len(statistics)} meccs statisztikája kész")
-
-            # 3. RÉSZLETES ELEMZÉS
-            console.print("\n🧠 [bold magenta]3. FÁZIS: Részletes elemzés[/bold magenta]")
-
-            if self.analysis_agent:
-                try:
-                    analysis = self.analysis_agent.analyze_matches(matches)
-                    results['analysis'] = analysis
-                    console.print("✅ Részletes elemzés befejezve", style="green")
-                except Exception as e:
-                    logger.error(f"Elemzés hiba: {e}")
-                    console.print("⚠️ Részletes elemzés sikertelen", style="yellow")
-            else:
-                console.print("⚠️ Elemző ügynök nem elérhető", style="yellow")
-
-            # 4. FOGADÁSI STRATÉGIÁK
-            console.print("\n💰 [bold green]4. FÁZIS: Fogadási stratégiák[/bold green]")
-
-            if self.betting_agent and results['analysis']:
-                try:
-                    betting_strategies = self.betting_agent.generate_betting_strategies(
-                        matches=matches,
-                        analysis=results['analysis']
-                    )
-                    results['betting_strategies'] = betting_strategies
-                    console.print("✅ Fogadási stratégiák generálva", style="green")
-                except Exception as e:
-                    logger.error(f"Fogadási stratégia hiba: {e}")
-                    console.print("⚠️ Fogadási stratégiák sikertelenek", style="yellow")
+            # 2-4. STATISZTIKÁK, ELEMZÉS, STRATÉGIÁK
+            workers = max_workers or self.config.STATS_MAX_WORKERS
+            if workers > 1 and len(matches) > 1:
+                self._run_streaming_phases(matches, results, workers)
             else:
-                console.print("⚠️ Fogadási ügynök nem elérhető", style="yellow")
+                self._run_serial_phases(matches, results)
 
             # 5. ÖSSZEGZÉS
             results['summary'] = self._generate_summary(results)
@@ -157,6 +117,165 @@ class CleanSportOrchestrator:
             console.print(f"❌ Általános hiba: {str(e)}", style="bold red")
             return results
 
+    def _run_serial_phases(self, matches: List[Dict], results: Dict):
+        """
+        2-4. fázis egymás után: minden statisztika, majd elemzés, majd stratégiák
+        """
+        # 2. STATISZTIKÁK GYŰJTÉSE
+        console.print("\n📊 [bold yellow]2. FÁZIS: Statisztikák gyűjtése[/bold yellow]")
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        ) as progress:
+            task = progress.add_task("Statisztikák elemzése...", total=len(matches))
+
+            statistics = {}
+            for i, match in enumerate(matches):
+                try:
+                    match_stats = self.statistics_agent.analyze_match(match)
+                    statistics[match['id']] = match_stats
+                    progress.advance(task)
+                except Exception as e:
+                    logger.error(f"Statisztika hiba {match.get('id')}: {e}")
+                    progress.advance(task)
+
+            results['statistics'] = statistics
+            progress.update(task, description=f"✅ {len(statistics)} meccs statisztikája kész")
+
+        # 3. RÉSZLETES ELEMZÉS
+        console.print("\n🧠 [bold magenta]3. FÁZIS: Részletes elemzés[/bold magenta]")
+
+        if self.analysis_agent:
+            try:
+                analysis = self.analysis_agent.analyze_matches(matches)
+                results['analysis'] = analysis
+                console.print("✅ Részletes elemzés befejezve", style="green")
+            except Exception as e:
+                logger.error(f"Elemzés hiba: {e}")
+                console.print("⚠️ Részletes elemzés sikertelen", style="yellow")
+        else:
+            console.print("⚠️ Elemző ügynök nem elérhető", style="yellow")
+
+        # 4. FOGADÁSI STRATÉGIÁK
+        console.print("\n💰 [bold green]4. FÁZIS: Fogadási stratégiák[/bold green]")
+
+        if self.betting_agent and results['analysis']:
+            try:
+                betting_strategies = self.betting_agent.generate_betting_strategies(
+                    matches=matches,
+                    analysis=results['analysis']
+                )
+                results['betting_strategies'] = betting_strategies
+                console.print("✅ Fogadási stratégiák generálva", style="green")
+            except Exception as e:
+                logger.error(f"Fogadási stratégia hiba: {e}")
+                console.print("⚠️ Fogadási stratégiák sikertelenek", style="yellow")
+        else:
+            console.print("⚠️ Fogadási ügynök nem elérhető", style="yellow")
+
+    def _run_streaming_phases(self, matches: List[Dict], results: Dict, workers: int):
+        """
+        2-4. fázis streamelve
+
+        A statisztikák egy korlátos szálkészletben, forrásonkénti rate
+        limittel készülnek. Amint egy meccs statisztikája kész, az elemzése
+        és a fogadási stratégiája is elkészül, miközben a többi meccs
+        adatai még töltődnek. Az eredmények a meccsek sorrendjében
+        kerülnek az összesítőkbe, ahogy soros futásnál.
+        """
+        console.print(f"\n📊 [bold yellow]2-4. FÁZIS: Statisztikák, elemzés és stratégiák "
+                      f"({workers} szálon)[/bold yellow]")
+
+        match_stats: List[Optional[Tuple[str, Dict]]] = [None] * len(matches)
+        match_analysis: List[Optional[Dict]] = [None] * len(matches)
+        match_recommendations: List[Optional[List[Dict]]] = [None] * len(matches)
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        ) as progress:
+            stats_task = progress.add_task("Statisztikák elemzése...", total=len(matches))
+            analysis_task = progress.add_task("Részletes elemzés...", total=len(matches),
+                                              visible=self.analysis_agent is not None)
+            betting_task = progress.add_task("Fogadási stratégiák...", total=len(matches),
+                                             visible=self.betting_agent is not None)
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stats") as executor:
+                futures = {
+                    executor.submit(self._fetch_match_statistics, match): index
+                    for index, match in enumerate(matches)
+                }
+
+                # Az elemzés és a stratégia a fő szálon fut, a kész meccseken
+                for future in as_completed(futures):
+                    index = futures[future]
+                    match = matches[index]
+
+                    try:
+                        match_stats[index] = (match['id'], future.result())
+                    except Exception as e:
+                        logger.error(f"Statisztika hiba {match.get('id')}: {e}")
+                    progress.advance(stats_task)
+
+                    if self.analysis_agent:
+                        try:
+                            match_analysis[index] = self.analysis_agent.analyze_match(match)
+                        except Exception as e:
+                            logger.error(f"Hiba a mérkőzés elemzése során: {e}")
+                        progress.advance(analysis_task)
+
+                    if self.betting_agent and match_analysis[index]:
+                        try:
+                            match_recommendations[index] = self.betting_agent.generate_match_strategies(
+                                match_analysis[index]
+                            )
+                        except Exception as e:
+                            logger.error(f"Fogadási stratégia hiba {match.get('id')}: {e}")
+                    progress.advance(betting_task)
+
+            statistics = dict(stats for stats in match_stats if stats is not None)
+            results['statistics'] = statistics
+            progress.update(stats_task, description=f"✅ {len(statistics)} meccs statisztikája kész")
+
+        # 3. RÉSZLETES ELEMZÉS - összesítés
+        if self.analysis_agent:
+            try:
+                results['analysis'] = self.analysis_agent.summarize_analysis(
+                    matches, [analysis for analysis in match_analysis if analysis]
+                )
+                console.print("✅ Részletes elemzés befejezve", style="green")
+            except Exception as e:
+                logger.error(f"Elemzés hiba: {e}")
+                console.print("⚠️ Részletes elemzés sikertelen", style="yellow")
+        else:
+            console.print("⚠️ Elemző ügynök nem elérhető", style="yellow")
+
+        # 4. FOGADÁSI STRATÉGIÁK - összesítés
+        if self.betting_agent and results['analysis']:
+            try:
+                results['betting_strategies'] = self.betting_agent.summarize_strategies(
+                    matches=matches,
+                    analysis=results['analysis'],
+                    match_recommendations=[
+                        recommendations for analysis, recommendations in zip(match_analysis, match_recommendations)
+                        if analysis and recommendations is not None
+                    ]
+                )
+                console.print("✅ Fogadási stratégiák generálva", style="green")
+            except Exception as e:
+                logger.error(f"Fogadási stratégia hiba: {e}")
+                console.print("⚠️ Fogadási stratégiák sikertelenek", style="yellow")
+        else:
+            console.print("⚠️ Fogadási ügynök nem elérhető", style="yellow")
+
+    def _fetch_match_statistics(self, match: Dict) -> Dict:
+        """Egy meccs statisztikái a forrása rate limitjével (szálkészletből hívva)"""
+        self.rate_limiter.acquire(match.get('source', 'default'))
+        return self.statistics_agent.analyze_match(match)
+
     def _collect_matches(self, date_option: str) -> List[Dict]:
         """
         Meccsek gyűjtése a dátum opció alapján
@@ -0,0 +1,53 @@
+"""
+Forrásonkénti kérés ütemezés
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+class SourceRateLimiter:
+    """
+    Szálbiztos, forrásonkénti rate limit
+
+    Egy forrás két egymást követő kérése között legalább a forráshoz
+    beállított időköz telik el. A hívók időpontot foglalnak, és a zár
+    elengedése után várnak, így a különböző források nem blokkolják
+    egymást.
+    """
+
+    def __init__(self,
+                 default_interval: float,
+                 intervals: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.default_interval = default_interval
+        self.intervals = dict(intervals or {})
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def interval_for(self, source: str) -> float:
+        """A forráshoz tartozó minimális időköz másodpercben"""
+        return self.intervals.get(source, self.default_interval)
+
+    def acquire(self, source: str) -> float:
+        """
+        Várakozás, amíg a forrás újabb kérést indíthat
+
+        Returns:
+            float: A várakozással töltött idő másodpercben
+        """
+        interval = self.interval_for(source)
+        if interval <= 0:
+            return 0.0
+
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_slot.get(source, now))
+            self._next_slot[source] = start + interval
+
+        wait = start - now
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -0,0 +1,110 @@
+"""
+DataStorage tesztek - napló alapú tárolás, lusta betöltés és indexelt lekérdezés
+"""
+
+import json
+import os
+import sys
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data import data_storage
+from src.data.data_storage import DataStorage
+
+def make_match(home, away, date, league="Premier League", **extra):
+    return {'home_team': home, 'away_team': away, 'date': date, 'time': '20:00',
+            'league': league, **extra}
+
+def log_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def test_get_matches_filters_from_indexes(tmp_path):
+    storage = DataStorage(base_path=str(tmp_path))
+    storage.store_matches([
+        make_match("Arsenal", "Chelsea", "2025-08-01"),
+        make_match("Barcelona", "Sevilla", "2025-08-01", league="La Liga"),
+        make_match("Chelsea", "Liverpool", "2025-08-02"),
+    ])
+
+    assert [m.id for m in storage.get_matches(date="2025-08-01")] == [
+        "arsenal-chelsea-2025-08-01", "barcelona-sevilla-2025-08-01"
+    ]
+    assert [m.home_team for m in storage.get_matches(league="premier")] == ["Arsenal", "Chelsea"]
+    assert [m.id for m in storage.get_matches(date="2025-08-02", team="CHELS")] == [
+        "chelsea-liverpool-2025-08-02"
+    ]
+    assert storage.get_matches(date="2025-08-01", league="liga", team="arsenal") == []
+    assert len(storage.get_matches()) == 3
+
+def test_store_appends_changes_and_reloads_lazily(tmp_path):
+    storage = DataStorage(base_path=str(tmp_path))
+    storage.store_matches([make_match("Arsenal", "Chelsea", "2025-08-01"),
+                           make_match("Chelsea", "Liverpool", "2025-08-02")])
+    storage.store_matches([make_match("Arsenal", "Chelsea", "2025-08-01", home_score=2)])
+
+    partition = tmp_path / "store" / "matches" / "2025-08-01.jsonl"
+    assert len(log_lines(partition)) == 2
+
+    reopened = DataStorage(base_path=str(tmp_path))
+    assert reopened.matches == {}
+    matches = reopened.get_matches(date="2025-08-01")
+    assert [m.home_score for m in matches] == [2]
+    assert list(reopened._match_logs) == ["2025-08-01"]
+
+def test_analysis_and_strategies_are_persisted(tmp_path):
+    storage = DataStorage(base_path=str(tmp_path))
+    storage.store_analysis("arsenal-chelsea-2025-08-01", {'prediction_confidence': 0.7})
+    storage.store_strategy("arsenal-chelsea-2025-08-01", {'strategy_type': 'safe'})
+
+    reopened = DataStorage(base_path=str(tmp_path))
+    assert reopened.get_analysis("arsenal-chelsea-2025-08-01").prediction_confidence == 0.7
+    assert reopened.get_strategy("arsenal-chelsea-2025-08-01").strategy_type == 'safe'
+
+def test_collected_updates_are_logged(tmp_path):
+    storage = DataStorage(base_path=str(tmp_path))
+    storage.store_matches([make_match("Arsenal", "Chelsea", "2025-08-01")])
+
+    reopened = DataStorage(base_path=str(tmp_path))
+    reopened.store_collected_data({'odds': {"arsenal-chelsea-2025-08-01": {'1x2': {'1': 1.9}}}})
+
+    match = DataStorage(base_path=str(tmp_path)).get_matches(date="2025-08-01")[0]
+    assert match.odds_1x2 == {'1': 1.9}
+
+def test_compaction_keeps_latest_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_storage, 'COMPACTION_MIN_LINES', 10)
+    storage = DataStorage(base_path=str(tmp_path))
+    for score in range(30):
+        storage.store_matches([make_match("Arsenal", "Chelsea", "2025-08-01", home_score=score)])
+    storage.compact()
+
+    partition = tmp_path / "store" / "matches" / "2025-08-01.jsonl"
+    assert [entry['data']['home_score'] for entry in log_lines(partition)] == [29]
+    assert DataStorage(base_path=str(tmp_path)).get_matches()[0].home_score == 29
+
+def test_cleanup_writes_tombstones(tmp_path):
+    storage = DataStorage(base_path=str(tmp_path))
+    storage.store_matches([make_match("Arsenal", "Chelsea", "2025-08-01"),
+                           make_match("Chelsea", "Liverpool", "2025-08-02")])
+    storage.store_analysis("arsenal-chelsea-2025-08-01", {})
+    storage.matches["arsenal-chelsea-2025-08-01"].last_updated = (
+        datetime.now() - timedelta(days=30)
+    ).isoformat()
+    storage.cleanup_old_data(days=7)
+
+    reopened = DataStorage(base_path=str(tmp_path))
+    assert [m.id for m in reopened.get_matches()] == ["chelsea-liverpool-2025-08-02"]
+    assert reopened.get_analysis("arsenal-chelsea-2025-08-01") is None
+
+def test_legacy_json_files_are_migrated(tmp_path):
+    legacy = DataStorage(base_path=str(tmp_path / "legacy"))
+    legacy.store_matches([make_match("Arsenal", "Chelsea", "2025-08-01")])
+    match = legacy.get_matches()[0]
+
+    with open(tmp_path / "matches.json", 'w', encoding='utf-8') as f:
+        json.dump({match.id: asdict(match)}, f)
+
+    storage = DataStorage(base_path=str(tmp_path))
+    assert storage.get_matches(date="2025-08-01") == [match]
@@ -0,0 +1,42 @@
+"""
+SourceRateLimiter tesztek
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.rate_limiter import SourceRateLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+def test_requests_of_one_source_are_spaced():
+    clock = FakeClock()
+    limiter = SourceRateLimiter(1.0, clock=clock, sleep=clock.sleep)
+
+    waits = [limiter.acquire('espn') for _ in range(3)]
+    assert waits == [0.0, 1.0, 2.0]
+    assert clock.sleeps == [1.0, 2.0]
+
+def test_sources_are_limited_independently():
+    clock = FakeClock()
+    limiter = SourceRateLimiter(2.0, intervals={'demo_data': 0.0, 'bbc': 0.5},
+                                clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire('espn') == 0.0
+    assert limiter.acquire('bbc') == 0.0
+    assert limiter.acquire('bbc') == 0.5
+    assert [limiter.acquire('demo_data') for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    clock.now += 5
+    assert limiter.acquire('espn') == 0.0